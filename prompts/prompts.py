@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import List, NamedTuple, Tuple, Optional
 
 from prompts.examples import (build_placeholder_section,
@@ -5,7 +6,7 @@ from prompts.examples import (build_placeholder_section,
                               TAG0)
 from src.config import (INPUT_TAG_IN, INPUT_TAG_OUT, TRANSLATE_TAG_IN,
                         TRANSLATE_TAG_OUT, PLACEHOLDER_PREFIX, PLACEHOLDER_SUFFIX,
-                        create_placeholder)
+                        PROMPT_LAYOUT, create_placeholder)
 
 # Tags for placeholder correction responses
 CORRECTED_TAG_IN = "<CORRECTED_TAG_IN>"
@@ -96,6 +97,17 @@ The source text may contain OCR errors, formatting artifacts, or typographic def
 
 **DO NOT** add content, remove meaningful text, or alter the author's style."""
 
+# Segmented input section (several short texts packed into one request)
+SEGMENTED_INPUT_SECTION = """
+# SEGMENTED INPUT
+
+The text to translate contains several independent segments, each introduced by a
+marker line such as "<<<SEGMENT 0>>>".
+
+- Translate each segment on its own: segments come from different documents
+- Copy every marker line exactly as it is, on its own line, in the same order
+- **DO NOT** merge, split, drop, translate or renumber the markers"""
+
 
 def _build_optional_prompt_sections(prompt_options: dict) -> str:
     """
@@ -106,6 +118,7 @@ def _build_optional_prompt_sections(prompt_options: dict) -> str:
             - preserve_technical_content: DEPRECATED - Technical content is now protected
               via placeholder system (no prompt section needed)
             - text_cleanup: Include OCR/typographic defect correction instructions
+            - segmented_input: The text is a pack of marked segments to keep apart
 
     Returns:
         str: Concatenated optional sections to include in the system prompt
@@ -126,6 +139,10 @@ def _build_optional_prompt_sections(prompt_options: dict) -> str:
     if prompt_options.get('text_cleanup', False):
         sections.append(TEXT_CLEANUP_SECTION)
 
+    # Several short texts packed into one request (batch translation)
+    if prompt_options.get('segmented_input', False):
+        sections.append(SEGMENTED_INPUT_SECTION)
+
     # Join sections with double newline for proper separation
     return '\n\n'.join(sections)
 
@@ -134,45 +151,26 @@ def _build_optional_prompt_sections(prompt_options: dict) -> str:
 # TRANSLATION PROMPT FUNCTIONS
 # ============================================================================
 
-def generate_translation_prompt(
-    main_content: str,
-    context_before: str,
-    context_after: str,
-    previous_translation_context: str,
-    source_language: str = "English",
-    target_language: str = "Chinese",
-    translate_tag_in: str = TRANSLATE_TAG_IN,
-    translate_tag_out: str = TRANSLATE_TAG_OUT,
-    has_placeholders: bool = True,
-    prompt_options: dict = None,
-    placeholder_format: Optional[Tuple[str, str]] = None
-) -> PromptPair:
+@lru_cache(maxsize=32)
+def _build_translation_system_prompt(
+    source_language: str,
+    target_language: str,
+    translate_tag_in: str,
+    translate_tag_out: str,
+    has_placeholders: bool,
+    optional_sections: str,
+    placeholder_format: Optional[Tuple[str, str]]
+) -> str:
     """
-    Generate the translation prompt with all contextual elements.
+    Build the translation system prompt.
 
-    Args:
-        main_content: The text to translate
-        context_before: Text appearing before main_content for context
-        context_after: Text appearing after main_content for context
-        previous_translation_context: Previously translated text for consistency
-        source_language: Source language name
-        target_language: Target language name
-        translate_tag_in: Opening tag for translation output
-        translate_tag_out: Closing tag for translation output
-        has_placeholders: If True, includes placeholder preservation instructions (for EPUB HTML tags)
-        prompt_options: Optional dict with prompt customization options:
-            - preserve_technical_content: If True, includes instructions to NOT translate
-              code, paths, URLs, etc. (for technical documents)
-        placeholder_format: Optional tuple of (prefix, suffix) for placeholders.
-            e.g., ('[', ']') for [0] format or ('[[', ']]') for [[0]] format.
-            If None, uses default [[0]] format
+    Depends only on job-level settings, so it is built once per job and
+    every chunk sends byte-identical instructions (a stable prefix for
+    server-side prompt caches).
 
     Returns:
-        PromptPair: A named tuple with 'system' and 'user' prompts
+        str: The stripped system prompt
     """
-    # Initialize prompt_options if not provided
-    if prompt_options is None:
-        prompt_options = {}
     # Get target-language-specific example text for output format
     example_texts = {
         "chinese": "您翻译的文本在这里" if not has_placeholders else f"您翻译的文本在这里，所有{TAG0}标记都精确保留",
@@ -206,9 +204,6 @@ def generate_translation_prompt(
     else:
         placeholder_section = ""
 
-    # Build optional prompt sections based on prompt_options
-    optional_sections = _build_optional_prompt_sections(prompt_options)
-
     # SYSTEM PROMPT - Role and instructions (stable across requests)
     system_prompt = f"""You are a professional {target_language} translator and writer.
 
@@ -244,6 +239,63 @@ Do NOT write in {source_language} or any other language - ONLY {target_language.
 
 {output_format_section}"""
 
+    return system_prompt.strip()
+
+
+def generate_translation_prompt(
+    main_content: str,
+    context_before: str,
+    context_after: str,
+    previous_translation_context: str,
+    source_language: str = "English",
+    target_language: str = "Chinese",
+    translate_tag_in: str = TRANSLATE_TAG_IN,
+    translate_tag_out: str = TRANSLATE_TAG_OUT,
+    has_placeholders: bool = True,
+    prompt_options: dict = None,
+    placeholder_format: Optional[Tuple[str, str]] = None,
+    layout: Optional[str] = None
+) -> PromptPair:
+    """
+    Generate the translation prompt with all contextual elements.
+
+    Args:
+        main_content: The text to translate
+        context_before: Text appearing before main_content for context
+        context_after: Text appearing after main_content for context
+        previous_translation_context: Previously translated text for consistency
+        source_language: Source language name
+        target_language: Target language name
+        translate_tag_in: Opening tag for translation output
+        translate_tag_out: Closing tag for translation output
+        has_placeholders: If True, includes placeholder preservation instructions (for EPUB HTML tags)
+        prompt_options: Optional dict with prompt customization options:
+            - preserve_technical_content: If True, includes instructions to NOT translate
+              code, paths, URLs, etc. (for technical documents)
+        placeholder_format: Optional tuple of (prefix, suffix) for placeholders.
+            e.g., ('[', ']') for [0] format or ('[[', ']]') for [[0]] format.
+            If None, uses default [[0]] format
+        layout: "standard" (output reminder after the text) or "cache" (all
+            fixed instructions before the per-chunk text, so the longest
+            possible prefix is shared between requests). Defaults to PROMPT_LAYOUT
+
+    Returns:
+        PromptPair: A named tuple with 'system' and 'user' prompts
+    """
+    # Initialize prompt_options if not provided
+    if prompt_options is None:
+        prompt_options = {}
+    system_prompt = _build_translation_system_prompt(
+        source_language,
+        target_language,
+        translate_tag_in,
+        translate_tag_out,
+        has_placeholders,
+        # Optional sections based on prompt_options
+        _build_optional_prompt_sections(prompt_options),
+        tuple(placeholder_format) if placeholder_format else None
+    )
+
     # USER PROMPT - Context and content to translate (varies per request)
     previous_translation_block_text = ""
     if previous_translation_context and previous_translation_context.strip():
@@ -255,6 +307,25 @@ For consistency and natural flow, here's what came immediately before:
 
 """
 
+    if (layout or PROMPT_LAYOUT) == "cache":
+        # Fixed reminder first, per-chunk text last
+        user_prompt = f"""REMINDER: Output ONLY your translation in this exact format:
+{translate_tag_in}
+your translation here
+{translate_tag_out}
+
+Start with {translate_tag_in} and end with {translate_tag_out}. Nothing before or after.
+
+{previous_translation_block_text}# TEXT TO TRANSLATE
+
+{INPUT_TAG_IN}
+{main_content}
+{INPUT_TAG_OUT}
+
+Provide your translation now:"""
+
+        return PromptPair(system=system_prompt, user=user_prompt.strip())
+
     user_prompt = f"""{previous_translation_block_text}# TEXT TO TRANSLATE
 
 {INPUT_TAG_IN}
@@ -270,7 +341,7 @@ Start with {translate_tag_in} and end with {translate_tag_out}. Nothing before o
 
 Provide your translation now:"""
 
-    return PromptPair(system=system_prompt.strip(), user=user_prompt.strip())
+    return PromptPair(system=system_prompt, user=user_prompt.strip())
 
 
 def generate_refinement_prompt(
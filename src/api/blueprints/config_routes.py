@@ -8,7 +8,7 @@ import logging
 import requests
 import re
 import time
-from flask import Blueprint, request, jsonify, send_from_directory
+from flask import Blueprint, Response, request, jsonify, send_from_directory
 from pathlib import Path
 
 
@@ -83,6 +83,12 @@ def create_config_blueprint(server_session_id=None):
             "session_id": startup_time  # Alias for compatibility with LifecycleManager
         })
 
+    @bp.route('/metrics', methods=['GET'])
+    def prometheus_metrics():
+        """LLM request metrics of all jobs since startup, in Prometheus text format"""
+        from src.utils.metrics import REGISTRY
+        return Response(REGISTRY.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
     @bp.route('/api/models', methods=['GET', 'POST'])
     def get_available_models():
         """Get available models from Ollama, Gemini, or OpenRouter
@@ -4,13 +4,17 @@ Translation job management routes
 import os
 import time
 import copy
+import threading
 from flask import Blueprint, request, jsonify
 
 from src.config import (
     REQUEST_TIMEOUT,
-    OLLAMA_NUM_CTX
+    OLLAMA_NUM_CTX,
+    PROFILING_ENABLED,
+    PROFILE_MAX_SECONDS
 )
 from src.tts.tts_config import TTSConfig
+from src.utils.profiler import PROFILE_FORMATS, ProfileSession, profile_output_base
 
 
 def _resolve_api_key(value, env_var_name):
@@ -30,13 +34,77 @@ def _resolve_api_key(value, env_var_name):
     return value
 
 
-def create_translation_blueprint(state_manager, start_translation_job):
+def _build_job_config(data):
+    """
+    Build the job configuration shared by single-file and batch requests.
+
+    Args:
+        data: JSON body of the request
+
+    Returns:
+        Configuration dict (without file or output fields)
+    """
+    return {
+        'source_language': data['source_language'],
+        'target_language': data['target_language'],
+        'model': data['model'],
+        'llm_api_endpoint': data['llm_api_endpoint'],
+        'request_timeout': int(data.get('timeout', REQUEST_TIMEOUT)),
+        'context_window': int(data.get('context_window', OLLAMA_NUM_CTX)),
+        'max_attempts': int(data.get('max_attempts', 2)),
+        'retry_delay': int(data.get('retry_delay', 2)),
+        'llm_provider': data.get('llm_provider', 'ollama'),
+        'gemini_api_key': _resolve_api_key(data.get('gemini_api_key'), 'GEMINI_API_KEY'),
+        'openai_api_key': _resolve_api_key(data.get('openai_api_key'), 'OPENAI_API_KEY'),
+        'openrouter_api_key': _resolve_api_key(data.get('openrouter_api_key'), 'OPENROUTER_API_KEY'),
+        # Prompt options (optional instructions to include in the system prompt)
+        'prompt_options': data.get('prompt_options', {}),
+        # Bilingual output (original + translation interleaved)
+        'bilingual_output': data.get('bilingual_output', False),
+        # TTS configuration
+        'tts_enabled': data.get('tts_enabled', False),
+        'tts_config': TTSConfig.from_web_request(data).to_dict() if data.get('tts_enabled') else None
+    }
+
+
+def _batch_resume_config(config):
+    """
+    Rebuild the handler configuration of a batch job from its stored config.
+
+    translate_batch() stores its own fields (input_files, output_files,
+    model_name...) over the web job's config; batch jobs started from the
+    CLI only have the former.
+
+    Args:
+        config: Stored job configuration (a copy, updated in place)
+
+    Returns:
+        Configuration for the batch handler, or None if the preserved
+        input files are missing
+    """
+    preserved_paths = config.get('preserved_input_paths') or []
+    if not preserved_paths or not all(os.path.exists(path) for path in preserved_paths):
+        return None
+
+    config['file_type'] = 'batch'
+    config['file_paths'] = preserved_paths
+    config.setdefault('output_filenames', [os.path.basename(path) for path in config.get('output_files', [])])
+    config.setdefault('model', config.get('model_name'))
+    config.setdefault('output_filename', f"{len(preserved_paths)} files ({config['target_language']})")
+    config['gemini_api_key'] = _resolve_api_key(config.get('gemini_api_key'), 'GEMINI_API_KEY')
+    config['openai_api_key'] = _resolve_api_key(config.get('openai_api_key'), 'OPENAI_API_KEY')
+    config['openrouter_api_key'] = _resolve_api_key(config.get('openrouter_api_key'), 'OPENROUTER_API_KEY')
+    return config
+
+
+def create_translation_blueprint(state_manager, start_translation_job, output_dir=None):
     """
     Create and configure the translation blueprint
 
     Args:
         state_manager: Translation state manager instance
         start_translation_job: Function to start translation jobs
+        output_dir: Directory of the job outputs (where profiles are saved)
     """
     bp = Blueprint('translation', __name__)
 
@@ -64,28 +132,8 @@ def create_translation_blueprint(state_manager, start_translation_job):
         translation_id = f"trans_{int(time.time() * 1000)}"
 
         # Build configuration
-        config = {
-            'source_language': data['source_language'],
-            'target_language': data['target_language'],
-            'model': data['model'],
-            'llm_api_endpoint': data['llm_api_endpoint'],
-            'request_timeout': int(data.get('timeout', REQUEST_TIMEOUT)),
-            'context_window': int(data.get('context_window', OLLAMA_NUM_CTX)),
-            'max_attempts': int(data.get('max_attempts', 2)),
-            'retry_delay': int(data.get('retry_delay', 2)),
-            'output_filename': data['output_filename'],
-            'llm_provider': data.get('llm_provider', 'ollama'),
-            'gemini_api_key': _resolve_api_key(data.get('gemini_api_key'), 'GEMINI_API_KEY'),
-            'openai_api_key': _resolve_api_key(data.get('openai_api_key'), 'OPENAI_API_KEY'),
-            'openrouter_api_key': _resolve_api_key(data.get('openrouter_api_key'), 'OPENROUTER_API_KEY'),
-            # Prompt options (optional instructions to include in the system prompt)
-            'prompt_options': data.get('prompt_options', {}),
-            # Bilingual output (original + translation interleaved)
-            'bilingual_output': data.get('bilingual_output', False),
-            # TTS configuration
-            'tts_enabled': data.get('tts_enabled', False),
-            'tts_config': TTSConfig.from_web_request(data).to_dict() if data.get('tts_enabled') else None
-        }
+        config = _build_job_config(data)
+        config['output_filename'] = data['output_filename']
 
         # Add file-specific or text-specific configuration
         if 'file_path' in data:
@@ -107,6 +155,61 @@ def create_translation_blueprint(state_manager, start_translation_job):
             "config_received": config
         })
 
+    @bp.route('/api/translate/batch', methods=['POST'])
+    def start_batch_translation_request():
+        """Start one job translating several uploaded TXT/SRT files"""
+        from src.core.adapters import is_batch_supported
+
+        data = request.json or {}
+
+        for field in ['source_language', 'target_language', 'model', 'llm_api_endpoint']:
+            if field not in data or not isinstance(data[field], str) or not data[field].strip():
+                return jsonify({"error": f"Missing or empty field: {field}"}), 400
+
+        file_paths = data.get('file_paths')
+        if not isinstance(file_paths, list) or not file_paths:
+            return jsonify({"error": "Missing or empty field: file_paths"}), 400
+
+        unsupported = [path for path in file_paths if not is_batch_supported(path)]
+        if unsupported:
+            return jsonify({
+                "error": "Batch translation supports TXT and SRT files only",
+                "unsupported_files": unsupported
+            }), 400
+
+        output_filenames = data.get('output_filenames')
+        if output_filenames is None:
+            output_filenames = []
+            for path in file_paths:
+                base, ext = os.path.splitext(os.path.basename(path))
+                output_filenames.append(f"{base} ({data['target_language']}){ext}")
+        elif not isinstance(output_filenames, list) or len(output_filenames) != len(file_paths):
+            return jsonify({"error": "output_filenames must have one entry per file"}), 400
+
+        # Generate unique translation ID
+        translation_id = f"trans_{int(time.time() * 1000)}"
+
+        config = _build_job_config(data)
+        config.update({
+            'file_type': 'batch',
+            'file_paths': file_paths,
+            'output_filenames': output_filenames,
+            # Shown in job lists in place of a single output file
+            'output_filename': f"{len(file_paths)} files ({data['target_language']})"
+        })
+
+        # Create translation in state manager
+        state_manager.create_translation(translation_id, config)
+
+        # Start translation job
+        start_translation_job(translation_id, config)
+
+        return jsonify({
+            "translation_id": translation_id,
+            "message": "Batch translation queued.",
+            "config_received": config
+        })
+
     @bp.route('/api/translation/<translation_id>', methods=['GET'])
     def get_translation_job_status(translation_id):
         """Get status of a translation job"""
@@ -142,7 +245,9 @@ def create_translation_blueprint(state_manager, start_translation_job):
             "result_preview": "[Preview functionality removed. Download file to view content.]" if job_data.get('status') in ['completed', 'interrupted'] else None,
             "error": job_data.get('error'),
             "config": job_data.get('config'),
-            "output_filepath": job_data.get('output_filepath')
+            "output_filepath": job_data.get('output_filepath'),
+            "metrics": job_data.get('metrics'),
+            "profile": job_data.get('profile')
         })
 
     @bp.route('/api/translation/<translation_id>/interrupt', methods=['POST'])
@@ -162,6 +267,57 @@ def create_translation_blueprint(state_manager, start_translation_job):
             "message": "The translation is not in an interruptible state (e.g., already completed or failed)."
         }), 400
 
+    @bp.route('/api/translation/<translation_id>/profile', methods=['POST'])
+    def profile_translation_job(translation_id):
+        """Sample the CPU (and optionally memory) of a running job for a few seconds"""
+        if not PROFILING_ENABLED:
+            return jsonify({"error": "Profiling is disabled (set PROFILING_ENABLED=true)"}), 403
+
+        job_data = state_manager.get_translation(translation_id)
+        if not job_data:
+            return jsonify({"error": "Translation not found"}), 404
+        thread_id = job_data.get('worker_thread_id')
+        if job_data.get('status') not in ['running', 'queued'] or thread_id is None:
+            return jsonify({"error": "The translation is not running"}), 400
+        if (job_data.get('profile') or {}).get('status') == 'running':
+            return jsonify({"error": "A profile of this translation is already running"}), 409
+
+        data = request.get_json(silent=True) or {}
+        try:
+            seconds = float(data.get('seconds', 30))
+        except (TypeError, ValueError):
+            return jsonify({"error": "seconds must be a number"}), 400
+        if not 0 < seconds <= PROFILE_MAX_SECONDS:
+            return jsonify({"error": f"seconds must be between 0 and {PROFILE_MAX_SECONDS}"}), 400
+        profile_format = data.get('format', 'speedscope')
+        if profile_format not in PROFILE_FORMATS:
+            return jsonify({"error": f"format must be one of: {', '.join(PROFILE_FORMATS)}"}), 400
+
+        output_filename = job_data.get('config', {}).get('output_filename') or translation_id
+        session = ProfileSession(
+            thread_id,
+            profile_output_base(os.path.join(output_dir or '.', output_filename)),
+            fmt=profile_format,
+            memory=bool(data.get('memory', False))
+        )
+        files = [os.path.basename(path) for path in session.planned_files]
+
+        def run_profile():
+            try:
+                session.run(seconds)
+                state_manager.set_translation_field(translation_id, 'profile', {'status': 'completed', 'files': files})
+            except Exception as e:
+                state_manager.set_translation_field(translation_id, 'profile', {'status': 'error', 'error': str(e)})
+
+        state_manager.set_translation_field(translation_id, 'profile', {'status': 'running', 'files': files})
+        threading.Thread(target=run_profile, name=f"profile-{translation_id}", daemon=True).start()
+
+        return jsonify({
+            "message": f"Profiling for {seconds:g}s. Files will be available under /api/files.",
+            "seconds": seconds,
+            "files": files
+        }), 202
+
     @bp.route('/api/translations', methods=['GET'])
     def list_all_translations():
         """List all translation jobs"""
@@ -171,22 +327,34 @@ def create_translation_blueprint(state_manager, start_translation_job):
     @bp.route('/api/resumable', methods=['GET'])
     def list_resumable_jobs():
         """List all jobs that can be resumed"""
-        resumable_jobs = state_manager.get_resumable_jobs()
-        return jsonify({"resumable_jobs": resumable_jobs})
+        # Optional keyset pagination: ?limit=N&after_updated=...&after_id=...
+        limit = request.args.get('limit', type=int)
+        after_updated = request.args.get('after_updated')
+        after_id = request.args.get('after_id')
+        after = (after_updated, after_id) if after_updated and after_id else None
+
+        resumable_jobs = state_manager.get_resumable_jobs(limit=limit, after=after)
+        response = {"resumable_jobs": resumable_jobs}
+        if limit and len(resumable_jobs) == limit:
+            last_job = resumable_jobs[-1]
+            response["next_cursor"] = {
+                "after_updated": last_job['updated_at'],
+                "after_id": last_job['translation_id']
+            }
+        return jsonify(response)
 
     @bp.route('/api/resume/<translation_id>', methods=['POST'])
     def resume_translation_job_endpoint(translation_id):
         """Resume a paused or interrupted translation job"""
         # Check if there are any active translations
-        all_translations = state_manager.get_all_translations()
         active_translations = []
-        for tid, tdata in all_translations.items():
-            status = tdata.get('status')
+        for summary in state_manager.get_translation_summaries():
+            status = summary.get('status')
             if status in ['running', 'queued']:
                 active_translations.append({
-                    'id': tid,
+                    'id': summary['translation_id'],
                     'status': status,
-                    'output_filename': tdata.get('config', {}).get('output_filename', 'unknown')
+                    'output_filename': summary.get('output_filename') or 'unknown'
                 })
 
         if active_translations:
@@ -215,7 +383,16 @@ def create_translation_blueprint(state_manager, start_translation_job):
         # Always use preserved_input_path from config (stored during job creation)
         # This ensures consistent file path across multiple resume cycles
         preserved_path = config.get('preserved_input_path')
-        if preserved_path:
+        if job.get('file_type') == 'batch':
+            # Batch jobs preserve one copy per input file
+            config = _batch_resume_config(config)
+            if config is None:
+                return jsonify({
+                    "error": "Preserved input files not found",
+                    "message": "The preserved input files of this batch job no longer exist.",
+                    "suggestion": "This job cannot be resumed. Please delete this checkpoint and start a new translation."
+                }), 404
+        elif preserved_path:
             # Verify that the preserved file actually exists
             from pathlib import Path
             if Path(preserved_path).exists():
@@ -12,8 +12,9 @@ from pathlib import Path
 from src.utils.unified_logger import setup_web_logger, LogType
 from src.utils.file_utils import get_unique_output_path, generate_tts_for_translation
 from src.core.llm import OpenRouterProvider
-from src.core.adapters import translate_file
+from src.core.adapters import translate_file, translate_batch
 from src.tts.tts_config import TTSConfig
+from src.utils.metrics import MetricsRegistry
 from .websocket import emit_update
 
 
@@ -30,6 +31,8 @@ def run_translation_async_wrapper(translation_id, config, state_manager, output_
     """
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
+    # Lets POST /api/translation/<id>/profile find the thread to sample
+    state_manager.set_translation_field(translation_id, 'worker_thread_id', threading.get_ident())
     try:
         loop.run_until_complete(perform_actual_translation(translation_id, config, state_manager, output_dir, socketio))
     except Exception as e:
@@ -47,6 +50,15 @@ def run_translation_async_wrapper(translation_id, config, state_manager, output_
         loop.close()
 
 
+def _store_job_metrics(translation_id, state_manager, checkpoint_manager):
+    """Copy the request metrics from the job record (deleted once completed) into the job state"""
+    job_record = checkpoint_manager.get_job(translation_id)
+    if job_record and job_record.get('metrics'):
+        state_manager.set_translation_field(
+            translation_id, 'metrics', MetricsRegistry.from_dict(job_record['metrics']).summary()
+        )
+
+
 async def perform_actual_translation(translation_id, config, state_manager, output_dir, socketio):
     """
     Perform the actual translation job
@@ -162,6 +174,15 @@ async def perform_actual_translation(translation_id, config, state_manager, outp
     is_resume = config.get('is_resume', False)
 
     try:
+        # Several files in one job: the batch translator manages its own checkpoint
+        if config['file_type'] == 'batch':
+            await _perform_batch_translation(
+                translation_id, config, state_manager, output_dir, socketio,
+                checkpoint_manager, _log_message_callback,
+                _update_translation_stats_callback, should_interrupt_current_task
+            )
+            return
+
         # Create checkpoint for new jobs (not for resumed jobs)
         if not is_resume:
             file_type = config['file_type']
@@ -237,6 +258,7 @@ async def perform_actual_translation(translation_id, config, state_manager, outp
             prompt_options=config.get('prompt_options', {}),
             bilingual_output=config.get('bilingual_output', False)
         )
+        _store_job_metrics(translation_id, state_manager, checkpoint_manager)
 
         # Set result message based on file type
         file_type_upper = config['file_type'].upper()
@@ -411,6 +433,93 @@ async def perform_actual_translation(translation_id, config, state_manager, outp
             }, state_manager)
 
 
+async def _perform_batch_translation(translation_id, config, state_manager, output_dir, socketio,
+                                     checkpoint_manager, log_callback, stats_callback,
+                                     check_interruption_callback):
+    """
+    Translate the uploaded files of a batch job and publish the final status.
+
+    Args:
+        translation_id (str): Translation job ID
+        config (dict): Translation configuration (file_paths, output_filenames, ...)
+        state_manager: State manager instance
+        output_dir (str): Output directory path
+        socketio: SocketIO instance
+        checkpoint_manager: Checkpoint manager of the job
+        log_callback: Legacy log callback of the job
+        stats_callback: Stats update callback of the job
+        check_interruption_callback: Returns True when the job should stop
+    """
+    output_filepaths = [
+        get_unique_output_path(os.path.join(output_dir, filename))
+        for filename in config['output_filenames']
+    ]
+
+    results = await translate_batch(
+        input_filepaths=config['file_paths'],
+        output_filepaths=output_filepaths,
+        source_language=config['source_language'],
+        target_language=config['target_language'],
+        model_name=config['model'],
+        llm_provider=config.get('llm_provider', 'ollama'),
+        checkpoint_manager=checkpoint_manager,
+        translation_id=translation_id,
+        log_callback=log_callback,
+        stats_callback=stats_callback,
+        check_interruption_callback=check_interruption_callback,
+        llm_api_endpoint=config['llm_api_endpoint'],
+        gemini_api_key=config.get('gemini_api_key', ''),
+        openai_api_key=config.get('openai_api_key', ''),
+        openrouter_api_key=config.get('openrouter_api_key', ''),
+        context_window=config.get('context_window', 2048),
+        prompt_options=config.get('prompt_options', {}),
+        bilingual_output=config.get('bilingual_output', False),
+        job_config=config
+    )
+    _store_job_metrics(translation_id, state_manager, checkpoint_manager)
+
+    translated_count = sum(results.values())
+    state_manager.set_translation_field(translation_id, 'output_filepaths', output_filepaths)
+    state_manager.set_translation_field(
+        translation_id, 'result',
+        f"[{translated_count}/{len(results)} files translated - download to view]"
+    )
+
+    stats = state_manager.get_translation_field(translation_id, 'stats') or {}
+    elapsed_time = time.time() - stats.get('start_time', time.time())
+    stats_callback({'elapsed_time': elapsed_time})
+
+    final_status_payload = {
+        'result': state_manager.get_translation_field(translation_id, 'result'),
+        'output_filename': config['output_filename'],
+        'output_filenames': [os.path.basename(path) for path in output_filepaths],
+        'file_type': 'batch'
+    }
+
+    if state_manager.get_translation_field(translation_id, 'interrupted'):
+        state_manager.set_translation_field(translation_id, 'status', 'interrupted')
+        log_callback("summary_interrupted", f"🛑 Batch interrupted - partial results saved ({elapsed_time:.2f}s)")
+        final_status_payload['status'] = 'interrupted'
+        checkpoint_manager.mark_interrupted(translation_id)
+    else:
+        state_manager.set_translation_field(translation_id, 'status', 'completed')
+        summary = f" | {translated_count}/{len(results)} files"
+        if translated_count < len(results):
+            summary += f" ({len(results) - translated_count} incomplete)"
+        log_callback("summary_completed", f"✅ Batch completed in {elapsed_time:.2f}s{summary}")
+        final_status_payload['status'] = 'completed'
+        checkpoint_manager.cleanup_completed_job(translation_id)
+
+    if config.get('llm_provider') == 'openrouter':
+        OpenRouterProvider.set_cost_callback(None)
+
+    emit_update(socketio, translation_id, final_status_payload, state_manager)
+    socketio.emit('file_list_changed', {
+        'reason': final_status_payload['status'],
+        'filename': config['output_filename']
+    }, namespace='/')
+
+
 async def _perform_tts_generation(translation_id, config, output_filepath, state_manager, socketio, log_callback):
     """
     Perform TTS generation after successful translation.
@@ -40,7 +40,7 @@ def configure_routes(app, state_manager, output_dir, start_translation_job, sock
     app.register_blueprint(config_bp)
 
     # Register translation management routes
-    translation_bp = create_translation_blueprint(state_manager, start_translation_job)
+    translation_bp = create_translation_blueprint(state_manager, start_translation_job, output_dir)
     app.register_blueprint(translation_bp)
 
     # Register file management routes
@@ -150,7 +150,7 @@ class TranslationStateManager:
                     "completed_chunks": stats.get('completed_chunks', 0),
                     "last_translation": data.get('last_translation')
                 })
-            return sorted(summaries, key=lambda x: x.get('start_time', 0), reverse=True)
+            return sorted(summaries, key=lambda x: x.get('start_time') or 0, reverse=True)
     
     def is_interrupted(self, translation_id: str) -> bool:
         """Check if translation is interrupted"""
@@ -167,9 +167,9 @@ class TranslationStateManager:
             self._translations[translation_id]['interrupted'] = interrupted
             return True
 
-    def get_resumable_jobs(self):
-        """Get all jobs that can be resumed from database"""
-        return self.checkpoint_manager.get_resumable_jobs()
+    def get_resumable_jobs(self, limit=None, after=None):
+        """Get jobs that can be resumed from database (optionally one keyset page)"""
+        return self.checkpoint_manager.get_resumable_jobs(limit=limit, after=after)
 
     def restore_job_from_checkpoint(self, translation_id: str) -> bool:
         """
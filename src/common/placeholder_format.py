@@ -5,7 +5,10 @@ This module provides a unified interface for working with placeholders,
 eliminating duplication across the codebase.
 """
 import re
-from typing import Optional, Tuple
+from array import array
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from src.config import (
     PLACEHOLDER_PREFIX,
@@ -14,6 +17,112 @@ from src.config import (
 )
 
 
+class PlaceholderScan:
+    """
+    Result of a single linear scan of a text for placeholders.
+
+    Occurrences are stored as three parallel integer arrays (start offset,
+    end offset, placeholder index), in order of appearance. Validation
+    (count, order, duplicates, missing indices) and renumbering work on these
+    arrays instead of re-searching the text with regexes or str.replace().
+
+    Example:
+        >>> scan = PlaceholderFormat.from_config().scan("[id0]Hello[id1]")
+        >>> list(scan.indices)
+        [0, 1]
+        >>> scan.remap_indices([5, 6])
+        '[id5]Hello[id6]'
+    """
+
+    __slots__ = ('text', 'placeholder_format', 'starts', 'ends', 'indices')
+
+    def __init__(self, text: str, placeholder_format: 'PlaceholderFormat'):
+        self.text = text
+        self.placeholder_format = placeholder_format
+        self.starts = array('q')
+        self.ends = array('q')
+        self.indices = array('q')
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def is_ordered(self) -> bool:
+        """Check that placeholder indices appear in non-decreasing order."""
+        indices = self.indices
+        return all(indices[i] <= indices[i + 1] for i in range(len(indices) - 1))
+
+    def is_sequential(self, expected_count: int) -> bool:
+        """Check that indices are exactly 0..expected_count-1 (in any order)."""
+        return len(self.indices) == expected_count and sorted(self.indices) == list(range(expected_count))
+
+    def missing(self, expected_count: int) -> List[int]:
+        """Indices in 0..expected_count-1 that never occur, sorted."""
+        found = set(self.indices)
+        return [i for i in range(expected_count) if i not in found]
+
+    def extra(self, expected_count: int) -> List[int]:
+        """Indices that occur but fall outside 0..expected_count-1, sorted."""
+        return sorted({i for i in self.indices if i < 0 or i >= expected_count})
+
+    def duplicates(self) -> Dict[int, int]:
+        """Map of index -> occurrence count for indices appearing more than once."""
+        return {idx: count for idx, count in Counter(self.indices).items() if count > 1}
+
+    def placeholders(self) -> set:
+        """Set of distinct placeholder strings found in the text."""
+        create = self.placeholder_format.create
+        return {create(idx) for idx in set(self.indices)}
+
+    def remap_indices(self, new_indices: Sequence[int]) -> str:
+        """
+        Rebuild the text, replacing index ``i`` by ``new_indices[i]``.
+
+        Occurrences whose index is outside ``new_indices`` are kept as-is.
+        """
+        limit = len(new_indices)
+        create = self.placeholder_format.create
+        return self._rebuild(
+            create(new_indices[idx]) if 0 <= idx < limit else None
+            for idx in self.indices
+        )
+
+    def remap(self, index_map: Dict[int, int]) -> str:
+        """
+        Rebuild the text, replacing each index found in ``index_map``.
+
+        Occurrences whose index is not a key of ``index_map`` are kept as-is.
+        """
+        create = self.placeholder_format.create
+        return self._rebuild(
+            create(index_map[idx]) if idx in index_map else None
+            for idx in self.indices
+        )
+
+    def renumber_occurrences(self, offset: int = 0) -> str:
+        """
+        Rebuild the text giving each occurrence its own sequential index.
+
+        Duplicated placeholders receive distinct indices, so the n-th
+        occurrence becomes ``offset + n``.
+        """
+        create = self.placeholder_format.create
+        return self._rebuild(create(offset + n) for n in range(len(self.indices)))
+
+    def _rebuild(self, replacements) -> str:
+        """Join text slices with one replacement per occurrence (None = keep)."""
+        text = self.text
+        if not self.indices:
+            return text
+        parts = []
+        last_end = 0
+        for start, end, replacement in zip(self.starts, self.ends, replacements):
+            parts.append(text[last_end:start])
+            parts.append(text[start:end] if replacement is None else replacement)
+            last_end = end
+        parts.append(text[last_end:])
+        return ''.join(parts)
+
+
 class PlaceholderFormat:
     """
     Encapsulates placeholder format detection and manipulation.
@@ -63,6 +172,25 @@ class PlaceholderFormat:
         """
         return cls(PLACEHOLDER_PREFIX, PLACEHOLDER_SUFFIX, PLACEHOLDER_PATTERN)
 
+    @classmethod
+    def from_placeholder(cls, sample: str) -> Optional['PlaceholderFormat']:
+        """
+        Build a format from a sample placeholder such as "[id0]" or "[[0]]".
+
+        Formats are cached by (prefix, suffix), so the regex is compiled once.
+
+        Args:
+            sample: Placeholder containing a single run of digits
+
+        Returns:
+            PlaceholderFormat instance, or None if sample has no digits
+        """
+        match = re.match(r'^(.*?)(\d+)(.*)$', sample)
+        if not match:
+            return None
+        prefix, _, suffix = match.groups()
+        return _cached_format(prefix, suffix)
+
     @classmethod
     def from_text(cls, text: str) -> 'PlaceholderFormat':
         """
@@ -193,6 +321,30 @@ class PlaceholderFormat:
             ))
         return results
 
+    def scan(self, text: str) -> PlaceholderScan:
+        """
+        Scan text once and record every placeholder occurrence.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            PlaceholderScan with parallel start/end/index arrays
+
+        Example:
+            >>> fmt = PlaceholderFormat.from_config()
+            >>> scan = fmt.scan("[id0]Hello[id1]")
+            >>> list(scan.starts), list(scan.indices)
+            ([0, 10], [0, 1])
+        """
+        result = PlaceholderScan(text, self)
+        starts, ends, indices = result.starts, result.ends, result.indices
+        for match in self._compiled_pattern.finditer(text):
+            starts.append(match.start())
+            ends.append(match.end())
+            indices.append(int(match.group(1)))
+        return result
+
     def remove_all(self, text: str) -> str:
         """
         Remove all placeholders from text.
@@ -250,26 +402,18 @@ class PlaceholderFormat:
             >>> mapping
             {'[id5]': '[id0]', '[id2]': '[id1]', '[id8]': '[id2]'}
         """
-        placeholders = self.find_all(text)
+        scan = self.scan(text)
 
         # Build renumbering map (preserving order of appearance)
-        mapping = {}
-        seen = set()
-        new_index = offset
-
-        for _, _, placeholder, _ in placeholders:
-            if placeholder not in seen:
-                mapping[placeholder] = self.create(new_index)
-                seen.add(placeholder)
-                new_index += 1
-
-        # Apply renumbering in reverse order to avoid conflicts
-        # (e.g., [id10] -> [id1]0 if we replace [id1] first)
-        result = text
-        for old_placeholder in sorted(mapping.keys(),
-                                      key=lambda p: self.parse(p) or 0,
-                                      reverse=True):
-            result = result.replace(old_placeholder, mapping[old_placeholder])
+        index_map = {}
+        for idx in scan.indices:
+            if idx not in index_map:
+                index_map[idx] = offset + len(index_map)
+
+        mapping = {self.create(old): self.create(new) for old, new in index_map.items()}
+
+        # Rebuild in one pass from the scanned positions
+        result = scan.remap(index_map)
 
         return result, mapping
 
@@ -300,3 +444,11 @@ class PlaceholderFormat:
         return (self.prefix == other.prefix and
                 self.suffix == other.suffix and
                 self.pattern == other.pattern)
+
+
+@lru_cache(maxsize=32)
+def _cached_format(prefix: str, suffix: str) -> PlaceholderFormat:
+    """Return a shared PlaceholderFormat for an arbitrary prefix/suffix pair."""
+    if (prefix, suffix) == (PLACEHOLDER_PREFIX, PLACEHOLDER_SUFFIX):
+        return PlaceholderFormat.from_config()
+    return PlaceholderFormat(prefix, suffix, re.escape(prefix) + r'(\d+)' + re.escape(suffix))
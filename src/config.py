@@ -91,6 +91,10 @@ DEFAULT_MODEL = os.getenv('DEFAULT_MODEL', 'qwen3:14b')
 PORT = int(os.getenv('PORT', '5000'))
 REQUEST_TIMEOUT = int(os.getenv('REQUEST_TIMEOUT', '900'))
 OLLAMA_NUM_CTX = int(os.getenv('OLLAMA_NUM_CTX', '4096'))
+# How long Ollama keeps the model loaded after a request ("30m", "24h", "-1" = forever, "" = server default)
+OLLAMA_KEEP_ALIVE = os.getenv('OLLAMA_KEEP_ALIVE', '30m')
+# Load the model and probe its behavior in the background at job start
+MODEL_WARM_UP = os.getenv('MODEL_WARM_UP', 'true').lower() == 'true'
 
 # =============================================================================
 # THINKING MODEL CONFIGURATION
@@ -135,6 +139,12 @@ ADAPTIVE_CONTEXT_INITIAL = int(os.getenv("ADAPTIVE_CONTEXT_INITIAL", "2048"))  #
 ADAPTIVE_CONTEXT_INITIAL_THINKING = int(os.getenv("ADAPTIVE_CONTEXT_INITIAL_THINKING", "6144"))  # Starting context for thinking models (need more space for reasoning)
 ADAPTIVE_CONTEXT_STEP = int(os.getenv("ADAPTIVE_CONTEXT_STEP", "2048"))  # Step size for increases
 ADAPTIVE_CONTEXT_STABILITY_WINDOW = int(os.getenv("ADAPTIVE_CONTEXT_STABILITY_WINDOW", "5"))  # Chunks to track before reducing
+# Context sizes the adaptive strategy snaps to (each num_ctx change reloads the Ollama model)
+# Empty = move in ADAPTIVE_CONTEXT_STEP increments instead
+ADAPTIVE_CONTEXT_BUCKETS = [
+    int(size) for size in os.getenv("ADAPTIVE_CONTEXT_BUCKETS", "2048,4096,8192,16384,32768,65536,131072").split(",")
+    if size.strip()
+]
 
 # Repetition loop detection settings
 # Thinking models may have natural repetitions in their reasoning, so we use higher thresholds
@@ -153,6 +163,23 @@ MAX_CHUNK_SIZE = int(os.getenv("MAX_CHUNK_SIZE", "100"))
 # All file types use token-based chunking with tiktoken for consistent chunk sizes
 MAX_TOKENS_PER_CHUNK = int(os.getenv('MAX_TOKENS_PER_CHUNK', '450'))
 SOFT_LIMIT_RATIO = float(os.getenv('SOFT_LIMIT_RATIO', '0.8'))
+# Output ceiling (max_tokens) for OpenAI-compatible, OpenRouter and Gemini requests
+# 0 = derive from MAX_TOKENS_PER_CHUNK (2x the chunk + tag overhead, at least 2048)
+MAX_OUTPUT_TOKENS = int(os.getenv('MAX_OUTPUT_TOKENS', '0'))
+# Reasoning models spend part of max_tokens on hidden reasoning before the answer,
+# so the ceiling above would truncate (or empty) their translations.
+# Their requests get REASONING_MAX_OUTPUT_TOKENS instead (0 = no ceiling sent)
+REASONING_MAX_OUTPUT_TOKENS = int(os.getenv('REASONING_MAX_OUTPUT_TOKENS', '0'))
+# Model name patterns treated as reasoning models (matched at the start of the
+# name or after '/', ':', '-' or '_', e.g. 'openai/o3-mini', 'deepseek-r1:14b')
+REASONING_MODEL_PATTERNS = [
+    pattern.strip().lower()
+    for pattern in os.getenv(
+        'REASONING_MODEL_PATTERNS',
+        'o1,o3,o4,gpt-5,gpt-oss,deepseek-r1,qwq,gemini-2.5,thinking,reasoning'
+    ).split(',')
+    if pattern.strip()
+]
 
 # === Translation Buffer Configuration ===
 TRANSLATION_OUTPUT_MULTIPLIER = 2
@@ -173,6 +200,28 @@ MAX_PLACEHOLDER_CORRECTION_ATTEMPTS = 2
 MIN_CHUNK_SIZE_TOKENS = 50
 """Taille minimale d'un chunk pour éviter la sur-fragmentation"""
 
+# Prompt layout: "standard", or "cache" to keep the static instructions ahead of
+# all per-chunk text so servers with prefix caching reuse them across requests
+PROMPT_LAYOUT = os.getenv('PROMPT_LAYOUT', 'standard').lower()
+# Send provider cache hints (llama.cpp cache_prompt, OpenRouter cache_control,
+# Gemini cached content) for the job's system prompt
+PROMPT_CACHE_HINTS = os.getenv('PROMPT_CACHE_HINTS', 'false').lower() == 'true'
+# Lifetime of a Gemini cached system prompt, in seconds
+GEMINI_CACHE_TTL_SECONDS = int(os.getenv('GEMINI_CACHE_TTL_SECONDS', '600'))
+
+# JSON library for streamed responses, checkpoints and websocket payloads:
+# 'auto' (msgspec or orjson when installed, else the standard library),
+# 'msgspec', 'orjson' or 'json'
+JSON_BACKEND = os.getenv('JSON_BACKEND', 'auto').lower()
+
+# On-demand profiling of running jobs (POST /api/translation/<id>/profile).
+# Off by default: the endpoint answers 403 unless enabled
+PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', 'false').lower() == 'true'
+# Milliseconds between two stack samples of the profiled thread
+PROFILE_SAMPLE_INTERVAL_MS = float(os.getenv('PROFILE_SAMPLE_INTERVAL_MS', '10'))
+# Longest profiling window a request may ask for, in seconds
+PROFILE_MAX_SECONDS = int(os.getenv('PROFILE_MAX_SECONDS', '300'))
+
 # LLM Provider configuration
 LLM_PROVIDER = os.getenv('LLM_PROVIDER', 'ollama')  # 'ollama', 'gemini', 'openai', or 'openrouter'
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY', '')
@@ -187,6 +236,31 @@ OPENROUTER_API_ENDPOINT = 'https://openrouter.ai/api/v1/chat/completions'
 # SRT-specific configuration
 SRT_LINES_PER_BLOCK = int(os.getenv('SRT_LINES_PER_BLOCK', '5'))
 SRT_MAX_CHARS_PER_BLOCK = int(os.getenv('SRT_MAX_CHARS_PER_BLOCK', '500'))
+# Block grouping: "lines" (SRT_LINES_PER_BLOCK / SRT_MAX_CHARS_PER_BLOCK)
+# or "tokens" (blocks filled up to a token budget derived from the context window)
+SRT_BLOCK_GROUPING = os.getenv('SRT_BLOCK_GROUPING', 'lines').lower()
+# Token budget per block in "tokens" mode (0 = derive from the model's context size)
+SRT_MAX_TOKENS_PER_BLOCK = int(os.getenv('SRT_MAX_TOKENS_PER_BLOCK', '0'))
+# Quality floor in "tokens" mode: maximum subtitles per block
+SRT_MAX_CUES_PER_BLOCK = int(os.getenv('SRT_MAX_CUES_PER_BLOCK', '40'))
+# Silence (seconds) between subtitles treated as a scene break (0 = disabled)
+SRT_SCENE_GAP_SECONDS = float(os.getenv('SRT_SCENE_GAP_SECONDS', '5.0'))
+# Number of subtitle blocks translated concurrently (1 = sequential)
+SRT_BLOCK_CONCURRENCY = int(os.getenv('SRT_BLOCK_CONCURRENCY', '1'))
+
+# Batch translation of many small files (translate.py --input-dir, /api/translate/batch)
+# Requests in flight at once across the files of a batch
+BATCH_CONCURRENCY = int(os.getenv('BATCH_CONCURRENCY', '4'))
+# Maximum short texts packed into one request (1 = no packing)
+BATCH_MAX_SEGMENTS_PER_REQUEST = int(os.getenv('BATCH_MAX_SEGMENTS_PER_REQUEST', '16'))
+
+# Offline submission through the provider's Batch API (translate.py --batch)
+# Seconds between two status checks of a submitted batch
+BATCH_API_POLL_INTERVAL = float(os.getenv('BATCH_API_POLL_INTERVAL', '30'))
+# Completion window requested from the API
+BATCH_API_COMPLETION_WINDOW = os.getenv('BATCH_API_COMPLETION_WINDOW', '24h')
+# Hours to wait for a batch before cancelling it and translating online
+BATCH_API_MAX_WAIT_HOURS = float(os.getenv('BATCH_API_MAX_WAIT_HOURS', '24'))
 
 # Translation Attribution
 # This adds a discrete attribution to your translations (metadata for EPUB, footer for TXT, comment for SRT)
@@ -293,6 +367,18 @@ Alignment method to use:
 - 'advanced': Future - could add ML-based alignment
 """
 
+# =============================================================================
+# SMALL CHUNK PACKING
+# =============================================================================
+# Small EPUB chunks (front matter, chapter endings) are translated several per
+# request before the files are processed (see src/core/epub/chunk_packing.py).
+
+EPUB_PACK_SMALL_CHUNKS = os.getenv('EPUB_PACK_SMALL_CHUNKS', 'true').lower() == 'true'
+"""Pack small EPUB chunks into shared requests"""
+
+EPUB_PACK_MAX_SEGMENTS = int(os.getenv('EPUB_PACK_MAX_SEGMENTS', '8'))
+"""Maximum chunks per packed request (1 = no packing)"""
+
 
 def detect_placeholder_mode(text: str) -> tuple:
     """
@@ -22,6 +22,9 @@ from .epub_adapter import EpubAdapter
 # Unified translation entry point (Phase 6)
 from .translate_file import translate_file, get_file_type_from_path, build_translated_output
 
+# Batch translation of many small files in one job
+from .batch_translator import translate_batch, is_batch_supported
+
 # Error handling system (Phase 5)
 from .exceptions import (
     TranslationError,
@@ -60,6 +63,10 @@ __all__ = [
     'get_file_type_from_path',
     'build_translated_output',
 
+    # Batch translation
+    'translate_batch',
+    'is_batch_supported',
+
     # Error handling - Exceptions
     'TranslationError',
     'AdapterError',
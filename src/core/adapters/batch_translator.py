@@ -0,0 +1,395 @@
+"""
+Batch translation of many small files in a single job.
+
+Translating a folder file by file pays the per-file overhead (LLM client,
+model and context detection, checkpoint job) once per file. A batch job
+shares one LLM client and one checkpoint job across all files, packs the
+units of small files together into requests that fit the token budget,
+sends the requests concurrently and routes each translation back to the
+adapter of its file.
+"""
+
+import asyncio
+import os
+import time
+from typing import Callable, Optional, Dict, Any, List, Tuple
+
+from src.config import (MAX_TOKENS_PER_CHUNK, BATCH_CONCURRENCY,
+                        BATCH_MAX_SEGMENTS_PER_REQUEST)
+from src.core.chunking.token_chunker import default_token_counter
+from src.core.llm_client import create_llm_client
+from src.core.llm.utils.prompt_cache import prompt_cache_summary
+from src.core.segment_packing import pack_segments, unpack_segments, plan_packs
+from src.core.translator import generate_translation_request
+from src.utils.metrics import report_job_metrics
+
+from .format_adapter import FormatAdapter
+from .translation_unit import TranslationUnit
+from .txt_adapter import TxtAdapter
+from .srt_adapter import SrtAdapter
+from .exceptions import UnsupportedFormatError
+
+
+# Formats that can be translated in a batch
+BATCH_ADAPTERS = {
+    '.txt': TxtAdapter,
+    '.srt': SrtAdapter,
+}
+
+
+def is_batch_supported(filepath: str) -> bool:
+    """Whether a file can be part of a batch job (TXT or SRT)."""
+    _, ext = os.path.splitext(filepath.lower())
+    return ext in BATCH_ADAPTERS
+
+
+async def translate_batch(
+    input_filepaths: List[str],
+    output_filepaths: List[str],
+    source_language: str,
+    target_language: str,
+    model_name: str,
+    llm_provider: str,
+    checkpoint_manager: Any,
+    translation_id: str,
+    log_callback: Optional[Callable] = None,
+    stats_callback: Optional[Callable] = None,
+    check_interruption_callback: Optional[Callable] = None,
+    llm_api_endpoint: Optional[str] = None,
+    gemini_api_key: Optional[str] = None,
+    openai_api_key: Optional[str] = None,
+    openrouter_api_key: Optional[str] = None,
+    context_window: Optional[int] = None,
+    prompt_options: Optional[Dict[str, Any]] = None,
+    bilingual_output: bool = False,
+    max_concurrent_requests: Optional[int] = None,
+    max_tokens_per_request: Optional[int] = None,
+    max_segments_per_request: Optional[int] = None,
+    count_tokens: Optional[Callable[[str], int]] = None,
+    job_config: Optional[Dict[str, Any]] = None,
+    **additional_config
+) -> Dict[str, bool]:
+    """
+    Translate many TXT/SRT files as a single job.
+
+    Files whose units fit together in one request are packed with their
+    neighbours (see src.core.segment_packing); units of larger files are
+    sent on their own with their surrounding context. A pack whose response
+    can't be split back is retried unit by unit.
+
+    Args:
+        input_filepaths: Paths of the input files
+        output_filepaths: Output path of each input file
+        source_language: Source language name
+        target_language: Target language name
+        model_name: LLM model identifier
+        llm_provider: LLM provider name (ollama, gemini, openai, openrouter)
+        checkpoint_manager: CheckpointManager instance (one job for the batch)
+        translation_id: Unique identifier for the batch job
+        log_callback: Optional callback for logging (receives type and message)
+        stats_callback: Optional callback for statistics updates
+        check_interruption_callback: Optional callback to check if translation should be interrupted
+        llm_api_endpoint: LLM API endpoint URL
+        gemini_api_key: Google Gemini API key (required for gemini provider)
+        openai_api_key: OpenAI API key (required for openai provider)
+        openrouter_api_key: OpenRouter API key (required for openrouter provider)
+        context_window: Context window size in tokens
+        prompt_options: Optional prompt customization options
+        bilingual_output: If True, outputs contain both original and translated text
+        max_concurrent_requests: Requests in flight at once (default: BATCH_CONCURRENCY)
+        max_tokens_per_request: Token budget of a pack (default: MAX_TOKENS_PER_CHUNK)
+        max_segments_per_request: Maximum units per pack (default: BATCH_MAX_SEGMENTS_PER_REQUEST)
+        count_tokens: Token counter (default: the text chunker's tiktoken encoder)
+        job_config: Configuration of the caller's job, stored with the checkpoint
+            (the web interface resumes the job from it)
+        **additional_config: Additional configuration passed to the adapters
+
+    Returns:
+        Dict mapping each input path to True if it was fully translated
+
+    Raises:
+        UnsupportedFormatError: If a file is not TXT or SRT
+    """
+    if len(input_filepaths) != len(output_filepaths):
+        raise ValueError("input_filepaths and output_filepaths must have the same length")
+
+    for input_filepath in input_filepaths:
+        if not is_batch_supported(input_filepath):
+            supported = ', '.join(BATCH_ADAPTERS)
+            raise UnsupportedFormatError(
+                f"Unsupported file format for batch translation: {input_filepath}. "
+                f"Supported formats: {supported}"
+            )
+
+    prompt_options = prompt_options or {}
+    max_concurrent_requests = max(1, max_concurrent_requests or BATCH_CONCURRENCY)
+    max_tokens_per_request = max_tokens_per_request or MAX_TOKENS_PER_CHUNK
+    max_segments_per_request = max(1, max_segments_per_request or BATCH_MAX_SEGMENTS_PER_REQUEST)
+    count_tokens = count_tokens or default_token_counter()
+    job_started_at = time.perf_counter()
+
+    results = {input_filepath: False for input_filepath in input_filepaths}
+    adapters: List[Optional[FormatAdapter]] = []
+
+    # One client for the whole batch: thinking-model and context detection
+    # happen once instead of once per file
+    llm_client = create_llm_client(
+        llm_provider, gemini_api_key, llm_api_endpoint, model_name,
+        openai_api_key, openrouter_api_key,
+        context_window=context_window, log_callback=log_callback
+    )
+    # The model loads while the files are parsed
+    if llm_client:
+        llm_client.start_warm_up(log_callback, job_started_at=job_started_at)
+
+    try:
+        # 1. Prepare every file
+        adapter_config = {
+            'context_window': context_window,
+            'prompt_options': prompt_options,
+            **additional_config
+        }
+        for input_filepath, output_filepath in zip(input_filepaths, output_filepaths):
+            _, ext = os.path.splitext(input_filepath.lower())
+            adapter = BATCH_ADAPTERS[ext](
+                input_file_path=input_filepath,
+                output_file_path=output_filepath,
+                config=adapter_config
+            )
+            if llm_client:
+                await adapter.configure_for_model(llm_client)
+            if await adapter.prepare_for_translation():
+                adapters.append(adapter)
+            else:
+                adapters.append(None)
+                if log_callback:
+                    log_callback("batch_file_failed", f"Failed to prepare {input_filepath}")
+
+        # Units of all files, in file order: (file index, unit)
+        items: List[Tuple[int, TranslationUnit]] = [
+            (file_idx, unit)
+            for file_idx, adapter in enumerate(adapters) if adapter is not None
+            for unit in adapter.get_translation_units()
+        ]
+        total_units = len(items)
+        token_counts = [count_tokens(unit.content) for _, unit in items]
+
+        # Only files that fit in a single request are packed; the units of
+        # larger files keep their own requests and context
+        file_tokens: Dict[int, int] = {}
+        for (file_idx, _), tokens in zip(items, token_counts):
+            file_tokens[file_idx] = file_tokens.get(file_idx, 0) + tokens
+        small_files = {f for f, tokens in file_tokens.items() if tokens <= max_tokens_per_request}
+
+        if log_callback:
+            log_callback("batch_prepared",
+                f"Prepared {len(file_tokens)}/{len(input_filepaths)} files: "
+                f"{total_units} units, {len(small_files)} small files packed together")
+
+        # 2. Resume from the batch checkpoint, or start it
+        translated: Dict[int, str] = {}
+        checkpoint_data = checkpoint_manager.load_checkpoint(translation_id)
+        if checkpoint_data:
+            for chunk in checkpoint_data.get('chunks', []):
+                item_idx = chunk.get('chunk_index')
+                if (chunk.get('status') == 'completed' and chunk.get('translated_text')
+                        and item_idx is not None and 0 <= item_idx < total_units):
+                    translated[item_idx] = chunk['translated_text']
+            for item_idx, translated_text in translated.items():
+                file_idx, unit = items[item_idx]
+                await adapters[file_idx].save_unit_translation(unit.unit_id, translated_text)
+            if log_callback:
+                log_callback("checkpoint_resumed",
+                    f"Resuming batch: {len(translated)}/{total_units} units already translated")
+        else:
+            checkpoint_manager.start_job(
+                translation_id=translation_id,
+                file_type='batch',
+                config={
+                    **(job_config or {}),
+                    'input_files': [str(path) for path in input_filepaths],
+                    'output_files': [str(path) for path in output_filepaths],
+                    'source_language': source_language,
+                    'target_language': target_language,
+                    'model_name': model_name,
+                    'llm_provider': llm_provider,
+                    'llm_api_endpoint': llm_api_endpoint,
+                    'bilingual_output': bilingual_output,
+                    **adapter_config
+                },
+                # Inputs are copied so the batch can be resumed after uploads are cleaned up
+                input_file_paths=[str(path) for path in input_filepaths]
+            )
+
+        # 3. Pack the remaining units
+        pending = [i for i in range(total_units) if i not in translated]
+        packs = [
+            [pending[p] for p in pack]
+            for pack in plan_packs(
+                [token_counts[i] for i in pending],
+                max_tokens=max_tokens_per_request,
+                max_segments=max_segments_per_request,
+                packable=lambda p: items[pending[p]][0] in small_files
+            )
+        ]
+
+        failed_count = 0
+        if stats_callback:
+            stats_callback({
+                'total_chunks': total_units,
+                'completed_chunks': len(translated),
+                'failed_chunks': 0,
+                'total_files': len(input_filepaths)
+            })
+
+        async def request_translation(content: str, context_before: str = "",
+                                      context_after: str = "",
+                                      options: Optional[Dict[str, Any]] = None) -> Optional[str]:
+            try:
+                return await generate_translation_request(
+                    main_content=content,
+                    context_before=context_before,
+                    context_after=context_after,
+                    previous_translation_context="",
+                    source_language=source_language,
+                    target_language=target_language,
+                    model=model_name,
+                    llm_client=llm_client,
+                    log_callback=log_callback,
+                    prompt_options=options if options is not None else prompt_options
+                )
+            except Exception as e:
+                if log_callback:
+                    log_callback("unit_error", f"Error translating batch request: {str(e)}")
+                return None
+
+        async def translate_unit(item_idx: int) -> Optional[str]:
+            _, unit = items[item_idx]
+            return await request_translation(unit.content, unit.context_before, unit.context_after)
+
+        async def translate_pack(pack: List[int]) -> List[Optional[str]]:
+            if len(pack) == 1:
+                return [await translate_unit(pack[0])]
+
+            packed = pack_segments([items[i][1].content for i in pack])
+            response = await request_translation(
+                packed, options={**prompt_options, 'segmented_input': True}
+            )
+            segments = unpack_segments(response, len(pack)) if response else None
+            if segments is not None:
+                return segments
+
+            if log_callback:
+                log_callback("batch_pack_fallback",
+                    f"Could not split a pack of {len(pack)} units, translating them one by one")
+            return [await translate_unit(i) for i in pack]
+
+        async def record(item_idx: int, translated_text: Optional[str]):
+            nonlocal failed_count
+            file_idx, unit = items[item_idx]
+
+            saved = bool(translated_text) and await adapters[file_idx].save_unit_translation(
+                unit.unit_id, translated_text
+            )
+            if saved:
+                translated[item_idx] = translated_text
+            else:
+                failed_count += 1
+
+            checkpoint_manager.save_checkpoint(
+                translation_id=translation_id,
+                chunk_index=item_idx,
+                original_text=unit.content,
+                translated_text=translated_text if saved else None,
+                chunk_data={'file_index': file_idx, 'unit_id': unit.unit_id},
+                total_chunks=total_units,
+                completed_chunks=len(translated),
+                failed_chunks=failed_count
+            )
+
+            if stats_callback:
+                stats_callback({
+                    'total_chunks': total_units,
+                    'completed_chunks': len(translated),
+                    'failed_chunks': failed_count,
+                    'total_files': len(input_filepaths)
+                })
+
+        # 4. Translate the packs concurrently; results are recorded as they come
+        semaphore = asyncio.Semaphore(max_concurrent_requests)
+        interrupted = False
+
+        async def run_pack(pack: List[int]):
+            nonlocal interrupted
+            queued_at = time.perf_counter()
+            async with semaphore:
+                llm_client.record_queue_wait(time.perf_counter() - queued_at)
+                if interrupted:
+                    return
+                if check_interruption_callback and check_interruption_callback():
+                    interrupted = True
+                    if log_callback:
+                        log_callback("translation_interrupted",
+                            f"Batch interrupted: {len(translated)}/{total_units} units translated")
+                    return
+                translations = await translate_pack(pack)
+                for item_idx, translated_text in zip(pack, translations):
+                    await record(item_idx, translated_text)
+
+        await asyncio.gather(*(run_pack(pack) for pack in packs))
+
+        # 5. Write every file (partial outputs too when interrupted)
+        if log_callback:
+            log_callback("reconstruct_start", f"Writing {len(file_tokens)} output files")
+
+        done_per_file: Dict[int, int] = {}
+        units_per_file: Dict[int, int] = {}
+        for item_idx, (file_idx, _) in enumerate(items):
+            units_per_file[file_idx] = units_per_file.get(file_idx, 0) + 1
+            if item_idx in translated:
+                done_per_file[file_idx] = done_per_file.get(file_idx, 0) + 1
+
+        for file_idx, adapter in enumerate(adapters):
+            if adapter is None:
+                continue
+            try:
+                await adapter.write_output(bilingual=bilingual_output)
+            except Exception as e:
+                if log_callback:
+                    log_callback("reconstruct_failed",
+                        f"Failed to write {adapter.output_file_path}: {str(e)}")
+                continue
+            results[input_filepaths[file_idx]] = (
+                done_per_file.get(file_idx, 0) == units_per_file.get(file_idx, 0)
+            )
+
+        if interrupted:
+            checkpoint_manager.mark_paused(translation_id)
+            return results
+
+        completed_files = sum(results.values())
+        if completed_files == len(input_filepaths):
+            checkpoint_manager.mark_completed(translation_id)
+            if log_callback:
+                log_callback("translation_complete",
+                    f"Batch completed successfully: {completed_files} files, {total_units} units "
+                    f"in {len(packs)} requests")
+        elif log_callback:
+            log_callback("translation_partial",
+                f"Batch completed with failures: {completed_files}/{len(input_filepaths)} files "
+                f"fully translated, {failed_count} units failed")
+        return results
+
+    finally:
+        for adapter in adapters:
+            if adapter is not None:
+                try:
+                    await adapter.cleanup()
+                except Exception:
+                    pass
+        if llm_client:
+            cache_summary = prompt_cache_summary(llm_client.prompt_cache_stats)
+            if cache_summary and log_callback:
+                log_callback("prompt_cache_summary", cache_summary)
+            report_job_metrics(llm_client, log_callback, checkpoint_manager, translation_id)
+            await llm_client.close()
@@ -41,6 +41,20 @@ class FormatAdapter(ABC):
         self.config = config
         self.work_dir: Optional[Path] = None
 
+    async def configure_for_model(self, llm_client) -> None:
+        """
+        Adjust format settings to the model before preparation.
+
+        Called once, before prepare_for_translation(), with the LLM client
+        that will translate the units. The default implementation does
+        nothing; adapters whose unit sizes depend on the model (e.g. its
+        context window) override it.
+
+        Args:
+            llm_client: LLMClient used for the translation
+        """
+        pass
+
     @abstractmethod
     async def prepare_for_translation(self) -> bool:
         """
@@ -52,6 +66,9 @@ class FormatAdapter(ABC):
         - EPUB: Extract archive to temporary directory
         - PDF: Extract text and structure (future)
 
+        GenericTranslator runs it in a worker thread, on an event loop of its
+        own, so it must not await anything bound to the job's event loop.
+
         Returns:
             True if preparation was successful, False otherwise
         """
@@ -106,6 +123,48 @@ class FormatAdapter(ABC):
         """
         pass
 
+    async def write_output(self, bilingual: bool = False):
+        """
+        Write the final output file to output_file_path.
+
+        The default implementation writes the bytes of reconstruct_output().
+        Adapters that can produce their output incrementally override this
+        to stream it to disk instead.
+
+        Args:
+            bilingual: If True, interleave original and translated content
+        """
+        output_bytes = await self.reconstruct_output(bilingual=bilingual)
+        with open(self.output_file_path, 'wb') as f:
+            f.write(output_bytes)
+
+    async def begin_output(self, bilingual: bool = False):
+        """
+        Start writing the output file, before the first unit is translated.
+
+        Adapters that write their output while the translation runs (see
+        finish_unit) open it here. The default implementation does nothing:
+        the output is written by write_output() at the end.
+
+        Args:
+            bilingual: If True, interleave original and translated content
+        """
+        pass
+
+    async def finish_unit(self, unit_index: int):
+        """
+        Hand over a unit whose translation is final.
+
+        Called once per unit, in unit order, after begin_output() - for units
+        restored from a checkpoint as well as for units that failed (their
+        original content is kept). Streaming adapters write the unit out
+        here; write_output() then only completes and closes the file.
+
+        Args:
+            unit_index: Index of the unit in get_translation_units()
+        """
+        pass
+
     @abstractmethod
     async def resume_from_checkpoint(
         self,
@@ -136,6 +195,20 @@ class FormatAdapter(ABC):
         """
         pass
 
+    @property
+    def max_concurrent_units(self) -> int:
+        """
+        Number of units that may be translated at the same time.
+
+        Each unit is sent with the context of the nearest earlier unit
+        already translated, so formats whose units read as one continuous
+        text keep the default of 1 (each unit sees the previous one).
+
+        Returns:
+            Maximum number of translation requests in flight
+        """
+        return 1
+
     @property
     @abstractmethod
     def format_name(self) -> str:
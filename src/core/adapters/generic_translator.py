@@ -5,6 +5,8 @@ This module provides a unified translation workflow that works with any file for
 through the FormatAdapter interface.
 """
 
+import asyncio
+import time
 from typing import Callable, Optional, Dict, Any
 from pathlib import Path
 
@@ -59,6 +61,7 @@ class GenericTranslator:
         stats_callback: Optional[Callable] = None,
         check_interruption_callback: Optional[Callable] = None,
         bilingual_output: bool = False,
+        batch_mode: bool = False,
         **llm_kwargs
     ) -> bool:
         """
@@ -73,17 +76,55 @@ class GenericTranslator:
             stats_callback: Optional callback for statistics updates (receives dict with total_chunks, completed_chunks, failed_chunks)
             check_interruption_callback: Optional callback to check if translation should be interrupted
             bilingual_output: If True, output will contain both original and translated text
+            batch_mode: If True, translate the units in one offline batch first
+                (see src.core.offline_batch); the others are translated online
             **llm_kwargs: Additional LLM configuration (endpoint, api_key, etc.)
 
         Returns:
             True if translation completed successfully, False otherwise
         """
+        job_started_at = time.perf_counter()
+        llm_client = None
+        in_flight = {}  # task -> unit index
         try:
+            # Create LLM client first: adapters may size units from the model
+            from src.core.llm_client import LLMClient
+            from src.core.translator import generate_translation_request, plan_job_context
+            from src.core.llm.utils.prompt_cache import prompt_cache_summary
+            from src.utils.metrics import report_job_metrics
+
+            # Ollama jobs adapt num_ctx, planned once the units are known
+            context_manager = None
+            if llm_provider == "ollama" and self.adapter.config.get('auto_adjust_context', True):
+                from src.config import THINKING_MODELS, ADAPTIVE_CONTEXT_INITIAL_THINKING
+                from src.core.context_optimizer import AdaptiveContextManager, INITIAL_CONTEXT_SIZE
+                if any(tm in model_name.lower() for tm in THINKING_MODELS):
+                    initial_context = ADAPTIVE_CONTEXT_INITIAL_THINKING
+                else:
+                    initial_context = INITIAL_CONTEXT_SIZE
+                llm_kwargs['context_window'] = initial_context
+                context_manager = AdaptiveContextManager(
+                    initial_context=initial_context,
+                    log_callback=log_callback
+                )
+
+            llm_client = LLMClient(
+                provider_type=llm_provider,
+                model=model_name,
+                **llm_kwargs
+            )
+            # Load the model in the background while the file is prepared
+            # (with a context plan, once the units are known and it is planned)
+            llm_client.start_warm_up(log_callback, job_started_at=job_started_at,
+                                     wait_for_context_plan=context_manager is not None)
+            await self.adapter.configure_for_model(llm_client)
+
             # 1. Prepare file for translation
             if log_callback:
                 log_callback("prepare_start", f"Preparing {self.adapter.format_name.upper()} file for translation")
 
-            if not await self.adapter.prepare_for_translation():
+            # Parsing blocks, so it runs in a worker thread while the warm-up proceeds
+            if not await asyncio.to_thread(asyncio.run, self.adapter.prepare_for_translation()):
                 if log_callback:
                     log_callback("prepare_failed", "Failed to prepare file for translation")
                 return False
@@ -141,65 +182,68 @@ class GenericTranslator:
                     input_file_path=str(self.adapter.input_file_path)
                 )
 
-            # 5. Create LLM client
-            from src.core.llm_client import LLMClient
-            from src.core.translator import generate_translation_request
-
-            llm_client = LLMClient(
-                provider_type=llm_provider,
-                model=model_name,
-                **llm_kwargs
-            )
-
-            # 6. Translate each unit
-            last_context = ""
-            failed_count = 0
-
-            for i, unit in enumerate(units):
-                if i < resume_from:
-                    continue
+            # Size the context once for the whole job, from the largest remaining unit
+            if context_manager:
+                remaining_units = (units[i] for i in range(resume_from, total_units))
+                plan_job_context(
+                    context_manager, llm_client,
+                    ({
+                        'main_content': unit.content,
+                        'context_before': unit.context_before,
+                        'context_after': unit.context_after
+                    } for unit in remaining_units),
+                    source_language, target_language, model_name
+                )
 
-                # Check for interruption at the start of each unit
-                if check_interruption_callback and check_interruption_callback():
-                    if log_callback:
-                        log_callback("translation_interrupted",
-                            f"Translation interrupted at unit {i+1}/{total_units}")
+            # 5. Translate each unit (those done in the offline batch need no request)
+            batch_translations = {}
+            if batch_mode:
+                from src.core.offline_batch import translate_offline
+                batch_translations = await translate_offline(
+                    [{
+                        'main_content': unit.content,
+                        'context_before': unit.context_before,
+                        'context_after': unit.context_after
+                    } for unit in units[resume_from:]],
+                    source_language, target_language, llm_client,
+                    log_callback=log_callback,
+                    check_interruption_callback=check_interruption_callback
+                )
 
-                    # Try to save partial output for TXT/SRT (fast reconstruction)
-                    # For EPUB, partial output may not be valid, so we skip reconstruction
-                    if self.adapter.format_name in ['txt', 'srt']:
-                        try:
-                            if log_callback:
-                                log_callback("reconstruct_partial", "Saving partial output before interruption")
-                            output_bytes = await self.adapter.reconstruct_output(bilingual=bilingual_output)
-                            with open(self.adapter.output_file_path, 'wb') as f:
-                                f.write(output_bytes)
-                        except Exception as e:
-                            if log_callback:
-                                log_callback("reconstruct_partial_failed",
-                                    f"Could not save partial output: {str(e)}")
+            # Streaming adapters write units out as soon as they are final
+            await self.adapter.begin_output(bilingual=bilingual_output)
+            for i in range(resume_from):
+                await self.adapter.finish_unit(i)
 
-                    # Mark as paused/interrupted
-                    self.checkpoint_manager.mark_paused(self.translation_id)
-                    return False
+            failed_count = 0
 
-                if log_callback:
-                    log_callback("unit_start",
-                        f"Translating unit {i+1}/{total_units} ({unit.unit_id})")
+            async def translate_unit(i: int, unit: TranslationUnit, previous_context: str):
+                """Translate one unit; returns (translated_content, error)."""
+                try:
+                    translated_content = batch_translations.get(i - resume_from)
+                    if translated_content is None:
+                        translated_content = await generate_translation_request(
+                            main_content=unit.content,
+                            context_before=unit.context_before,
+                            context_after=unit.context_after,
+                            previous_translation_context=previous_context,
+                            source_language=source_language,
+                            target_language=target_language,
+                            model=model_name,
+                            llm_client=llm_client,
+                            log_callback=log_callback,
+                            context_manager=context_manager
+                        )
+                    return translated_content, None
+                except Exception as e:
+                    return None, e
 
-                # Translate unit
+            async def record_unit(i: int, unit: TranslationUnit, translated_content, error):
+                """Save a finished unit, checkpoint it and update stats (in unit order)."""
+                nonlocal failed_count
                 try:
-                    translated_content = await generate_translation_request(
-                        main_content=unit.content,
-                        context_before=unit.context_before,
-                        context_after=unit.context_after,
-                        previous_translation_context=last_context,
-                        source_language=source_language,
-                        target_language=target_language,
-                        model=model_name,
-                        llm_client=llm_client,
-                        log_callback=log_callback
-                    )
+                    if error is not None:
+                        raise error
 
                     if translated_content:
                         # Save via adapter
@@ -213,7 +257,7 @@ class GenericTranslator:
                                 log_callback("save_failed",
                                     f"Failed to save translation for unit {unit.unit_id}")
                             failed_count += 1
-                            continue
+                            return
 
                         # Save checkpoint
                         self.checkpoint_manager.save_checkpoint(
@@ -234,13 +278,6 @@ class GenericTranslator:
                                 'failed_chunks': failed_count
                             })
 
-                        # Update context for next unit
-                        last_context = (
-                            translated_content[-200:]
-                            if len(translated_content) > 200
-                            else translated_content
-                        )
-
                         if log_callback:
                             log_callback("unit_complete",
                                 f"Unit {i+1}/{total_units} translated successfully")
@@ -297,16 +334,86 @@ class GenericTranslator:
                             'failed_chunks': failed_count
                         })
 
-            # 7. Reconstruct output file
+            # Up to max_concurrent_units units are in flight. Each unit is sent with
+            # the context of the nearest earlier unit finished when it is launched
+            # (with a single slot this is exactly the previous unit). Finished units
+            # are recorded strictly in order, so checkpoints always cover a
+            # contiguous prefix and the resume point stays valid.
+            max_in_flight = max(1, self.adapter.max_concurrent_units)
+            finished_units = {}  # unit index -> (translated_content, error)
+            next_unit_idx = resume_from
+            next_record_idx = resume_from
+            latest_finished_idx = -1
+            last_context = ""
+            interrupted = False
+
+            while True:
+                while (not interrupted and next_unit_idx < total_units
+                       and len(in_flight) < max_in_flight):
+                    # Check for interruption before sending each unit
+                    if check_interruption_callback and check_interruption_callback():
+                        if log_callback:
+                            log_callback("translation_interrupted",
+                                f"Translation interrupted at unit {next_unit_idx+1}/{total_units}")
+                        interrupted = True
+                        break
+
+                    unit = units[next_unit_idx]
+                    if log_callback:
+                        log_callback("unit_start",
+                            f"Translating unit {next_unit_idx+1}/{total_units} ({unit.unit_id})")
+                    task = asyncio.ensure_future(translate_unit(next_unit_idx, unit, last_context))
+                    in_flight[task] = next_unit_idx
+                    next_unit_idx += 1
+
+                if not in_flight:
+                    break
+
+                # Units already sent are finished even when interrupted
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    i = in_flight.pop(task)
+                    finished_units[i] = task.result()
+                    translated_content = finished_units[i][0]
+                    if translated_content and i > latest_finished_idx:
+                        # Update context for the next units
+                        latest_finished_idx = i
+                        last_context = (
+                            translated_content[-200:]
+                            if len(translated_content) > 200
+                            else translated_content
+                        )
+
+                while next_record_idx in finished_units:
+                    translated_content, error = finished_units.pop(next_record_idx)
+                    await record_unit(next_record_idx, units[next_record_idx], translated_content, error)
+                    await self.adapter.finish_unit(next_record_idx)
+                    next_record_idx += 1
+
+            if interrupted:
+                # Try to save partial output for TXT/SRT (fast reconstruction)
+                # For EPUB, partial output may not be valid, so we skip reconstruction
+                if self.adapter.format_name in ['txt', 'srt']:
+                    try:
+                        if log_callback:
+                            log_callback("reconstruct_partial", "Saving partial output before interruption")
+                        await self.adapter.write_output(bilingual=bilingual_output)
+                    except Exception as e:
+                        if log_callback:
+                            log_callback("reconstruct_partial_failed",
+                                f"Could not save partial output: {str(e)}")
+
+                # Mark as paused/interrupted
+                self.checkpoint_manager.mark_paused(self.translation_id)
+                return False
+
+            # 6. Reconstruct output file
             if log_callback:
                 log_callback("reconstruct_start", "Reconstructing output file")
 
             try:
-                output_bytes = await self.adapter.reconstruct_output(bilingual=bilingual_output)
-
                 # Save final file
-                with open(self.adapter.output_file_path, 'wb') as f:
-                    f.write(output_bytes)
+                await self.adapter.write_output(bilingual=bilingual_output)
 
                 if log_callback:
                     log_callback("reconstruct_complete",
@@ -318,10 +425,10 @@ class GenericTranslator:
                         f"Failed to reconstruct output: {str(e)}")
                 return False
 
-            # 8. Cleanup
+            # 7. Cleanup
             await self.adapter.cleanup()
 
-            # 9. Mark job as completed
+            # 8. Mark job as completed
             if failed_count == 0:
                 self.checkpoint_manager.mark_completed(self.translation_id)
                 if log_callback:
@@ -339,12 +446,24 @@ class GenericTranslator:
                 log_callback("translation_error", f"Translation error: {str(e)}")
             return False
         finally:
+            # Units still in flight only remain after an error
+            for task in in_flight:
+                task.cancel()
+
             # Ensure cleanup even on error
             try:
                 await self.adapter.cleanup()
             except:
                 pass
 
+            # Interrupted and failed jobs report their metrics too
+            if llm_client:
+                cache_summary = prompt_cache_summary(llm_client.prompt_cache_stats)
+                if cache_summary and log_callback:
+                    log_callback("prompt_cache_summary", cache_summary)
+                report_job_metrics(llm_client, log_callback, self.checkpoint_manager, self.translation_id)
+                await llm_client.close()
+
     def __repr__(self) -> str:
         return (
             f"GenericTranslator("
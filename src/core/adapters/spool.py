@@ -0,0 +1,49 @@
+"""
+Temporary-file storage for adapters that must not hold a whole file in memory.
+"""
+
+import tempfile
+from collections.abc import Sequence
+from typing import List, Optional
+
+from src.utils import json_backend
+
+
+class SpooledRecords(Sequence):
+    """
+    List-like store of JSON records kept in an anonymous temporary file.
+
+    Only the file offset of each record stays in memory; records are read
+    back on access. Slots may be None (e.g. chunks not yet translated).
+    """
+
+    def __init__(self, length: int = 0):
+        self._file = tempfile.TemporaryFile()
+        self._offsets: List[Optional[int]] = [None] * length
+
+    def _write(self, record) -> Optional[int]:
+        if record is None:
+            return None
+        self._file.seek(0, 2)
+        offset = self._file.tell()
+        self._file.write(json_backend.dumps(record).encode('utf-8') + b'\n')
+        return offset
+
+    def append(self, record):
+        self._offsets.append(self._write(record))
+
+    def __setitem__(self, index: int, record):
+        self._offsets[index] = self._write(record)
+
+    def __getitem__(self, index: int):
+        offset = self._offsets[index]
+        if offset is None:
+            return None
+        self._file.seek(offset)
+        return json_backend.loads(self._file.readline())
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def close(self):
+        self._file.close()
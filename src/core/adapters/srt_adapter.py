@@ -1,124 +1,226 @@
 """
 SRT Adapter for the generic translation system.
 Handles SRT subtitle file format with local index renumbering.
+
+The file is parsed and grouped into blocks incrementally; blocks and their
+translations are spooled to temporary files, and translated blocks are
+written to the output as soon as they are final, so memory stays bounded
+by the blocks in flight regardless of the file size.
 """
 
-from typing import List, Dict, Any, Optional
-from pathlib import Path
+import io
+from collections import deque
+from collections.abc import Sequence
+from typing import List, Dict, Any, Optional, TextIO
 
+from src.config import SRT_BLOCK_GROUPING, SRT_BLOCK_CONCURRENCY
 from .format_adapter import FormatAdapter
+from .spool import SpooledRecords
 from .translation_unit import TranslationUnit
 
 
+class _SrtBlocks(Sequence):
+    """Subtitles of each block (the cues sent for translation), read from the spool."""
+
+    def __init__(self, records: SpooledRecords):
+        self._records = records
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __getitem__(self, index: int) -> List[Dict]:
+        record = self._records[index]
+        return record['subtitles'][record['skip']:]
+
+
+class _SrtUnits(Sequence):
+    """Translation units built on access from the spooled blocks."""
+
+    def __init__(self, blocks: _SrtBlocks, records: SpooledRecords):
+        self._blocks = blocks
+        self._records = records
+
+    def __len__(self) -> int:
+        return len(self._blocks)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        record = self._records[index]
+        block = record['subtitles'][record['skip']:]
+        first_global = record['first'] + record['skip']
+
+        # Build block text with local indices
+        local_to_global = {local_idx: first_global + local_idx for local_idx in range(len(block))}
+        block_text = '\n'.join(f"[{local_idx}]{subtitle['text']}" for local_idx, subtitle in enumerate(block))
+
+        # Context from adjacent blocks
+        context_before = self._blocks[index - 1][-1]['text'] if index > 0 else ""
+        context_after = self._blocks[index + 1][0]['text'] if index < len(self) - 1 else ""
+
+        return TranslationUnit(
+            unit_id=f"block_{index}",
+            content=block_text,
+            context_before=context_before,
+            context_after=context_after,
+            metadata={
+                'block_index': index,
+                'local_to_global': local_to_global,
+                'block_subtitles': list(local_to_global.values())
+            }
+        )
+
+
 class SrtAdapter(FormatAdapter):
     """Adapter for SRT (subtitle) files."""
 
     def __init__(self, input_file_path: str, output_file_path: str, config: Dict[str, Any]):
         super().__init__(input_file_path, output_file_path, config)
-        self.subtitles: List[Dict] = []
-        self.blocks: List[List[Dict]] = []
-        self.translations: Dict[int, str] = {}  # global_index -> translated_text
+        # One record per block: {'first': global index of its first subtitle,
+        # 'skip': leading subtitles that are written but not translated,
+        # 'subtitles': [...]}
+        self.block_records: SpooledRecords = SpooledRecords()
+        self.blocks = _SrtBlocks(self.block_records)
+        # Translated text of each block, by local index (None = not translated)
+        self.translated_blocks: SpooledRecords = SpooledRecords()
         self.processor = None
+        self.model_context_size: Optional[int] = None
+        self._output = None
+        self._writer = None
+        self._bilingual = False
+        self._streamed_blocks = set()
+
+    async def configure_for_model(self, llm_client) -> None:
+        """Detect the model's context size to size token-based blocks."""
+        if SRT_BLOCK_GROUPING == 'tokens':
+            self.model_context_size = await llm_client.get_model_context_size()
 
     async def prepare_for_translation(self) -> bool:
-        """Parse SRT file and group subtitles into blocks."""
+        """Parse the SRT file and group subtitles into blocks, spooling each block."""
         try:
             # Import here to avoid circular dependency
             from src.core.srt_processor import SRTProcessor
             self.processor = SRTProcessor()
 
-            # Read and parse SRT
-            with open(self.input_file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            self.subtitles = self.processor.parse_srt(content)
-
-            if not self.subtitles:
-                return False
-
-            # Group subtitles into blocks for translation
-            lines_per_block = self.config.get('lines_per_block', 5)
-            self.blocks = self.processor.group_subtitles_for_translation(
-                self.subtitles,
-                lines_per_block=lines_per_block
-            )
+            self._close_output()
+            self.block_records.close()
+            self.translated_blocks.close()
+            self.block_records = SpooledRecords()
+            self.blocks = _SrtBlocks(self.block_records)
+
+            # Subtitles parsed but not yet spooled with their block
+            parsed = deque()
+
+            def iter_subtitles():
+                for subtitle in self.processor.iter_srt_file(self.input_file_path):
+                    parsed.append(subtitle)
+                    yield subtitle
+
+            if SRT_BLOCK_GROUPING == 'tokens':
+                groups = self.processor.iter_groups(
+                    iter_subtitles(),
+                    context_size=self.model_context_size or self.config.get('context_window'),
+                    strategy='tokens'
+                )
+            else:
+                groups = self.processor.iter_groups_for_translation(
+                    iter_subtitles(),
+                    lines_per_block=self.config.get('lines_per_block', 5)
+                )
 
-            return True
+            next_global = 0
+            for block in groups:
+                # The record also carries the untranslated subtitles before the block
+                # (empty subtitles at the start of the file are in no block)
+                subtitles = []
+                while not subtitles or subtitles[-1] is not block[-1]:
+                    subtitles.append(parsed.popleft())
+                self.block_records.append({
+                    'first': next_global,
+                    'skip': len(subtitles) - len(block),
+                    'subtitles': subtitles
+                })
+                next_global += len(subtitles)
+
+            # Initialize translation storage (None = not yet translated)
+            self.translated_blocks = SpooledRecords(len(self.block_records))
+
+            return len(self.block_records) > 0
 
         except Exception:
             return False
 
     def get_translation_units(self) -> List[TranslationUnit]:
-        """Create translation units from subtitle blocks."""
-        units = []
-
-        for block_idx, block in enumerate(self.blocks):
-            # Build block text with local indices
-            block_text_lines = []
-            local_to_global = {}
-
-            for local_idx, subtitle in enumerate(block):
-                # Find global index of this subtitle
-                global_idx = self.subtitles.index(subtitle)
-                local_to_global[local_idx] = global_idx
-                block_text_lines.append(f"[{local_idx}]{subtitle['text']}")
-
-            block_text = '\n'.join(block_text_lines)
-
-            # Context from adjacent blocks
-            context_before = ""
-            context_after = ""
-
-            if block_idx > 0:
-                prev_block = self.blocks[block_idx - 1]
-                context_before = prev_block[-1]['text']
-
-            if block_idx < len(self.blocks) - 1:
-                next_block = self.blocks[block_idx + 1]
-                context_after = next_block[0]['text']
-
-            unit = TranslationUnit(
-                unit_id=f"block_{block_idx}",
-                content=block_text,
-                context_before=context_before,
-                context_after=context_after,
-                metadata={
-                    'block_index': block_idx,
-                    'local_to_global': local_to_global,
-                    'block_subtitles': [self.subtitles.index(s) for s in block]
-                }
-            )
-            units.append(unit)
-
-        return units
+        """
+        Create translation units from subtitle blocks.
+
+        Returns:
+            Sequence of TranslationUnit objects, one per block, built on access
+        """
+        return _SrtUnits(self.blocks, self.block_records)
+
+    def _store_block_translations(self, block_idx: int, translated_content: str,
+                                  local_to_global: Dict[int, int]):
+        """Extract the translations of a block and spool them by local index."""
+        block_translations = self.processor.extract_block_translations_with_remapping(
+            translated_content,
+            local_to_global
+        )
+        self.translated_blocks[block_idx] = [
+            block_translations.get(global_idx) for _, global_idx in sorted(local_to_global.items())
+        ]
 
     async def save_unit_translation(self, unit_id: str, translated_content: str) -> bool:
-        """Extract translations from block and store by global index."""
+        """Extract translations from block and store them with the block."""
         try:
             # Extract block index from unit_id
             block_idx = int(unit_id.split('_')[1])
-            units = self.get_translation_units()
 
-            if block_idx >= len(units):
+            if not 0 <= block_idx < len(self.block_records):
                 return False
 
-            unit = units[block_idx]
-
-            # Extract translations using remapping
-            local_to_global = unit.metadata['local_to_global']
-            block_translations = self.processor.extract_block_translations_with_remapping(
-                translated_content,
-                local_to_global
-            )
-
-            # Store translations by global index
-            self.translations.update(block_translations)
+            record = self.block_records[block_idx]
+            first_global = record['first'] + record['skip']
+            local_to_global = {
+                local_idx: first_global + local_idx
+                for local_idx in range(len(record['subtitles']) - record['skip'])
+            }
+            self._store_block_translations(block_idx, translated_content, local_to_global)
 
             return True
 
         except Exception:
             return False
 
+    def _output_block(self, block_idx: int, bilingual: bool) -> List[Dict]:
+        """Subtitles of a block as written to the output (translated or bilingual text)."""
+        record = self.block_records[block_idx]
+        translations = self.translated_blocks[block_idx] or []
+        output = []
+        for position, subtitle in enumerate(record['subtitles']):
+            local_idx = position - record['skip']
+            translated = translations[local_idx] if 0 <= local_idx < len(translations) else None
+            original_text = subtitle.get('original_text', subtitle['text'])
+            if bilingual:
+                text = f"{original_text}\n{translated if translated is not None else original_text}"
+            else:
+                text = translated if translated is not None else subtitle['text']
+            output.append({**subtitle, 'text': text})
+        return output
+
+    def _new_writer(self, stream: TextIO, bilingual: bool):
+        from src.core.srt_processor import SRTStreamWriter, attribution_signature
+        return SRTStreamWriter(stream, signature=attribution_signature(" (Bilingual)" if bilingual else ""))
+
+    def _write_srt(self, stream: TextIO, bilingual: bool = False):
+        """Write the whole translated SRT file block by block."""
+        writer = self._new_writer(stream, bilingual)
+        for block_idx in range(len(self.block_records)):
+            writer.add_block(block_idx, self._output_block(block_idx, bilingual))
+        writer.close()
+
     async def reconstruct_output(self, bilingual: bool = False) -> bytes:
         """
         Reconstruct SRT file with translations.
@@ -132,56 +234,62 @@ class SrtAdapter(FormatAdapter):
             Complete SRT file as bytes
         """
         try:
-            if bilingual:
-                # Bilingual mode: keep original and add translation below
-                srt_content = self._reconstruct_bilingual_srt()
-            else:
-                # Standard mode: replace text with translation
-                updated_subtitles = self.processor.update_translated_subtitles(
-                    self.subtitles,
-                    self.translations
-                )
-                srt_content = self.processor.reconstruct_srt(updated_subtitles)
-
-            return srt_content.encode('utf-8')
+            buffer = io.StringIO()
+            self._write_srt(buffer, bilingual=bilingual)
+            return buffer.getvalue().encode('utf-8')
 
         except Exception:
             # Fallback: return original file
             with open(self.input_file_path, 'rb') as f:
                 return f.read()
 
-    def _reconstruct_bilingual_srt(self) -> str:
-        """
-        Reconstruct SRT with bilingual format (original + translation).
-
-        Format:
-            1
-            00:00:01,000 --> 00:00:04,000
-            Hello, how are you?
-            Bonjour, comment allez-vous ?
+    async def begin_output(self, bilingual: bool = False):
+        """Open the output file; blocks are written by finish_unit() as they are final."""
+        self._close_output()
+        self._output = open(self.output_file_path, 'w', encoding='utf-8', newline='')
+        self._writer = self._new_writer(self._output, bilingual)
+        self._bilingual = bilingual
+        self._streamed_blocks = set()
+
+    async def finish_unit(self, unit_index: int):
+        """Write a final block (held back by the writer until earlier blocks are written)."""
+        if self._writer is None or unit_index in self._streamed_blocks:
+            return
+        self._streamed_blocks.add(unit_index)
+        self._writer.add_block(unit_index, self._output_block(unit_index, self._bilingual))
+        self._output.flush()
+
+    async def write_output(self, bilingual: bool = False):
         """
-        from src.config import ATTRIBUTION_ENABLED, GENERATOR_NAME, GENERATOR_SOURCE
+        Complete the translated SRT file.
 
-        srt_blocks = []
+        After begin_output(), writes the blocks not handed over yet (with
+        their original text if untranslated) and closes the file; otherwise
+        streams the whole file to output_file_path block by block.
 
-        for idx, subtitle in enumerate(self.subtitles):
-            original_text = subtitle.get('original_text', subtitle['text'])
-            translated_text = self.translations.get(idx, original_text)
-
-            block = f"{subtitle['number']}\n"
-            block += f"{subtitle['start_time']} --> {subtitle['end_time']}\n"
-            block += f"{original_text}\n"
-            block += f"{translated_text}\n"
-
-            srt_blocks.append(block)
-
-        # Add signature as comment at the end if enabled
-        if ATTRIBUTION_ENABLED:
-            signature = f"\n# Translated with {GENERATOR_NAME} (Bilingual)\n"
-            signature += f"# {GENERATOR_SOURCE}\n"
-            srt_blocks.append(signature)
+        Args:
+            bilingual: If True, include both original and translated text
+        """
+        try:
+            if self._writer is not None:
+                for block_idx in range(len(self.block_records)):
+                    await self.finish_unit(block_idx)
+                self._writer.close()
+                self._close_output()
+            else:
+                with open(self.output_file_path, 'w', encoding='utf-8', newline='') as f:
+                    self._write_srt(f, bilingual=bilingual)
+        except Exception:
+            # Fallback: write original file
+            self._close_output()
+            with open(self.input_file_path, 'rb') as src, open(self.output_file_path, 'wb') as dst:
+                dst.write(src.read())
 
-        return '\n'.join(srt_blocks)
+    def _close_output(self):
+        if self._output is not None:
+            self._output.close()
+        self._output = None
+        self._writer = None
 
     async def resume_from_checkpoint(self, checkpoint_data: Dict[str, Any]) -> int:
         """Restore translations from checkpoint."""
@@ -199,12 +307,9 @@ class SrtAdapter(FormatAdapter):
                         local_to_global = {
                             int(k): v for k, v in local_to_global_raw.items()
                         }
-
-                        block_translations = self.processor.extract_block_translations_with_remapping(
-                            translated_text,
-                            local_to_global
-                        )
-                        self.translations.update(block_translations)
+                        block_idx = metadata.get('block_index', chunk_data.get('chunk_index'))
+                        if block_idx is not None and 0 <= block_idx < len(self.translated_blocks):
+                            self._store_block_translations(block_idx, translated_text, local_to_global)
 
             return checkpoint_data.get('resume_from_index', 0)
 
@@ -212,8 +317,15 @@ class SrtAdapter(FormatAdapter):
             return 0
 
     async def cleanup(self):
-        """No cleanup needed for SRT files."""
-        pass
+        """Close the output file and the block spools."""
+        self._close_output()
+        self.block_records.close()
+        self.translated_blocks.close()
+
+    @property
+    def max_concurrent_units(self) -> int:
+        """Subtitle blocks translated in parallel (SRT_BLOCK_CONCURRENCY)."""
+        return max(1, SRT_BLOCK_CONCURRENCY)
 
     @property
     def format_name(self) -> str:
@@ -38,6 +38,7 @@ async def translate_file(
     min_chunk_size: int = 5,
     prompt_options: Optional[Dict[str, Any]] = None,
     bilingual_output: bool = False,
+    batch_mode: bool = False,
     **additional_config
 ) -> bool:
     """
@@ -70,6 +71,8 @@ async def translate_file(
         min_chunk_size: Minimum chunk size for text splitting
         prompt_options: Optional prompt customization options
         bilingual_output: If True, output will contain both original and translated text
+        batch_mode: If True, submit the job to the provider's Batch API first
+            (TXT, SRT, EPUB; see src.core.offline_batch)
         **additional_config: Additional configuration passed to the adapter
 
     Returns:
@@ -130,6 +133,7 @@ async def translate_file(
             resume_from_index=resume_from_index,
             prompt_options=prompt_options,
             bilingual=bilingual_output,
+            batch_mode=batch_mode,
             **additional_config
         )
         return True  # Legacy function doesn't return success status
@@ -214,7 +218,15 @@ async def translate_file(
         'openai_api_key': openai_api_key,
         'openrouter_api_key': openrouter_api_key,
         'prompt_options': prompt_options,
+        # Keys read by the provider factory
+        'api_key': {
+            'gemini': gemini_api_key,
+            'openai': openai_api_key,
+            'openrouter': openrouter_api_key
+        }.get(llm_provider),
     }
+    if llm_api_endpoint:
+        llm_config['api_endpoint'] = llm_api_endpoint
 
     # Execute translation
     return await translator.translate(
@@ -226,6 +238,7 @@ async def translate_file(
         stats_callback=stats_callback,
         check_interruption_callback=check_interruption_callback,
         bilingual_output=bilingual_output,
+        batch_mode=batch_mode,
         **llm_config
     )
 
@@ -2,19 +2,48 @@
 TXT format adapter for the generic translation system.
 
 This adapter handles plain text files by:
-1. Reading the entire file into memory
-2. Splitting it into token-based chunks
-3. Storing translated chunks in memory
-4. Reconstructing the output by joining chunks
+1. Streaming the file through the token chunker (never held whole in memory)
+2. Spooling the chunks and translated chunks to temporary files
+3. Writing the output chunk by chunk
 """
 
+import io
+from collections.abc import Sequence
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, TextIO
 
 from .format_adapter import FormatAdapter
+from .spool import SpooledRecords
 from .translation_unit import TranslationUnit
 
 
+class _TxtUnits(Sequence):
+    """Translation units built on access from the spooled chunks."""
+
+    def __init__(self, chunks: SpooledRecords):
+        self._chunks = chunks
+
+    def __len__(self) -> int:
+        return len(self._chunks)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        chunk = self._chunks[index]
+        return TranslationUnit(
+            unit_id=f"chunk_{index}",
+            content=chunk['main_content'],
+            context_before=chunk.get('context_before', ''),
+            context_after=chunk.get('context_after', ''),
+            metadata={
+                'chunk_index': index,
+                'total_chunks': len(self._chunks)
+            }
+        )
+
+
 class TxtAdapter(FormatAdapter):
     """
     Adapter for plain text (.txt) files.
@@ -35,33 +64,36 @@ class TxtAdapter(FormatAdapter):
                 - soft_limit_ratio: Soft limit for chunk splitting (default: from config)
         """
         super().__init__(input_file_path, output_file_path, config)
-        self.text: str = ""
-        self.chunks: List[Dict[str, str]] = []
-        self.translated_chunks: List[Optional[str]] = []
+        self.chunks: SpooledRecords = SpooledRecords()
+        self.translated_chunks: SpooledRecords = SpooledRecords()
 
     async def prepare_for_translation(self) -> bool:
         """
-        Read the text file and split it into chunks.
+        Stream the text file into chunks.
+
+        The file is read a block at a time and each chunk is spooled to a
+        temporary file as soon as it is complete, so memory stays bounded by
+        a few chunks regardless of the input size.
 
         Returns:
             True if file was successfully read and chunked
         """
         try:
-            # Read the entire file
-            with open(self.input_file_path, 'r', encoding='utf-8') as f:
-                self.text = f.read()
+            from src.core.text_processor import iter_file_chunks
 
-            # Split into chunks using token chunker
-            from src.core.text_processor import split_text_into_chunks
+            self.chunks.close()
+            self.translated_chunks.close()
+            self.chunks = SpooledRecords()
 
-            self.chunks = split_text_into_chunks(
-                text=self.text,
+            for chunk in iter_file_chunks(
+                str(self.input_file_path),
                 max_tokens_per_chunk=self.config.get('max_tokens_per_chunk'),
                 soft_limit_ratio=self.config.get('soft_limit_ratio')
-            )
+            ):
+                self.chunks.append(chunk)
 
             # Initialize translation storage (None = not yet translated)
-            self.translated_chunks = [None] * len(self.chunks)
+            self.translated_chunks = SpooledRecords(len(self.chunks))
 
             return True
 
@@ -73,24 +105,9 @@ class TxtAdapter(FormatAdapter):
         Convert chunks into translation units.
 
         Returns:
-            List of TranslationUnit objects, one per chunk
+            Sequence of TranslationUnit objects, one per chunk, built on access
         """
-        units = []
-
-        for i, chunk in enumerate(self.chunks):
-            unit = TranslationUnit(
-                unit_id=f"chunk_{i}",
-                content=chunk['main_content'],
-                context_before=chunk.get('context_before', ''),
-                context_after=chunk.get('context_after', ''),
-                metadata={
-                    'chunk_index': i,
-                    'total_chunks': len(self.chunks)
-                }
-            )
-            units.append(unit)
-
-        return units
+        return _TxtUnits(self.chunks)
 
     async def save_unit_translation(
         self,
@@ -98,7 +115,7 @@ class TxtAdapter(FormatAdapter):
         translated_content: str
     ) -> bool:
         """
-        Save a translated chunk to memory.
+        Save a translated chunk to the translation spool.
 
         Args:
             unit_id: Unit identifier (format: "chunk_{index}")
@@ -119,43 +136,66 @@ class TxtAdapter(FormatAdapter):
         except Exception:
             return False
 
-    async def reconstruct_output(self, bilingual: bool = False) -> bytes:
+    def _write_text(self, stream: TextIO, bilingual: bool = False):
         """
-        Reconstruct the complete translated text file.
+        Write the translated text chunk by chunk.
 
         If a chunk wasn't translated, uses the original text as fallback.
 
         Args:
+            stream: Text stream to write to
             bilingual: If True, interleave original and translated content
                       with visual separators for language learning.
-
-        Returns:
-            Complete translated file as bytes
         """
-        text_chunks = []
         separator = "─" * 40
+        joiner = "\n\n" if bilingual else "\n"
+        total = len(self.chunks)
 
-        for i, translated_chunk in enumerate(self.translated_chunks):
+        for i in range(total):
+            translated_chunk = self.translated_chunks[i]
             original = self.chunks[i]['main_content'].strip()
             translated = translated_chunk.strip() if translated_chunk else original
 
+            if i > 0:
+                stream.write(joiner)
+
             if bilingual:
                 # Bilingual format: original, blank line, translation, separator
-                block = f"{original}\n\n{translated}\n\n{separator}"
-                text_chunks.append(block)
+                # (no trailing separator after the last chunk)
+                if i < total - 1:
+                    stream.write(f"{original}\n\n{translated}\n\n{separator}")
+                else:
+                    stream.write(f"{original}\n\n{translated}".rstrip())
             else:
                 # Standard format: translation only
-                text_chunks.append(translated if translated_chunk else original)
+                stream.write(translated if translated_chunk else original)
 
-        # Join chunks
-        joiner = "\n\n" if bilingual else "\n"
-        final_text = joiner.join(text_chunks)
+    async def reconstruct_output(self, bilingual: bool = False) -> bytes:
+        """
+        Reconstruct the complete translated text file.
+
+        If a chunk wasn't translated, uses the original text as fallback.
 
-        # Remove trailing separator in bilingual mode
-        if bilingual and final_text.endswith(separator):
-            final_text = final_text[:-len(separator)].rstrip()
+        Args:
+            bilingual: If True, interleave original and translated content
+                      with visual separators for language learning.
 
-        return final_text.encode('utf-8')
+        Returns:
+            Complete translated file as bytes
+        """
+        buffer = io.StringIO()
+        self._write_text(buffer, bilingual=bilingual)
+        return buffer.getvalue().encode('utf-8')
+
+    async def write_output(self, bilingual: bool = False):
+        """
+        Write the translated file incrementally, one chunk at a time.
+
+        Args:
+            bilingual: If True, interleave original and translated content
+        """
+        with open(self.output_file_path, 'w', encoding='utf-8', newline='') as f:
+            self._write_text(f, bilingual=bilingual)
 
     async def resume_from_checkpoint(
         self,
@@ -194,10 +234,10 @@ class TxtAdapter(FormatAdapter):
         """
         Clean up resources.
 
-        For TXT adapter, there are no temporary resources to clean up.
+        Closes (and thereby deletes) the chunk and translation spool files.
         """
-        # No cleanup needed for TXT files (everything is in memory)
-        pass
+        self.chunks.close()
+        self.translated_chunks.close()
 
     @property
     def format_name(self) -> str:
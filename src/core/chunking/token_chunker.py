@@ -5,12 +5,37 @@ This module provides intelligent text chunking based on token counts
 using tiktoken, while respecting natural text boundaries (paragraphs and sentences).
 """
 import re
-from typing import List, Dict
+from typing import Callable, List, Dict, Iterable, Iterator, TextIO, Tuple
 import tiktoken
 
 from src.config import SENTENCE_TERMINATORS
 
 
+# Paragraph separator: a blank line (possibly containing whitespace)
+PARAGRAPH_SEPARATOR_RE = re.compile(r'\n\s*\n')
+
+# Characters read at a time when streaming paragraphs from a file
+STREAM_BLOCK_SIZE = 1024 * 1024
+
+
+def default_token_counter() -> Callable[[str], int]:
+    """
+    Token counter for code that measures text without chunking it.
+
+    Batch packing and SRT token grouping both use it, so the same text
+    gets the same count everywhere.
+
+    Returns:
+        TokenChunker.count_tokens, or the character-based estimate when the
+        tiktoken encoding is unavailable
+    """
+    try:
+        return TokenChunker().count_tokens
+    except Exception:
+        from src.core.context_optimizer import estimate_tokens_with_margin
+        return lambda text: estimate_tokens_with_margin(text, apply_margin=False).estimated_tokens
+
+
 class TokenChunker:
     """
     Token-based text chunker that respects natural boundaries.
@@ -31,6 +56,10 @@ class TokenChunker:
         self.soft_limit = int(max_tokens * soft_limit_ratio)
         self.encoder = tiktoken.get_encoding("cl100k_base")
 
+        # Sentence terminators, longest first so multi-character ones win
+        sorted_terminators = sorted(SENTENCE_TERMINATORS, key=len, reverse=True)
+        self._sentence_re = re.compile('|'.join(re.escape(t) for t in sorted_terminators))
+
     def count_tokens(self, text: str) -> int:
         """
         Count the number of tokens in a text string.
@@ -56,10 +85,43 @@ class TokenChunker:
             List of paragraphs (preserving single newlines within)
         """
         # Split on double newlines (or more)
-        paragraphs = re.split(r'\n\s*\n', text)
+        paragraphs = PARAGRAPH_SEPARATOR_RE.split(text)
         # Filter out empty paragraphs but preserve whitespace-only ones as empty markers
         return [p for p in paragraphs if p.strip()]
 
+    def iter_paragraphs(self, stream: TextIO, block_size: int = STREAM_BLOCK_SIZE) -> Iterator[str]:
+        """
+        Yield the paragraphs of a text stream without reading it whole.
+
+        Produces exactly split_into_paragraphs(stream.read()). A separator
+        spans a whole whitespace run, so only text up to the last
+        non-whitespace character read so far is split; the trailing
+        whitespace and the unfinished last paragraph are carried over.
+
+        Args:
+            stream: Text stream (e.g. a file opened in text mode)
+            block_size: Characters read per step
+
+        Yields:
+            Non-empty paragraphs
+        """
+        carry = ""
+        while True:
+            block = stream.read(block_size)
+            if not block:
+                break
+            text = carry + block
+            stable_end = len(text.rstrip())
+            parts = PARAGRAPH_SEPARATOR_RE.split(text[:stable_end])
+            for paragraph in parts[:-1]:
+                if paragraph.strip():
+                    yield paragraph
+            carry = parts[-1] + text[stable_end:]
+
+        for paragraph in PARAGRAPH_SEPARATOR_RE.split(carry):
+            if paragraph.strip():
+                yield paragraph
+
     def split_paragraph_into_sentences(self, paragraph: str) -> List[str]:
         """
         Split a paragraph into sentences for finer-grained chunking.
@@ -72,15 +134,10 @@ class TokenChunker:
         Returns:
             List of sentences
         """
-        # Create regex pattern from sentence terminators
-        sorted_terminators = sorted(list(SENTENCE_TERMINATORS), key=len, reverse=True)
-        escaped_terminators = [re.escape(t) for t in sorted_terminators]
-        pattern = '|'.join(escaped_terminators)
-
         sentences = []
         last_end = 0
 
-        for match in re.finditer(pattern, paragraph):
+        for match in self._sentence_re.finditer(paragraph):
             end = match.end()
             sentence = paragraph[last_end:end].strip()
             if sentence:
@@ -109,11 +166,32 @@ class TokenChunker:
         Returns:
             List of chunk strings
         """
+        return [chunk for chunk, _, _ in self._iter_chunk_units(units, separator)]
+
+    def _iter_chunk_units(self, units: Iterable[str],
+                          separator: str = "\n\n") -> Iterator[Tuple[str, str, str]]:
+        """
+        Lazily chunk text units (paragraphs or sentences), see _chunk_units.
+
+        Each chunk comes with its first and last paragraph, known from the
+        units it was built from, so context assembly never re-splits chunk
+        text. A chunk of sentences is a single paragraph (sentences are
+        stripped and joined with spaces). The boundaries are only meaningful
+        when chunking paragraphs.
+
+        Args:
+            units: Iterable of text units to chunk
+            separator: Separator to use when joining units
+
+        Yields:
+            (chunk, first_paragraph, last_paragraph) tuples
+        """
         # Minimum chunk size threshold - chunks smaller than this will be merged
         # with adjacent content rather than saved separately
         min_chunk_tokens = int(self.max_tokens * 0.25)  # 25% of max_tokens
 
-        chunks = []
+        separator_tokens = self.count_tokens(separator)
+
         current_units = []
         current_tokens = 0
 
@@ -131,7 +209,7 @@ class TokenChunker:
                     current_tokens = 0
                 elif current_units:
                     # Current chunk is big enough, save it
-                    chunks.append(separator.join(current_units))
+                    yield separator.join(current_units), current_units[0], current_units[-1]
                     current_units = []
                     current_tokens = 0
 
@@ -149,39 +227,41 @@ class TokenChunker:
 
                         # Only merge if combined size is reasonable
                         if prefix_tokens + first_chunk_tokens <= self.max_tokens:
-                            sentence_chunks[0] = prefix_text + separator + sentence_chunks[0]
+                            first_chunk = sentence_chunks.pop(0)
+                            yield prefix_text + separator + first_chunk, prefix_units[0], first_chunk
                         else:
                             # Prefix too big, save it separately
-                            chunks.append(prefix_text)
+                            yield prefix_text, prefix_units[0], prefix_units[-1]
                     elif prefix_units:
                         # No sentence chunks but have prefix
-                        chunks.append(separator.join(prefix_units))
+                        yield separator.join(prefix_units), prefix_units[0], prefix_units[-1]
 
-                    chunks.extend(sentence_chunks)
+                    for sentence_chunk in sentence_chunks:
+                        yield sentence_chunk, sentence_chunk, sentence_chunk
                 else:
                     # Can't split further, prepend prefix if any
                     if prefix_units:
-                        chunks.append(separator.join(prefix_units) + separator + unit)
+                        yield separator.join(prefix_units) + separator + unit, prefix_units[0], unit
                     else:
-                        chunks.append(unit)
+                        yield unit, unit, unit
                 continue
 
             # Check if adding this unit would exceed limits
             potential_tokens = current_tokens + unit_tokens
             if current_units:
                 # Account for separator
-                potential_tokens += self.count_tokens(separator)
+                potential_tokens += separator_tokens
 
             # If we're past soft limit, check if we should start a new chunk
             if current_tokens >= self.soft_limit and potential_tokens > self.max_tokens:
                 # Save current chunk and start new one
-                chunks.append(separator.join(current_units))
+                yield separator.join(current_units), current_units[0], current_units[-1]
                 current_units = [unit]
                 current_tokens = unit_tokens
             elif potential_tokens > self.max_tokens:
                 # Would exceed hard limit, start new chunk
                 if current_units:
-                    chunks.append(separator.join(current_units))
+                    yield separator.join(current_units), current_units[0], current_units[-1]
                 current_units = [unit]
                 current_tokens = unit_tokens
             else:
@@ -191,9 +271,7 @@ class TokenChunker:
 
         # Don't forget the last chunk
         if current_units:
-            chunks.append(separator.join(current_units))
-
-        return chunks
+            yield separator.join(current_units), current_units[0], current_units[-1]
 
     def chunk_text(self, text: str) -> List[Dict[str, str]]:
         """
@@ -218,43 +296,43 @@ class TokenChunker:
         if not text or not text.strip():
             return []
 
-        # Split into paragraphs
-        paragraphs = self.split_into_paragraphs(text)
-
-        if not paragraphs:
-            return []
-
-        # Chunk paragraphs
-        raw_chunks = self._chunk_units(paragraphs, separator="\n\n")
-
-        if not raw_chunks:
-            return []
+        return list(self.iter_chunks(self.split_into_paragraphs(text)))
 
-        # Build structured chunks with context
-        structured_chunks = []
-
-        for i, chunk_content in enumerate(raw_chunks):
-            # Context before: last part of previous chunk
-            if i > 0:
-                prev_paragraphs = self.split_into_paragraphs(raw_chunks[i - 1])
-                context_before = prev_paragraphs[-1] if prev_paragraphs else ""
-            else:
-                context_before = ""
+    def iter_chunks(self, paragraphs: Iterable[str]) -> Iterator[Dict[str, str]]:
+        """
+        Lazily build structured chunks from a stream of paragraphs.
 
-            # Context after: first part of next chunk
-            if i < len(raw_chunks) - 1:
-                next_paragraphs = self.split_into_paragraphs(raw_chunks[i + 1])
-                context_after = next_paragraphs[0] if next_paragraphs else ""
-            else:
-                context_after = ""
+        Same chunks as chunk_text, but only the current chunk and its two
+        neighbours are held: each chunk is yielded as soon as the first
+        paragraph of the next one is known.
 
-            structured_chunks.append({
-                "context_before": context_before,
-                "main_content": chunk_content,
-                "context_after": context_after
-            })
+        Args:
+            paragraphs: Paragraphs (see split_into_paragraphs / iter_paragraphs)
 
-        return structured_chunks
+        Yields:
+            Chunk dictionaries with context_before, main_content and context_after
+        """
+        previous_last = ""  # Last paragraph of the chunk before `current`
+        current = None
+        current_last = ""
+
+        for chunk_content, first_paragraph, last_paragraph in self._iter_chunk_units(paragraphs, separator="\n\n"):
+            if current is not None:
+                yield {
+                    "context_before": previous_last,
+                    "main_content": current,
+                    "context_after": first_paragraph
+                }
+                previous_last = current_last
+            current = chunk_content
+            current_last = last_paragraph
+
+        if current is not None:
+            yield {
+                "context_before": previous_last,
+                "main_content": current,
+                "context_after": ""
+            }
 
     def get_stats(self, chunks: List[Dict[str, str]]) -> Dict:
         """
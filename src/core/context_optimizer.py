@@ -9,16 +9,21 @@ Strategy:
 - After each request, check if the context was near its limit
 - If truncated or near limit: increase context and retry
 - Track last N successful chunks to potentially reduce context if all fit with smaller size
+
+Every num_ctx change makes Ollama reload the model, so when context buckets
+are configured the size is planned once from the pre-computed chunk sizes
+and only moves between buckets, shrinking with hysteresis.
 """
 
 import re
-from typing import Optional, Tuple, Dict, List
+from typing import Optional, Tuple, Dict, List, Sequence
 from dataclasses import dataclass, field
 from collections import deque
 
 from src.config import (
     MAX_TOKENS_PER_CHUNK, THINKING_MODELS,
-    ADAPTIVE_CONTEXT_INITIAL, ADAPTIVE_CONTEXT_STEP, ADAPTIVE_CONTEXT_STABILITY_WINDOW
+    ADAPTIVE_CONTEXT_INITIAL, ADAPTIVE_CONTEXT_STEP, ADAPTIVE_CONTEXT_STABILITY_WINDOW,
+    ADAPTIVE_CONTEXT_BUCKETS
 )
 
 # Try to import tiktoken, fallback to character-based estimation
@@ -81,6 +86,9 @@ def round_to_standard_context_size(required: int) -> int:
 # Default context size - most translations fit within 2048 tokens
 DEFAULT_CONTEXT_SIZE = 2048
 
+# Extra context reserved for the internal reasoning of thinking models
+THINKING_BUFFER = 2000
+
 # Maximum context size limit (can be adjusted via OLLAMA_NUM_CTX in .env)
 # Most modern models support at least 32K, so we use this as a safe upper bound
 MAX_CONTEXT_SIZE = 131072
@@ -144,6 +152,32 @@ def estimate_tokens_with_margin(
     )
 
 
+def estimate_request_tokens(
+    prompt_tokens: int,
+    content_tokens: int,
+    is_thinking_model: bool = False
+) -> int:
+    """
+    Estimate the context a translation request needs: prompt plus expected output.
+
+    The response can take up to 2x the source tokens (languages that tokenize
+    less efficiently) + ~50 tokens for the translation tags, plus
+    THINKING_BUFFER for thinking models.
+
+    Args:
+        prompt_tokens: Tokens of the full prompt (instructions, context, source text)
+        content_tokens: Tokens of the source text alone
+        is_thinking_model: Whether the model produces thinking output
+
+    Returns:
+        Estimated total tokens for the request
+    """
+    response_tokens = content_tokens * 2 + 50
+    if is_thinking_model:
+        response_tokens += THINKING_BUFFER
+    return prompt_tokens + response_tokens
+
+
 def calculate_optimal_chunk_size(
     max_context_tokens: int,
     base_overhead: int = 2000,
@@ -223,8 +257,7 @@ def adjust_parameters_for_context(
     if is_thinking_model is None:
         is_thinking_model = any(tm in model_name.lower() for tm in THINKING_MODELS)
     if is_thinking_model:
-        thinking_buffer = 2000  # Conservative estimate for model's internal reasoning
-        response_buffer += thinking_buffer
+        response_buffer += THINKING_BUFFER
 
     required_ctx = estimated_tokens + response_buffer
 
@@ -326,6 +359,13 @@ STABILITY_WINDOW = ADAPTIVE_CONTEXT_STABILITY_WINDOW
 # Threshold for considering context as "near limit" (95% usage)
 NEAR_LIMIT_THRESHOLD = 0.95
 
+# Context buckets (sorted); empty means step mode
+CONTEXT_BUCKETS = sorted(ADAPTIVE_CONTEXT_BUCKETS)
+
+# Hysteresis in bucket mode: only drop to the next smaller bucket when every
+# recent request used at most this fraction of it
+BUCKET_SHRINK_RATIO = 0.5
+
 
 @dataclass
 class ChunkTokenUsage:
@@ -361,6 +401,13 @@ class AdaptiveContextManager:
 
     This avoids over-allocating context (which wastes VRAM) while ensuring
     translations complete successfully.
+
+    With buckets, sizes snap to the bucket list instead of CONTEXT_STEP
+    increments: plan() picks the bucket for the largest request of the job up
+    front, growth jumps to the next bucket, and shrinking needs usage well
+    below the smaller bucket (BUCKET_SHRINK_RATIO), so num_ctx - and with it
+    the Ollama model - changes only when it must. Changes applied to the
+    client are counted as reloads in get_stats().
     """
 
     def __init__(self,
@@ -368,7 +415,8 @@ class AdaptiveContextManager:
                  context_step: int = CONTEXT_STEP,
                  stability_window: int = STABILITY_WINDOW,
                  max_context: int = MAX_CONTEXT_SIZE,
-                 log_callback: Optional[callable] = None):
+                 log_callback: Optional[callable] = None,
+                 buckets: Optional[Sequence[int]] = None):
         """
         Initialize the adaptive context manager.
 
@@ -378,13 +426,23 @@ class AdaptiveContextManager:
             stability_window: Number of chunks to track for stability (default: 5)
             max_context: Maximum allowed context size (default: 131072)
             log_callback: Optional callback for logging
+            buckets: Context sizes to snap to (default: CONTEXT_BUCKETS;
+                empty for step mode)
         """
-        self.current_context = initial_context
-        self.min_context = initial_context  # Never reduce below the initial context
+        self.buckets = sorted(b for b in (CONTEXT_BUCKETS if buckets is None else buckets)
+                              if b <= max_context)
         self.context_step = context_step
         self.stability_window = stability_window
         self.max_context = max_context
         self.log_callback = log_callback
+        self.current_context = self._snap_to_bucket(initial_context)
+        self.min_context = self.current_context  # Never reduce below the initial context
+
+        # num_ctx last pushed to the client, and the model reloads it caused
+        self._applied_context: Optional[int] = None
+        self._reload_pending = False
+        self.reload_count = 0
+        self.reload_time = 0.0
 
         # Track token usage for recent chunks
         self._usage_history: deque = deque(maxlen=stability_window)
@@ -397,6 +455,81 @@ class AdaptiveContextManager:
         """Get the current context size to use for the next request"""
         return self.current_context
 
+    def _snap_to_bucket(self, size: int) -> int:
+        """Smallest bucket >= size (the size itself in step mode or beyond the largest bucket)"""
+        for bucket in self.buckets:
+            if bucket >= size:
+                return bucket
+        return min(size, self.max_context)
+
+    def plan(self, request_tokens: Sequence[int]) -> int:
+        """
+        Choose the context size once from the job's pre-computed request sizes.
+
+        The bucket must hold the largest request below NEAR_LIMIT_THRESHOLD,
+        so the job normally runs at a single num_ctx. The planned size also
+        becomes the floor for later reductions.
+
+        Args:
+            request_tokens: Estimated prompt + output tokens of each request
+                (see estimate_request_tokens)
+
+        Returns:
+            The planned context size
+        """
+        if not request_tokens:
+            return self.current_context
+
+        largest = max(request_tokens)
+        planned = self._snap_to_bucket(max(int(largest / NEAR_LIMIT_THRESHOLD) + 1, self.min_context))
+        self.current_context = self.min_context = planned
+
+        if self.log_callback:
+            self.log_callback("context_adaptive",
+                f"🎯 Context planned from {len(request_tokens)} chunks: largest request ~{largest} tokens "
+                f"→ num_ctx={planned}")
+        return planned
+
+    def apply_to_client(self, client) -> Optional[int]:
+        """
+        Push the current context size to the client's context window.
+
+        A change once the model is loaded means the server reloads it; it is
+        counted in the reload stats. The first application compares against
+        the size the client last loaded the model at (warm-up preload or
+        thinking probes), if any.
+
+        Args:
+            client: LLM client exposing a context_window attribute
+
+        Returns:
+            The client's previous context window if it changed, else None
+        """
+        previous = client.context_window
+        if self._applied_context is None:
+            self._applied_context = getattr(client, 'loaded_context', None)
+        if self._applied_context is not None and self._applied_context != self.current_context:
+            self.reload_count += 1
+            self._reload_pending = True
+        self._applied_context = self.current_context
+        if previous == self.current_context:
+            return None
+        client.context_window = self.current_context
+        return previous
+
+    def record_load_duration(self, seconds: float) -> None:
+        """
+        Record the model load time reported for a request.
+
+        Only the load that follows a context change is attributed to reloads.
+
+        Args:
+            seconds: Load time reported by the server (0 if unknown)
+        """
+        if self._reload_pending:
+            self.reload_time += seconds
+            self._reload_pending = False
+
     def record_success(self, prompt_tokens: int, completion_tokens: int, context_limit: int) -> None:
         """
         Record a successful translation with its token usage.
@@ -459,7 +592,10 @@ class AdaptiveContextManager:
             The new context size
         """
         old_context = self.current_context
-        self.current_context = min(self.current_context + self.context_step, self.max_context)
+        if self.buckets and self.current_context < self.buckets[-1]:
+            self.current_context = next(b for b in self.buckets if b > self.current_context)
+        else:
+            self.current_context = min(self.current_context + self.context_step, self.max_context)
         self._retry_count += 1
 
         if self.log_callback:
@@ -488,14 +624,19 @@ class AdaptiveContextManager:
         max_tokens_used = max(usage.total_tokens for usage in self._usage_history)
 
         # Check if all chunks could fit in a smaller context
-        smaller_context = max(self.current_context - self.context_step, self.min_context)
+        if self.buckets:
+            smaller_context = max((b for b in self.buckets if b < self.current_context), default=self.min_context)
+            smaller_context = max(smaller_context, self.min_context)
+        else:
+            smaller_context = max(self.current_context - self.context_step, self.min_context)
 
         # Don't reduce if we're already at minimum
         if smaller_context >= self.current_context:
             return
 
-        # We need some headroom (20%) to avoid oscillation
-        headroom_threshold = 0.80
+        # We need some headroom (20%) to avoid oscillation; more in bucket
+        # mode, where a wrong reduction costs two model reloads
+        headroom_threshold = BUCKET_SHRINK_RATIO if self.buckets else 0.80
         if max_tokens_used <= smaller_context * headroom_threshold:
             old_context = self.current_context
             self.current_context = smaller_context
@@ -513,9 +654,17 @@ class AdaptiveContextManager:
         self.current_context = self.min_context
         self._usage_history.clear()
         self._retry_count = 0
+        self._applied_context = None
+        self._reload_pending = False
+        self.reload_count = 0
+        self.reload_time = 0.0
 
     def get_stats(self) -> Dict:
         """Get statistics about context usage"""
+        reloads = {
+            "reloads": self.reload_count,
+            "reload_time": self.reload_time,
+        }
         if not self._usage_history:
             return {
                 "current_context": self.current_context,
@@ -523,6 +672,7 @@ class AdaptiveContextManager:
                 "avg_usage": 0,
                 "max_usage": 0,
                 "min_usage": 0,
+                **reloads,
             }
 
         usages = [u.total_tokens for u in self._usage_history]
@@ -532,4 +682,5 @@ class AdaptiveContextManager:
             "avg_usage": sum(usages) / len(usages),
             "max_usage": max(usages),
             "min_usage": min(usages),
+            **reloads,
         }
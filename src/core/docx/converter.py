@@ -9,14 +9,40 @@ Uses:
 import io
 import mammoth
 from docx import Document
+from docx.enum.style import WD_STYLE_TYPE
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
 from docx.shared import Pt, RGBColor, Inches
 from docx.enum.text import WD_ALIGN_PARAGRAPH
-from typing import Tuple, Dict, Any, Optional
+from typing import Tuple, Dict, Any, Optional, List
 from lxml import etree
 
 
+# Inline HTML tags mapped to the run property they set
+INLINE_RUN_PROPERTIES = {
+    'strong': 'w:b',
+    'b': 'w:b',
+    'em': 'w:i',
+    'i': 'w:i',
+    'u': 'w:u',
+}
+
+
 class DocxHtmlConverter:
-    """Converts DOCX to/from HTML for translation."""
+    """
+    Converts DOCX to/from HTML for translation.
+
+    Reconstruction builds the WordprocessingML elements directly instead of
+    going through python-docx's object API (one Paragraph/Run object and one
+    style-name lookup per call), which dominated conversion time on large
+    documents. The output is identical to the python-docx API calls it
+    replaces.
+    """
+
+    def __init__(self):
+        # Per-document reconstruction state (reset by from_html)
+        self._style_ids: Dict[Tuple[str, WD_STYLE_TYPE], Optional[str]] = {}
+        self._body_end = None
 
     def to_html(self, docx_path: str) -> Tuple[str, Dict[str, Any]]:
         """
@@ -77,6 +103,9 @@ class DocxHtmlConverter:
 
         # Create DOCX document
         doc = Document()
+        self._style_ids = {}
+        # Body content goes before the final section properties
+        self._body_end = doc.element.body.find(qn('w:sectPr'))
 
         # Apply page metadata (page size, margins, etc.)
         self._apply_page_metadata(doc, metadata)
@@ -188,9 +217,59 @@ class DocxHtmlConverter:
         elif tag == 'table':
             self._convert_table(doc, element, metadata)
         elif tag == 'br':
-            doc.add_paragraph()  # Empty paragraph for line break
+            self._new_paragraph(doc)  # Empty paragraph for line break
         # Skip other tags (div, span handled within paragraphs)
 
+    def _style_id(self, doc: Document, name: str, style_type: WD_STYLE_TYPE) -> Optional[str]:
+        """Resolve a style name to its style id, once per document."""
+        key = (name, style_type)
+        if key not in self._style_ids:
+            self._style_ids[key] = doc.part.get_style_id(name, style_type)
+        return self._style_ids[key]
+
+    def _append_block(self, doc: Document, block) -> None:
+        """Append a block element (w:p, w:tbl) at the end of the body."""
+        if self._body_end is not None:
+            self._body_end.addprevious(block)
+        else:
+            doc.element.body.append(block)
+
+    def _new_paragraph(self, doc: Document, style: Optional[str] = None):
+        """Append an empty w:p to the body, with an optional paragraph style."""
+        p = OxmlElement('w:p')
+        if style is not None:
+            p.style = self._style_id(doc, style, WD_STYLE_TYPE.PARAGRAPH)
+        self._append_block(doc, p)
+        return p
+
+    def _make_run(self, text: str, run_property: Optional[str] = None):
+        """
+        Build a w:r element for text (same XML as python-docx's add_run).
+
+        Args:
+            text: Run text
+            run_property: Optional 'w:b', 'w:i' or 'w:u' property
+        """
+        r = OxmlElement('w:r')
+        if run_property is not None:
+            rPr = etree.SubElement(r, qn('w:rPr'))
+            prop = etree.SubElement(rPr, qn(run_property))
+            if run_property == 'w:u':
+                prop.set(qn('w:val'), 'single')
+
+        if not text:
+            return r
+        if '\t' in text or '\n' in text or '\r' in text:
+            # Tabs and line breaks become w:tab / w:br elements
+            r.text = text
+            return r
+
+        t = etree.SubElement(r, qn('w:t'))
+        t.text = text
+        if len(text.strip()) < len(text):
+            t.set(qn('xml:space'), 'preserve')
+        return r
+
     def _convert_paragraph(
         self,
         doc: Document,
@@ -198,7 +277,7 @@ class DocxHtmlConverter:
         metadata: Dict[str, Any]
     ):
         """Convert HTML <p> to DOCX paragraph."""
-        p = doc.add_paragraph()
+        p = self._new_paragraph(doc)
         self._add_runs_from_element(p, element, metadata)
 
     def _convert_heading(
@@ -211,7 +290,9 @@ class DocxHtmlConverter:
         """Convert HTML heading to DOCX heading."""
         level = int(tag[1])  # h1 → 1, h2 → 2, etc.
         text = self._get_text_content(element)
-        doc.add_heading(text, level=level)
+        p = self._new_paragraph(doc, style=f"Heading {level}")
+        if text:
+            p.append(self._make_run(text))
 
     def _convert_list(
         self,
@@ -220,11 +301,13 @@ class DocxHtmlConverter:
         metadata: Dict[str, Any]
     ):
         """Convert HTML list to DOCX list."""
-        is_ordered = element.tag == 'ol'
+        style = 'List Number' if element.tag == 'ol' else 'List Bullet'
 
-        for li in element.findall('.//li'):
+        for li in element.iterfind('.//li'):
             text = self._get_text_content(li)
-            p = doc.add_paragraph(text, style='List Number' if is_ordered else 'List Bullet')
+            p = self._new_paragraph(doc, style=style)
+            if text:
+                p.append(self._make_run(text))
 
     def _convert_table(
         self,
@@ -232,7 +315,13 @@ class DocxHtmlConverter:
         element: etree._Element,
         metadata: Dict[str, Any]
     ):
-        """Convert HTML table to DOCX table."""
+        """
+        Convert HTML table to DOCX table.
+
+        Rows are filled by walking the new table's w:tr/w:tc elements in step
+        with the HTML rows, instead of python-docx's row.cells (which
+        recomputes the cell grid on every access).
+        """
         rows = element.findall('.//tr')
         if not rows:
             return
@@ -246,15 +335,14 @@ class DocxHtmlConverter:
 
         # Create table
         table = doc.add_table(rows=len(rows), cols=cols)
-        table.style = 'Table Grid'
+        table._tbl.tblStyle_val = self._style_id(doc, 'Table Grid', WD_STYLE_TYPE.TABLE)
 
         # Fill cells
-        for row_idx, tr in enumerate(rows):
+        for tr_element, tr in zip(table._tbl.tr_lst, rows):
             cells = tr.findall('.//td') + tr.findall('.//th')
-            for col_idx, cell in enumerate(cells):
-                if col_idx < cols:
-                    text = self._get_text_content(cell)
-                    table.rows[row_idx].cells[col_idx].text = text
+            for tc, cell in zip(tr_element.tc_lst, cells[:cols]):
+                # A new cell holds a single empty paragraph
+                tc.p_lst[0].append(self._make_run(self._get_text_content(cell)))
 
     def _add_runs_from_element(
         self,
@@ -265,34 +353,27 @@ class DocxHtmlConverter:
         """
         Add runs to paragraph from HTML element, preserving inline formatting.
 
-        Handles <strong>, <em>, <b>, <i>, etc.
+        Handles <strong>, <em>, <b>, <i>, etc. The runs are built first and
+        appended to the w:p element in one batch.
         """
+        runs: List = []
+
         # Handle direct text
         if element.text:
-            paragraph.add_run(element.text)
+            runs.append(self._make_run(element.text))
 
         # Handle child elements
         for child in element:
-            if child.tag == 'strong' or child.tag == 'b':
-                text = self._get_text_content(child)
-                run = paragraph.add_run(text)
-                run.bold = True
-            elif child.tag == 'em' or child.tag == 'i':
-                text = self._get_text_content(child)
-                run = paragraph.add_run(text)
-                run.italic = True
-            elif child.tag == 'u':
-                text = self._get_text_content(child)
-                run = paragraph.add_run(text)
-                run.underline = True
-            else:
-                # For other tags, just extract text
-                text = self._get_text_content(child)
-                paragraph.add_run(text)
+            # Inline formatting tags set one run property; other tags are
+            # reduced to their text
+            text = self._get_text_content(child)
+            runs.append(self._make_run(text, INLINE_RUN_PROPERTIES.get(child.tag)))
 
             # Handle tail text (text after closing tag)
             if child.tail:
-                paragraph.add_run(child.tail)
+                runs.append(self._make_run(child.tail))
+
+        paragraph.extend(runs)
 
     def _get_text_content(self, element: etree._Element) -> str:
         """Extract all text content from an element and its children."""
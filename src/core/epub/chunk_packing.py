@@ -0,0 +1,189 @@
+"""
+Packing of small EPUB chunks into shared translation requests.
+
+Front matter (title page, copyright, dedication, table of contents) and the
+last chunk of each chapter are often far smaller than the chunk budget, yet
+each costs a full request. Before the files are translated one by one, the
+small chunks of the whole book are packed, in spine order, into numbered
+segments (see src.core.segment_packing) and translated together.
+
+Placeholders are local to each chunk ([id0], [id1]...), so inside a pack
+every segment's placeholders are shifted to their own index range and
+shifted back after the response is split. A segment whose placeholders
+don't validate, or a pack whose markers don't match, is simply not
+recorded: its chunks go through the normal per-chunk translation.
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+
+from src.common.placeholder_format import PlaceholderFormat
+from src.config import EPUB_PACK_MAX_SEGMENTS
+from src.core.segment_packing import pack_segments, unpack_segments, plan_packs
+from ..translator import generate_translation_request
+from .xhtml_translator import validate_placeholders
+
+# Chunks at or below this fraction of max_tokens_per_chunk are packed
+SMALL_CHUNK_RATIO = 0.5
+
+
+def shift_placeholders(text: str, count: int, offset: int, fmt: PlaceholderFormat) -> str:
+    """
+    Move a chunk's local placeholders 0..count-1 to offset..offset+count-1.
+
+    A negative offset shifts them back; other indices are left untouched.
+
+    Args:
+        text: Chunk text (or its translation)
+        count: Number of local placeholders of the chunk
+        offset: Amount added to each index
+        fmt: Placeholder format of the text
+
+    Returns:
+        Text with shifted placeholders
+    """
+    if not count or not offset:
+        return text
+    start = max(0, -offset)
+    return fmt.scan(text).remap({i: i + offset for i in range(start, start + count)})
+
+
+def select_small_chunks(
+    chunks: List[Dict],
+    max_tokens_per_chunk: int,
+    count_tokens: Callable[[str], int]
+) -> List[Dict]:
+    """
+    Keep the chunks worth packing, each text once, in order.
+
+    Args:
+        chunks: EPUB chunk dicts (text, local_tag_map, global_indices) in spine order
+        max_tokens_per_chunk: Chunk token budget
+        count_tokens: Token counter
+
+    Returns:
+        Small chunks with their token count added under 'tokens'
+    """
+    limit = max_tokens_per_chunk * SMALL_CHUNK_RATIO
+    seen = set()
+    small = []
+    for chunk in chunks:
+        text = chunk['text']
+        if text in seen or not text.strip():
+            continue
+        seen.add(text)
+        tokens = count_tokens(text)
+        if tokens <= limit:
+            small.append({**chunk, 'tokens': tokens})
+    return small
+
+
+async def translate_small_chunks(
+    chunks: List[Dict],
+    max_tokens_per_chunk: int,
+    count_tokens: Callable[[str], int],
+    source_language: str,
+    target_language: str,
+    model_name: str,
+    llm_client: Any,
+    log_callback: Optional[Callable] = None,
+    context_manager: Optional[Any] = None,
+    check_interruption_callback: Optional[Callable] = None,
+    max_segments: Optional[int] = None
+) -> Dict[str, str]:
+    """
+    Translate the small chunks of a book in packs.
+
+    Args:
+        chunks: EPUB chunk dicts of all files still to translate, in spine order
+        max_tokens_per_chunk: Chunk token budget (also the budget of a pack)
+        count_tokens: Token counter
+        source_language: Source language
+        target_language: Target language
+        model_name: LLM model name
+        llm_client: LLM client
+        log_callback: Optional logging callback
+        context_manager: Optional AdaptiveContextManager
+        check_interruption_callback: Optional interruption check, run between packs
+        max_segments: Maximum chunks per pack (default: EPUB_PACK_MAX_SEGMENTS)
+
+    Returns:
+        Map of chunk text to its translation (still with local placeholders)
+        for every packed chunk that came back valid
+    """
+    max_segments = max_segments or EPUB_PACK_MAX_SEGMENTS
+    small = select_small_chunks(chunks, max_tokens_per_chunk, count_tokens)
+    packs = [
+        pack for pack in plan_packs(
+            [chunk['tokens'] for chunk in small],
+            max_tokens=max_tokens_per_chunk,
+            max_segments=max_segments
+        )
+        if len(pack) > 1
+    ]
+
+    translations: Dict[str, str] = {}
+    if not packs:
+        return translations
+
+    packed_chunks = sum(len(pack) for pack in packs)
+    if log_callback:
+        log_callback("epub_packing_start",
+                     f"📦 Packing {packed_chunks} small chunks into {len(packs)} requests")
+
+    fmt = PlaceholderFormat.from_config()
+    placeholder_format = (fmt.prefix, fmt.suffix)
+
+    for pack_number, pack in enumerate(packs, 1):
+        if check_interruption_callback and check_interruption_callback():
+            break
+
+        members = [small[i] for i in pack]
+        offsets = []
+        texts = []
+        offset = 0
+        for chunk in members:
+            count = len(chunk['local_tag_map'])
+            offsets.append(offset)
+            texts.append(shift_placeholders(chunk['text'], count, offset, fmt))
+            offset += count
+
+        try:
+            response = await generate_translation_request(
+                pack_segments(texts),
+                context_before="",
+                context_after="",
+                previous_translation_context="",
+                source_language=source_language,
+                target_language=target_language,
+                model=model_name,
+                llm_client=llm_client,
+                log_callback=log_callback,
+                has_placeholders=offset > 0,
+                prompt_options={'segmented_input': True},
+                context_manager=context_manager,
+                placeholder_format=placeholder_format
+            )
+        except Exception as e:
+            if log_callback:
+                log_callback("epub_pack_error", f"Error translating pack {pack_number}: {e}")
+            response = None
+
+        segments = unpack_segments(response, len(members)) if response else None
+        if segments is None:
+            if log_callback:
+                log_callback("epub_pack_fallback",
+                             f"Could not split pack {pack_number} ({len(members)} chunks), "
+                             f"they will be translated one by one")
+            continue
+
+        for chunk, segment, segment_offset in zip(members, segments, offsets):
+            local_tag_map = chunk['local_tag_map']
+            translated = shift_placeholders(segment, len(local_tag_map), -segment_offset, fmt)
+            if validate_placeholders(translated, local_tag_map):
+                translations[chunk['text']] = translated
+
+    if log_callback:
+        log_callback("epub_packing_complete",
+                     f"📦 Packed translation: {len(translations)}/{packed_chunks} small chunks "
+                     f"in {len(packs)} requests instead of {packed_chunks}")
+    return translations
@@ -231,6 +231,7 @@ class EpubTranslationAdapter(TranslationAdapter[etree._Element, bool]):
         # Extract global_stats from kwargs if provided
         global_total_chunks = kwargs.get('global_total_chunks')
         global_completed_chunks = kwargs.get('global_completed_chunks')
+        packed_translations = kwargs.get('packed_translations')
 
         success, stats = await translate_xhtml_simplified(
             doc_root=doc_root,
@@ -252,6 +253,7 @@ class EpubTranslationAdapter(TranslationAdapter[etree._Element, bool]):
             stats_callback=stats_callback,
             global_total_chunks=global_total_chunks,
             global_completed_chunks=global_completed_chunks,
+            packed_translations=packed_translations,
         )
 
         return success, stats
@@ -4,8 +4,15 @@ HTML-aware chunking that splits on complete HTML blocks
 This module provides intelligent chunking of HTML content with placeholders,
 ensuring chunks are split at safe boundaries (between complete HTML blocks)
 and includes a proportional reinsertion fallback for placeholder recovery.
+
+Segments are handled as (start, end) offsets into the body string, with a
+prefix-sum array of their token counts; chunk strings are only materialized
+once a chunk is final, so chunking stays linear in body size.
 """
-from typing import List, Dict, Tuple
+import re
+from bisect import bisect_right
+from itertools import accumulate
+from typing import List, Dict, Tuple, Union
 
 from src.core.chunking.token_chunker import TokenChunker
 from src.common.placeholder_format import PlaceholderFormat
@@ -14,6 +21,13 @@ from .tag_classifier import TagClassifier
 from .placeholder_renumberer import PlaceholderRenumberer
 
 
+_NON_WHITESPACE_RE = re.compile(r'\S')
+
+# A pending chunk item: a (start, end) span of the body, or a string produced
+# by splitting an oversized segment
+ChunkItem = Union[Tuple[int, int], str]
+
+
 class HtmlChunker:
     """
     Chunks HTML with placeholders into complete HTML blocks.
@@ -58,11 +72,11 @@ class HtmlChunker:
         # Find safe split points (between complete blocks)
         split_points = self._find_safe_split_points(text_with_placeholders, tag_map)
 
-        # Split into segments
-        segments = self._split_at_points(text_with_placeholders, split_points)
+        # Split into segment offsets (no substring copies)
+        spans = self._segment_spans(text_with_placeholders, split_points)
 
         # Merge segments into appropriately sized chunks
-        chunks = self._merge_segments_into_chunks(segments, tag_map)
+        chunks = self._merge_spans_into_chunks(text_with_placeholders, spans, tag_map)
 
         return chunks
 
@@ -83,55 +97,72 @@ class HtmlChunker:
         """
         split_points = []
 
-        # Find placeholders with their positions
-        placeholder_positions = [
-            (start, end, placeholder, idx)
-            for start, end, placeholder, idx in self.placeholder_format.find_all(text)
-        ]
-
-        for i, (start, end, placeholder, idx) in enumerate(placeholder_positions):
-            tag = tag_map.get(placeholder, "")
-
-            # If this is a block closing tag
-            if self.tag_classifier.is_block_closing_tag(tag):
-                # Check if next placeholder is a block opening tag
-                if i + 1 < len(placeholder_positions):
-                    next_placeholder = placeholder_positions[i + 1][2]
-                    next_tag = tag_map.get(next_placeholder, "")
-                    if self.tag_classifier.is_block_opening_tag(next_tag):
-                        # Determine priority based on tag type
-                        priority = self.tag_classifier.get_split_priority(tag)
-                        split_points.append((end, priority))
+        # Single placeholder scan; tag classification memoized per tag string
+        scan = self.placeholder_format.scan(text)
+        ends = scan.ends
+        tags = [tag_map.get(text[start:end], "") for start, end in zip(scan.starts, ends)]
+        closing_priority: Dict[str, object] = {}
+        opening: Dict[str, bool] = {}
+
+        for i in range(len(tags) - 1):
+            tag = tags[i]
+
+            # If this is a block closing tag, get its split priority (None if not closing)
+            if tag not in closing_priority:
+                closing_priority[tag] = (
+                    self.tag_classifier.get_split_priority(tag)
+                    if self.tag_classifier.is_block_closing_tag(tag) else None
+                )
+            priority = closing_priority[tag]
+            if priority is None:
+                continue
+
+            # Check if next placeholder is a block opening tag
+            next_tag = tags[i + 1]
+            if next_tag not in opening:
+                opening[next_tag] = self.tag_classifier.is_block_opening_tag(next_tag)
+            if opening[next_tag]:
+                split_points.append((ends[i], priority))
 
         return split_points
 
-    def _split_at_points(self, text: str, points: List[Tuple[int, int]]) -> List[str]:
+    def _segment_spans(self, text: str, points: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
         """
-        Split the text at the specified points.
+        Compute the (start, end) offsets of the segments between split points.
+
+        Whitespace-only segments are skipped.
 
         Args:
             text: Text to split
             points: List of (position, priority) tuples
 
         Returns:
-            List of text segments
+            List of (start, end) offsets into text
         """
-        if not points:
-            return [text]
-
-        # Extract just the positions (ignore priority for now, it's used in merging)
-        positions = [pos for pos, _ in points]
-
-        segments = []
+        spans = []
         prev = 0
-        for point in positions:
+        for point, _ in points:
             if point > prev:
-                segments.append(text[prev:point])
+                spans.append((prev, point))
             prev = point
         if prev < len(text):
-            segments.append(text[prev:])
+            spans.append((prev, len(text)))
+
+        search = _NON_WHITESPACE_RE.search
+        return [(start, end) for start, end in spans if search(text, start, end)]
+
+    def _split_at_points(self, text: str, points: List[Tuple[int, int]]) -> List[str]:
+        """
+        Split the text at the specified points.
 
-        return [s for s in segments if s.strip()]
+        Args:
+            text: Text to split
+            points: List of (position, priority) tuples
+
+        Returns:
+            List of text segments
+        """
+        return [text[start:end] for start, end in self._segment_spans(text, points)]
 
     def _merge_segments_into_chunks(
         self,
@@ -141,66 +172,124 @@ class HtmlChunker:
         """
         Merge segments into chunks respecting token limit.
 
-        Simplified to call focused helper functions for better readability.
+        Convenience wrapper over _merge_spans_into_chunks for a list of strings.
         """
         if not segments:
             return []
 
+        spans = []
+        position = 0
+        for segment in segments:
+            spans.append((position, position + len(segment)))
+            position += len(segment)
+
+        return self._merge_spans_into_chunks("".join(segments), spans, global_tag_map)
+
+    def _merge_spans_into_chunks(
+        self,
+        text: str,
+        spans: List[Tuple[int, int]],
+        global_tag_map: Dict[str, str]
+    ) -> List[Dict]:
+        """
+        Merge segment spans into chunks respecting token limit.
+
+        Token counts are computed once per segment and accumulated into a
+        prefix-sum array, so each run of segments that fits in a chunk is found
+        with one bisect. Chunk strings are only built when a chunk is final.
+
+        Args:
+            text: Full text the spans refer to
+            spans: (start, end) offsets of the segments, in order
+            global_tag_map: Global tag mapping
+
+        Returns:
+            List of chunk dictionaries with local renumbering
+        """
+        if not spans:
+            return []
+
+        token_counts = [self._count_segment_tokens(text[start:end]) for start, end in spans]
+        prefix = list(accumulate(token_counts, initial=0))
+
         chunks = []
-        current_segments = []
-        current_tokens = 0
+        pending: List[ChunkItem] = []
+        pending_tokens = 0
         global_offset = 0
 
-        for segment in segments:
-            segment_tokens = self._count_segment_tokens(segment)
+        def flush():
+            nonlocal pending, pending_tokens, global_offset
+            if pending:
+                chunk = self._finalize_chunk(
+                    [self._materialize(text, pending)], global_tag_map, global_offset
+                )
+                chunks.append(chunk)
+                global_offset += len(chunk['local_tag_map'])
+                pending = []
+                pending_tokens = 0
 
+        i = 0
+        n = len(spans)
+        while i < n:
             # Check if segment is oversized and needs splitting
-            if segment_tokens > self.max_tokens:
+            if token_counts[i] > self.max_tokens:
                 # Finalize current chunk before processing oversized segment
-                if current_segments:
-                    chunk = self._finalize_chunk(current_segments, global_tag_map, global_offset)
-                    chunks.append(chunk)
-                    global_offset += len(chunk['local_tag_map'])
-                    current_segments = []
-                    current_tokens = 0
+                flush()
 
                 # Split and process oversized segment
-                sub_segments = self._split_oversized_segment(segment, global_tag_map)
-
-                for sub_seg in sub_segments:
+                start, end = spans[i]
+                for sub_seg in self._split_oversized_segment(text[start:end], global_tag_map):
                     sub_tokens = self._count_segment_tokens(sub_seg)
 
-                    if self._would_exceed_limit(current_tokens, sub_tokens) and current_segments:
-                        # Finalize current chunk
-                        chunk = self._finalize_chunk(current_segments, global_tag_map, global_offset)
-                        chunks.append(chunk)
-                        global_offset += len(chunk['local_tag_map'])
-
-                        current_segments = [sub_seg]
-                        current_tokens = sub_tokens
-                    else:
-                        current_segments.append(sub_seg)
-                        current_tokens += sub_tokens
-
-            elif self._would_exceed_limit(current_tokens, segment_tokens) and current_segments:
-                # Finalize current chunk
-                chunk = self._finalize_chunk(current_segments, global_tag_map, global_offset)
-                chunks.append(chunk)
-                global_offset += len(chunk['local_tag_map'])
+                    if self._would_exceed_limit(pending_tokens, sub_tokens) and pending:
+                        flush()
+                    pending.append(sub_seg)
+                    pending_tokens += sub_tokens
+                i += 1
+                continue
 
-                current_segments = [segment]
-                current_tokens = segment_tokens
-            else:
-                current_segments.append(segment)
-                current_tokens += segment_tokens
+            # Longest run of segments i..j-1 that still fits with the pending ones
+            # (an oversized segment always ends the run since it alone exceeds the limit)
+            limit = prefix[i] + self.max_tokens - pending_tokens
+            j = bisect_right(prefix, limit, i, n + 1) - 1
+
+            if j <= i:
+                # Next segment does not fit: finalize current chunk
+                flush()
+                continue
+
+            pending.extend(spans[i:j])
+            pending_tokens += prefix[j] - prefix[i]
+            i = j
 
         # Finalize last chunk
-        if current_segments:
-            chunk = self._finalize_chunk(current_segments, global_tag_map, global_offset)
-            chunks.append(chunk)
+        flush()
 
         return chunks
 
+    @staticmethod
+    def _materialize(text: str, items: List[ChunkItem]) -> str:
+        """Build a chunk string, slicing adjacent spans of text in one piece."""
+        parts = []
+        run_start = run_end = None
+        for item in items:
+            if isinstance(item, tuple):
+                start, end = item
+                if run_end == start:
+                    run_end = end
+                    continue
+                if run_start is not None:
+                    parts.append(text[run_start:run_end])
+                run_start, run_end = start, end
+            else:
+                if run_start is not None:
+                    parts.append(text[run_start:run_end])
+                    run_start = run_end = None
+                parts.append(item)
+        if run_start is not None:
+            parts.append(text[run_start:run_end])
+        return "".join(parts)
+
     def _count_segment_tokens(self, segment: str) -> int:
         """Count tokens in a segment.
 
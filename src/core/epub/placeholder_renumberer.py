@@ -74,41 +74,17 @@ class PlaceholderRenumberer:
             >>> result['global_indices']
             [5, 6]
         """
-        # Find all global placeholders in this chunk (including duplicates)
-        # Each occurrence will get a unique local index
-        placeholder_occurrences = []
-
-        for start, end, global_placeholder, global_idx in self.placeholder_format.find_all(text):
-            placeholder_occurrences.append((start, end, global_placeholder, global_idx))
-
-        # Step 1: Replace each occurrence with a unique temporary marker
-        # This prevents issues with overlapping replacements
-        temp_markers = []
-        for i, (start, end, global_placeholder, global_idx) in enumerate(placeholder_occurrences):
-            temp_marker = f"__TEMP_PH_{i}__"
-            temp_markers.append(temp_marker)
-
-        # Apply temp markers in REVERSE order to avoid position shifts
-        temp_text = text
-        for i in range(len(placeholder_occurrences) - 1, -1, -1):
-            start, end, _, _ = placeholder_occurrences[i]
-            temp_text = temp_text[:start] + temp_markers[i] + temp_text[end:]
-
-        # Step 2: Replace temp markers with local placeholders (0, 1, 2, ...)
-        renumbered_text = temp_text
-        local_tag_map = {}
-        global_indices = []
-
-        for local_idx, (_, _, global_placeholder, global_idx) in enumerate(placeholder_occurrences):
-            local_placeholder = self.placeholder_format.create(local_idx)
-            temp_marker = temp_markers[local_idx]
-
-            # Replace temp marker with local placeholder
-            renumbered_text = renumbered_text.replace(temp_marker, local_placeholder, 1)
-
-            # Build mapping
-            local_tag_map[local_placeholder] = global_tag_map.get(global_placeholder, "")
-            global_indices.append(global_idx)
+        # Single scan of all global placeholders in this chunk (including
+        # duplicates); each occurrence gets a unique local index
+        scan = self.placeholder_format.scan(text)
+        renumbered_text = scan.renumber_occurrences()
+
+        create = self.placeholder_format.create
+        global_indices = scan.indices.tolist()
+        local_tag_map = {
+            create(local_idx): global_tag_map.get(text[start:end], "")
+            for local_idx, (start, end) in enumerate(zip(scan.starts, scan.ends))
+        }
 
         return {
             'text': renumbered_text,
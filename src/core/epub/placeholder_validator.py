@@ -4,9 +4,9 @@ Centralized placeholder validation for EPUB translation.
 This module provides unified validation logic for placeholder integrity checks.
 """
 
-from typing import Dict, Tuple, List
-import re
+from typing import Dict, Tuple, List, Optional
 from .exceptions import PlaceholderValidationError
+from src.common.placeholder_format import PlaceholderFormat, PlaceholderScan
 
 
 class PlaceholderValidator:
@@ -23,10 +23,7 @@ class PlaceholderValidator:
         Returns:
             True if all placeholders present, False otherwise
         """
-        for placeholder in expected_tag_map:
-            if placeholder not in text:
-                return False
-        return True
+        return not PlaceholderValidator.get_missing_placeholders(text, expected_tag_map)
 
     @staticmethod
     def validate_strict(
@@ -52,23 +49,43 @@ class PlaceholderValidator:
         Raises:
             PlaceholderValidationError: If validation fails (optional behavior)
         """
-        # Extract placeholder pattern (e.g., "[id", "]")
         if not expected_tag_map:
             return True, ""
 
         # Get first placeholder to detect format
         first_ph = next(iter(expected_tag_map.keys()))
-        match = re.match(r'^(.*?)(\d+)(.*)$', first_ph)
-        if not match:
+        placeholder_format = PlaceholderFormat.from_placeholder(first_ph)
+        if placeholder_format is None:
             return False, f"Invalid placeholder format: {first_ph}"
 
-        prefix, _, suffix = match.groups()
+        return PlaceholderValidator.validate_scan(
+            placeholder_format.scan(text), expected_tag_map
+        )
+
+    @staticmethod
+    def validate_scan(
+        scan: PlaceholderScan,
+        expected_tag_map: Dict[str, str]
+    ) -> Tuple[bool, str]:
+        """Strict validation on an existing placeholder scan.
+
+        Same checks as validate_strict(), but reuses the positions/index
+        arrays of a scan that the caller may also use for renumbering, so
+        the response is only scanned once.
+
+        Args:
+            scan: Result of PlaceholderFormat.scan() on the translated text
+            expected_tag_map: Map of placeholders to tags
+
+        Returns:
+            Tuple of (is_valid, error_message)
+        """
+        if not expected_tag_map:
+            return True, ""
 
         # 1. Check count
         expected_count = len(expected_tag_map)
-        pattern = re.escape(prefix) + r'(\d+)' + re.escape(suffix)
-        found_placeholders = re.findall(pattern, text)
-        actual_count = len(found_placeholders)
+        actual_count = len(scan)
 
         if actual_count != expected_count:
             return False, (
@@ -77,24 +94,42 @@ class PlaceholderValidator:
             )
 
         # 2. Check sequential order
-        indices = sorted([int(idx) for idx in found_placeholders])
-        expected_indices = list(range(expected_count))
-
-        if indices != expected_indices:
-            missing = set(expected_indices) - set(indices)
-            extra = set(indices) - set(expected_indices)
+        if not scan.is_sequential(expected_count):
+            missing = set(scan.missing(expected_count))
+            extra = set(scan.extra(expected_count))
             return False, (
                 f"Non-sequential placeholders. "
                 f"Missing: {missing}, Extra: {extra}"
             )
 
         # 3. Check all expected placeholders present
-        for placeholder in expected_tag_map:
-            if placeholder not in text:
-                return False, f"Missing placeholder: {placeholder}"
+        missing = PlaceholderValidator._missing_from_scan(scan, expected_tag_map)
+        if missing:
+            return False, f"Missing placeholder: {missing[0]}"
 
         return True, ""
 
+    @staticmethod
+    def scan_for(
+        text: str,
+        expected_tag_map: Dict[str, str]
+    ) -> Optional[PlaceholderScan]:
+        """Scan text using the placeholder format of expected_tag_map.
+
+        Args:
+            text: Text to scan
+            expected_tag_map: Map whose keys define the placeholder format
+
+        Returns:
+            PlaceholderScan, or None if the map is empty or its keys are invalid
+        """
+        if not expected_tag_map:
+            return None
+        placeholder_format = PlaceholderFormat.from_placeholder(next(iter(expected_tag_map)))
+        if placeholder_format is None:
+            return None
+        return placeholder_format.scan(text)
+
     @staticmethod
     def get_missing_placeholders(
         text: str,
@@ -109,8 +144,23 @@ class PlaceholderValidator:
         Returns:
             List of missing placeholder IDs
         """
-        missing = []
-        for placeholder in expected_tag_map:
-            if placeholder not in text:
-                missing.append(placeholder)
-        return missing
+        scan = PlaceholderValidator.scan_for(text, expected_tag_map)
+        if scan is None:
+            return [p for p in expected_tag_map if p not in text]
+        return PlaceholderValidator._missing_from_scan(scan, expected_tag_map)
+
+    @staticmethod
+    def _missing_from_scan(
+        scan: PlaceholderScan,
+        expected_tag_map: Dict[str, str]
+    ) -> List[str]:
+        """Expected placeholders absent from a scan, in tag map order.
+
+        Keys that don't round-trip through the format (e.g. "[id01]") fall
+        back to a substring check on the scanned text.
+        """
+        found = scan.placeholders()
+        return [
+            p for p in expected_tag_map
+            if p not in found and p not in scan.text
+        ]
@@ -16,6 +16,30 @@ from .placeholder_validator import PlaceholderValidator
 from src.common.placeholder_format import PlaceholderFormat
 
 
+# Characters allowed in non-translatable runs: digits, numbering punctuation,
+# whitespace, invisible Unicode spaces and roman numeral letters
+_NON_TRANSLATABLE_CHARS = r'[\d\.\-\–\—\)\(\s\u00A0\u2000-\u200F\u2028\u2029IVXLCDM]'
+_NON_TRANSLATABLE_RE = re.compile(r'^' + _NON_TRANSLATABLE_CHARS + r'+$', re.IGNORECASE)
+
+_TAG_SPLIT_RE = re.compile(r'(<[^>]+>)')
+_TECH_BLOCK_SPLIT_RE = re.compile(r'(__TECH_BLOCK_\d+__)')
+_TECH_BLOCK_MARKER_RE = re.compile(r'__TECH_BLOCK_\d+__')
+
+# Fused single-pass tokenizer for preserve_tags(). Each match is a maximal
+# group of HTML/XML tags plus the inter-tag runs made only of
+# non-translatable characters (whitespace, numbers, roman numerals), and a
+# trailing non-translatable run at end of text. Splitting on it yields
+# translatable text at even indices and ready-made placeholder groups at odd
+# indices, so tags, whitespace/number runs and grouping are all handled by
+# the regex engine in one pass. The pattern starts with a literal "<" so the
+# search between groups stays fast.
+_TAG_GROUP_SPLIT_RE = re.compile(
+    r'(<[^>]+>'
+    r'(?:(?i:' + _NON_TRANSLATABLE_CHARS + r')*<[^>]+>)*'
+    r'(?:(?i:' + _NON_TRANSLATABLE_CHARS + r')*\Z)?)'
+)
+
+
 def is_non_translatable(text: str) -> bool:
     """
     Check if text contains only non-translatable content.
@@ -48,8 +72,7 @@ def is_non_translatable(text: str) -> bool:
     # Check if it's just numbers/roman numerals with optional formatting
     # Matches: "1", "1.", "1.2", "42", "III", "IV.", "1-", "1)", "(1)"
     # Also matches invisible Unicode characters
-    non_translatable_pattern = r'^[\d\.\-\–\—\)\(\s\u00A0\u2000-\u200F\u2028\u2029IVXLCDM]+$'
-    return bool(re.match(non_translatable_pattern, stripped, re.IGNORECASE))
+    return bool(_NON_TRANSLATABLE_RE.match(stripped))
 
 class TagPreserver:
     """
@@ -112,41 +135,40 @@ class TagPreserver:
         self.tag_map = {}
         self.counter = 0
 
-        # Split text into segments: tags vs non-tags
-        # This preserves the order and allows us to analyze each segment
-        segments = re.split(r'(<[^>]+>)', text)
+        # Single pass over the text: odd pieces are whole groups of tags and
+        # non-translatable content, even pieces are translatable text
+        pieces = _TAG_GROUP_SPLIT_RE.split(text)
 
-        # Build output by grouping tags and non-translatable content
+        tag_map = self.tag_map
+        create = self.placeholder_format.create
         merged_segments = []
         current_group = []
 
-        for segment in segments:
-            if not segment:
+        for i, piece in enumerate(pieces):
+            if not piece:
                 continue
 
-            is_tag = segment.startswith('<') and segment.endswith('>')
-            is_non_trans = is_non_translatable(segment)
-
-            if is_tag or is_non_trans:
-                # Add to current group (tags and non-translatable content)
-                current_group.append(segment)
+            # Only the leading run can still be non-translatable (it has no tag
+            # before it); a text run like "<>" still counts as a tag
+            if (i & 1
+                    or (piece[0] == '<' and piece[-1] == '>')
+                    or (i == 0 and is_non_translatable(piece))):
+                current_group.append(piece)
             else:
                 # Found translatable text - flush the group as a placeholder
                 if current_group:
-                    merged_content = ''.join(current_group)
-                    placeholder = self.placeholder_format.create(self.counter)
-                    self.tag_map[placeholder] = merged_content
+                    placeholder = create(self.counter)
+                    tag_map[placeholder] = ''.join(current_group)
                     merged_segments.append(placeholder)
                     self.counter += 1
                     current_group = []
                 # Add the translatable text directly
-                merged_segments.append(segment)
+                merged_segments.append(piece)
 
         # Flush remaining group at the end
         if current_group:
-            merged_content = ''.join(current_group)
-            placeholder = self.placeholder_format.create(self.counter)
-            self.tag_map[placeholder] = merged_content
+            placeholder = create(self.counter)
+            tag_map[placeholder] = ''.join(current_group)
             merged_segments.append(placeholder)
             self.counter += 1
 
@@ -198,7 +220,7 @@ class TagPreserver:
         text_with_markers, multiline_block_map = self._extract_multiline_blocks(text)
 
         # Step 2: Split on HTML tags
-        tag_segments = re.split(r'(<[^>]+>)', text_with_markers)
+        tag_segments = _TAG_SPLIT_RE.split(text_with_markers)
 
         # Step 3 & 4: For each segment, split on technical patterns and group
         all_segments = []
@@ -215,7 +237,7 @@ class TagPreserver:
                 # Check if segment contains block markers - if so, split on them specially
                 if '__TECH_BLOCK_' in segment:
                     # Split on block markers manually to preserve them
-                    parts = re.split(r'(__TECH_BLOCK_\d+__)', segment)
+                    parts = _TECH_BLOCK_SPLIT_RE.split(segment)
                     all_segments.extend(parts)
                 else:
                     # Split on inline technical patterns (code, LaTeX, measurements)
@@ -226,14 +248,28 @@ class TagPreserver:
         # BUT: Technical content should get its own placeholder (not grouped with tags)
         merged_segments = []
         current_group = []
+        technical_cache: Dict[str, bool] = {}
+
+        def restore_blocks(content: str) -> str:
+            """Put multiline blocks back in place of their markers."""
+            if not multiline_block_map or '__TECH_BLOCK_' not in content:
+                return content
+            return _TECH_BLOCK_MARKER_RE.sub(
+                lambda m: multiline_block_map.get(m.group(), m.group()), content
+            )
+
+        def is_technical(segment: str) -> bool:
+            """_is_technical_content() memoized for repeated segments."""
+            result = technical_cache.get(segment)
+            if result is None:
+                result = technical_cache[segment] = self._is_technical_content(segment)
+            return result
 
         def flush_group():
             """Helper to flush current group as a placeholder."""
             if current_group:
-                merged_content = ''.join(current_group)
                 # Restore multiline blocks in the group
-                for marker, block_content in multiline_block_map.items():
-                    merged_content = merged_content.replace(marker, block_content)
+                merged_content = restore_blocks(''.join(current_group))
 
                 placeholder = self.placeholder_format.create(self.counter)
                 self.tag_map[placeholder] = merged_content
@@ -247,7 +283,7 @@ class TagPreserver:
 
             is_tag = segment.startswith('<') and segment.endswith('>')
             is_non_trans = is_non_translatable(segment)
-            is_tech = self._is_technical_content(segment)
+            is_tech = is_technical(segment)
             is_block_marker = segment.startswith('__TECH_BLOCK_')
 
             # Technical content and block markers get their own placeholders
@@ -256,9 +292,7 @@ class TagPreserver:
                 flush_group()
 
                 # Create dedicated placeholder for technical content
-                merged_content = segment
-                for marker, block_content in multiline_block_map.items():
-                    merged_content = merged_content.replace(marker, block_content)
+                merged_content = restore_blocks(segment)
 
                 placeholder = self.placeholder_format.create(self.counter)
                 self.tag_map[placeholder] = merged_content
@@ -331,9 +365,9 @@ class TagPreserver:
             - missing_placeholders: List of missing placeholder strings
             - mutated_placeholders: Empty list (legacy compatibility, no longer used)
         """
-        # Use centralized PlaceholderValidator
-        is_valid = PlaceholderValidator.validate_basic(text, tag_map)
+        # Use centralized PlaceholderValidator (single pass over tag_map)
         missing_placeholders = PlaceholderValidator.get_missing_placeholders(text, tag_map)
+        is_valid = not missing_placeholders
         mutated_placeholders = []  # Legacy compatibility
 
         return is_valid, missing_placeholders, mutated_placeholders
@@ -381,10 +415,10 @@ class TagPreserver:
         return fixed_text
 
     def _get_detector(self):
-        """Lazy-load the TechnicalContentDetector."""
+        """Lazy-load the shared TechnicalContentDetector."""
         if self._detector is None:
-            from .technical_content_detector import TechnicalContentDetector
-            self._detector = TechnicalContentDetector()
+            from .technical_content_detector import get_default_detector
+            self._detector = get_default_detector()
         return self._detector
 
     def _extract_multiline_blocks(self, text: str) -> Tuple[str, Dict[str, str]]:
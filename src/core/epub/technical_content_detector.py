@@ -15,12 +15,36 @@ Supported patterns:
 - Technical measurements (10 Mbps, 5V, etc.)
 - Technical identifiers (TIA/EIA-485-A, DS1487, etc.)
 - HTML entity blocks (&lt;section&gt;..., escaped code examples)
+
+Detection results are memoized by content hash in a process-wide LRU cache
+shared by all detectors, so code blocks, formulas and measurements repeated
+across chunks and files are only analysed once. Text without any trigger
+character ("&", "`", "$", digits, or two adjacent capitals) skips the regex
+battery entirely, which keeps the cost near zero for prose-only books.
 """
 
+import hashlib
+import heapq
 import re
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass
-from typing import List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 from enum import IntEnum
+from operator import attrgetter
+
+
+DETECTION_CACHE_SIZE = 4096
+"""Maximum number of distinct texts whose detection results are memoized"""
+
+# At least one of these must be present for any pattern below to match:
+# & (entities), ` (code), $ (LaTeX), digits (measurements, IDs like DS1487),
+# two adjacent capitals (IDs like RS-485, TIA/EIA)
+_TRIGGER_RE = re.compile(r'[&`$\d]|[A-Z]{2}')
+_DIGIT_RE = re.compile(r'\d')
+_TECHNICAL_ID_TRIGGER_RE = re.compile(r'[A-Z][A-Z\d]')
 
 
 class PatternPriority(IntEnum):
@@ -32,7 +56,7 @@ class PatternPriority(IntEnum):
     IDENTIFIER = 2        # Technical IDs like TIA/EIA-485-A
 
 
-@dataclass
+@dataclass(frozen=True)
 class TechnicalPattern:
     """Represents a detected technical content pattern."""
     start: int          # Start position in text
@@ -42,6 +66,44 @@ class TechnicalPattern:
     priority: int       # Pattern priority (for overlap resolution)
 
 
+class _DetectionCache:
+    """Thread-safe LRU cache of detection results keyed by content hash."""
+
+    def __init__(self, max_size: int = DETECTION_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: "OrderedDict[bytes, Tuple[TechnicalPattern, ...]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(text: str) -> bytes:
+        """Compact content hash used as cache key."""
+        return hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+    def get(self, key: bytes) -> Optional[Tuple[TechnicalPattern, ...]]:
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+            return result
+
+    def put(self, key: bytes, patterns: Tuple[TechnicalPattern, ...]) -> None:
+        with self._lock:
+            self._entries[key] = patterns
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_detection_cache = _DetectionCache()
+
+
 class TechnicalContentDetector:
     """
     Detects technical content in text using regex patterns.
@@ -54,10 +116,20 @@ class TechnicalContentDetector:
     - HTML entity blocks (&lt;section&gt;..., escaped code examples)
 
     Patterns are applied with priority levels to handle overlaps correctly.
+    Results are memoized by content hash (shared across detector instances)
+    and usage statistics are kept per detector (see get_usage_statistics).
     """
 
-    def __init__(self):
-        """Initialize detector with pre-compiled regex patterns."""
+    def __init__(self, use_cache: bool = True):
+        """Initialize detector with pre-compiled regex patterns.
+
+        Args:
+            use_cache: If True, memoize results in the shared detection cache
+        """
+        self.use_cache = use_cache
+        self._usage_lock = threading.Lock()
+        self.reset_usage_statistics()
+
         # Pattern 0: HTML entity blocks (escaped code examples in documentation)
         # Matches continuous blocks with multiple HTML entities like &lt;section&gt;
         # This captures code examples that are shown as escaped HTML
@@ -223,6 +295,13 @@ class TechnicalContentDetector:
         When two patterns overlap, the one with higher priority is kept.
         If priorities are equal, the longer pattern is kept.
 
+        Priority levels are processed from highest to lowest. Each level is
+        sorted by start once, swept against the already accepted (disjoint,
+        sorted) spans with a two-pointer scan, resolved internally (longer
+        wins), then merged into the accepted spans. With a fixed number of
+        priority levels this is O(n log n) overall, whatever the number of
+        overlapping candidates.
+
         Args:
             patterns: List of detected patterns (may have overlaps)
 
@@ -238,34 +317,40 @@ class TechnicalContentDetector:
         if not patterns:
             return []
 
-        # Sort by start position, then by priority (descending)
-        sorted_patterns = sorted(patterns, key=lambda p: (p.start, -p.priority))
-
-        result = []
-        last_end = -1
-
-        for pattern in sorted_patterns:
-            # Check if this pattern overlaps with previously accepted pattern
-            if pattern.start >= last_end:
-                # No overlap, accept this pattern
-                result.append(pattern)
-                last_end = pattern.end
-            else:
-                # Overlap detected - check priorities
-                last_pattern = result[-1]
-
-                if pattern.priority > last_pattern.priority:
-                    # Higher priority - replace last pattern
-                    result[-1] = pattern
+        by_priority: Dict[int, List[TechnicalPattern]] = {}
+        for pattern in patterns:
+            by_priority.setdefault(pattern.priority, []).append(pattern)
+
+        start_of = attrgetter('start')
+        accepted: List[TechnicalPattern] = []
+
+        for priority in sorted(by_priority, reverse=True):
+            # Stable sort keeps detection order for candidates with equal start
+            candidates = sorted(by_priority[priority], key=start_of)
+
+            level = []
+            last_end = -1
+            j = 0
+            for pattern in candidates:
+                # Skip accepted spans ending before this candidate; since they
+                # are disjoint and sorted, ends are sorted too
+                while j < len(accepted) and accepted[j].end <= pattern.start:
+                    j += 1
+                if j < len(accepted) and accepted[j].start < pattern.end:
+                    continue  # Overlaps a higher priority span
+
+                if pattern.start >= last_end:
+                    level.append(pattern)
                     last_end = pattern.end
-                elif pattern.priority == last_pattern.priority:
+                elif (pattern.end - pattern.start) > (level[-1].end - level[-1].start):
                     # Same priority - keep longer pattern
-                    if (pattern.end - pattern.start) > (last_pattern.end - last_pattern.start):
-                        result[-1] = pattern
-                        last_end = pattern.end
-                # else: lower or equal priority with shorter length - skip
+                    level[-1] = pattern
+                    last_end = pattern.end
+
+            if level:
+                accepted = list(heapq.merge(accepted, level, key=start_of)) if accepted else level
 
-        return result
+        return accepted
 
     def find_all_technical_content(self, text: str) -> List[TechnicalPattern]:
         """
@@ -281,6 +366,9 @@ class TechnicalContentDetector:
         4. Measurements (10 Mbps, 32 ULs) - Priority 3
         5. Technical IDs (TIA/EIA-485-A) - Priority 2
 
+        Text without trigger characters returns immediately, and results for
+        previously seen text are served from the shared content-hash cache.
+
         Args:
             text: Text to analyze
 
@@ -293,75 +381,166 @@ class TechnicalContentDetector:
             >>> [p.pattern_name for p in patterns]
             ['latex_inline', 'measurement', 'inline_code']
         """
+        if not text or not _TRIGGER_RE.search(text):
+            self._record_usage('prefilter_skips')
+            return []
+
+        if not self.use_cache:
+            patterns = self._detect(text)
+            self._record_usage('detections', patterns)
+            return list(patterns)
+
+        key = _DetectionCache.key(text)
+        patterns = _detection_cache.get(key)
+        if patterns is not None:
+            self._record_usage('cache_hits', patterns)
+            return list(patterns)
+
+        patterns = self._detect(text)
+        _detection_cache.put(key, patterns)
+        self._record_usage('detections', patterns)
+        return list(patterns)
+
+    def _detect(self, text: str) -> Tuple[TechnicalPattern, ...]:
+        """Run the regex battery and overlap resolution (uncached).
+
+        Patterns whose trigger character is absent from the text are skipped.
+        """
         all_patterns = []
+        has_backtick = '`' in text
+        has_dollar = '$' in text
+        has_digit = _DIGIT_RE.search(text) is not None
 
         # Priority 10: Multiline code blocks
-        all_patterns.extend(self._find_pattern_matches(
-            text,
-            self.code_block_pattern,
-            "code_block",
-            PatternPriority.MULTILINE_BLOCK
-        ))
+        if has_backtick:
+            all_patterns.extend(self._find_pattern_matches(
+                text,
+                self.code_block_pattern,
+                "code_block",
+                PatternPriority.MULTILINE_BLOCK
+            ))
 
         # Priority 10: LaTeX display math
-        all_patterns.extend(self._find_pattern_matches(
-            text,
-            self.latex_display_pattern,
-            "latex_display",
-            PatternPriority.MULTILINE_BLOCK
-        ))
+        if has_dollar:
+            all_patterns.extend(self._find_pattern_matches(
+                text,
+                self.latex_display_pattern,
+                "latex_display",
+                PatternPriority.MULTILINE_BLOCK
+            ))
 
         # Priority 9: HTML entity blocks (escaped code examples)
-        all_patterns.extend(self._find_pattern_matches(
-            text,
-            self.html_entity_block_pattern,
-            "html_entity_block",
-            PatternPriority.HTML_ENTITY_BLOCK
-        ))
+        if '&' in text:
+            all_patterns.extend(self._find_pattern_matches(
+                text,
+                self.html_entity_block_pattern,
+                "html_entity_block",
+                PatternPriority.HTML_ENTITY_BLOCK
+            ))
 
         # Priority 5: Inline code
-        all_patterns.extend(self._find_pattern_matches(
-            text,
-            self.inline_code_pattern,
-            "inline_code",
-            PatternPriority.INLINE_CODE
-        ))
+        if has_backtick:
+            all_patterns.extend(self._find_pattern_matches(
+                text,
+                self.inline_code_pattern,
+                "inline_code",
+                PatternPriority.INLINE_CODE
+            ))
 
         # Priority 5: LaTeX inline (with validation)
-        all_patterns.extend(self._find_pattern_matches(
-            text,
-            self.latex_inline_pattern,
-            "latex_inline",
-            PatternPriority.INLINE_CODE,
-            validator=self._is_latex_formula
-        ))
-
-        # Priority 3: Technical measurements
-        all_patterns.extend(self._find_pattern_matches(
-            text,
-            self.measurement_pattern,
-            "measurement",
-            PatternPriority.MEASUREMENT
-        ))
-
-        # Priority 3: Measurement ranges
-        all_patterns.extend(self._find_pattern_matches(
-            text,
-            self.measurement_range_pattern,
-            "measurement_range",
-            PatternPriority.MEASUREMENT
-        ))
+        if has_dollar:
+            all_patterns.extend(self._find_pattern_matches(
+                text,
+                self.latex_inline_pattern,
+                "latex_inline",
+                PatternPriority.INLINE_CODE,
+                validator=self._is_latex_formula
+            ))
+
+        if has_digit:
+            # Priority 3: Technical measurements
+            all_patterns.extend(self._find_pattern_matches(
+                text,
+                self.measurement_pattern,
+                "measurement",
+                PatternPriority.MEASUREMENT
+            ))
+
+            # Priority 3: Measurement ranges
+            all_patterns.extend(self._find_pattern_matches(
+                text,
+                self.measurement_range_pattern,
+                "measurement_range",
+                PatternPriority.MEASUREMENT
+            ))
 
         # Priority 2: Technical identifiers
-        all_patterns.extend(self._find_pattern_matches(
-            text,
-            self.technical_id_pattern,
-            "technical_id",
-            PatternPriority.IDENTIFIER
-        ))
+        if _TECHNICAL_ID_TRIGGER_RE.search(text):
+            all_patterns.extend(self._find_pattern_matches(
+                text,
+                self.technical_id_pattern,
+                "technical_id",
+                PatternPriority.IDENTIFIER
+            ))
 
         # Resolve overlaps and return sorted by position
-        return self._resolve_overlaps(all_patterns)
+        return tuple(self._resolve_overlaps(all_patterns))
+
+    def _record_usage(self, event: str, patterns: Tuple[TechnicalPattern, ...] = ()) -> None:
+        """Update usage counters for one find_all_technical_content() call."""
+        with self._usage_lock:
+            usage = self._usage
+            usage['calls'] += 1
+            usage[event] += 1
+            pattern_counts = usage['patterns']
+            for pattern in patterns:
+                pattern_counts[pattern.pattern_name] = pattern_counts.get(pattern.pattern_name, 0) + 1
+
+    def reset_usage_statistics(self) -> None:
+        """Reset the usage counters of this detector."""
+        with self._usage_lock:
+            self._usage = {
+                'calls': 0,
+                'prefilter_skips': 0,
+                'cache_hits': 0,
+                'detections': 0,
+                'patterns': {},
+            }
+
+    def get_usage_statistics(self) -> Dict:
+        """
+        Get usage statistics of this detector.
+
+        Returns:
+            Dictionary with call counts and how often each pattern fired:
+            - calls: Total find_all_technical_content() calls
+            - prefilter_skips: Calls answered by the trigger-character pre-filter
+            - cache_hits: Calls answered from the shared content-hash cache
+            - detections: Calls that ran the full regex battery
+            - patterns: Map of pattern name -> matches returned
+
+        Example:
+            >>> detector.get_usage_statistics()
+            {'calls': 120, 'prefilter_skips': 95, 'cache_hits': 12,
+             'detections': 13, 'patterns': {'measurement': 7, 'inline_code': 4}}
+        """
+        with self._usage_lock:
+            usage = dict(self._usage)
+            usage['patterns'] = dict(self._usage['patterns'])
+        return usage
+
+    def format_usage_summary(self) -> str:
+        """One-line human-readable summary of get_usage_statistics()."""
+        usage = self.get_usage_statistics()
+        patterns = ", ".join(
+            f"{name}={count}" for name, count in sorted(usage['patterns'].items(), key=lambda item: -item[1])
+        ) or "none"
+        return (
+            f"Technical content detection: {usage['calls']} calls, "
+            f"{usage['prefilter_skips']} skipped by pre-filter, "
+            f"{usage['cache_hits']} cache hits, {usage['detections']} full scans "
+            f"(patterns: {patterns})"
+        )
 
     def get_statistics(self, patterns: List[TechnicalPattern]) -> dict:
         """
@@ -391,3 +570,59 @@ class TechnicalContentDetector:
             stats[pattern_type] = stats.get(pattern_type, 0) + 1
 
         return stats
+
+
+_default_detector: Optional[TechnicalContentDetector] = None
+_default_detector_lock = threading.Lock()
+_job_detector: ContextVar[Optional[TechnicalContentDetector]] = ContextVar(
+    'technical_content_job_detector', default=None
+)
+
+
+def get_default_detector() -> TechnicalContentDetector:
+    """
+    Get the detector shared by all TagPreserver instances.
+
+    Inside job_detector() this is the job's own detector, so its usage
+    statistics cover that job only; elsewhere it is a process-wide instance.
+    The detection cache itself is shared by every detector.
+
+    Returns:
+        Shared TechnicalContentDetector instance
+    """
+    detector = _job_detector.get()
+    if detector is not None:
+        return detector
+    global _default_detector
+    if _default_detector is None:
+        with _default_detector_lock:
+            if _default_detector is None:
+                _default_detector = TechnicalContentDetector()
+    return _default_detector
+
+
+@contextmanager
+def job_detector():
+    """
+    Count technical content detection separately for one job.
+
+    get_default_detector() returns a fresh detector within the block and in
+    the asyncio tasks started from it, so jobs running concurrently in the
+    server (or one after another) don't add up their statistics.
+
+    Example:
+        >>> with job_detector() as detector:
+        ...     ...  # translate the book
+        ...     log_callback("epub_technical_detection_stats", detector.format_usage_summary())
+    """
+    detector = TechnicalContentDetector()
+    token = _job_detector.set(detector)
+    try:
+        yield detector
+    finally:
+        _job_detector.reset(token)
+
+
+def clear_detection_cache() -> None:
+    """Drop all memoized detection results."""
+    _detection_cache.clear()
@@ -11,6 +11,7 @@ unified generic orchestrator approach:
 Refactored to use the same pattern as DOCX for consistency and maintainability.
 """
 import os
+import time
 import zipfile
 import tempfile
 import aiofiles
@@ -21,14 +22,20 @@ from lxml import etree
 from src.config import (
     NAMESPACES, DEFAULT_MODEL, API_ENDPOINT,
     MAX_TOKENS_PER_CHUNK, THINKING_MODELS, ADAPTIVE_CONTEXT_INITIAL_THINKING,
-    MAX_TRANSLATION_ATTEMPTS, ATTRIBUTION_ENABLED, GENERATOR_NAME, GENERATOR_SOURCE
+    MAX_TRANSLATION_ATTEMPTS, ATTRIBUTION_ENABLED, GENERATOR_NAME, GENERATOR_SOURCE,
+    EPUB_PACK_SMALL_CHUNKS, EPUB_PACK_MAX_SEGMENTS
 )
 from ..common.translation_orchestrator import GenericTranslationOrchestrator
 from .epub_translation_adapter import EpubTranslationAdapter
+from .technical_content_detector import job_detector
 from ..post_processor import clean_residual_tag_placeholders
 from ..context_optimizer import AdaptiveContextManager, INITIAL_CONTEXT_SIZE, CONTEXT_STEP, MAX_CONTEXT_SIZE
+from ..translator import plan_job_context
+from src.utils.metrics import report_job_metrics
+from src.utils.tracing import span, traced
 
 
+@traced("epub.translate_file")
 async def translate_epub_file(
     input_filepath: str,
     output_filepath: str,
@@ -53,6 +60,7 @@ async def translate_epub_file(
     max_tokens_per_chunk: int = MAX_TOKENS_PER_CHUNK,
     max_attempts: int = None,
     bilingual: bool = False,
+    batch_mode: bool = False,
 ) -> None:
     """
     Translate an EPUB file using LLM with generic orchestrator.
@@ -92,7 +100,11 @@ async def translate_epub_file(
         max_tokens_per_chunk: Maximum tokens per chunk
         max_attempts: Maximum translation attempts per chunk
         bilingual: Enable bilingual translation mode
+        batch_mode: Submit the chunks to the provider's Batch API first
+            (see src.core.offline_batch)
     """
+    job_started_at = time.perf_counter()
+
     # Validate input file
     if not os.path.exists(input_filepath):
         err_msg = f"ERROR: Input EPUB file '{input_filepath}' not found."
@@ -144,13 +156,20 @@ async def translate_epub_file(
         log_callback=log_callback
     )
 
-    with tempfile.TemporaryDirectory() as temp_dir:
+    # Load the model and probe it while the EPUB is extracted and parsed; with
+    # a context plan, the load waits for it (once the chunks are counted)
+    llm_client.start_warm_up(log_callback, job_started_at=job_started_at,
+                             wait_for_context_plan=context_manager is not None)
+
+    with tempfile.TemporaryDirectory() as temp_dir, job_detector() as technical_detector:
         try:
             # 1. Extract EPUB
-            _extract_epub(input_filepath, temp_dir, log_callback)
+            with span("epub.extract"):
+                _extract_epub(input_filepath, temp_dir, log_callback)
 
             # 2. Parse manifest
-            manifest_data = _parse_epub_manifest(temp_dir, log_callback)
+            with span("epub.parse_manifest"):
+                manifest_data = _parse_epub_manifest(temp_dir, log_callback)
 
             # 2.5. Restore checkpoint if resuming
             restored_docs = {}
@@ -179,14 +198,16 @@ async def translate_epub_file(
                 stats_callback=stats_callback,
                 check_interruption_callback=check_interruption_callback,
                 prompt_options=prompt_options,
-                restored_docs=restored_docs
+                restored_docs=restored_docs,
+                batch_mode=batch_mode
             )
 
             # 4. Save translated files
-            await _save_translated_files(
-                parsed_xhtml_docs=results['parsed_docs'],
-                log_callback=log_callback
-            )
+            with span("epub.save_files"):
+                await _save_translated_files(
+                    parsed_xhtml_docs=results['parsed_docs'],
+                    log_callback=log_callback
+                )
 
             # 5. Update metadata
             _update_epub_metadata(
@@ -196,10 +217,11 @@ async def translate_epub_file(
             )
 
             # 6. Repackage EPUB
-            _repackage_epub(
-                temp_dir=temp_dir,
-                output_filepath=output_filepath,
-                log_callback=log_callback)
+            with span("epub.repackage"):
+                _repackage_epub(
+                    temp_dir=temp_dir,
+                    output_filepath=output_filepath,
+                    log_callback=log_callback)
 
             # 7. Final summary
             if log_callback:
@@ -213,12 +235,18 @@ async def translate_epub_file(
                         if stats_summary:
                             log_callback("epub_translation_stats", stats_summary)
 
+                if technical_detector.get_usage_statistics()['calls'] > 0:
+                    log_callback("epub_technical_detection_stats", technical_detector.format_usage_summary())
+
         except Exception as e_epub:
             err_msg = f"MAJOR ERROR processing EPUB '{input_filepath}': {e_epub}"
             if log_callback:
                 log_callback("epub_major_error", err_msg)
                 import traceback
                 log_callback("epub_major_error_traceback", traceback.format_exc())
+        finally:
+            report_job_metrics(llm_client, log_callback, checkpoint_manager, translation_id)
+            await llm_client.close()
 
 
 # === Private Helper Functions ===
@@ -387,22 +415,15 @@ async def _restore_checkpoint_files(
         return restored_docs
 
     # Parse restored files
-    checkpoint_files_dir = checkpoint_manager.uploads_dir / translation_id / "translated_files"
+    saved_hrefs = checkpoint_manager.list_epub_files(translation_id)
 
-    if not checkpoint_files_dir.exists():
+    if not saved_hrefs:
         if log_callback:
             log_callback("epub_restore_no_files", "⚠️ No translated files found in checkpoint")
         return restored_docs
 
     restored_count = 0
-    for saved_file in checkpoint_files_dir.rglob('*'):
-        if not saved_file.is_file():
-            continue
-
-        # Get relative path from checkpoint storage
-        rel_path = saved_file.relative_to(checkpoint_files_dir)
-        rel_path_str = str(rel_path).replace('\\', '/')
-
+    for rel_path_str in saved_hrefs:
         # Calculate absolute path in temp_dir
         file_path_abs = os.path.normpath(os.path.join(temp_dir, rel_path_str))
 
@@ -437,6 +458,7 @@ async def _restore_checkpoint_files(
     return restored_docs
 
 
+@traced("epub.translate_xhtml")
 async def _translate_single_xhtml_file(
     file_path: str,
     content_href: str,
@@ -455,6 +477,7 @@ async def _translate_single_xhtml_file(
     check_interruption_callback: Optional[Callable] = None,
     global_total_chunks: Optional[int] = None,
     global_completed_chunks: Optional[int] = None,
+    packed_translations: Optional[Dict[str, str]] = None,
 ) -> Tuple[Optional[etree._Element], bool, Any]:
     """
     Translate a single XHTML file using GenericTranslationOrchestrator.
@@ -476,6 +499,9 @@ async def _translate_single_xhtml_file(
         checkpoint_manager: Optional checkpoint manager for partial state
         translation_id: Optional translation ID for checkpointing
         check_interruption_callback: Optional interruption check callback
+        packed_translations: Translations of small chunks done in packs or
+            of chunks done in the offline batch (chunk text -> translation),
+            used instead of a request
 
     Returns:
         (doc_root, success, stats)
@@ -502,8 +528,9 @@ async def _translate_single_xhtml_file(
         async with aiofiles.open(file_path, 'r', encoding='utf-8') as f:
             content = await f.read()
 
-        parser = etree.XMLParser(encoding='utf-8', recover=True, remove_blank_text=False)
-        doc_root = etree.fromstring(content.encode('utf-8'), parser)
+        with span("epub.parse_xhtml", file=content_href, size=len(content)):
+            parser = etree.XMLParser(encoding='utf-8', recover=True, remove_blank_text=False)
+            doc_root = etree.fromstring(content.encode('utf-8'), parser)
 
         # Create adapter and orchestrator
         adapter = EpubTranslationAdapter()
@@ -530,6 +557,7 @@ async def _translate_single_xhtml_file(
             resume_state=resume_state,
             global_total_chunks=global_total_chunks,
             global_completed_chunks=global_completed_chunks,
+            packed_translations=packed_translations,
         )
 
         return doc_root, success, stats
@@ -548,11 +576,21 @@ async def _precount_chunks(
     content_files: list,
     opf_dir: str,
     max_tokens_per_chunk: int,
-    log_callback: Optional[Callable] = None
+    log_callback: Optional[Callable] = None,
+    chunks_by_file: Optional[List[List[Dict]]] = None,
+    plan_context: Optional[Callable[[List[Dict]], Any]] = None,
+    resume_from_index: int = 0
 ) -> Tuple[int, List[int]]:
     """
     Pre-count chunks across all XHTML files for accurate progress tracking.
 
+    Args:
+        chunks_by_file: Optional list that receives the chunks of each file
+            (empty for files without content), for small chunk packing
+        plan_context: Optional callback receiving the chunks of the files
+            still to translate, to size the context once for the job
+        resume_from_index: Index of the first file still to translate
+
     Returns:
         (total_chunks, chunks_per_file)
     """
@@ -560,6 +598,7 @@ async def _precount_chunks(
 
     chunks_per_file = []
     total_chunks = 0
+    pending_chunks = []
 
     if log_callback:
         log_callback("epub_precount_start", f"📊 Analyzing {len(content_files)} files for progress tracking...")
@@ -568,6 +607,8 @@ async def _precount_chunks(
         file_path = os.path.normpath(os.path.join(opf_dir, content_href))
         if not os.path.exists(file_path):
             chunks_per_file.append(0)
+            if chunks_by_file is not None:
+                chunks_by_file.append([])
             continue
 
         try:
@@ -584,6 +625,8 @@ async def _precount_chunks(
 
             if not raw_content or not raw_content.strip():
                 chunks_per_file.append(0)
+                if chunks_by_file is not None:
+                    chunks_by_file.append([])
                 continue
 
             text_with_placeholders, structure_map, _ = adapter.preserve_structure(
@@ -595,19 +638,127 @@ async def _precount_chunks(
             )
 
             chunk_count = len(chunks)
+            if plan_context and len(chunks_per_file) >= resume_from_index:
+                pending_chunks.extend(chunks)
             chunks_per_file.append(chunk_count)
             total_chunks += chunk_count
+            if chunks_by_file is not None:
+                chunks_by_file.append(chunks)
 
         except Exception:
             chunks_per_file.append(0)
+            if chunks_by_file is not None:
+                chunks_by_file.append([])
 
     if log_callback:
         log_callback("epub_precount_complete",
                      f"📊 Found {total_chunks} total chunks across {len(content_files)} files")
 
+    if plan_context:
+        plan_context(pending_chunks)
+
     return total_chunks, chunks_per_file
 
 
+def _pending_chunks(
+    content_files: list,
+    chunks_by_file: List[List[Dict]],
+    resume_from_index: int,
+    translation_id: Optional[str],
+    checkpoint_manager=None
+) -> List[Dict]:
+    """
+    Chunks of the files still to translate, in spine order.
+
+    Files already translated, and a file resumed from a partial state, are
+    left out (their chunks are restored from the checkpoint).
+    """
+    chunks = []
+    for file_idx in range(resume_from_index, len(chunks_by_file)):
+        if (file_idx == resume_from_index and checkpoint_manager and translation_id
+                and checkpoint_manager.load_xhtml_partial_state(translation_id, content_files[file_idx])):
+            continue
+        chunks.extend(chunks_by_file[file_idx])
+    return chunks
+
+
+async def _translate_chunks_offline(
+    chunks: List[Dict],
+    source_language: str,
+    target_language: str,
+    llm_client: Any,
+    log_callback: Optional[Callable] = None,
+    check_interruption_callback: Optional[Callable] = None
+) -> Dict[str, str]:
+    """
+    Translate chunks in one offline batch, each text once.
+
+    Chunks get the same prompt as in translate_chunk_with_fallback, and
+    their translations the same placeholder validation.
+
+    Returns:
+        Map of chunk text to translation (still with local placeholders)
+    """
+    from ..offline_batch import translate_offline
+    from .xhtml_translator import validate_placeholders
+    from src.common.placeholder_format import PlaceholderFormat
+
+    fmt = PlaceholderFormat.from_config()
+    unique = list({chunk['text']: chunk for chunk in chunks if chunk['text'].strip()}.values())
+    translations = await translate_offline(
+        [{
+            'main_content': chunk['text'],
+            'has_placeholders': bool(chunk['local_tag_map']),
+            'placeholder_format': (fmt.prefix, fmt.suffix)
+        } for chunk in unique],
+        source_language, target_language, llm_client,
+        validate=lambda i, translated: validate_placeholders(translated, unique[i]['local_tag_map']),
+        log_callback=log_callback,
+        check_interruption_callback=check_interruption_callback
+    )
+    return {unique[i]['text']: translated for i, translated in translations.items()}
+
+
+async def _translate_small_chunks(
+    content_files: list,
+    chunks_by_file: List[List[Dict]],
+    resume_from_index: int,
+    source_language: str,
+    target_language: str,
+    model_name: str,
+    llm_client: Any,
+    max_tokens_per_chunk: int,
+    context_manager: Optional[AdaptiveContextManager],
+    translation_id: Optional[str],
+    checkpoint_manager=None,
+    log_callback: Optional[Callable] = None,
+    check_interruption_callback: Optional[Callable] = None
+) -> Dict[str, str]:
+    """
+    Translate the small chunks of the files still to translate in packs.
+
+    Returns:
+        Map of chunk text to translation (see chunk_packing.translate_small_chunks)
+    """
+    from .chunk_packing import translate_small_chunks
+
+    adapter = EpubTranslationAdapter()
+    return await translate_small_chunks(
+        _pending_chunks(content_files, chunks_by_file, resume_from_index,
+                        translation_id, checkpoint_manager),
+        max_tokens_per_chunk=max_tokens_per_chunk,
+        count_tokens=adapter.html_chunker.token_chunker.count_tokens,
+        source_language=source_language,
+        target_language=target_language,
+        model_name=model_name,
+        llm_client=llm_client,
+        log_callback=log_callback,
+        context_manager=context_manager,
+        check_interruption_callback=check_interruption_callback,
+        max_segments=EPUB_PACK_MAX_SEGMENTS
+    )
+
+
 async def _process_all_content_files(
     content_files: list,
     opf_dir: str,
@@ -626,7 +777,8 @@ async def _process_all_content_files(
     stats_callback: Optional[Callable] = None,
     check_interruption_callback: Optional[Callable] = None,
     prompt_options: Optional[Dict] = None,
-    restored_docs: Optional[Dict[str, etree._Element]] = None
+    restored_docs: Optional[Dict[str, etree._Element]] = None,
+    batch_mode: bool = False
 ) -> Dict:
     """
     Process all XHTML content files using GenericTranslationOrchestrator.
@@ -649,17 +801,50 @@ async def _process_all_content_files(
         check_interruption_callback: Optional interruption check callback
         prompt_options: Optional prompt options
         restored_docs: Restored documents from checkpoint
+        batch_mode: Translate the chunks in one offline batch first
 
     Returns:
         Dictionary with processing results
     """
     from .translation_metrics import TranslationMetrics
 
+    # Size the context once for the whole book, from its largest remaining chunk
+    plan_context = None
+    if context_manager:
+        def plan_context(chunks: List[Dict]):
+            plan_job_context(
+                context_manager, llm_client,
+                ({'main_content': chunk['text']} for chunk in chunks),
+                source_language, target_language, model_name,
+                has_placeholders=True, previous_context=False
+            )
+
     # Pre-count chunks for accurate progress tracking
+    pack_small_chunks = EPUB_PACK_SMALL_CHUNKS and EPUB_PACK_MAX_SEGMENTS > 1
+    chunks_by_file = [] if pack_small_chunks or batch_mode else None
     total_chunks, chunks_per_file = await _precount_chunks(
-        content_files, opf_dir, max_tokens_per_chunk, log_callback
+        content_files, opf_dir, max_tokens_per_chunk, log_callback, chunks_by_file,
+        plan_context=plan_context, resume_from_index=resume_from_index
     )
 
+    # Translate the whole book in one offline batch, or at least its small
+    # chunks in packs, first; the files then only request what is missing
+    packed_translations: Dict[str, str] = {}
+    if chunks_by_file and batch_mode:
+        packed_translations = await _translate_chunks_offline(
+            _pending_chunks(content_files, chunks_by_file, resume_from_index,
+                            translation_id, checkpoint_manager),
+            source_language, target_language, llm_client,
+            log_callback, check_interruption_callback
+        )
+    elif chunks_by_file:
+        packed_translations = await _translate_small_chunks(
+            content_files, chunks_by_file, resume_from_index,
+            source_language, target_language, model_name, llm_client,
+            max_tokens_per_chunk, context_manager, translation_id,
+            checkpoint_manager, log_callback, check_interruption_callback
+        )
+
     # Start with restored documents
     parsed_xhtml_docs: Dict[str, etree._Element] = restored_docs.copy() if restored_docs else {}
     total_files = len(content_files)
@@ -744,6 +929,7 @@ async def _process_all_content_files(
             check_interruption_callback=check_interruption_callback,
             global_total_chunks=total_chunks,
             global_completed_chunks=completed_chunks_global,
+            packed_translations=packed_translations,
         )
 
         # Update global chunk counter
@@ -36,7 +36,6 @@ LEVEL 3 - Translation (PlaceholderManager):
     → Restored: "[id5]Bonjour[id6]" (global indices)
 """
 import re
-from collections import Counter
 from typing import List, Dict, Any, Optional, Callable, Tuple
 from lxml import etree
 
@@ -51,6 +50,7 @@ from .exceptions import (
     BodyExtractionError
 )
 from .placeholder_validator import PlaceholderValidator
+from src.common.placeholder_format import PlaceholderFormat, PlaceholderScan
 from .container import TranslationContainer
 from ..translator import generate_translation_request
 from ..context_optimizer import AdaptiveContextManager, INITIAL_CONTEXT_SIZE, CONTEXT_STEP, MAX_CONTEXT_SIZE
@@ -59,12 +59,12 @@ from src.config import (
     MAX_PLACEHOLDER_CORRECTION_ATTEMPTS,
     create_placeholder,
     detect_placeholder_format_in_text,
-    detect_format_from_placeholder,
     THINKING_MODELS,
     ADAPTIVE_CONTEXT_INITIAL_THINKING,
 )
 from prompts.prompts import generate_placeholder_correction_prompt, CORRECTED_TAG_IN, CORRECTED_TAG_OUT
 from src.utils.unified_logger import LogLevel, LogType
+from src.utils.tracing import span, traced
 
 
 def _log_error(log_callback: Optional[Callable], event_name: str, message: str):
@@ -103,13 +103,19 @@ class PlaceholderManager:
     """
 
     @staticmethod
-    def restore_to_global(translated_text: str, global_indices: List[int]) -> str:
+    def restore_to_global(
+        translated_text: str,
+        global_indices: List[int],
+        scan: Optional[PlaceholderScan] = None
+    ) -> str:
         """
         Convert local placeholder indices (0, 1, 2...) to global indices.
 
         Args:
             translated_text: Text with local placeholders (0, 1, 2...)
             global_indices: List of global indices to restore
+            scan: Optional scan of translated_text already computed during
+                validation (avoids rescanning the response)
 
         Returns:
             Text with global placeholder indices
@@ -117,24 +123,23 @@ class PlaceholderManager:
         if not global_indices:
             return translated_text
 
-        result = translated_text
-
         # Detect placeholder format from the text
-        prefix, suffix = detect_placeholder_format_in_text(result)
-
-        # Renumber from local to global using temp markers to avoid conflicts
-        for local_idx in range(len(global_indices)):
-            local_ph = f"{prefix}{local_idx}{suffix}"
-            if local_ph in result:
-                result = result.replace(local_ph, f"__RESTORE_{local_idx}__")
+        prefix, suffix = detect_placeholder_format_in_text(translated_text)
 
-        for local_idx, global_idx in enumerate(global_indices):
-            result = result.replace(f"__RESTORE_{local_idx}__", f"{prefix}{global_idx}{suffix}")
+        if (scan is None or scan.text is not translated_text
+                or (scan.placeholder_format.prefix, scan.placeholder_format.suffix) != (prefix, suffix)):
+            scan = PlaceholderFormat.from_placeholder(f"{prefix}0{suffix}").scan(translated_text)
 
-        return result
+        # Single pass: every local index with a global counterpart is rewritten
+        return scan.remap_indices(global_indices)
 
 
-def validate_placeholders(translated_text: str, local_tag_map: Dict[str, str]) -> bool:
+@traced("epub.validate_placeholders")
+def validate_placeholders(
+    translated_text: str,
+    local_tag_map: Dict[str, str],
+    scan: Optional[PlaceholderScan] = None
+) -> bool:
     """
     Validate that translated text contains all expected placeholders.
 
@@ -143,12 +148,16 @@ def validate_placeholders(translated_text: str, local_tag_map: Dict[str, str]) -
     Args:
         translated_text: Text with placeholders after translation
         local_tag_map: Expected local tag map
+        scan: Optional precomputed scan (see PlaceholderValidator.scan_for)
 
     Returns:
         True if all placeholders present and valid
     """
     # Use centralized PlaceholderValidator
-    is_valid, error_msg = PlaceholderValidator.validate_strict(translated_text, local_tag_map)
+    if scan is not None and scan.text is translated_text:
+        is_valid, error_msg = PlaceholderValidator.validate_scan(scan, local_tag_map)
+    else:
+        is_valid, error_msg = PlaceholderValidator.validate_strict(translated_text, local_tag_map)
     return is_valid
 
 
@@ -166,71 +175,47 @@ def build_specific_error_details(translated_text: str, expected_count: int, loca
     """
     errors = []
 
-    # Detect format from tag_map keys
-    current_format = "safe"
+    # All formats are unified to [idN]; detect from tag_map keys when possible
+    placeholder_format = None
     if local_tag_map:
-        sample_placeholder = next((k for k in local_tag_map.keys() if not k.startswith("__")), "[[0]]")
-        current_format = detect_format_from_placeholder(sample_placeholder)
-
-    # Set appropriate pattern and placeholder functions based on format
-    if current_format == "id":
-        pattern = r'\[id(\d+)\]'
-        prefix = "[id"
-        suffix = "]"
-    elif current_format == "slash":
-        pattern = r'/(\d+)(?!/)'
-        prefix = "/"
-        suffix = ""
-    elif current_format == "dollar":
-        pattern = r'\$(\d+)\$'
-        prefix = "$"
-        suffix = "$"
-    elif current_format == "simple":
-        pattern = r'(?<!\[)\[(\d+)\](?!\])'
-        prefix = "["
-        suffix = "]"
-    else:  # safe
-        pattern = r'\[\[(\d+)\]\]'
-        prefix = "[["
-        suffix = "]]"
-
-    def make_placeholder(i):
-        return f"{prefix}{i}{suffix}"
-
-    # 1. Find correct placeholders present
-    found_correct = re.findall(pattern, translated_text)
-    # Extract indices from found placeholders
-    found_indices = [int(num_str) for num_str in found_correct]
+        sample_placeholder = next((k for k in local_tag_map.keys() if not k.startswith("__")), None)
+        if sample_placeholder:
+            placeholder_format = PlaceholderFormat.from_placeholder(sample_placeholder)
+    if placeholder_format is None:
+        placeholder_format = PlaceholderFormat.from_config()
+
+    make_placeholder = placeholder_format.create
+
+    # 1. Find correct placeholders present (single scan)
+    scan = placeholder_format.scan(translated_text)
+    found_count = len(scan)
+    found_set = set(scan.indices)
     expected_indices = set(range(expected_count))
 
     # 2. Detect missing placeholders
-    found_set = set(found_indices)
-    missing = expected_indices - found_set
+    missing = scan.missing(expected_count)
     if missing:
-        missing_str = ", ".join(make_placeholder(i) for i in sorted(missing))
+        missing_str = ", ".join(make_placeholder(i) for i in missing)
         errors.append(f"- Missing placeholders: {missing_str}")
 
     # 3. Detect duplicates
-    counts = Counter(found_indices)
-    duplicates = {idx: count for idx, count in counts.items() if count > 1}
-    if duplicates:
-        for idx, count in duplicates.items():
-            errors.append(f"- Duplicate: {make_placeholder(idx)} appears {count} times (should appear once)")
+    for idx, count in scan.duplicates().items():
+        errors.append(f"- Duplicate: {make_placeholder(idx)} appears {count} times (should appear once)")
 
     # 4. Check order
-    if found_indices != sorted(found_indices):
+    if not scan.is_ordered():
         errors.append("- Out of order: placeholders are not in sequential order")
 
     # 5. Count summary
-    if len(found_correct) != expected_count:
-        errors.append(f"- Count mismatch: Expected {expected_count} placeholders, found {len(found_correct)}")
+    if found_count != expected_count:
+        errors.append(f"- Count mismatch: Expected {expected_count} placeholders, found {found_count}")
 
     # 6. Position hint - if count matches but indices don't, placeholders are shifted
-    if len(found_correct) == expected_count and found_set != expected_indices:
+    if found_count == expected_count and found_set != expected_indices:
         # Some placeholders have wrong indices (shifted)
-        wrong_indices = found_set - expected_indices
+        wrong_indices = scan.extra(expected_count)
         if wrong_indices:
-            wrong_str = ", ".join(make_placeholder(i) for i in sorted(wrong_indices))
+            wrong_str = ", ".join(make_placeholder(i) for i in wrong_indices)
             errors.append(f"- Wrong indices used: {wrong_str} (should be {make_placeholder(0)} to {make_placeholder(expected_count - 1)})")
 
     if errors:
@@ -316,12 +301,10 @@ async def attempt_placeholder_correction(
 
             # Set context from manager if available
             if context_manager and hasattr(llm_client, 'context_window'):
-                new_ctx = context_manager.get_context_size()
-                if llm_client.context_window != new_ctx:
-                    if log_callback:
-                        log_callback("context_update",
-                            f"📐 Correction: Updating context window: {llm_client.context_window} → {new_ctx}")
-                llm_client.context_window = new_ctx
+                old_ctx = context_manager.apply_to_client(llm_client)
+                if old_ctx is not None and log_callback:
+                    log_callback("context_update",
+                        f"📐 Correction: Updating context window: {old_ctx} → {context_manager.get_context_size()}")
 
             llm_response = await llm_client.make_request(
                 prompt_pair.user,
@@ -331,6 +314,9 @@ async def attempt_placeholder_correction(
             if llm_response is None:
                 return translated_text, False
 
+            if context_manager:
+                context_manager.record_load_duration(llm_response.load_duration)
+
             # Check if we should retry with larger context (adaptive strategy)
             if context_manager and llm_response.was_truncated:
                 if context_manager.should_retry_with_larger_context(
@@ -381,6 +367,7 @@ async def attempt_placeholder_correction(
     return translated_text, False
 
 
+@traced("epub.chunk")
 async def translate_chunk_with_fallback(
     chunk_text: str,
     local_tag_map: Dict[str, str],
@@ -393,7 +380,8 @@ async def translate_chunk_with_fallback(
     log_callback: Optional[Callable] = None,
     max_retries: int = 1,
     context_manager: Optional[AdaptiveContextManager] = None,
-    placeholder_format: Optional[Tuple[str, str]] = None
+    placeholder_format: Optional[Tuple[str, str]] = None,
+    packed_translations: Optional[Dict[str, str]] = None
 ) -> str:
     """
     Translate a chunk with retry mechanism.
@@ -415,6 +403,10 @@ async def translate_chunk_with_fallback(
         log_callback: Optional logging callback
         max_retries: Maximum translation retry attempts (default from config)
         context_manager: Optional AdaptiveContextManager for handling context overflow
+        placeholder_format: Optional (prefix, suffix) of the placeholders
+        packed_translations: Translations already obtained in a pack of small
+            chunks or in the offline batch (chunk text -> translation with
+            local placeholders)
 
     Returns:
         Translated text with global placeholders restored
@@ -425,6 +417,11 @@ async def translate_chunk_with_fallback(
     # Initialize placeholder manager
     placeholder_mgr = PlaceholderManager()
 
+    # Already translated (and validated) together with other small chunks
+    if packed_translations and chunk_text in packed_translations:
+        stats.successful_first_try += 1
+        return placeholder_mgr.restore_to_global(packed_translations[chunk_text], global_indices)
+
     # Calculate if this chunk has placeholders
     has_placeholders = len(local_tag_map) > 0
 
@@ -435,8 +432,11 @@ async def translate_chunk_with_fallback(
 
     for attempt in range(max_retries):
         # Only log retry attempts (not the first attempt)
-        if log_callback and attempt > 0:
-            log_callback("translation_attempt", f"🔄 Translation retry attempt {attempt + 1}/{max_retries}")
+        if attempt > 0:
+            if llm_client is not None:
+                llm_client.record_fallback("retry")
+            if log_callback:
+                log_callback("translation_attempt", f"🔄 Translation retry attempt {attempt + 1}/{max_retries}")
 
         # Send chunk as-is to LLM (already has local indices 0, 1, 2...)
         translated = await generate_translation_request(
@@ -459,8 +459,9 @@ async def translate_chunk_with_fallback(
             stats.retry_attempts += 1
             continue  # Try again
 
-        # Validate placeholders
-        validation_result = validate_placeholders(translated, local_tag_map)
+        # Validate placeholders (one scan shared with global index restoration)
+        scan = PlaceholderValidator.scan_for(translated, local_tag_map)
+        validation_result = validate_placeholders(translated, local_tag_map, scan=scan)
 
         if validation_result:
             # Success - restore to global indices
@@ -471,7 +472,7 @@ async def translate_chunk_with_fallback(
                 if log_callback:
                     log_callback("retry_success", f"✓ Translation succeeded after {attempt + 1} attempt(s)")
 
-            result = placeholder_mgr.restore_to_global(translated, global_indices)
+            result = placeholder_mgr.restore_to_global(translated, global_indices, scan=scan)
             return result
         else:
             # Track placeholder error
@@ -487,6 +488,8 @@ async def translate_chunk_with_fallback(
     if EPUB_TOKEN_ALIGNMENT_ENABLED:
         try:
             stats.token_alignment_used += 1  # Track Phase 2 usage
+            if llm_client is not None:
+                llm_client.record_fallback("token_alignment")
             if log_callback:
                 log_callback("phase2_warning",
                     f"⚠️ Placeholder validation failed after {max_retries} attempts - using fallback")
@@ -494,7 +497,6 @@ async def translate_chunk_with_fallback(
                     "💡 Tip: A more capable LLM model may better preserve placeholders and avoid layout issues")
 
             # 1. Extract clean text (without placeholders)
-            from src.common.placeholder_format import PlaceholderFormat
             fmt = PlaceholderFormat.from_config()
             clean_text = fmt.remove_all(chunk_text)
 
@@ -526,21 +528,23 @@ async def translate_chunk_with_fallback(
             # 4. Align and reinsert placeholders
             placeholders_list = list(local_tag_map.keys())  # ["[id0]", "[id1]", ...]
 
-            result_with_placeholders = translate_chunk_with_fallback._aligner.align_and_insert_placeholders(
-                original_with_placeholders=chunk_text,
-                translated_without_placeholders=translated_clean,
-                placeholders=placeholders_list
-            )
+            with span("epub.token_alignment", placeholders=len(placeholders_list)):
+                result_with_placeholders = translate_chunk_with_fallback._aligner.align_and_insert_placeholders(
+                    original_with_placeholders=chunk_text,
+                    translated_without_placeholders=translated_clean,
+                    placeholders=placeholders_list
+                )
 
             # 5. Validate (should always pass, but check anyway)
-            if validate_placeholders(result_with_placeholders, local_tag_map):
+            scan = PlaceholderValidator.scan_for(result_with_placeholders, local_tag_map)
+            if validate_placeholders(result_with_placeholders, local_tag_map, scan=scan):
                 stats.token_alignment_success += 1  # Track Phase 2 success
                 if log_callback:
                     log_callback("phase2_success", f"✓ Phase 2 successful: Token alignment repositioned {len(placeholders_list)} tags")
                     log_callback("phase2_warning", "⚠️ Note: Proportional repositioning may cause minor layout imperfections")
 
                 # 6. Restore global indices and return
-                result = placeholder_mgr.restore_to_global(result_with_placeholders, global_indices)
+                result = placeholder_mgr.restore_to_global(result_with_placeholders, global_indices, scan=scan)
                 return result
             else:
                 _log_error(log_callback, "phase2_validation_failed", "✗ Phase 2 validation failed")
@@ -552,6 +556,8 @@ async def translate_chunk_with_fallback(
     # PHASE 3: UNTRANSLATED FALLBACK
     # ==========================================================================
     stats.fallback_used += 1
+    if llm_client is not None:
+        llm_client.record_fallback("untranslated")
 
     _log_error(log_callback, "fallback_untranslated",
         "✗ Phase 3: All translation attempts failed - returning original untranslated text")
@@ -593,6 +599,7 @@ def _setup_translation(
     return body_html, body_element, tag_preserver
 
 
+@traced("epub.preserve_tags")
 def _preserve_tags(
     body_html: str,
     tag_preserver: TagPreserver,
@@ -630,6 +637,7 @@ def _preserve_tags(
     return text_with_placeholders, global_tag_map, placeholder_format
 
 
+@traced("epub.chunking")
 def _create_chunks(
     text: str,
     tag_map: Dict[str, str],
@@ -690,6 +698,7 @@ async def _translate_all_chunks_with_checkpoint(
     # Global statistics (for EPUB with multiple XHTML files)
     global_total_chunks: Optional[int] = None,
     global_completed_chunks: Optional[int] = None,
+    packed_translations: Optional[Dict[str, str]] = None,
 ) -> Tuple[List[str], TranslationMetrics, bool]:
     """
     Translate all chunks with checkpoint support.
@@ -724,6 +733,7 @@ async def _translate_all_chunks_with_checkpoint(
         original_chunks: Original chunks (for bilingual mode)
         global_total_chunks: Total chunks across all XHTML files (for EPUB)
         global_completed_chunks: Chunks completed in previous files (for EPUB)
+        packed_translations: Translations of small chunks done in packs
 
     Returns:
         Tuple of (translated_chunks, statistics, was_interrupted)
@@ -813,7 +823,8 @@ async def _translate_all_chunks_with_checkpoint(
             log_callback=log_callback,
             max_retries=max_retries,
             context_manager=context_manager,
-            placeholder_format=placeholder_format
+            placeholder_format=placeholder_format,
+            packed_translations=packed_translations
         )
         translated_chunks.append(translated)
 
@@ -953,6 +964,7 @@ async def _translate_all_chunks(
     return translated_chunks, stats
 
 
+@traced("epub.reconstruct")
 def _reconstruct_html(
     translated_chunks: List[str],
     global_tag_map: Dict[str, str],
@@ -1004,6 +1016,7 @@ def _reconstruct_html(
         return final_html
 
 
+@traced("epub.replace_body")
 def _replace_body(
     body_element: etree._Element,
     new_html: str,
@@ -1166,9 +1179,7 @@ async def _refine_epub_chunks(
 
             # Set context from manager if available
             if context_manager and hasattr(llm_client, 'context_window'):
-                new_ctx = context_manager.get_context_size()
-                if llm_client.context_window != new_ctx:
-                    llm_client.context_window = new_ctx
+                context_manager.apply_to_client(llm_client)
 
             import time
             start_time = time.time()
@@ -1177,12 +1188,17 @@ async def _refine_epub_chunks(
             )
             execution_time = time.time() - start_time
 
+            if context_manager and llm_response:
+                context_manager.record_load_duration(llm_response.load_duration)
+
             # Log the response (like translation does)
             if log_callback and llm_response:
                 log_callback("llm_response", "LLM Response received", data={
                     'type': 'llm_response',
                     'response': llm_response.content,
                     'execution_time': execution_time,
+                    'time_to_first_token': llm_response.time_to_first_token,
+                    'tokens_per_second': llm_response.tokens_per_second,
                     'model': model_name,
                     'tokens': {
                         'prompt': llm_response.prompt_tokens,
@@ -1254,6 +1270,7 @@ async def translate_xhtml_simplified(
     # Global statistics (for EPUB with multiple XHTML files)
     global_total_chunks: Optional[int] = None,
     global_completed_chunks: Optional[int] = None,
+    packed_translations: Optional[Dict[str, str]] = None,
 ) -> Tuple[bool, 'TranslationMetrics']:
     """
     Translate an XHTML document using the simplified approach.
@@ -1287,6 +1304,8 @@ async def translate_xhtml_simplified(
         check_interruption_callback: Optional callback to check if translation should be interrupted
         resume_state: Optional XHTMLTranslationState to resume from partial progress
         stats_callback: Optional callback for stats updates during translation
+        packed_translations: Translations of small chunks done in packs
+            or of chunks done in the offline batch (chunk text -> translation)
 
     Returns:
         Tuple of (success: bool, stats: TranslationMetrics)
@@ -1423,6 +1442,7 @@ async def translate_xhtml_simplified(
         original_chunks=original_chunks,
         global_total_chunks=global_total_chunks,
         global_completed_chunks=global_completed_chunks,
+        packed_translations=packed_translations,
     )
 
     # If interrupted, return without reconstruction
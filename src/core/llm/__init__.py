@@ -4,10 +4,10 @@ LLM Provider System
 This package provides a modular system for interacting with various LLM providers.
 
 Public API:
-    - Exceptions: ContextOverflowError, RepetitionLoopError
+    - Exceptions: ContextOverflowError, RepetitionLoopError, BatchAPIError
     - Base classes: LLMProvider, LLMResponse
     - Thinking system: ThinkingBehavior, get_thinking_behavior_sync, get_model_warning_message, detect_repetition_loop
-    - Utilities: ContextDetector, TranslationExtractor
+    - Utilities: ContextDetector, TranslationExtractor, BatchAPIClient
     - Providers: OllamaProvider, OpenAICompatibleProvider, OpenRouterProvider, GeminiProvider
     - Factory: create_llm_provider
 
@@ -18,7 +18,7 @@ Example usage:
 """
 
 # Exceptions
-from .exceptions import ContextOverflowError, RepetitionLoopError
+from .exceptions import ContextOverflowError, RepetitionLoopError, BatchAPIError
 
 # Base classes
 from .base import LLMProvider, LLMResponse
@@ -31,6 +31,7 @@ from .thinking.detection import detect_repetition_loop
 # Utilities
 from .utils.context_detection import ContextDetector
 from .utils.extraction import TranslationExtractor
+from .batch_api import BatchAPIClient, BatchResult
 
 # Providers
 from .providers.ollama import OllamaProvider
@@ -45,6 +46,7 @@ __all__ = [
     # Exceptions
     'ContextOverflowError',
     'RepetitionLoopError',
+    'BatchAPIError',
 
     # Base
     'LLMProvider',
@@ -61,6 +63,8 @@ __all__ = [
     # Utilities
     'ContextDetector',
     'TranslationExtractor',
+    'BatchAPIClient',
+    'BatchResult',
 
     # Providers
     'OllamaProvider',
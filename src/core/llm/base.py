@@ -13,6 +13,7 @@ import httpx
 from src.config import TRANSLATE_TAG_IN, TRANSLATE_TAG_OUT, REQUEST_TIMEOUT
 from src.utils.telemetry import get_telemetry_headers
 from src.core.llm.utils.extraction import TranslationExtractor
+from src.core.llm.batch_api import BatchAPIClient
 
 
 @dataclass
@@ -24,6 +25,11 @@ class LLMResponse:
     context_used: int = 0  # Total context used (prompt + completion)
     context_limit: int = 0  # Context limit that was set for this request
     was_truncated: bool = False  # True if response was truncated due to context limit
+    cached_tokens: int = 0  # Prompt tokens served from the server's prefix cache
+    load_duration: float = 0.0  # Seconds the server spent loading the model (Ollama)
+    time_to_first_token: float = 0.0  # Seconds until the first streamed token (0 if unknown)
+    tokens_per_second: float = 0.0  # Generation speed after the first token (0 if unknown)
+    attempts: int = 1  # Attempts the provider made, retries included
 
 
 class LLMProvider(ABC):
@@ -74,6 +80,26 @@ class LLMProvider(ABC):
         """
         pass
 
+    async def warm_up(self) -> float:
+        """
+        Prepare the model before the first request (see OllamaProvider.warm_up).
+
+        Hosted APIs have nothing to load, so the default does nothing.
+
+        Returns:
+            Seconds the server spent loading the model
+        """
+        return 0.0
+
+    def batch_api(self) -> Optional[BatchAPIClient]:
+        """
+        Client for the provider's offline Batch API (see src.core.llm.batch_api).
+
+        Returns:
+            BatchAPIClient, or None if the provider has no Batch API
+        """
+        return None
+
     def extract_translation(self, response: str) -> Optional[str]:
         """
         Extract translation from response using configured tags with strict validation.
@@ -0,0 +1,245 @@
+"""
+Client for OpenAI-style Batch APIs.
+
+A batch is a JSONL file of requests ({"custom_id", "method", "url", "body"})
+uploaded to /files and submitted to /batches. Within the completion window
+the server answers with an output file of {"custom_id", "response":
+{"status_code", "body"}, "error"} lines, in any order, and an error file for
+the requests it couldn't run. Batches are billed at a discount and don't
+count against the online rate limits, which suits large jobs nobody is
+waiting on.
+
+OpenAI and several OpenAI-compatible servers (vLLM, ...) implement the API.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+import httpx
+
+from src.config import (
+    REQUEST_TIMEOUT,
+    BATCH_API_POLL_INTERVAL,
+    BATCH_API_COMPLETION_WINDOW,
+    BATCH_API_MAX_WAIT_HOURS
+)
+from src.utils import json_backend
+from src.utils.telemetry import get_telemetry_headers
+from .exceptions import BatchAPIError
+
+# Batch statuses after which nothing changes anymore
+BATCH_FINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+
+@dataclass
+class BatchResult:
+    """Answer to one request of a batch"""
+    custom_id: str
+    content: Optional[str] = None  # Message content when the request succeeded
+    error: Optional[str] = None  # Why the request failed otherwise
+
+
+def parse_result_line(line: str) -> Optional[BatchResult]:
+    """
+    Read one line of a batch output or error file.
+
+    Args:
+        line: JSONL line
+
+    Returns:
+        BatchResult, or None for blank or unreadable lines
+    """
+    try:
+        record = json_backend.loads(line)
+    except json_backend.JSONDecodeError:
+        return None
+    if not isinstance(record, dict) or not record.get("custom_id"):
+        return None
+
+    custom_id = record["custom_id"]
+    if record.get("error"):
+        error = record["error"]
+        return BatchResult(custom_id, error=error.get("message", str(error)) if isinstance(error, dict) else str(error))
+
+    response = record.get("response") or {}
+    status_code = response.get("status_code", 200)
+    body = response.get("body") or {}
+    if status_code >= 400:
+        error = body.get("error") or {}
+        message = error.get("message") if isinstance(error, dict) else error
+        return BatchResult(custom_id, error=f"HTTP {status_code}: {message or 'request failed'}")
+
+    choices = body.get("choices") or [{}]
+    content = (choices[0].get("message") or {}).get("content")
+    if not content:
+        return BatchResult(custom_id, error="empty response")
+    return BatchResult(custom_id, content=content)
+
+
+class BatchAPIClient:
+    """Submits chat completion requests as one batch and collects the answers"""
+
+    def __init__(self, chat_endpoint: str, build_body: Callable[[str, Optional[str]], Dict[str, Any]],
+                 api_key: Optional[str] = None, poll_interval: Optional[float] = None,
+                 max_wait: Optional[float] = None, completion_window: Optional[str] = None):
+        """
+        Args:
+            chat_endpoint: Online chat completions URL (e.g. https://api.openai.com/v1/chat/completions);
+                the files and batches routes live next to it
+            build_body: Builds the chat completion body of a (prompt, system_prompt) pair
+            api_key: Optional bearer token
+            poll_interval: Seconds between status checks (default: BATCH_API_POLL_INTERVAL)
+            max_wait: Seconds to wait before cancelling (default: BATCH_API_MAX_WAIT_HOURS)
+            completion_window: Requested completion window (default: BATCH_API_COMPLETION_WINDOW)
+        """
+        self.chat_endpoint = chat_endpoint.rstrip("/")
+        self.base_url = self.chat_endpoint.rsplit("/chat/completions", 1)[0]
+        # Request URL of each batch line, relative to the server root
+        self.chat_path = urlparse(self.chat_endpoint).path or "/v1/chat/completions"
+        self.build_body = build_body
+        self.api_key = api_key
+        self.poll_interval = BATCH_API_POLL_INTERVAL if poll_interval is None else poll_interval
+        self.max_wait = BATCH_API_MAX_WAIT_HOURS * 3600 if max_wait is None else max_wait
+        self.completion_window = completion_window or BATCH_API_COMPLETION_WINDOW
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Get or create the HTTP client"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(REQUEST_TIMEOUT),
+                headers=get_telemetry_headers()
+            )
+        return self._client
+
+    async def close(self):
+        """Close the HTTP client"""
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+
+    def _headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+
+    async def _request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        client = await self._get_client()
+        try:
+            response = await client.request(method, f"{self.base_url}{path}",
+                                            headers=self._headers(), **kwargs)
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            raise BatchAPIError(f"{method} {path} failed with HTTP {e.response.status_code}: "
+                                f"{e.response.text[:200]}") from e
+        except httpx.HTTPError as e:
+            raise BatchAPIError(f"{method} {path} failed: {e}") from e
+        return response
+
+    def request_line(self, custom_id: str, prompt: str, system_prompt: Optional[str] = None) -> Dict[str, Any]:
+        """Batch line of one chat completion request"""
+        return {
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": self.chat_path,
+            "body": self.build_body(prompt, system_prompt)
+        }
+
+    async def upload(self, lines: List[Dict[str, Any]]) -> str:
+        """Upload the batch input file and return its id"""
+        content = "".join(json_backend.dumps(line) + "\n" for line in lines).encode("utf-8")
+        response = await self._request(
+            "POST", "/files",
+            data={"purpose": "batch"},
+            files={"file": ("batch.jsonl", content, "application/jsonl")}
+        )
+        return response.json()["id"]
+
+    async def create(self, input_file_id: str) -> Dict[str, Any]:
+        """Submit an uploaded input file as a batch"""
+        response = await self._request("POST", "/batches", json={
+            "input_file_id": input_file_id,
+            "endpoint": self.chat_path,
+            "completion_window": self.completion_window
+        })
+        return response.json()
+
+    async def retrieve(self, batch_id: str) -> Dict[str, Any]:
+        """Current state of a batch"""
+        return (await self._request("GET", f"/batches/{batch_id}")).json()
+
+    async def cancel(self, batch_id: str) -> None:
+        """Cancel a batch (ignoring errors: it may just have finished)"""
+        try:
+            await self._request("POST", f"/batches/{batch_id}/cancel")
+        except BatchAPIError:
+            pass
+
+    async def download(self, file_id: str) -> str:
+        """Content of an output or error file"""
+        return (await self._request("GET", f"/files/{file_id}/content")).text
+
+    async def run(
+        self,
+        lines: List[Dict[str, Any]],
+        log_callback: Optional[Callable] = None,
+        check_interruption_callback: Optional[Callable] = None
+    ) -> Dict[str, BatchResult]:
+        """
+        Submit the requests as one batch, wait for it and read the answers.
+
+        Args:
+            lines: Batch lines (see request_line)
+            log_callback: Optional logging callback
+            check_interruption_callback: Optional interruption check, run at every poll
+
+        Returns:
+            Map of custom_id to result; requests without an answer are missing
+
+        Raises:
+            BatchAPIError: If the batch can't be submitted, fails, expires,
+                takes longer than max_wait or is interrupted
+        """
+        input_file_id = await self.upload(lines)
+        batch = await self.create(input_file_id)
+        batch_id = batch["id"]
+        if log_callback:
+            log_callback("batch_api_submitted",
+                         f"📤 Submitted {len(lines)} requests as batch {batch_id} "
+                         f"(completion window {self.completion_window})")
+
+        started = time.monotonic()
+        status = batch.get("status")
+        while status not in BATCH_FINAL_STATUSES:
+            if check_interruption_callback and check_interruption_callback():
+                await self.cancel(batch_id)
+                raise BatchAPIError(f"Batch {batch_id} cancelled: job interrupted")
+            if time.monotonic() - started > self.max_wait:
+                await self.cancel(batch_id)
+                raise BatchAPIError(f"Batch {batch_id} still {status} after {self.max_wait:.0f}s, cancelled")
+
+            await asyncio.sleep(self.poll_interval)
+            batch = await self.retrieve(batch_id)
+            if batch.get("status") != status:
+                status = batch.get("status")
+                counts = batch.get("request_counts") or {}
+                if log_callback:
+                    log_callback("batch_api_status",
+                                 f"Batch {batch_id}: {status} "
+                                 f"({counts.get('completed', 0)}/{counts.get('total', len(lines))} done)")
+
+        # An expired or cancelled batch still returns the requests it completed
+        results: Dict[str, BatchResult] = {}
+        for file_key in ("error_file_id", "output_file_id"):
+            if batch.get(file_key):
+                for line in (await self.download(batch[file_key])).splitlines():
+                    result = parse_result_line(line)
+                    if result:
+                        results[result.custom_id] = result
+
+        if status != "completed" and not results:
+            errors = (batch.get("errors") or {}).get("data") or []
+            detail = "; ".join(error.get("message", "") for error in errors if isinstance(error, dict))
+            raise BatchAPIError(f"Batch {batch_id} {status}" + (f": {detail}" if detail else ""))
+        return results
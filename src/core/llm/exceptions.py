@@ -24,3 +24,13 @@ class RepetitionLoopError(Exception):
     context window or encountered an issue.
     """
     pass
+
+
+class BatchAPIError(Exception):
+    """
+    Raised when an offline batch can't be submitted or doesn't complete.
+
+    The batch failed validation, expired, was cancelled, or the Batch API
+    answered with an error; its requests should be sent online instead.
+    """
+    pass
@@ -10,13 +10,25 @@ Features:
     - Efficient batch processing
 """
 
-from typing import Optional
+from typing import Dict, Optional, Tuple
+import hashlib
 import httpx
 import asyncio
-
-from src.config import REQUEST_TIMEOUT, MAX_TRANSLATION_ATTEMPTS
+import time
+
+from src.config import (
+    REQUEST_TIMEOUT,
+    MAX_TRANSLATION_ATTEMPTS,
+    PROMPT_CACHE_HINTS,
+    GEMINI_CACHE_TTL_SECONDS
+)
 from ..base import LLMProvider, LLMResponse
-from ..exceptions import ContextOverflowError
+from ..exceptions import ContextOverflowError, RepetitionLoopError
+from ..utils.streaming import StreamMonitor, iter_sse_events, output_token_ceiling, raise_for_stream_status
+
+# A cache is recreated this long before its TTL runs out (capped at a fifth
+# of the TTL), so no request is sent with a cache about to expire
+CACHE_RENEWAL_MARGIN_SECONDS = 60
 
 
 class GeminiProvider(LLMProvider):
@@ -56,6 +68,68 @@ class GeminiProvider(LLMProvider):
         super().__init__(model)
         self.api_key = api_key
         self.api_endpoint = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent"
+        self.stream_endpoint = (
+            f"https://generativelanguage.googleapis.com/v1beta/models/{model}:streamGenerateContent?alt=sse"
+        )
+        # (cachedContents resource name, expiry on time.monotonic()) per system
+        # prompt hash; the name is None when caching was refused
+        self._cached_contents: Dict[str, Tuple[Optional[str], float]] = {}
+
+    @staticmethod
+    def _cache_key(system_prompt: str) -> str:
+        return hashlib.sha256(system_prompt.encode('utf-8')).hexdigest()
+
+    async def _get_cached_content(self, system_prompt: str) -> Optional[str]:
+        """
+        Create an explicit context cache holding the system prompt.
+
+        The cache is reused until shortly before GEMINI_CACHE_TTL_SECONDS
+        runs out, then a new one is created. Gemini rejects caches below a
+        model-dependent minimum size; the refusal is remembered so the
+        request falls back to a plain systemInstruction without retrying
+        the cache every chunk.
+
+        Args:
+            system_prompt: System prompt to cache
+
+        Returns:
+            cachedContents resource name, or None if caching is unavailable
+        """
+        key = self._cache_key(system_prompt)
+        if key in self._cached_contents:
+            name, expires_at = self._cached_contents[key]
+            if name is None or time.monotonic() < expires_at:
+                return name
+
+        payload = {
+            "model": f"models/{self.model}",
+            "systemInstruction": {"parts": [{"text": system_prompt}]},
+            "ttl": f"{GEMINI_CACHE_TTL_SECONDS}s"
+        }
+        name = None
+        created_at = time.monotonic()
+        client = await self._get_client()
+        try:
+            response = await client.post(
+                "https://generativelanguage.googleapis.com/v1beta/cachedContents",
+                headers={"Content-Type": "application/json", "x-goog-api-key": self.api_key},
+                json=payload,
+                timeout=30
+            )
+            response.raise_for_status()
+            name = response.json().get("name")
+        except (httpx.HTTPError, ValueError) as e:
+            print(f"Gemini context cache unavailable, using systemInstruction: {e}")
+
+        margin = min(CACHE_RENEWAL_MARGIN_SECONDS, GEMINI_CACHE_TTL_SECONDS / 5)
+        self._cached_contents[key] = (name, created_at + GEMINI_CACHE_TTL_SECONDS - margin)
+        return name
+
+    @staticmethod
+    def _is_cache_rejection(status_code: int, error_body: str) -> bool:
+        """Whether a request was rejected because its cachedContent is unknown or expired."""
+        body = error_body.lower()
+        return status_code in (400, 403, 404) and ("cachedcontent" in body or "cached content" in body)
 
     async def get_available_models(self) -> list[dict]:
         """
@@ -130,6 +204,7 @@ class GeminiProvider(LLMProvider):
             "x-goog-api-key": self.api_key
         }
 
+        max_tokens = output_token_ceiling(self.model)
         payload = {
             "contents": [{
                 "role": "user",
@@ -138,13 +213,20 @@ class GeminiProvider(LLMProvider):
                 }]
             }],
             "generationConfig": {
-                "temperature": 0.7,
-                "maxOutputTokens": 2048
+                "temperature": 0.7
             }
         }
+        # No ceiling for thinking models (see output_token_ceiling)
+        if max_tokens is not None:
+            payload["generationConfig"]["maxOutputTokens"] = max_tokens
 
         # Add system instruction if provided (Gemini API supports systemInstruction field)
-        if system_prompt:
+        cached_content = None
+        if system_prompt and PROMPT_CACHE_HINTS:
+            cached_content = await self._get_cached_content(system_prompt)
+        if cached_content:
+            payload["cachedContent"] = cached_content
+        elif system_prompt:
             payload["systemInstruction"] = {
                 "parts": [{
                     "text": system_prompt
@@ -152,43 +234,60 @@ class GeminiProvider(LLMProvider):
             }
 
         client = await self._get_client()
-        for attempt in range(MAX_TRANSLATION_ATTEMPTS):
+        attempt = 0
+        while attempt < MAX_TRANSLATION_ATTEMPTS:
             try:
-                response = await client.post(
-                    self.api_endpoint,
-                    headers=headers,
-                    json=payload,
-                    timeout=timeout
-                )
-                response.raise_for_status()
-
-                response_json = response.json()
-                # Extract text from Gemini response structure
-                response_text = ""
-                if "candidates" in response_json and response_json["candidates"]:
-                    content = response_json["candidates"][0].get("content", {})
-                    parts = content.get("parts", [])
-                    if parts:
-                        response_text = parts[0].get("text", "")
+                monitor = StreamMonitor(max_tokens)
+                usage_metadata = {}
+                finish_reason = None
+                abort_reason = None
+
+                async with client.stream("POST", self.stream_endpoint, headers=headers,
+                                         json=payload, timeout=timeout) as response:
+                    await raise_for_stream_status(response)
+                    async for event in iter_sse_events(response):
+                        # Each event is a partial GenerateContentResponse; the last one has the totals
+                        usage_metadata = event.get("usageMetadata") or usage_metadata
+                        candidates = event.get("candidates") or [{}]
+                        finish_reason = candidates[0].get("finishReason") or finish_reason
+                        for part in candidates[0].get("content", {}).get("parts", []):
+                            if part.get("thought"):
+                                continue
+                            abort_reason = monitor.feed(part.get("text", ""))
+                            if abort_reason:
+                                break
+                        if abort_reason:
+                            break
+                monitor.finish()
+
+                if abort_reason:
+                    raise RepetitionLoopError(f"Stream aborted: {abort_reason}")
 
                 # Extract token usage if available
-                usage_metadata = response_json.get("usageMetadata", {})
                 prompt_tokens = usage_metadata.get("promptTokenCount", 0)
-                completion_tokens = usage_metadata.get("candidatesTokenCount", 0)
+                completion_tokens = usage_metadata.get("candidatesTokenCount", 0) or monitor.estimated_tokens
 
                 return LLMResponse(
-                    content=response_text,
+                    content=monitor.text,
                     prompt_tokens=prompt_tokens,
                     completion_tokens=completion_tokens,
                     context_used=prompt_tokens + completion_tokens,
                     context_limit=0,  # Gemini manages context internally
-                    was_truncated=False
+                    was_truncated=finish_reason == "MAX_TOKENS",
+                    cached_tokens=usage_metadata.get("cachedContentTokenCount", 0),
+                    time_to_first_token=monitor.time_to_first_token,
+                    tokens_per_second=monitor.tokens_per_second(completion_tokens),
+                    attempts=attempt + 1
                 )
 
+            except RepetitionLoopError:
+                raise
+
             except httpx.TimeoutException as e:
                     print(f"Gemini API Timeout (attempt {attempt + 1}/{MAX_TRANSLATION_ATTEMPTS}): {e}")
                     if attempt < MAX_TRANSLATION_ATTEMPTS - 1:
                         await asyncio.sleep(2)
+                        attempt += 1
                         continue
                     return None
             except httpx.HTTPStatusError as e:
@@ -198,6 +297,16 @@ class GeminiProvider(LLMProvider):
                         error_body = e.response.text[:500]
                         error_message = f"{e} - {error_body}"
 
+                    if cached_content and self._is_cache_rejection(e.response.status_code, error_body):
+                        # The cache expired or was deleted: forget it (the next request
+                        # creates a new one) and resend with the system prompt inline
+                        print(f"Gemini context cache {cached_content} rejected, using systemInstruction")
+                        self._cached_contents.pop(self._cache_key(system_prompt), None)
+                        cached_content = None
+                        del payload["cachedContent"]
+                        payload["systemInstruction"] = {"parts": [{"text": system_prompt}]}
+                        continue
+
                     print(f"Gemini API HTTP Error (attempt {attempt + 1}/{MAX_TRANSLATION_ATTEMPTS}): {e}")
                     if error_body:
                         print(f"Response details: Status {e.response.status_code}, Body: {error_body[:200]}...")
@@ -210,12 +319,14 @@ class GeminiProvider(LLMProvider):
 
                     if attempt < MAX_TRANSLATION_ATTEMPTS - 1:
                         await asyncio.sleep(2)
+                        attempt += 1
                         continue
                     return None
             except Exception as e:
                     print(f"Gemini API Error (attempt {attempt + 1}/{MAX_TRANSLATION_ATTEMPTS}): {e}")
                     if attempt < MAX_TRANSLATION_ATTEMPTS - 1:
                         await asyncio.sleep(2)
+                        attempt += 1
                         continue
                     return None
 
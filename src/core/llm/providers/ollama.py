@@ -9,6 +9,7 @@ from typing import Optional, Callable
 import asyncio
 import json
 import re
+import time
 import httpx
 
 from ..base import LLMProvider, LLMResponse
@@ -17,12 +18,14 @@ from ..thinking.cache import get_thinking_cache
 from ..thinking.detection import detect_repetition_loop
 from ..thinking.behavior import ThinkingBehavior, _model_matches_pattern
 from ..utils.context_detection import ContextDetector
+from src.utils import json_backend
 
 from src.config import (
     API_ENDPOINT,
     DEFAULT_MODEL,
     REQUEST_TIMEOUT,
     OLLAMA_NUM_CTX,
+    OLLAMA_KEEP_ALIVE,
     MAX_TRANSLATION_ATTEMPTS,
     UNCONTROLLABLE_THINKING_MODELS,
     CONTROLLABLE_THINKING_MODELS,
@@ -30,6 +33,14 @@ from src.config import (
 )
 
 
+def _keep_alive_value(keep_alive: str):
+    """OLLAMA_KEEP_ALIVE as sent to Ollama: plain numbers are seconds, others durations ("30m")."""
+    try:
+        return int(keep_alive)
+    except ValueError:
+        return keep_alive
+
+
 class OllamaProvider(LLMProvider):
     """Ollama API provider - uses /api/chat for proper think parameter support"""
 
@@ -39,10 +50,16 @@ class OllamaProvider(LLMProvider):
         # Convert /api/generate endpoint to /api/chat for proper think support
         self.api_endpoint = api_endpoint.replace('/api/generate', '/api/chat')
         self.context_window = context_window
+        # num_ctx of the last request the server accepted (the size the model is loaded at)
+        self.loaded_context: Optional[int] = None
         self.log_callback = log_callback
         # Will be detected on first request via _detect_thinking_behavior()
         self._thinking_behavior: Optional[ThinkingBehavior] = None
         self._supports_think_param: bool = True
+        # Warm-up and the first request share a single detection
+        self._thinking_lock = asyncio.Lock()
+        self.keep_alive = _keep_alive_value(OLLAMA_KEEP_ALIVE) if OLLAMA_KEEP_ALIVE else None
+        self._context_detector = ContextDetector()
         # Quick check against known model lists (fallback if detection fails)
         self._known_uncontrollable = any(_model_matches_pattern(model, tm) for tm in UNCONTROLLABLE_THINKING_MODELS)
         self._known_controllable = any(_model_matches_pattern(model, tm) for tm in CONTROLLABLE_THINKING_MODELS)
@@ -73,12 +90,16 @@ class OllamaProvider(LLMProvider):
         """
         test_prompt = "What is 2+2? Reply with just the number."
 
+        # Same num_ctx as the translation requests, so the probe's model load
+        # is the one the job keeps using
         payload = {
             "model": self.model,
             "messages": [{"role": "user", "content": test_prompt}],
             "stream": False,
-            "options": {"num_ctx": 2048},
+            "options": {"num_ctx": self.context_window},
         }
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
 
         if think_param is not None:
             payload["think"] = think_param
@@ -86,6 +107,7 @@ class OllamaProvider(LLMProvider):
         client = await self._get_client()
         response = await client.post(self.api_endpoint, json=payload, timeout=60)
         response.raise_for_status()
+        self.loaded_context = payload["options"]["num_ctx"]
         data = response.json()
 
         message = data.get("message", {})
@@ -115,6 +137,7 @@ class OllamaProvider(LLMProvider):
         cache = get_thinking_cache()
         cached = cache.get(self.model, self.api_endpoint)
         if cached:
+            self._supports_think_param = cache.supports_think_param(self.model, self.api_endpoint) is not False
             if self.log_callback:
                 self.log_callback("info", f"[MODEL] {self.model}: {cached.value} (from cache)")
             return cached
@@ -128,39 +151,36 @@ class OllamaProvider(LLMProvider):
             cache.set(self.model, known_behavior, True, self.api_endpoint)
             return known_behavior
 
-        # Need to run dynamic tests (slow - 3 LLM requests)
+        # Need to run dynamic tests (3 LLM requests, sent concurrently)
         if self.log_callback:
             self.log_callback("info", f"[MODEL] {self.model}: Testing thinking behavior (first time)...")
 
         try:
-            # Test 1: Without think parameter (baseline)
-            field_none, tags_none, _ = await self._test_thinking(think_param=None)
-            thinks_without_param = field_none or tags_none
+            # Test 1: without think parameter (baseline)
+            # Test 2: with think=true (does model support thinking?)
+            # Test 3: with think=false (can we disable thinking?)
+            baseline, enabled, disabled = await asyncio.gather(
+                self._test_thinking(think_param=None),
+                self._test_thinking(think_param=True),
+                self._test_thinking(think_param=False),
+                return_exceptions=True
+            )
+            if isinstance(baseline, BaseException):
+                raise baseline
+            thinks_without_param = baseline[0] or baseline[1]
 
-            # Test 2: With think=true (does model support thinking?)
-            try:
-                field_true, tags_true, _ = await self._test_thinking(think_param=True)
-                thinks_when_enabled = field_true or tags_true
-            except httpx.HTTPStatusError as e:
-                if e.response.status_code == 400:
+            for result in (enabled, disabled):
+                if isinstance(result, httpx.HTTPStatusError) and result.response.status_code == 400:
                     # Model doesn't support think param
                     self._supports_think_param = False
-                    if thinks_without_param:
-                        return ThinkingBehavior.UNCONTROLLABLE
-                    return ThinkingBehavior.STANDARD
-                raise
-
-            # Test 3: With think=false (can we disable thinking?)
-            try:
-                field_false, tags_false, _ = await self._test_thinking(think_param=False)
-                thinks_when_disabled = field_false or tags_false
-            except httpx.HTTPStatusError as e:
-                if e.response.status_code == 400:
-                    self._supports_think_param = False
-                    if thinks_without_param:
-                        return ThinkingBehavior.UNCONTROLLABLE
-                    return ThinkingBehavior.STANDARD
-                raise
+                    behavior = (ThinkingBehavior.UNCONTROLLABLE if thinks_without_param
+                                else ThinkingBehavior.STANDARD)
+                    cache.set(self.model, behavior, False, self.api_endpoint)
+                    return behavior
+                if isinstance(result, BaseException):
+                    raise result
+            thinks_when_enabled = enabled[0] or enabled[1]
+            thinks_when_disabled = disabled[0] or disabled[1]
 
             # Classify based on test results
             if thinks_when_disabled:
@@ -191,6 +211,78 @@ class OllamaProvider(LLMProvider):
                 return ThinkingBehavior.CONTROLLABLE
             return ThinkingBehavior.STANDARD
 
+    async def _ensure_thinking_behavior(self) -> ThinkingBehavior:
+        """
+        Detect the thinking behavior once and report it.
+
+        Returns:
+            The model's ThinkingBehavior
+        """
+        async with self._thinking_lock:
+            if self._thinking_behavior is None:
+                self._thinking_behavior = await self._detect_thinking_behavior()
+
+                # Show warning only for uncontrollable thinking models
+                if self._thinking_behavior == ThinkingBehavior.UNCONTROLLABLE and self.log_callback:
+                    self._show_thinking_warning()
+                elif self._thinking_behavior == ThinkingBehavior.CONTROLLABLE and self.log_callback:
+                    GREEN = '\033[92m'
+                    RESET = '\033[0m'
+                    print(f"\n{GREEN}[MODEL] {self.model}: Controllable thinking model - using think=false{RESET}")
+                elif self._thinking_behavior == ThinkingBehavior.STANDARD and self.log_callback:
+                    GREEN = '\033[92m'
+                    RESET = '\033[0m'
+                    print(f"\n{GREEN}[MODEL] {self.model}: Standard model (no thinking){RESET}")
+        return self._thinking_behavior
+
+    def known_thinking_behavior(self) -> Optional[ThinkingBehavior]:
+        """
+        Thinking behavior known without sending a request.
+
+        Returns:
+            The detected behavior, else the cached one, else the one from the
+            known model lists, else None
+        """
+        if self._thinking_behavior is not None:
+            return self._thinking_behavior
+        cached = get_thinking_cache().get(self.model, self.api_endpoint)
+        return cached or self._check_known_model_lists()
+
+    async def preload(self) -> float:
+        """
+        Load the model without generating anything (Ollama preload request).
+
+        The request uses the current context_window as num_ctx, so the first
+        translation request finds the model loaded at the right size, and
+        OLLAMA_KEEP_ALIVE so it stays loaded between requests.
+
+        Returns:
+            Seconds the server spent loading the model (0 if it was loaded)
+        """
+        payload = {
+            "model": self.model,
+            "messages": [],
+            "options": {"num_ctx": self.context_window},
+        }
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
+
+        client = await self._get_client()
+        response = await client.post(self.api_endpoint, json=payload, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        self.loaded_context = payload["options"]["num_ctx"]
+        return response.json().get("load_duration", 0) / 1e9
+
+    async def warm_up(self) -> float:
+        """
+        Preload the model and detect its thinking behavior concurrently.
+
+        Returns:
+            Seconds the server spent loading the model
+        """
+        load_duration, _ = await asyncio.gather(self.preload(), self._ensure_thinking_behavior())
+        return load_duration
+
     def _show_thinking_warning(self):
         """Display warning for uncontrollable thinking models."""
         CYAN = '\033[96m'
@@ -248,21 +340,8 @@ class OllamaProvider(LLMProvider):
         Returns:
             LLMResponse with content and token usage info, or None if failed
         """
-        # Detect thinking behavior on first request
-        if self._thinking_behavior is None:
-            self._thinking_behavior = await self._detect_thinking_behavior()
-
-            # Show warning only for uncontrollable thinking models
-            if self._thinking_behavior == ThinkingBehavior.UNCONTROLLABLE and self.log_callback:
-                self._show_thinking_warning()
-            elif self._thinking_behavior == ThinkingBehavior.CONTROLLABLE and self.log_callback:
-                GREEN = '\033[92m'
-                RESET = '\033[0m'
-                print(f"\n{GREEN}[MODEL] {self.model}: Controllable thinking model - using think=false{RESET}")
-            elif self._thinking_behavior == ThinkingBehavior.STANDARD and self.log_callback:
-                GREEN = '\033[92m'
-                RESET = '\033[0m'
-                print(f"\n{GREEN}[MODEL] {self.model}: Standard model (no thinking){RESET}")
+        # Detect thinking behavior on first request (or wait for the warm-up's detection)
+        await self._ensure_thinking_behavior()
 
         # Build messages array for chat API
         messages = []
@@ -283,6 +362,8 @@ class OllamaProvider(LLMProvider):
                 "truncate": False
             },
         }
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
 
         # Only add think param if model supports it
         if self._supports_think_param:
@@ -299,8 +380,14 @@ class OllamaProvider(LLMProvider):
                 # Use streaming to monitor tokens in real-time
                 content_chunks = []
                 thinking_chunks = []
+                content_len = 0
+                thinking_len = 0
                 prompt_tokens = 0
                 completion_tokens = 0
+                load_duration_ns = 0
+                eval_duration_ns = 0
+                first_token_at = None
+                request_start = time.perf_counter()
                 exceeded_context = False
 
                 # Calculate safe limit for completion tokens
@@ -310,6 +397,7 @@ class OllamaProvider(LLMProvider):
 
                 async with client.stream("POST", self.api_endpoint, json=payload, timeout=timeout) as response:
                     response.raise_for_status()
+                    self.loaded_context = payload["options"]["num_ctx"]
 
                     try:
                         async for line in response.aiter_lines():
@@ -317,30 +405,33 @@ class OllamaProvider(LLMProvider):
                                 continue
 
                             try:
-                                chunk_data = json.loads(line)
-                            except json.JSONDecodeError:
+                                chunk = json_backend.decode_ollama_chunk(line)
+                            except json_backend.JSONDecodeError:
                                 continue
 
                             # Get prompt tokens from first chunk (Ollama sends this once)
-                            if chunk_data.get("prompt_eval_count"):
-                                prompt_tokens = chunk_data["prompt_eval_count"]
+                            if chunk.prompt_eval_count:
+                                prompt_tokens = chunk.prompt_eval_count
                                 # Recalculate max completion tokens based on actual prompt size
                                 max_completion_tokens = int((self.context_window - prompt_tokens) * 0.90)
 
                             # Accumulate content
-                            message = chunk_data.get("message", {})
-                            if message.get("content"):
-                                content_chunks.append(message["content"])
-                            if message.get("thinking"):
-                                thinking_chunks.append(message["thinking"])
+                            if first_token_at is None and (chunk.content or chunk.thinking):
+                                first_token_at = time.perf_counter()
+                            if chunk.content:
+                                content_chunks.append(chunk.content)
+                                content_len += len(chunk.content)
+                            if chunk.thinking:
+                                thinking_chunks.append(chunk.thinking)
+                                thinking_len += len(chunk.thinking)
 
                             # Update completion token count
-                            if chunk_data.get("eval_count"):
-                                completion_tokens = chunk_data["eval_count"]
+                            if chunk.eval_count:
+                                completion_tokens = chunk.eval_count
 
                             # Check for context overflow during streaming
                             # This catches the case where Ollama keeps generating past the limit
-                            current_completion_len = len("".join(content_chunks)) + len("".join(thinking_chunks))
+                            current_completion_len = content_len + thinking_len
 
                             # Heuristic: ~4 chars per token on average
                             estimated_tokens = current_completion_len // 3
@@ -355,14 +446,11 @@ class OllamaProvider(LLMProvider):
                                 break
 
                             # Also check for repetition in real-time during streaming
-                            current_content = "".join(content_chunks)
-                            current_thinking = "".join(thinking_chunks)
-
                             # Only check periodically (every ~500 chars) to avoid overhead
                             # Use streaming thresholds (slightly more sensitive for early detection)
-                            if len(current_content) > 500 and len(current_content) % 500 < 50:
+                            if content_len > 500 and content_len % 500 < 50:
                                 if detect_repetition_loop(
-                                    current_content,
+                                    "".join(content_chunks),
                                     min_repetitions=REPETITION_MIN_COUNT_STREAMING,
                                     is_thinking_content=False
                                 ):
@@ -374,9 +462,9 @@ class OllamaProvider(LLMProvider):
                                     break
 
                             # For thinking content, use more lenient detection
-                            if len(current_thinking) > 800 and len(current_thinking) % 500 < 50:
+                            if thinking_len > 800 and thinking_len % 500 < 50:
                                 if detect_repetition_loop(
-                                    current_thinking,
+                                    "".join(thinking_chunks),
                                     min_repetitions=REPETITION_MIN_COUNT_STREAMING,
                                     is_thinking_content=True
                                 ):
@@ -388,10 +476,13 @@ class OllamaProvider(LLMProvider):
                                     break
 
                             # Check if stream is done
-                            if chunk_data.get("done"):
+                            if chunk.done:
                                 # Get final token counts
-                                prompt_tokens = chunk_data.get("prompt_eval_count", prompt_tokens)
-                                completion_tokens = chunk_data.get("eval_count", completion_tokens)
+                                prompt_tokens = chunk.prompt_eval_count or prompt_tokens
+                                completion_tokens = chunk.eval_count or completion_tokens
+                                # Non-zero when this request (re)loaded the model, e.g. after a num_ctx change
+                                load_duration_ns = chunk.load_duration
+                                eval_duration_ns = chunk.eval_duration
                                 break
                     finally:
                         # Ensure the stream is properly closed and all data is consumed
@@ -488,7 +579,11 @@ class OllamaProvider(LLMProvider):
                     completion_tokens=effective_completion_tokens,  # Use effective count (includes thinking estimate)
                     context_used=context_used,
                     context_limit=self.context_window,
-                    was_truncated=was_truncated
+                    was_truncated=was_truncated,
+                    load_duration=load_duration_ns / 1e9,
+                    time_to_first_token=first_token_at - request_start if first_token_at else 0.0,
+                    tokens_per_second=completion_tokens / (eval_duration_ns / 1e9) if eval_duration_ns else 0.0,
+                    attempts=attempt + 1
                 )
 
             except httpx.TimeoutException as e:
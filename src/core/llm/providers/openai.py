@@ -11,13 +11,17 @@ import json
 import httpx
 
 from ..base import LLMProvider, LLMResponse
-from ..exceptions import ContextOverflowError
+from ..batch_api import BatchAPIClient
+from ..exceptions import ContextOverflowError, RepetitionLoopError
 from ..utils.context_detection import ContextDetector
+from ..utils.prompt_cache import openai_cached_tokens
+from ..utils.streaming import StreamMonitor, iter_sse_events, output_token_ceiling, raise_for_stream_status
 
 from src.config import (
     REQUEST_TIMEOUT,
     OLLAMA_NUM_CTX,
-    MAX_TRANSLATION_ATTEMPTS
+    MAX_TRANSLATION_ATTEMPTS,
+    PROMPT_CACHE_HINTS
 )
 
 
@@ -34,6 +38,51 @@ class OpenAICompatibleProvider(LLMProvider):
         self._detected_context_size: Optional[int] = None
         self._context_detector = ContextDetector()
 
+    def _chat_body(self, prompt: str, system_prompt: Optional[str], max_tokens: Optional[int]) -> dict:
+        """Chat completion request body shared by online and batch requests"""
+        # Build messages array with optional system prompt
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+
+        body = {
+            "model": self.model,
+            "messages": messages,
+            # Disable thinking/reasoning mode for local servers and compatible APIs
+            # This prevents models from outputting <think>...</think> blocks
+            "thinking": False,
+            "enable_thinking": False,
+            # Some servers use chat_template_kwargs
+            "chat_template_kwargs": {
+                "enable_thinking": False
+            }
+        }
+
+        # No ceiling for reasoning models (see output_token_ceiling);
+        # OpenAI's own API replaced max_tokens (rejected by reasoning models)
+        if max_tokens is not None:
+            if "api.openai.com" in self.api_endpoint:
+                body["max_completion_tokens"] = max_tokens
+            else:
+                body["max_tokens"] = max_tokens
+
+        # llama.cpp: reuse the KV cache of the shared prompt prefix
+        # (OpenAI's own API caches automatically and rejects unknown fields)
+        if PROMPT_CACHE_HINTS and "api.openai.com" not in self.api_endpoint:
+            body["cache_prompt"] = True
+        return body
+
+    def batch_api(self) -> Optional[BatchAPIClient]:
+        """Batch API next to the chat completions endpoint (OpenAI, vLLM...)"""
+        return BatchAPIClient(
+            self.api_endpoint,
+            build_body=lambda prompt, system_prompt: self._chat_body(
+                prompt, system_prompt, output_token_ceiling(self.model)
+            ),
+            api_key=self.api_key
+        )
+
     async def generate(self, prompt: str, timeout: int = REQUEST_TIMEOUT,
                       system_prompt: Optional[str] = None) -> Optional[LLMResponse]:
         """
@@ -51,54 +100,59 @@ class OpenAICompatibleProvider(LLMProvider):
         if self.api_key:
             headers["Authorization"] = f"Bearer {self.api_key}"
 
-        # Build messages array with optional system prompt
-        messages = []
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        messages.append({"role": "user", "content": prompt})
-
+        max_tokens = output_token_ceiling(self.model)
         payload = {
-            "model": self.model,
-            "messages": messages,
-            "stream": False,
-            # Disable thinking/reasoning mode for local servers and compatible APIs
-            # This prevents models from outputting <think>...</think> blocks
-            "thinking": False,
-            "enable_thinking": False,
-            # Some servers use chat_template_kwargs
-            "chat_template_kwargs": {
-                "enable_thinking": False
-            }
+            **self._chat_body(prompt, system_prompt, max_tokens),
+            "stream": True,
+            # Final chunk carries usage (OpenAI, vLLM, llama.cpp)
+            "stream_options": {"include_usage": True},
         }
 
         client = await self._get_client()
         for attempt in range(MAX_TRANSLATION_ATTEMPTS):
             try:
-                response = await client.post(
-                    self.api_endpoint,
-                    json=payload,
-                    headers=headers,
-                    timeout=timeout
-                )
-                response.raise_for_status()
-
-                response_json = response.json()
-                response_text = response_json.get("choices", [{}])[0].get("message", {}).get("content", "")
+                monitor = StreamMonitor(max_tokens)
+                usage_event = {}
+                finish_reason = None
+                abort_reason = None
+
+                async with client.stream("POST", self.api_endpoint, json=payload,
+                                         headers=headers, timeout=timeout) as response:
+                    await raise_for_stream_status(response)
+                    async for event in iter_sse_events(response):
+                        if event.get("usage"):
+                            usage_event = event
+                        choices = event.get("choices") or [{}]
+                        finish_reason = choices[0].get("finish_reason") or finish_reason
+                        abort_reason = monitor.feed((choices[0].get("delta") or {}).get("content") or "")
+                        if abort_reason:
+                            break
+                monitor.finish()
+
+                if abort_reason:
+                    raise RepetitionLoopError(f"Stream aborted: {abort_reason}")
 
                 # Extract token usage if available
-                usage = response_json.get("usage", {})
+                usage = usage_event.get("usage", {})
                 prompt_tokens = usage.get("prompt_tokens", 0)
-                completion_tokens = usage.get("completion_tokens", 0)
+                completion_tokens = usage.get("completion_tokens", 0) or monitor.estimated_tokens
 
                 return LLMResponse(
-                    content=response_text,
+                    content=monitor.text,
                     prompt_tokens=prompt_tokens,
                     completion_tokens=completion_tokens,
                     context_used=prompt_tokens + completion_tokens,
                     context_limit=self.context_window,
-                    was_truncated=False  # OpenAI API doesn't provide truncation info
+                    was_truncated=finish_reason == "length",
+                    cached_tokens=openai_cached_tokens(usage_event),
+                    time_to_first_token=monitor.time_to_first_token,
+                    tokens_per_second=monitor.tokens_per_second(completion_tokens),
+                    attempts=attempt + 1
                 )
 
+            except RepetitionLoopError:
+                raise
+
             except httpx.TimeoutException as e:
                 RED = '\033[91m'
                 YELLOW = '\033[93m'
@@ -16,9 +16,12 @@ import httpx
 import asyncio
 import json
 
-from src.config import REQUEST_TIMEOUT, MAX_TRANSLATION_ATTEMPTS
+from src.config import REQUEST_TIMEOUT, MAX_TRANSLATION_ATTEMPTS, PROMPT_CACHE_HINTS
 from ..base import LLMProvider, LLMResponse
-from ..exceptions import ContextOverflowError
+from ..exceptions import ContextOverflowError, RepetitionLoopError
+from ..utils.prompt_cache import (supports_cache_control, cache_control_system_message,
+                                  openai_cached_tokens)
+from ..utils.streaming import StreamMonitor, iter_sse_events, output_token_ceiling, raise_for_stream_status
 
 
 class OpenRouterProvider(LLMProvider):
@@ -235,46 +238,72 @@ class OpenRouterProvider(LLMProvider):
         # Build messages array
         messages = []
         if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
+            if PROMPT_CACHE_HINTS and supports_cache_control(self.model):
+                # Cache breakpoint after the (job-constant) system prompt
+                messages.append(cache_control_system_message(system_prompt))
+            else:
+                messages.append({"role": "system", "content": system_prompt})
         messages.append({"role": "user", "content": prompt})
 
+        max_tokens = output_token_ceiling(self.model)
         payload = {
             "model": self.model,
             "messages": messages,
-            "stream": False,
+            "stream": True,
+            # Final chunk carries token usage and cost
+            "usage": {"include": True},
             # Disable thinking/reasoning mode for models like DeepSeek, Qwen via OpenRouter
             # OpenRouter passes these parameters to the underlying model
             "thinking": False,
             "enable_thinking": False,
         }
+        # No ceiling for reasoning models (see output_token_ceiling)
+        if max_tokens is not None:
+            payload["max_tokens"] = max_tokens
 
         client = await self._get_client()
         for attempt in range(MAX_TRANSLATION_ATTEMPTS):
             try:
-                response = await client.post(
-                    self.API_URL,
-                    headers=headers,
-                    json=payload,
-                    timeout=timeout
-                )
-                response.raise_for_status()
-
-                result = response.json()
-
-                if "choices" not in result or len(result["choices"]) == 0:
-                    print(f"⚠️ OpenRouter: Unexpected response format: {result}")
+                monitor = StreamMonitor(max_tokens)
+                usage_event = {}
+                finish_reason = None
+                abort_reason = None
+                received_choices = False
+
+                async with client.stream("POST", self.API_URL, headers=headers,
+                                         json=payload, timeout=timeout) as response:
+                    await raise_for_stream_status(response)
+                    async for event in iter_sse_events(response):
+                        if "error" in event:
+                            print(f"⚠️ OpenRouter: Error in stream: {event['error']}")
+                            return None
+                        if event.get("usage"):
+                            usage_event = event
+                        choices = event.get("choices") or []
+                        if not choices:
+                            continue
+                        received_choices = True
+                        finish_reason = choices[0].get("finish_reason") or finish_reason
+                        abort_reason = monitor.feed((choices[0].get("delta") or {}).get("content") or "")
+                        if abort_reason:
+                            break
+                monitor.finish()
+
+                if abort_reason:
+                    raise RepetitionLoopError(f"Stream aborted: {abort_reason}")
+
+                if not received_choices:
+                    print(f"⚠️ OpenRouter: Unexpected response format: {usage_event}")
                     return None
 
-                response_text = result["choices"][0].get("message", {}).get("content", "")
-
                 # Track cost from usage data
-                usage = result.get("usage", {})
+                usage = usage_event.get("usage", {})
                 prompt_tokens = usage.get("prompt_tokens", 0)
-                completion_tokens = usage.get("completion_tokens", 0)
+                completion_tokens = usage.get("completion_tokens", 0) or monitor.estimated_tokens
 
-                # OpenRouter returns cost in the response (in USD)
-                if "cost" in result:
-                    cost = float(result.get("cost", 0))
+                # OpenRouter returns cost in the usage data (in USD)
+                if "cost" in usage:
+                    cost = float(usage.get("cost") or 0)
                 else:
                     # Fallback estimate (using typical rates)
                     cost = (prompt_tokens * 0.50 / 1_000_000) + (completion_tokens * 1.50 / 1_000_000)
@@ -303,14 +332,21 @@ class OpenRouterProvider(LLMProvider):
                         print(f"⚠️ Cost callback error: {cb_err}")
 
                 return LLMResponse(
-                    content=response_text,
+                    content=monitor.text,
                     prompt_tokens=prompt_tokens,
                     completion_tokens=completion_tokens,
                     context_used=prompt_tokens + completion_tokens,
                     context_limit=0,  # OpenRouter manages context internally
-                    was_truncated=False
+                    was_truncated=finish_reason == "length",
+                    cached_tokens=openai_cached_tokens(usage_event),
+                    time_to_first_token=monitor.time_to_first_token,
+                    tokens_per_second=monitor.tokens_per_second(completion_tokens),
+                    attempts=attempt + 1
                 )
 
+            except RepetitionLoopError:
+                raise
+
             except httpx.TimeoutException as e:
                 print(f"OpenRouter API Timeout (attempt {attempt + 1}/{MAX_TRANSLATION_ATTEMPTS}): {e}")
                 if attempt < MAX_TRANSLATION_ATTEMPTS - 1:
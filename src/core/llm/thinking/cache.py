@@ -6,7 +6,7 @@ use thinking tokens and how they behave, avoiding repeated detection.
 """
 
 import json
-import asyncio
+import time
 from pathlib import Path
 from typing import Dict, Any, Optional
 from .behavior import ThinkingBehavior
@@ -108,6 +108,25 @@ class ThinkingCache:
 
         return None
 
+    def supports_think_param(self, model: str, endpoint: str = "") -> Optional[bool]:
+        """
+        Get whether a cached model accepts the "think" parameter.
+
+        Args:
+            model: Model name/identifier
+            endpoint: Optional API endpoint URL
+
+        Returns:
+            The cached flag, or None if the model isn't cached
+        """
+        self.load()
+
+        cache_key = f"{model}@{endpoint}" if endpoint else model
+        entry = self._cache.get(cache_key)
+        if entry is None:
+            return None
+        return bool(entry.get("supports_think_param", True))
+
     def set(
         self,
         model: str,
@@ -128,18 +147,10 @@ class ThinkingCache:
 
         cache_key = f"{model}@{endpoint}" if endpoint else model
 
-        # Get current time (works in both sync and async contexts)
-        try:
-            loop = asyncio.get_event_loop()
-            tested_at = loop.time() if loop.is_running() else 0
-        except RuntimeError:
-            # No event loop running
-            tested_at = 0
-
         self._cache[cache_key] = {
             "behavior": behavior.value,
             "supports_think_param": supports_think_param,
-            "tested_at": tested_at
+            "tested_at": time.time()
         }
 
         self.save()
@@ -6,6 +6,8 @@ Shared utilities used across multiple providers.
 Components:
     - extraction: Translation extraction from LLM responses
     - context_detection: Model context size detection
+    - prompt_cache: Prefix cache hints and cached-token accounting
+    - streaming: SSE parsing and in-flight guards/timing for streamed responses
 """
 
 from .context_detection import ContextDetector
@@ -5,6 +5,7 @@ This module provides utilities for detecting the context window size of various
 LLM models through API queries and heuristics.
 """
 
+import asyncio
 import re
 from typing import Optional, Callable, Any
 
@@ -50,10 +51,9 @@ class ContextDetector:
             Context window size in tokens
 
         Process:
-            1. Try provider-specific endpoints
-            2. Try model info endpoints
-            3. Try model list endpoints
-            4. Fall back to model family defaults
+            1. Query provider-specific, model info and model list endpoints concurrently
+            2. Use the first of them (in that order) that reports a size
+            3. Fall back to model family defaults
         """
         headers = {"Content-Type": "application/json"}
         if api_key:
@@ -61,14 +61,18 @@ class ContextDetector:
 
         base_url = endpoint.replace("/v1/chat/completions", "").replace("/chat/completions", "")
 
-        # Try endpoints in order: /props -> /v1/models/{model} -> /v1/models -> fallback
-        for strategy in [
-            lambda: self._try_props_endpoint(client, base_url, headers, log_callback),
-            lambda: self._try_model_info_endpoint(client, base_url, model, headers, log_callback),
-            lambda: self._try_models_list_endpoint(client, base_url, model, headers, log_callback)
-        ]:
-            ctx = await strategy()
+        # Query the endpoints concurrently, but prefer them in order:
+        # /props -> /v1/models/{model} -> /v1/models -> fallback
+        # (strategies don't log, so only the size that is used gets reported)
+        results = await asyncio.gather(
+            self._try_props_endpoint(client, base_url, headers),
+            self._try_model_info_endpoint(client, base_url, model, headers),
+            self._try_models_list_endpoint(client, base_url, model, headers)
+        )
+        for ctx in results:
             if ctx:
+                if log_callback:
+                    log_callback("info", f"Detected context size: {ctx}")
                 return ctx
 
         # Fallback to model family defaults
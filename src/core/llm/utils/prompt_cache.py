@@ -0,0 +1,68 @@
+"""
+Prefix (prompt) cache hints and cached-token accounting.
+
+The translation system prompt is identical for every chunk of a job, so
+servers with prefix caching can skip re-processing it. These helpers build
+the provider-specific hints that ask for it and read back how many prompt
+tokens were served from cache.
+"""
+
+from typing import Any, Dict, Optional
+
+# OpenRouter models that honour explicit cache_control breakpoints
+# (other OpenRouter models cache automatically or not at all)
+CACHE_CONTROL_MODEL_PREFIXES = ("anthropic/", "google/gemini")
+
+
+def supports_cache_control(model: str) -> bool:
+    """Whether an OpenRouter model takes cache_control breakpoints."""
+    return model.lower().startswith(CACHE_CONTROL_MODEL_PREFIXES)
+
+
+def cache_control_system_message(system_prompt: str) -> Dict[str, Any]:
+    """System message whose content ends with an ephemeral cache breakpoint."""
+    return {
+        "role": "system",
+        "content": [{
+            "type": "text",
+            "text": system_prompt,
+            "cache_control": {"type": "ephemeral"}
+        }]
+    }
+
+
+def openai_cached_tokens(response_json: Dict[str, Any]) -> int:
+    """
+    Prompt tokens served from cache in an OpenAI-style chat response.
+
+    Reads usage.prompt_tokens_details.cached_tokens (OpenAI, OpenRouter,
+    vLLM, recent llama.cpp) and falls back to llama.cpp's timings.cache_n.
+
+    Args:
+        response_json: Decoded response body
+
+    Returns:
+        Number of cached prompt tokens (0 if not reported)
+    """
+    usage = response_json.get("usage") or {}
+    details = usage.get("prompt_tokens_details") or {}
+    cached = details.get("cached_tokens")
+    if cached is None:
+        cached = (response_json.get("timings") or {}).get("cache_n")
+    return int(cached or 0)
+
+
+def prompt_cache_summary(stats: Dict[str, int]) -> Optional[str]:
+    """
+    One-line summary of an LLMClient's prompt_cache_stats.
+
+    Returns:
+        Summary message, or None if no request reported cached tokens
+    """
+    cached = stats.get('cached_tokens', 0)
+    if not cached:
+        return None
+    prompt_tokens = stats.get('prompt_tokens', 0)
+    ratio = cached / prompt_tokens if prompt_tokens else 0.0
+    return (f"Prompt cache: {cached:,} of {prompt_tokens:,} prompt tokens served from cache "
+            f"({ratio:.0%}) over {stats.get('requests', 0)} requests")
@@ -0,0 +1,193 @@
+"""
+Incremental reading of streamed (SSE) responses.
+
+OpenAI-compatible servers, OpenRouter and Gemini stream Server-Sent Events.
+StreamMonitor applies the guards the Ollama stream uses while the response
+arrives (output overrun and repetition loops), so a runaway model is cut
+off early instead of running into REQUEST_TIMEOUT, and measures time to
+first token and generation speed.
+"""
+
+import re
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import httpx
+
+from src.config import (
+    MAX_TOKENS_PER_CHUNK,
+    MAX_OUTPUT_TOKENS,
+    REASONING_MAX_OUTPUT_TOKENS,
+    REASONING_MODEL_PATTERNS,
+    TRANSLATION_OUTPUT_MULTIPLIER,
+    TRANSLATION_TAG_OVERHEAD,
+    REPETITION_MIN_COUNT_STREAMING
+)
+from ..thinking.detection import detect_repetition_loop
+from src.utils import json_backend
+
+# Heuristic characters per token for estimating output while streaming
+CHARS_PER_TOKEN = 3
+
+# Re-run the repetition check every this many characters of new output
+REPETITION_CHECK_INTERVAL = 500
+
+# Servers normally stop at max_tokens themselves; the local guard only
+# catches ones that ignore it, so it allows for the estimate's slack
+OVERRUN_FACTOR = 1.5
+
+
+def is_reasoning_model(model: str) -> bool:
+    """Whether the model name matches one of REASONING_MODEL_PATTERNS"""
+    name = (model or "").lower()
+    return any(re.search(r"(^|[/:_-])" + re.escape(pattern), name)
+               for pattern in REASONING_MODEL_PATTERNS)
+
+
+def output_token_ceiling(model: str = "") -> Optional[int]:
+    """
+    max_tokens for a translation request.
+
+    Reasoning models count their hidden reasoning against max_tokens, so
+    they get REASONING_MAX_OUTPUT_TOKENS, or no ceiling (None) when it is 0.
+    Other models get MAX_OUTPUT_TOKENS if set, else a ceiling derived from
+    the chunk size: the translation can be TRANSLATION_OUTPUT_MULTIPLIER
+    times the source plus the tags, never below 2048 so verbose target
+    languages aren't cut.
+
+    Args:
+        model: Model name the request is sent to
+
+    Returns:
+        Ceiling to send, or None to send none
+    """
+    if is_reasoning_model(model):
+        return REASONING_MAX_OUTPUT_TOKENS if REASONING_MAX_OUTPUT_TOKENS > 0 else None
+    if MAX_OUTPUT_TOKENS > 0:
+        return MAX_OUTPUT_TOKENS
+    return max(2048, MAX_TOKENS_PER_CHUNK * TRANSLATION_OUTPUT_MULTIPLIER + TRANSLATION_TAG_OVERHEAD)
+
+
+async def raise_for_stream_status(response: httpx.Response) -> None:
+    """
+    raise_for_status() for a streamed response.
+
+    The error body is read first so the providers' HTTPStatusError handlers
+    can inspect e.response.text as they do for buffered responses.
+    """
+    if response.is_error:
+        await response.aread()
+    response.raise_for_status()
+
+
+async def iter_sse_events(response: httpx.Response) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Yield the decoded JSON payload of each SSE data line.
+
+    Comment lines (e.g. OpenRouter's ": OPENROUTER PROCESSING" keep-alives)
+    and malformed payloads are skipped; iteration stops at "data: [DONE]".
+    """
+    async for line in response.aiter_lines():
+        if not line.startswith("data:"):
+            continue
+        data = line[5:].strip()
+        if data == "[DONE]":
+            break
+        try:
+            yield json_backend.loads(data)
+        except json_backend.JSONDecodeError:
+            continue
+
+
+class StreamMonitor:
+    """
+    Accumulates streamed text, guards it and times it.
+
+    Example:
+        >>> monitor = StreamMonitor(max_output_tokens=2048)
+        >>> for delta in deltas:
+        ...     abort_reason = monitor.feed(delta)
+        ...     if abort_reason:
+        ...         raise RepetitionLoopError(abort_reason)
+        >>> monitor.finish()
+        >>> monitor.tokens_per_second(completion_tokens)
+    """
+
+    def __init__(self, max_output_tokens: Optional[int]):
+        """
+        Start monitoring a request (the clock starts now).
+
+        Args:
+            max_output_tokens: max_tokens sent with the request (None: no overrun guard)
+        """
+        self.max_output_tokens = max_output_tokens
+        self._parts: List[str] = []
+        self._length = 0
+        self._next_repetition_check = REPETITION_CHECK_INTERVAL
+        self._start = time.perf_counter()
+        self._first_token_at: Optional[float] = None
+        self._end: Optional[float] = None
+
+    @property
+    def text(self) -> str:
+        """Text received so far"""
+        return "".join(self._parts)
+
+    @property
+    def estimated_tokens(self) -> int:
+        """Output tokens estimated from the text length (for servers that don't report usage)"""
+        return self._length // CHARS_PER_TOKEN
+
+    def feed(self, delta: str) -> Optional[str]:
+        """
+        Add a streamed text delta and run the guards.
+
+        Args:
+            delta: New text from the stream
+
+        Returns:
+            Reason to abort the stream, or None to keep reading
+        """
+        if not delta:
+            return None
+        if self._first_token_at is None:
+            self._first_token_at = time.perf_counter()
+        self._parts.append(delta)
+        self._length += len(delta)
+
+        if (self.max_output_tokens is not None
+                and self.estimated_tokens > self.max_output_tokens * OVERRUN_FACTOR):
+            return (f"Output exceeded ~{self.estimated_tokens} tokens "
+                    f"(max_tokens={self.max_output_tokens})")
+
+        if self._length >= self._next_repetition_check:
+            self._next_repetition_check = self._length + REPETITION_CHECK_INTERVAL
+            if detect_repetition_loop(self.text, min_repetitions=REPETITION_MIN_COUNT_STREAMING):
+                return "Repetition loop detected in streamed content"
+        return None
+
+    def finish(self) -> None:
+        """Stop the clock at the end of the stream"""
+        self._end = time.perf_counter()
+
+    @property
+    def time_to_first_token(self) -> float:
+        """Seconds from the request to the first streamed text (0 if none arrived)"""
+        if self._first_token_at is None:
+            return 0.0
+        return self._first_token_at - self._start
+
+    def tokens_per_second(self, completion_tokens: int) -> float:
+        """
+        Generation speed after the first token.
+
+        Args:
+            completion_tokens: Output tokens reported by the server (or estimated)
+
+        Returns:
+            Tokens per second, 0 if it can't be measured
+        """
+        if self._first_token_at is None:
+            return 0.0
+        elapsed = (self._end or time.perf_counter()) - self._first_token_at
+        return completion_tokens / elapsed if elapsed > 0 else 0.0
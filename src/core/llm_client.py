@@ -1,10 +1,15 @@
 """
 Centralized LLM client for all API communication
 """
-from typing import Optional, Dict, Any
+import asyncio
+import time
+from typing import Optional, Dict, Any, Callable
 
-from src.config import API_ENDPOINT, DEFAULT_MODEL
-from src.core.llm import create_llm_provider, LLMProvider, ContextOverflowError, RepetitionLoopError, LLMResponse
+from src.config import API_ENDPOINT, DEFAULT_MODEL, MODEL_WARM_UP
+from src.core.llm import (create_llm_provider, LLMProvider, ContextOverflowError, RepetitionLoopError,
+                          LLMResponse, ThinkingBehavior, BatchAPIClient)
+from src.utils.metrics import JobMetrics
+from src.utils.tracing import span
 
 # Re-export for convenience
 __all__ = ['LLMClient', 'default_client', 'create_llm_client', 'ContextOverflowError', 'RepetitionLoopError', 'LLMResponse']
@@ -17,6 +22,16 @@ class LLMClient:
         self.provider_type = provider_type
         self.provider_kwargs = kwargs
         self._provider: Optional[LLMProvider] = None
+        self._model_context_size: Optional[int] = None
+        self.prompt_cache_stats: Dict[str, int] = {'requests': 0, 'prompt_tokens': 0, 'cached_tokens': 0}
+        self._context_size_lock = asyncio.Lock()
+        self._warm_up_task: Optional[asyncio.Task] = None
+        # Set once the job's context size is final (see start_warm_up)
+        self._context_planned = asyncio.Event()
+        self._job_log_callback: Optional[Callable] = None
+        self.job_started_at: Optional[float] = None
+        self.time_to_first_chunk: Optional[float] = None
+        self.metrics = JobMetrics()
         
         # For backward compatibility
         if "api_endpoint" in kwargs and "model" in kwargs:
@@ -42,10 +57,171 @@ class LLMClient:
     @context_window.setter
     def context_window(self, value: int):
         """Set the context window size on the provider"""
+        # Sizing before the first request loads the model once anyway
+        if value != self.context_window and self.prompt_cache_stats['requests']:
+            self.metrics.increment("llm_context_size_changes_total", self.metric_labels())
         if self._provider and hasattr(self._provider, 'context_window'):
             self._provider.context_window = value
         self.provider_kwargs['context_window'] = value
 
+    @property
+    def loaded_context(self) -> Optional[int]:
+        """num_ctx the model was last loaded at by this client (None if unknown or not loaded)"""
+        return getattr(self._provider, 'loaded_context', None)
+
+    async def get_model_context_size(self) -> int:
+        """
+        Get the model's context size as detected by the provider.
+
+        Falls back to the configured context window for providers without
+        detection or when detection fails. A detected size is cached, so
+        adapters sharing the client (batch jobs) query the provider once.
+        """
+        # Concurrent callers (warm-up, adapters) wait for a single detection
+        async with self._context_size_lock:
+            if self._model_context_size:
+                return self._model_context_size
+
+            provider = self._get_provider()
+            if hasattr(provider, 'get_model_context_size'):
+                try:
+                    detected = await provider.get_model_context_size()
+                    if detected:
+                        self._model_context_size = detected
+                        return detected
+                except Exception:
+                    pass
+            return self.context_window
+
+    def start_warm_up(self, log_callback: Optional[Callable] = None,
+                      job_started_at: Optional[float] = None,
+                      wait_for_context_plan: bool = False) -> None:
+        """
+        Start preparing the model in the background, at job start.
+
+        The model's cold load, its thinking-behavior probes and context size
+        detection then overlap with file parsing and chunk planning instead
+        of delaying the first request. Also starts the clock reported as
+        time_to_first_chunk.
+
+        Jobs that plan their context size from the chunks (plan_job_context)
+        pass wait_for_context_plan: the model is then loaded and probed only
+        once context_planned() is called, at the planned num_ctx, so the
+        first request doesn't reload it. Context size detection still starts
+        right away (it doesn't load the model).
+
+        Args:
+            log_callback: Callback for the warm-up and time-to-first-chunk messages
+            job_started_at: time.perf_counter() at job submission (default: now)
+            wait_for_context_plan: Load the model only after context_planned()
+        """
+        self.job_started_at = job_started_at if job_started_at is not None else time.perf_counter()
+        self._job_log_callback = log_callback
+        if not wait_for_context_plan:
+            self._context_planned.set()
+        if MODEL_WARM_UP and self._warm_up_task is None:
+            self._warm_up_task = asyncio.create_task(self._warm_up())
+
+    def context_planned(self) -> None:
+        """Signal that the job's context size is final: a pending warm-up may load the model."""
+        self._context_planned.set()
+
+    async def _load_when_planned(self) -> float:
+        """Warm up the provider once the context size is final"""
+        await self._context_planned.wait()
+        return await self._get_provider().warm_up()
+
+    async def _warm_up(self) -> None:
+        """Warm up the provider and detect the context size, concurrently."""
+        log_callback = self._job_log_callback
+        start = time.perf_counter()
+        try:
+            load_duration, _ = await asyncio.gather(
+                self._load_when_planned(),
+                self.get_model_context_size()
+            )
+        except Exception as e:
+            if log_callback:
+                log_callback("model_warm_up_failed", f"Model warm-up failed: {e}")
+            return
+
+        if log_callback:
+            log_callback("model_warm_up",
+                f"🔥 Model ready after {time.perf_counter() - start:.1f}s in the background "
+                f"(load {load_duration:.1f}s)")
+
+    async def wait_for_warm_up(self) -> None:
+        """Wait until a warm-up started with start_warm_up() is over."""
+        if self._warm_up_task is not None:
+            await self._warm_up_task
+
+    def metric_labels(self) -> Dict[str, str]:
+        """Provider, model and endpoint labels of this client's metrics"""
+        provider = self._provider
+        endpoint = (getattr(provider, 'api_endpoint', None) or getattr(provider, 'API_URL', None)
+                    or self.provider_kwargs.get('api_endpoint') or "")
+        model = getattr(provider, 'model', None) or self.provider_kwargs.get('model') or self.model
+        return {'provider': self.provider_type, 'model': model, 'endpoint': endpoint}
+
+    def record_queue_wait(self, seconds: float) -> None:
+        """Record the time a request waited for a concurrency slot"""
+        self.metrics.observe("llm_queue_wait_seconds", seconds, self.metric_labels())
+
+    def record_fallback(self, phase: str) -> None:
+        """Count a chunk that needed a fallback phase (e.g. 'token_alignment')"""
+        self.metrics.increment("translation_fallbacks_total", {**self.metric_labels(), 'phase': phase})
+
+    def _record_metrics(self, response: Optional[LLMResponse], duration: float) -> None:
+        """Record the latency and throughput of one request"""
+        labels = self.metric_labels()
+        if response is None:
+            self.metrics.increment("llm_request_failures_total", labels)
+            return
+        self.metrics.increment("llm_requests_total", labels)
+        self.metrics.observe("llm_generation_seconds", duration, labels)
+        if response.time_to_first_token:
+            self.metrics.observe("llm_time_to_first_token_seconds", response.time_to_first_token, labels)
+        if response.prompt_tokens:
+            self.metrics.observe("llm_prompt_tokens", response.prompt_tokens, labels)
+        if response.completion_tokens:
+            self.metrics.observe("llm_completion_tokens", response.completion_tokens, labels)
+        if response.tokens_per_second:
+            self.metrics.observe("llm_tokens_per_second", response.tokens_per_second, labels)
+        if response.attempts > 1:
+            self.metrics.increment("llm_retries_total", labels, response.attempts - 1)
+
+    async def _timed_generate(self, provider: LLMProvider, prompt: str, timeout: Optional[int],
+                              system_prompt: Optional[str]) -> Optional[LLMResponse]:
+        """Send a request through the provider, recording its metrics"""
+        start = time.perf_counter()
+        with span("llm.request", provider=self.provider_type, model=getattr(provider, 'model', self.model)) as request_span:
+            try:
+                if timeout:
+                    response = await provider.generate(prompt, timeout, system_prompt=system_prompt)
+                else:
+                    response = await provider.generate(prompt, system_prompt=system_prompt)
+            except Exception:
+                self._record_metrics(None, time.perf_counter() - start)
+                raise
+            if response is not None:
+                request_span.set(prompt_tokens=response.prompt_tokens, completion_tokens=response.completion_tokens,
+                                 time_to_first_token=response.time_to_first_token, attempts=response.attempts)
+        self._record_metrics(response, time.perf_counter() - start)
+        return self._record_usage(response)
+
+    def _record_usage(self, response: Optional[LLMResponse]) -> Optional[LLMResponse]:
+        """Accumulate prompt/cached token counts into prompt_cache_stats"""
+        if response is not None:
+            self.prompt_cache_stats['requests'] += 1
+            self.prompt_cache_stats['prompt_tokens'] += response.prompt_tokens
+            self.prompt_cache_stats['cached_tokens'] += response.cached_tokens
+            if self.job_started_at is not None and self.time_to_first_chunk is None:
+                self.time_to_first_chunk = time.perf_counter() - self.job_started_at
+                if self._job_log_callback:
+                    self._job_log_callback("time_to_first_chunk",
+                        f"⏱️ First chunk translated {self.time_to_first_chunk:.1f}s after job start")
+        return response
+
     async def generate(self, prompt: str, system_prompt: Optional[str] = None,
                       timeout: int = None) -> Optional[LLMResponse]:
         """
@@ -59,12 +235,7 @@ class LLMClient:
         Returns:
             LLMResponse with content and token usage info, or None if failed
         """
-        provider = self._get_provider()
-
-        if timeout:
-            return await provider.generate(prompt, timeout, system_prompt=system_prompt)
-        else:
-            return await provider.generate(prompt, system_prompt=system_prompt)
+        return await self._timed_generate(self._get_provider(), prompt, timeout, system_prompt)
 
     async def make_request(self, prompt: str, model: Optional[str] = None,
                     timeout: int = None, system_prompt: Optional[str] = None) -> Optional[LLMResponse]:
@@ -86,10 +257,7 @@ class LLMClient:
         if model:
             provider.model = model
 
-        if timeout:
-            return await provider.generate(prompt, timeout, system_prompt=system_prompt)
-        else:
-            return await provider.generate(prompt, system_prompt=system_prompt)
+        return await self._timed_generate(provider, prompt, timeout, system_prompt)
     
     def extract_translation(self, response: str) -> Optional[str]:
         """
@@ -104,6 +272,15 @@ class LLMClient:
         provider = self._get_provider()
         return provider.extract_translation(response)
     
+    def batch_api(self) -> Optional[BatchAPIClient]:
+        """
+        Client for the provider's offline Batch API (translate.py --batch)
+
+        Returns:
+            BatchAPIClient, or None if the provider has no Batch API
+        """
+        return self._get_provider().batch_api()
+
     async def translate_text(self, prompt: str, model: Optional[str] = None) -> Optional[str]:
         """
         Complete translation workflow: request + extraction
@@ -125,6 +302,13 @@ class LLMClient:
     
     async def close(self):
         """Close the HTTP client and clean up resources"""
+        if self._warm_up_task is not None and not self._warm_up_task.done():
+            self._warm_up_task.cancel()
+            try:
+                await self._warm_up_task
+            except asyncio.CancelledError:
+                pass
+        self._warm_up_task = None
         if self._provider:
             await self._provider.close()
             self._provider = None
@@ -133,11 +317,18 @@ class LLMClient:
         """
         Get the thinking model status from the provider (if available).
 
+        Only models that think even when asked not to count: the others are
+        sent think=false. The behavior detected by the provider is used if
+        known, else the one from the thinking cache or known model lists.
+
         Returns:
             True if model produces thinking output, False if not, None if unknown/not detected yet
         """
-        if self._provider and hasattr(self._provider, '_is_thinking_model'):
-            return self._provider._is_thinking_model
+        provider = self._get_provider()
+        if hasattr(provider, 'known_thinking_behavior'):
+            behavior = provider.known_thinking_behavior()
+            if behavior is not None:
+                return behavior == ThinkingBehavior.UNCONTROLLABLE
         return None
 
     async def detect_thinking_model(self) -> Optional[bool]:
@@ -151,11 +342,10 @@ class LLMClient:
             True if model produces thinking output, False if not, None if detection not supported
         """
         provider = self._get_provider()
-        if hasattr(provider, '_detect_thinking_model'):
-            # Trigger detection if not already done
-            if provider._is_thinking_model is None:
-                provider._is_thinking_model = await provider._detect_thinking_model()
-            return provider._is_thinking_model
+        if hasattr(provider, '_ensure_thinking_behavior'):
+            # Runs the detection if not already done (or waits for the warm-up's)
+            await provider._ensure_thinking_behavior()
+            return self.get_is_thinking_model()
         return None
 
 
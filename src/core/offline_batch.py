@@ -0,0 +1,106 @@
+"""
+Offline translation through the provider's Batch API (translate.py --batch).
+
+For large jobs nobody is waiting on, every prompt of the job is rendered up
+front with generate_translation_prompt and submitted as one batch (see
+src.core.llm.batch_api), which is cheaper and not rate limited. Each answer
+then goes through the same extraction as an online response, and through
+the caller's validation (placeholders for EPUB chunks).
+
+The batch only precomputes translations: whatever it doesn't return
+valid — failed requests, unextractable answers, lost placeholders, or a
+whole batch that failed or expired — is translated afterwards by the
+normal online path, with its retries and fallbacks.
+
+Prompts are rendered before any translation exists, so they carry the
+source context of each text but no previous translation.
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+
+from prompts.prompts import generate_translation_prompt
+from src.core.llm import BatchAPIError
+
+
+async def translate_offline(
+    requests: List[Dict[str, Any]],
+    source_language: str,
+    target_language: str,
+    llm_client: Any,
+    prompt_options: Optional[Dict] = None,
+    validate: Optional[Callable[[int, str], bool]] = None,
+    log_callback: Optional[Callable] = None,
+    check_interruption_callback: Optional[Callable] = None
+) -> Dict[int, str]:
+    """
+    Translate texts in one offline batch.
+
+    Args:
+        requests: Texts to translate, as dicts with 'main_content' and
+            optionally 'context_before', 'context_after', 'has_placeholders'
+            and 'placeholder_format' (as for generate_translation_request)
+        source_language: Source language
+        target_language: Target language
+        llm_client: LLM client of the job
+        prompt_options: Optional prompt customization options
+        validate: Optional check of (request index, translation); rejected
+            translations are left to the online path
+        log_callback: Optional logging callback
+        check_interruption_callback: Optional interruption check, run while waiting
+
+    Returns:
+        Map of request index to translation, for the requests that came back valid
+    """
+    batch_api = llm_client.batch_api() if llm_client else None
+    if batch_api is None:
+        if log_callback:
+            log_callback("batch_api_unsupported",
+                         "⚠️ This provider has no Batch API, translating online")
+        return {}
+
+    # Single characters are never sent (see generate_translation_request)
+    pending = [i for i, request in enumerate(requests) if len(request['main_content'].strip()) > 1]
+    if not pending:
+        return {}
+
+    lines = []
+    for i in pending:
+        request = requests[i]
+        prompt_pair = generate_translation_prompt(
+            request['main_content'],
+            request.get('context_before') or "",
+            request.get('context_after') or "",
+            "",
+            source_language,
+            target_language,
+            has_placeholders=request.get('has_placeholders', False),
+            prompt_options=prompt_options,
+            placeholder_format=request.get('placeholder_format')
+        )
+        lines.append(batch_api.request_line(f"request-{i}", prompt_pair.user, prompt_pair.system))
+
+    try:
+        results = await batch_api.run(lines, log_callback, check_interruption_callback)
+    except BatchAPIError as e:
+        if log_callback:
+            log_callback("batch_api_error", f"⚠️ {e}. Translating online instead")
+        return {}
+    finally:
+        await batch_api.close()
+
+    translations: Dict[int, str] = {}
+    for i in pending:
+        result = results.get(f"request-{i}")
+        if result is None or result.content is None:
+            continue
+        translated = llm_client.extract_translation(result.content)
+        if not translated or (validate and not validate(i, translated)):
+            continue
+        translations[i] = translated
+
+    if log_callback:
+        log_callback("batch_api_complete",
+                     f"📥 Batch translated {len(translations)}/{len(pending)} texts"
+                     + (f", {len(pending) - len(translations)} will be translated online"
+                        if len(translations) < len(pending) else ""))
+    return translations
@@ -0,0 +1,106 @@
+"""
+Packing of several small texts into a single translation request.
+
+Each text becomes a segment introduced by a numbered marker line. The LLM is
+asked to keep the markers (see the segmented_input prompt option), so the
+response can be split back into one translation per segment. A response
+whose markers don't match is rejected and the caller falls back to
+translating the segments one by one.
+"""
+import re
+from typing import Callable, List, Optional, Sequence
+
+
+SEGMENT_MARKER = "<<<SEGMENT {}>>>"
+
+# A marker line, tolerating surrounding spaces added by the model
+SEGMENT_MARKER_RE = re.compile(r'^[ \t]*<<<SEGMENT (\d+)>>>[ \t]*$', re.MULTILINE)
+
+# Tokens taken by a marker line and its newlines
+SEGMENT_MARKER_TOKENS = 8
+
+
+def pack_segments(texts: Sequence[str]) -> str:
+    """
+    Join texts into one request body, each preceded by its marker line.
+
+    Args:
+        texts: Texts to pack, in order
+
+    Returns:
+        Packed text
+    """
+    return '\n\n'.join(f"{SEGMENT_MARKER.format(i)}\n{text}" for i, text in enumerate(texts))
+
+
+def unpack_segments(text: str, count: int) -> Optional[List[str]]:
+    """
+    Split a translated pack back into its segments.
+
+    Args:
+        text: Translated packed text
+        count: Number of segments that were packed
+
+    Returns:
+        One translated text per segment, or None if the markers are missing,
+        duplicated or out of order (or a segment came back empty)
+    """
+    markers = list(SEGMENT_MARKER_RE.finditer(text))
+    if [int(m.group(1)) for m in markers] != list(range(count)):
+        return None
+
+    segments = []
+    for marker, next_marker in zip(markers, markers[1:] + [None]):
+        end = next_marker.start() if next_marker else len(text)
+        segment = text[marker.end():end].strip()
+        if not segment:
+            return None
+        segments.append(segment)
+    return segments
+
+
+def plan_packs(
+    token_counts: Sequence[int],
+    max_tokens: int,
+    max_segments: int,
+    packable: Optional[Callable[[int], bool]] = None
+) -> List[List[int]]:
+    """
+    Group consecutive items into packs that fit a token budget.
+
+    Items are taken in order; a pack is closed when the next item would
+    exceed max_tokens (markers included) or max_segments. An item that
+    doesn't fit on its own, or isn't packable, forms a pack by itself.
+
+    Args:
+        token_counts: Token count of each item
+        max_tokens: Token budget of a pack
+        max_segments: Maximum items per pack
+        packable: Optional predicate on the item index; items for which it
+            returns False are never packed with others
+
+    Returns:
+        List of packs, each a list of item indices
+    """
+    packs = []
+    current = []
+    current_tokens = 0
+
+    for index, tokens in enumerate(token_counts):
+        tokens += SEGMENT_MARKER_TOKENS
+        if packable is not None and not packable(index):
+            if current:
+                packs.append(current)
+                current, current_tokens = [], 0
+            packs.append([index])
+            continue
+
+        if current and (current_tokens + tokens > max_tokens or len(current) >= max_segments):
+            packs.append(current)
+            current, current_tokens = [], 0
+        current.append(index)
+        current_tokens += tokens
+
+    if current:
+        packs.append(current)
+    return packs
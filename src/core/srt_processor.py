@@ -1,9 +1,130 @@
+import io
 import re
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Iterable, Iterator, Optional, TextIO, Callable
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Timecode line of a subtitle block ("00:00:01,000 --> 00:00:04,000")
+TIMECODE_RE = re.compile(r'(\d{2}:\d{2}:\d{2},\d{3})\s*-->\s*(\d{2}:\d{2}:\d{2},\d{3})')
+
+# Token budget of a subtitle block derived from the context window:
+# the fixed prompt (instructions, previous block) takes about this many tokens...
+SRT_PROMPT_OVERHEAD_TOKENS = 1000
+# ...and the translated block about this many tokens per source token
+SRT_OUTPUT_TOKEN_RATIO = 1.5
+# Never plan blocks smaller than this, even for tiny context windows
+SRT_MIN_BLOCK_TOKENS = 200
+# Tokens added per cue by its "[N]" tag and line break
+SRT_CUE_TAG_TOKENS = 3
+
+
+def timecode_to_seconds(timecode: str) -> float:
+    """Convert an SRT timecode ("HH:MM:SS,mmm") to seconds."""
+    hours, minutes, rest = timecode.split(':')
+    seconds, millis = rest.split(',')
+    return int(hours) * 3600 + int(minutes) * 60 + int(seconds) + int(millis) / 1000
+
+
+def block_token_budget(context_size: int) -> int:
+    """
+    Largest number of source tokens a subtitle block may hold so that
+    prompt, block and translation fit in the model's context window.
+
+    Args:
+        context_size: Model context window in tokens
+
+    Returns:
+        Source token budget per block
+    """
+    budget = (context_size - SRT_PROMPT_OVERHEAD_TOKENS) / (1 + SRT_OUTPUT_TOKEN_RATIO)
+    return max(SRT_MIN_BLOCK_TOKENS, int(budget))
+
+
+def format_subtitle(subtitle: Dict[str, str]) -> str:
+    """Format one subtitle as an SRT block (number, timecode, text)."""
+    return f"{subtitle['number']}\n{subtitle['start_time']} --> {subtitle['end_time']}\n{subtitle['text']}\n"
+
+
+def attribution_signature(label: str = "") -> Optional[str]:
+    """
+    Build the comment appended to translated SRT files.
+
+    Args:
+        label: Optional suffix after the generator name (e.g. " (Bilingual)")
+
+    Returns:
+        Signature text, or None if attribution is disabled
+    """
+    from src.config import ATTRIBUTION_ENABLED, GENERATOR_NAME, GENERATOR_SOURCE
+
+    if not ATTRIBUTION_ENABLED:
+        return None
+    return f"\n# Translated with {GENERATOR_NAME}{label}\n# {GENERATOR_SOURCE}\n"
+
+
+class SRTStreamWriter:
+    """
+    Incremental SRT writer.
+
+    Subtitles are written to the stream as soon as they are available, so the
+    output never has to be assembled in memory. Blocks finishing out of order
+    are held back until every earlier block has been written, which bounds
+    memory by the number of blocks in flight.
+
+    Produces exactly the same text as SRTProcessor.reconstruct_srt.
+
+    Example:
+        >>> with open("out.srt", "w", encoding="utf-8") as f:
+        ...     writer = SRTStreamWriter(f, signature=attribution_signature())
+        ...     writer.add_block(1, block_1_subtitles)  # held back
+        ...     writer.add_block(0, block_0_subtitles)  # writes blocks 0 and 1
+        ...     writer.close()
+    """
+
+    def __init__(self, stream: TextIO, signature: Optional[str] = None):
+        """
+        Args:
+            stream: Text stream to write to
+            signature: Text appended by close() (see attribution_signature)
+        """
+        self.stream = stream
+        self.signature = signature
+        self.written = 0
+        self.next_block_index = 0
+        self._pending_blocks: Dict[int, List[Dict[str, str]]] = {}
+
+    def write(self, subtitle: Dict[str, str]):
+        """Write one subtitle immediately."""
+        if self.written:
+            self.stream.write('\n')
+        self.stream.write(format_subtitle(subtitle))
+        self.written += 1
+
+    def add_block(self, block_index: int, subtitles: List[Dict[str, str]]):
+        """
+        Add a finished block, writing it (and any held-back successors)
+        once all earlier blocks have been written.
+        """
+        self._pending_blocks[block_index] = subtitles
+        while self.next_block_index in self._pending_blocks:
+            for subtitle in self._pending_blocks.pop(self.next_block_index):
+                self.write(subtitle)
+            self.next_block_index += 1
+
+    @property
+    def pending_blocks(self) -> int:
+        """Number of blocks held back waiting for an earlier block."""
+        return len(self._pending_blocks)
+
+    def close(self):
+        """Write the signature. Blocks still held back are not written."""
+        if self.signature:
+            if self.written:
+                self.stream.write('\n')
+            self.stream.write(self.signature)
+        self.stream.flush()
+
 
 class SRTProcessor:
     def __init__(self):
@@ -15,46 +136,85 @@ class SRTProcessor:
         )
 
     def parse_srt(self, content: str) -> List[Dict[str, str]]:
-        subtitles = []
+        subtitles = list(self.iter_srt(io.StringIO(content, newline=None)))
 
-        content = content.replace('\r\n', '\n').replace('\r', '\n')
-        if not content.endswith('\n'):
-            content += '\n'
-
-        blocks = content.split('\n\n')
+        logger.info(f"Parsed {len(subtitles)} subtitles from SRT file")
+        return subtitles
 
-        for block in blocks:
-            block = block.strip()
-            if not block:
-                continue
+    def iter_srt(self, lines: Iterable[str]) -> Iterator[Dict[str, str]]:
+        """
+        Parse subtitles incrementally from an iterable of lines.
 
-            lines = block.split('\n')
-            if len(lines) < 3:
-                continue
+        Blocks are separated by empty lines. Lines must already have their
+        line endings normalized to '\\n' (as text files opened with universal
+        newlines do).
 
-            if not lines[0].isdigit():
-                continue
-            number = lines[0]
+        Args:
+            lines: Lines of the SRT file (e.g. an open text file)
 
-            timecode_match = re.match(r'(\d{2}:\d{2}:\d{2},\d{3})\s*-->\s*(\d{2}:\d{2}:\d{2},\d{3})', lines[1])
-            if not timecode_match:
-                continue
-            start_time, end_time = timecode_match.groups()
+        Yields:
+            Subtitle dictionaries, as returned by parse_srt
+        """
+        block_lines: List[str] = []
 
-            text_lines = lines[2:]
-            text = '\n'.join(text_lines)
+        for line in lines:
+            line = line.rstrip('\n')
+            if line:
+                block_lines.append(line)
+            elif block_lines:
+                subtitle = self._parse_block('\n'.join(block_lines))
+                block_lines = []
+                if subtitle:
+                    yield subtitle
+
+        if block_lines:
+            subtitle = self._parse_block('\n'.join(block_lines))
+            if subtitle:
+                yield subtitle
+
+    def iter_srt_file(self, file_path: str, encoding: str = 'utf-8') -> Iterator[Dict[str, str]]:
+        """
+        Parse an SRT file incrementally without loading it into memory.
 
-            subtitle = {
-                'number': number,
-                'start_time': start_time,
-                'end_time': end_time,
-                'text': text,
-                'original_text': text
-            }
-            subtitles.append(subtitle)
+        Args:
+            file_path: Path to the SRT file
+            encoding: File encoding
 
-        logger.info(f"Parsed {len(subtitles)} subtitles from SRT file")
-        return subtitles
+        Yields:
+            Subtitle dictionaries, as returned by parse_srt
+        """
+        with open(file_path, 'r', encoding=encoding, newline=None) as f:
+            yield from self.iter_srt(f)
+
+    @staticmethod
+    def _parse_block(block: str) -> Optional[Dict[str, str]]:
+        """Parse one subtitle block, or return None if it is malformed."""
+        block = block.strip()
+        if not block:
+            return None
+
+        lines = block.split('\n')
+        if len(lines) < 3:
+            return None
+
+        if not lines[0].isdigit():
+            return None
+        number = lines[0]
+
+        timecode_match = TIMECODE_RE.match(lines[1])
+        if not timecode_match:
+            return None
+        start_time, end_time = timecode_match.groups()
+
+        text = '\n'.join(lines[2:])
+
+        return {
+            'number': number,
+            'start_time': start_time,
+            'end_time': end_time,
+            'text': text,
+            'original_text': text
+        }
 
     def extract_translatable_text(self, subtitles: List[Dict[str, str]]) -> List[Tuple[int, str]]:
         translatable = []
@@ -74,24 +234,22 @@ class SRTProcessor:
         return subtitles
 
     def reconstruct_srt(self, subtitles: List[Dict[str, str]]) -> str:
-        from src.config import ATTRIBUTION_ENABLED, GENERATOR_NAME, GENERATOR_SOURCE
+        output = io.StringIO()
+        self.write_srt(subtitles, output)
+        return output.getvalue()
 
-        srt_content = []
+    def write_srt(self, subtitles: Iterable[Dict[str, str]], stream: TextIO):
+        """
+        Write subtitles to a text stream one by one (see SRTStreamWriter).
 
+        Args:
+            subtitles: Subtitles to write, in order
+            stream: Destination text stream
+        """
+        writer = SRTStreamWriter(stream, signature=attribution_signature())
         for subtitle in subtitles:
-            block = f"{subtitle['number']}\n"
-            block += f"{subtitle['start_time']} --> {subtitle['end_time']}\n"
-            block += f"{subtitle['text']}\n"
-
-            srt_content.append(block)
-
-        # Add signature as comment at the end if enabled
-        if ATTRIBUTION_ENABLED:
-            signature = f"\n# Translated with {GENERATOR_NAME}\n"
-            signature += f"# {GENERATOR_SOURCE}\n"
-            srt_content.append(signature)
-
-        return '\n'.join(srt_content)
+            writer.write(subtitle)
+        writer.close()
 
     def validate_srt(self, content: str) -> bool:
         return bool(self.subtitle_pattern.search(content))
@@ -138,14 +296,23 @@ class SRTProcessor:
     def group_subtitles_for_translation(self, subtitles: List[Dict[str, str]],
                                         lines_per_block: int = 5,
                                         max_chars_per_block: int = 500) -> List[List[Dict[str, str]]]:
-        if not subtitles:
-            return []
+        blocks = list(self.iter_groups_for_translation(subtitles, lines_per_block, max_chars_per_block))
+
+        logger.info(f"Grouped {len(subtitles)} subtitles into {len(blocks)} blocks")
+        return blocks
 
-        blocks = []
+    def iter_groups_for_translation(self, subtitles: Iterable[Dict[str, str]],
+                                    lines_per_block: int = 5,
+                                    max_chars_per_block: int = 500) -> Iterator[List[Dict[str, str]]]:
+        """
+        Incremental version of group_subtitles_for_translation: blocks are
+        yielded as soon as they are closed, so subtitles can be streamed in.
+        Empty subtitles before the first text are not part of any block.
+        """
         current_block = []
         current_char_count = 0
 
-        for i, subtitle in enumerate(subtitles):
+        for subtitle in subtitles:
             text = subtitle.get('text', '').strip()
 
             if not text:
@@ -159,7 +326,7 @@ class SRTProcessor:
             would_exceed_chars = current_char_count + text_length > max_chars_per_block
 
             if current_block and (would_exceed_lines or would_exceed_chars):
-                blocks.append(current_block)
+                yield current_block
                 current_block = []
                 current_char_count = 0
 
@@ -167,11 +334,150 @@ class SRTProcessor:
             current_char_count += text_length
 
         if current_block:
-            blocks.append(current_block)
+            yield current_block
+
+    def group_subtitles_by_tokens(self, subtitles: List[Dict[str, str]],
+                                  max_tokens_per_block: int,
+                                  max_cues_per_block: int = 40,
+                                  scene_gap_seconds: float = 5.0,
+                                  min_cues_before_scene_break: int = 3,
+                                  count_tokens: Optional[Callable[[str], int]] = None
+                                  ) -> List[List[Dict[str, str]]]:
+        """
+        Group subtitles into blocks filled up to a token budget.
+
+        Blocks are closed when the next cue would exceed max_tokens_per_block
+        or max_cues_per_block (the quality floor: LLMs drop [N] tags in very
+        long blocks), and at scene breaks - a silence of at least
+        scene_gap_seconds - once the block holds min_cues_before_scene_break
+        cues. Empty cues travel with the block they fall in.
+
+        Args:
+            subtitles: Parsed subtitles
+            max_tokens_per_block: Source token budget per block
+                (see block_token_budget)
+            max_cues_per_block: Maximum number of subtitles per block
+            scene_gap_seconds: Gap between cues treated as a scene break
+                (0 disables scene breaks)
+            min_cues_before_scene_break: Minimum block size before a scene
+                break may close it
+            count_tokens: Token counter (default: tiktoken cl100k_base)
+
+        Returns:
+            List of subtitle blocks
+        """
+        blocks = list(self.iter_groups_by_tokens(
+            subtitles, max_tokens_per_block, max_cues_per_block,
+            scene_gap_seconds, min_cues_before_scene_break, count_tokens
+        ))
+
+        logger.info(f"Grouped {len(subtitles)} subtitles into {len(blocks)} token-sized blocks "
+                    f"(budget {max_tokens_per_block} tokens)")
+        return blocks
+
+    def iter_groups_by_tokens(self, subtitles: Iterable[Dict[str, str]],
+                              max_tokens_per_block: int,
+                              max_cues_per_block: int = 40,
+                              scene_gap_seconds: float = 5.0,
+                              min_cues_before_scene_break: int = 3,
+                              count_tokens: Optional[Callable[[str], int]] = None
+                              ) -> Iterator[List[Dict[str, str]]]:
+        """Incremental version of group_subtitles_by_tokens (same arguments)."""
+        if count_tokens is None:
+            from src.core.chunking.token_chunker import default_token_counter
+            count_tokens = default_token_counter()
+
+        current_block = []
+        current_cues = 0
+        current_tokens = 0
+        previous_end = None
+
+        for subtitle in subtitles:
+            text = subtitle.get('text', '').strip()
+
+            if not text:
+                current_block.append(subtitle)
+                continue
+
+            tokens = count_tokens(text) + SRT_CUE_TAG_TOKENS
+
+            scene_break = False
+            if scene_gap_seconds > 0 and previous_end is not None:
+                try:
+                    gap = timecode_to_seconds(subtitle['start_time']) - previous_end
+                    scene_break = gap >= scene_gap_seconds
+                except (KeyError, ValueError):
+                    pass
+
+            if current_cues and (
+                current_tokens + tokens > max_tokens_per_block
+                or current_cues >= max_cues_per_block
+                or (scene_break and current_cues >= min_cues_before_scene_break)
+            ):
+                yield current_block
+                current_block = []
+                current_cues = 0
+                current_tokens = 0
+
+            current_block.append(subtitle)
+            current_cues += 1
+            current_tokens += tokens
+
+            try:
+                previous_end = timecode_to_seconds(subtitle['end_time'])
+            except (KeyError, ValueError):
+                previous_end = None
+
+        if current_block:
+            yield current_block
+
+    def group_subtitles(self, subtitles: List[Dict[str, str]],
+                        context_size: Optional[int] = None,
+                        strategy: Optional[str] = None) -> List[List[Dict[str, str]]]:
+        """
+        Group subtitles with the configured strategy (SRT_BLOCK_GROUPING).
+
+        Args:
+            subtitles: Parsed subtitles
+            context_size: Model context window in tokens, used to size
+                token blocks when SRT_MAX_TOKENS_PER_BLOCK is 0
+            strategy: "lines" (SRT_LINES_PER_BLOCK/SRT_MAX_CHARS_PER_BLOCK)
+                or "tokens"; defaults to SRT_BLOCK_GROUPING
+
+        Returns:
+            List of subtitle blocks
+        """
+        blocks = list(self.iter_groups(subtitles, context_size, strategy))
 
         logger.info(f"Grouped {len(subtitles)} subtitles into {len(blocks)} blocks")
         return blocks
 
+    def iter_groups(self, subtitles: Iterable[Dict[str, str]],
+                    context_size: Optional[int] = None,
+                    strategy: Optional[str] = None) -> Iterator[List[Dict[str, str]]]:
+        """Incremental version of group_subtitles (same arguments)."""
+        from src.config import (
+            SRT_BLOCK_GROUPING, SRT_LINES_PER_BLOCK, SRT_MAX_CHARS_PER_BLOCK,
+            SRT_MAX_TOKENS_PER_BLOCK, SRT_MAX_CUES_PER_BLOCK, SRT_SCENE_GAP_SECONDS,
+            OLLAMA_NUM_CTX
+        )
+
+        strategy = strategy or SRT_BLOCK_GROUPING
+        if strategy != 'tokens':
+            return self.iter_groups_for_translation(
+                subtitles,
+                lines_per_block=SRT_LINES_PER_BLOCK,
+                max_chars_per_block=SRT_MAX_CHARS_PER_BLOCK
+            )
+
+        max_tokens = SRT_MAX_TOKENS_PER_BLOCK or block_token_budget(context_size or OLLAMA_NUM_CTX)
+        return self.iter_groups_by_tokens(
+            subtitles,
+            max_tokens_per_block=max_tokens,
+            max_cues_per_block=SRT_MAX_CUES_PER_BLOCK,
+            scene_gap_seconds=SRT_SCENE_GAP_SECONDS
+        )
+
     def extract_block_translations(self, translated_text: str, block_indices: List[int]) -> Dict[int, str]:
         """
         Extract translations from a block with GLOBAL indices.
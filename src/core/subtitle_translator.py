@@ -1,16 +1,19 @@
 """
 Subtitle-specific translation module
 """
+import asyncio
+import re
 import time
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from tqdm.auto import tqdm
 
 from prompts.prompts import generate_subtitle_block_prompt
-from src.config import TRANSLATE_TAG_IN, TRANSLATE_TAG_OUT
+from src.config import TRANSLATE_TAG_IN, TRANSLATE_TAG_OUT, SRT_BLOCK_CONCURRENCY
 from .llm_client import create_llm_client
 from .post_processor import clean_translated_text
 from .translator import generate_translation_request
 from .epub import TagPreserver
+from src.utils.metrics import report_job_metrics
 
 
 async def translate_subtitles(subtitles: List[Dict[str, str]], source_language: str,
@@ -240,6 +243,174 @@ async def _refine_subtitle_translations(
     return refined_translations
 
 
+def _prepare_subtitle_block(block: List[Dict[str, str]]) -> Tuple[List[Tuple[int, str]], List[int]]:
+    """
+    Collect the non-empty subtitles of a block.
+
+    Returns:
+        (subtitle_tuples, block_indices): (global_index, text) pairs and the
+        global indices (0-based subtitle numbers) of the block
+    """
+    subtitle_tuples = []
+    block_indices = []  # Global indices (original)
+
+    for subtitle in block:
+        idx = int(subtitle['number']) - 1  # Convert to 0-based index
+        text = subtitle['text'].strip()
+        if text:  # Only include non-empty subtitles
+            subtitle_tuples.append((idx, text))
+            block_indices.append(idx)
+
+    return subtitle_tuples, block_indices
+
+
+def _build_previous_translation_block(block_translations: Dict[int, str]) -> str:
+    """
+    Build the context passed to following blocks (last 5 translated subtitles).
+
+    Uses LOCAL indices (0-4) for consistency with how the LLM sees the data.
+    """
+    last_subtitles = []
+    sorted_global_indices = sorted(block_translations.keys())[-5:]
+    for local_idx, global_idx in enumerate(sorted_global_indices):
+        last_subtitles.append(f"[{local_idx}]{block_translations[global_idx]}")
+    return '\n'.join(last_subtitles)
+
+
+async def _request_subtitle_block_translation(llm_client, block_idx: int,
+                                              local_subtitle_tuples: List[Tuple[int, str]],
+                                              previous_translation_block: str,
+                                              source_language: str, target_language: str,
+                                              model_name: str, custom_instructions: str,
+                                              log_callback=None) -> Optional[str]:
+    """
+    Translate one subtitle block, retrying when [N] tags are lost.
+
+    Returns:
+        Translated block text with local [N] tags, or None if all attempts failed
+    """
+    from .llm_client import default_client
+
+    # Generate system and user prompts for this block with local indices
+    prompt_pair = generate_subtitle_block_prompt(
+        local_subtitle_tuples,
+        previous_translation_block,
+        source_language,
+        target_language,
+        TRANSLATE_TAG_IN,
+        TRANSLATE_TAG_OUT,
+        custom_instructions
+    )
+
+    # Make translation request using LLM client with retry mechanism
+    max_retries = 3
+    retry_count = 0
+    translated_block_text = None
+
+    while retry_count < max_retries:
+        try:
+            if retry_count > 0 and log_callback:
+                log_callback("srt_block_retry", f"Retry attempt {retry_count} for block {block_idx+1}")
+
+            # Log the LLM request with structured data for web interface
+            if log_callback:
+                log_callback("llm_request", "Sending subtitle block to LLM", data={
+                    'type': 'llm_request',
+                    'system_prompt': prompt_pair.system,
+                    'user_prompt': prompt_pair.user,
+                    'model': model_name
+                })
+
+            # Use provided client or default - pass system and user prompts separately
+            client = llm_client or default_client
+            start_time = time.time()
+            llm_response = await client.make_request(
+                prompt_pair.user, model_name, system_prompt=prompt_pair.system
+            )
+            execution_time = time.time() - start_time
+
+            # Extract raw response content
+            full_raw_response = llm_response.content if llm_response else None
+
+            # Log the LLM response with structured data for web interface preview
+            if full_raw_response and log_callback:
+                log_callback("llm_response", "LLM Response received", data={
+                    'type': 'llm_response',
+                    'response': full_raw_response,
+                    'execution_time': execution_time,
+                    'model': model_name
+                })
+
+            if full_raw_response:
+                translated_block_text = client.extract_translation(full_raw_response)
+
+                # Validate placeholder tags if translation succeeded
+                if translated_block_text:
+                    # Check if all expected LOCAL [NUMBER] tags are present (0, 1, 2...)
+                    expected_local_indices = list(range(len(local_subtitle_tuples)))
+                    expected_tags = set(f"[{idx}]" for idx in expected_local_indices)
+                    found_tags = set()
+                    for match in re.finditer(r'\[(\d+)\]', translated_block_text):
+                        found_tags.add(match.group(0))
+
+                    missing_tags = expected_tags - found_tags
+
+                    if missing_tags:
+                        if log_callback:
+                            log_callback("srt_placeholder_validation_failed",
+                                       f"Block {block_idx+1} missing tags: {missing_tags}")
+
+                        if retry_count < max_retries - 1:
+                            # Enhance prompt with stronger instructions about preserving tags
+                            prompt_pair = generate_subtitle_block_prompt(
+                                local_subtitle_tuples,
+                                previous_translation_block,
+                                source_language,
+                                target_language,
+                                TRANSLATE_TAG_IN,
+                                TRANSLATE_TAG_OUT,
+                                custom_instructions + f"\n\nCRITICAL: You MUST preserve ALL [NUMBER] tags EXACTLY as they appear. Missing tags: {', '.join(missing_tags)}"
+                            )
+                            retry_count += 1
+                            continue
+                        else:
+                            # Final retry failed, will use original text
+                            translated_block_text = None
+                            break
+                    else:
+                        # All tags present, translation successful
+                        if retry_count > 0 and log_callback:
+                            log_callback("srt_retry_successful",
+                                       f"Block {block_idx+1} translation successful after {retry_count} retries")
+                        break
+                else:
+                    # No translation extracted
+                    if retry_count < max_retries - 1:
+                        retry_count += 1
+                        continue
+                    else:
+                        break
+            else:
+                translated_block_text = None
+                if retry_count < max_retries - 1:
+                    retry_count += 1
+                    continue
+                else:
+                    break
+
+        except Exception as e:
+            if log_callback:
+                log_callback("srt_block_translation_error", f"Error: {str(e)}")
+            translated_block_text = None
+            if retry_count < max_retries - 1:
+                retry_count += 1
+                continue
+            else:
+                break
+
+    return translated_block_text
+
+
 async def translate_subtitles_in_blocks(subtitle_blocks: List[List[Dict[str, str]]],
                                       source_language: str, target_language: str,
                                       model_name: str, api_endpoint: str,
@@ -252,10 +423,15 @@ async def translate_subtitles_in_blocks(subtitle_blocks: List[List[Dict[str, str
                                       post_processing_instructions="",
                                       checkpoint_manager=None, translation_id=None,
                                       resume_from_block_index=0,
-                                      prompt_options=None) -> Dict[int, str]:
+                                      prompt_options=None,
+                                      max_concurrent_blocks=None) -> Dict[int, str]:
     """
     Translate subtitle entries in blocks for better context preservation.
 
+    With max_concurrent_blocks > 1, several blocks are translated at once;
+    each uses the nearest finished earlier block as context, and results are
+    applied (and checkpointed) in block order.
+
     Args:
         subtitle_blocks: List of subtitle blocks (each block is a list of subtitle dicts)
         source_language: Source language
@@ -268,14 +444,18 @@ async def translate_subtitles_in_blocks(subtitle_blocks: List[List[Dict[str, str
         checkpoint_manager: CheckpointManager instance for saving progress
         translation_id: Job ID for checkpoint saving
         resume_from_block_index: Block index to resume from (for resumed jobs)
+        max_concurrent_blocks: Blocks translated concurrently
+            (default: SRT_BLOCK_CONCURRENCY, 1 = sequential)
 
     Returns:
         dict: Mapping of subtitle index to translated text
     """
     from src.core.srt_processor import SRTProcessor
-    from .llm_client import default_client
-    
+
     srt_processor = SRTProcessor()
+    if max_concurrent_blocks is None:
+        max_concurrent_blocks = SRT_BLOCK_CONCURRENCY
+    max_concurrent_blocks = max(1, max_concurrent_blocks)
     
     total_blocks = len(subtitle_blocks)
     total_subtitles = sum(len(block) for block in subtitle_blocks)
@@ -325,270 +505,190 @@ async def translate_subtitles_in_blocks(subtitle_blocks: List[List[Dict[str, str
     # Create LLM client based on provider or custom endpoint
     llm_client = create_llm_client(llm_provider, gemini_api_key, api_endpoint, model_name, openai_api_key, openrouter_api_key, log_callback=log_callback)
     
-    try:
-        for block_idx, block in enumerate(subtitle_blocks):
-            # Skip already processed blocks when resuming
-            if block_idx < resume_from_block_index:
-                continue
-
-            if check_interruption_callback and check_interruption_callback():
-                if log_callback:
-                    log_callback("srt_translation_interrupted",
-                               f"Translation interrupted at block {block_idx+1}/{total_blocks}")
-                else:
-                    tqdm.write(f"\nTranslation interrupted at block {block_idx+1}/{total_blocks}")
-                # Mark as paused when interrupted
-                if checkpoint_manager and translation_id:
-                    checkpoint_manager.mark_paused(translation_id)
-                break
-
-            # Prepare subtitle blocks with indices
-            subtitle_tuples = []
-            block_indices = []  # Global indices (original)
+    async def translate_block(block_idx: int, context: str):
+        """Translate a block; returns None for blocks without text."""
+        subtitle_tuples, block_indices = _prepare_subtitle_block(subtitle_blocks[block_idx])
+        if not subtitle_tuples:
+            return None
+
+        # Renumber to local indices (0, 1, 2...) for LLM simplicity
+        # Create mapping: local_index -> global_index
+        local_to_global = {local_idx: global_idx for local_idx, (global_idx, _) in enumerate(subtitle_tuples)}
+
+        # Create subtitle tuples with local indices for LLM
+        local_subtitle_tuples = [(local_idx, text) for local_idx, (_, text) in enumerate(subtitle_tuples)]
+
+        translated_block_text = await _request_subtitle_block_translation(
+            llm_client, block_idx, local_subtitle_tuples, context,
+            source_language, target_language, model_name, custom_instructions,
+            log_callback=log_callback
+        )
+
+        block_translations = None
+        if translated_block_text:
+            # Extract individual translations from block with local->global index remapping
+            block_translations = srt_processor.extract_block_translations_with_remapping(
+                translated_block_text, local_to_global
+            )
+        return block_indices, translated_block_text, block_translations
+
+    def block_context(result) -> str:
+        """Context a finished block provides to the blocks after it."""
+        _, translated_block_text, block_translations = result
+        if not translated_block_text:
+            return ""  # Reset context on failure
+        return _build_previous_translation_block(block_translations)
+
+    def record_block(block_idx: int, result):
+        """Apply a finished block in order: translations, checkpoint, stats."""
+        nonlocal completed_count, failed_count, completed_blocks_count, failed_blocks_count
+
+        block = subtitle_blocks[block_idx]
+        block_indices, translated_block_text, block_translations = result
+        context = block_context(result)
+
+        if translated_block_text:
+            # Update translations dictionary
+            for idx, trans_text in block_translations.items():
+                translations[idx] = trans_text
+                completed_count += 1
 
-            for subtitle in block:
-                idx = int(subtitle['number']) - 1  # Convert to 0-based index
-                text = subtitle['text'].strip()
-                if text:  # Only include non-empty subtitles
-                    subtitle_tuples.append((idx, text))
-                    block_indices.append(idx)
+            # Track failed translations in block (individual subtitles that couldn't be extracted)
+            for idx in block_indices:
+                if idx not in block_translations:
+                    # Keep original text for missing translations
+                    for subtitle in block:
+                        if int(subtitle['number']) - 1 == idx:
+                            translations[idx] = subtitle['text']
+                            failed_count += 1
+                            break
 
-            if not subtitle_tuples:
-                continue
+            # Increment completed blocks count (even if some subtitles failed in extraction)
+            completed_blocks_count += 1
+
+            # Save checkpoint after successful block translation
+            if checkpoint_manager and translation_id:
+                # Create chunk_data with block information
+                block_chunk_data = {
+                    'block_translations': block_translations,
+                    'block_indices': block_indices
+                }
+                translation_context = {
+                    'previous_translation_block': context
+                }
+                # For SRT: completed_chunks = number of BLOCKS completed (not individual subtitles)
+                checkpoint_manager.save_checkpoint(
+                    translation_id=translation_id,
+                    chunk_index=block_idx,
+                    original_text=translated_block_text,  # Store the raw LLM response
+                    translated_text=translated_block_text,
+                    chunk_data=block_chunk_data,
+                    translation_context=translation_context,
+                    total_chunks=total_blocks,
+                    completed_chunks=completed_blocks_count,
+                    failed_chunks=failed_blocks_count
+                )
 
-            # Renumber to local indices (0, 1, 2...) for LLM simplicity
-            # Create mapping: local_index -> global_index
-            local_to_global = {local_idx: global_idx for local_idx, (global_idx, _) in enumerate(subtitle_tuples)}
+        else:
+            # Block translation failed - keep original text
+            err_msg = f"Failed to translate block {block_idx+1}"
+            if log_callback:
+                log_callback("srt_block_error", err_msg)
+            else:
+                tqdm.write(f"\n{err_msg}")
 
-            # Create subtitle tuples with local indices for LLM
-            local_subtitle_tuples = [(local_idx, text) for local_idx, (_, text) in enumerate(subtitle_tuples)]
+            # Store original text for failed translations
+            failed_block_translations = {}
+            for subtitle in block:
+                idx = int(subtitle['number']) - 1
+                translations[idx] = subtitle['text']
+                failed_block_translations[idx] = subtitle['text']
+                failed_count += 1
 
-            # Generate system and user prompts for this block with local indices
-            prompt_pair = generate_subtitle_block_prompt(
-                local_subtitle_tuples,
-                previous_translation_block,
-                source_language,
-                target_language,
-                TRANSLATE_TAG_IN,
-                TRANSLATE_TAG_OUT,
-                custom_instructions
-            )
-            
-            # Make translation request using LLM client with retry mechanism
-            max_retries = 3
-            retry_count = 0
-            translated_block_text = None
+            # Increment failed blocks count
+            failed_blocks_count += 1
+
+            # Save checkpoint for failed block
+            if checkpoint_manager and translation_id:
+                block_chunk_data = {
+                    'block_translations': failed_block_translations,
+                    'block_indices': block_indices
+                }
+                translation_context = {
+                    'previous_translation_block': context
+                }
+                checkpoint_manager.save_checkpoint(
+                    translation_id=translation_id,
+                    chunk_index=block_idx,
+                    original_text="",  # No translated text for failed blocks
+                    translated_text=None,  # Mark as failed
+                    chunk_data=block_chunk_data,
+                    translation_context=translation_context,
+                    total_chunks=total_blocks,
+                    completed_chunks=completed_blocks_count,
+                    failed_chunks=failed_blocks_count
+                )
 
-            while retry_count < max_retries:
-                try:
-                    if retry_count > 0 and log_callback:
-                        log_callback("srt_block_retry", f"Retry attempt {retry_count} for block {block_idx+1}")
+        if stats_callback and total_subtitles > 0:
+            stats_callback({
+                'completed_subtitles': completed_count,
+                'failed_subtitles': failed_count,
+                'total_subtitles': total_subtitles,
+                'completed_blocks': block_idx + 1,
+                'total_blocks': total_blocks
+            })
+
+    # Up to max_concurrent_blocks blocks are in flight. Each block is sent with
+    # the context of the nearest earlier block finished when it is launched
+    # (with a single slot this is exactly the previous block). Finished blocks
+    # are recorded strictly in order, so checkpoints always cover a contiguous
+    # prefix and resume_from_block_index stays valid.
+    finished_blocks = {}  # block_idx -> result, waiting for earlier blocks
+    in_flight = {}  # task -> block_idx
+    next_block_idx = resume_from_block_index
+    next_record_idx = resume_from_block_index
+    latest_finished_idx = -1
+    interrupted = False
 
-                    # Log the LLM request with structured data for web interface
-                    if log_callback:
-                        log_callback("llm_request", "Sending subtitle block to LLM", data={
-                            'type': 'llm_request',
-                            'system_prompt': prompt_pair.system,
-                            'user_prompt': prompt_pair.user,
-                            'model': model_name
-                        })
-
-                    # Use provided client or default - pass system and user prompts separately
-                    client = llm_client or default_client
-                    start_time = time.time()
-                    llm_response = await client.make_request(
-                        prompt_pair.user, model_name, system_prompt=prompt_pair.system
-                    )
-                    execution_time = time.time() - start_time
-
-                    # Extract raw response content
-                    full_raw_response = llm_response.content if llm_response else None
-
-                    # Log the LLM response with structured data for web interface preview
-                    if full_raw_response and log_callback:
-                        log_callback("llm_response", "LLM Response received", data={
-                            'type': 'llm_response',
-                            'response': full_raw_response,
-                            'execution_time': execution_time,
-                            'model': model_name
-                        })
-
-                    if full_raw_response:
-                        translated_block_text = client.extract_translation(full_raw_response)
-
-                        # Validate placeholder tags if translation succeeded
-                        if translated_block_text:
-                            # Check if all expected LOCAL [NUMBER] tags are present (0, 1, 2...)
-                            expected_local_indices = list(range(len(local_subtitle_tuples)))
-                            expected_tags = set(f"[{idx}]" for idx in expected_local_indices)
-                            found_tags = set()
-                            import re
-                            for match in re.finditer(r'\[(\d+)\]', translated_block_text):
-                                found_tags.add(match.group(0))
-
-                            missing_tags = expected_tags - found_tags
-
-                            if missing_tags:
-                                if log_callback:
-                                    log_callback("srt_placeholder_validation_failed",
-                                               f"Block {block_idx+1} missing tags: {missing_tags}")
-
-                                if retry_count < max_retries - 1:
-                                    # Enhance prompt with stronger instructions about preserving tags
-                                    prompt_pair = generate_subtitle_block_prompt(
-                                        local_subtitle_tuples,
-                                        previous_translation_block,
-                                        source_language,
-                                        target_language,
-                                        TRANSLATE_TAG_IN,
-                                        TRANSLATE_TAG_OUT,
-                                        custom_instructions + f"\n\nCRITICAL: You MUST preserve ALL [NUMBER] tags EXACTLY as they appear. Missing tags: {', '.join(missing_tags)}"
-                                    )
-                                    retry_count += 1
-                                    continue
-                                else:
-                                    # Final retry failed, will use original text
-                                    translated_block_text = None
-                                    break
-                            else:
-                                # All tags present, translation successful
-                                if retry_count > 0 and log_callback:
-                                    log_callback("srt_retry_successful",
-                                               f"Block {block_idx+1} translation successful after {retry_count} retries")
-                                break
-                        else:
-                            # No translation extracted
-                            if retry_count < max_retries - 1:
-                                retry_count += 1
-                                continue
-                            else:
-                                break
-                    else:
-                        translated_block_text = None
-                        if retry_count < max_retries - 1:
-                            retry_count += 1
-                            continue
-                        else:
-                            break
-                            
-                except Exception as e:
+    try:
+        while True:
+            while (not interrupted and next_block_idx < total_blocks
+                   and len(in_flight) < max_concurrent_blocks):
+                if check_interruption_callback and check_interruption_callback():
                     if log_callback:
-                        log_callback("srt_block_translation_error", f"Error: {str(e)}")
-                    translated_block_text = None
-                    if retry_count < max_retries - 1:
-                        retry_count += 1
-                        continue
+                        log_callback("srt_translation_interrupted",
+                                   f"Translation interrupted at block {next_block_idx+1}/{total_blocks}")
                     else:
-                        break
-            
-            if translated_block_text:
-                # Extract individual translations from block with local->global index remapping
-                block_translations = srt_processor.extract_block_translations_with_remapping(
-                    translated_block_text, local_to_global
-                )
+                        tqdm.write(f"\nTranslation interrupted at block {next_block_idx+1}/{total_blocks}")
+                    # Mark as paused when interrupted
+                    if checkpoint_manager and translation_id:
+                        checkpoint_manager.mark_paused(translation_id)
+                    interrupted = True
+                    break
+
+                task = asyncio.ensure_future(translate_block(next_block_idx, previous_translation_block))
+                in_flight[task] = next_block_idx
+                next_block_idx += 1
+
+            if not in_flight:
+                break
 
-                # Update translations dictionary
-                for idx, trans_text in block_translations.items():
-                    translations[idx] = trans_text
-                    completed_count += 1
-
-                # Track failed translations in block (individual subtitles that couldn't be extracted)
-                subtitles_failed_in_block = 0
-                for idx in block_indices:
-                    if idx not in block_translations:
-                        # Keep original text for missing translations
-                        for subtitle in block:
-                            if int(subtitle['number']) - 1 == idx:
-                                translations[idx] = subtitle['text']
-                                failed_count += 1
-                                subtitles_failed_in_block += 1
-                                break
-
-                # Increment completed blocks count (even if some subtitles failed in extraction)
-                completed_blocks_count += 1
-
-                # Store translated block for context (last 5 subtitles)
-                # Use LOCAL indices (0-4) for consistency with how the LLM sees the data
-                last_subtitles = []
-                sorted_global_indices = sorted(block_translations.keys())[-5:]
-                for local_idx, global_idx in enumerate(sorted_global_indices):
-                    last_subtitles.append(f"[{local_idx}]{block_translations[global_idx]}")
-                previous_translation_block = '\n'.join(last_subtitles)
-
-                # Save checkpoint after successful block translation
-                if checkpoint_manager and translation_id:
-                    # Create chunk_data with block information
-                    block_chunk_data = {
-                        'block_translations': block_translations,
-                        'block_indices': block_indices
-                    }
-                    translation_context = {
-                        'previous_translation_block': previous_translation_block
-                    }
-                    # For SRT: completed_chunks = number of BLOCKS completed (not individual subtitles)
-                    checkpoint_manager.save_checkpoint(
-                        translation_id=translation_id,
-                        chunk_index=block_idx,
-                        original_text=translated_block_text,  # Store the raw LLM response
-                        translated_text=translated_block_text,
-                        chunk_data=block_chunk_data,
-                        translation_context=translation_context,
-                        total_chunks=total_blocks,
-                        completed_chunks=completed_blocks_count,
-                        failed_chunks=failed_blocks_count
-                    )
-                
-            else:
-                # Block translation failed - keep original text
-                err_msg = f"Failed to translate block {block_idx+1}"
-                if log_callback:
-                    log_callback("srt_block_error", err_msg)
-                else:
-                    tqdm.write(f"\n{err_msg}")
+            # Blocks already sent are finished even when interrupted
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                block_idx = in_flight.pop(task)
+                result = task.result()
+                finished_blocks[block_idx] = result
+                if result is not None and block_idx > latest_finished_idx:
+                    latest_finished_idx = block_idx
+                    previous_translation_block = block_context(result)
+
+            while next_record_idx in finished_blocks:
+                result = finished_blocks.pop(next_record_idx)
+                if result is not None:
+                    record_block(next_record_idx, result)
+                next_record_idx += 1
 
-                # Store original text for failed translations
-                failed_block_translations = {}
-                for subtitle in block:
-                    idx = int(subtitle['number']) - 1
-                    translations[idx] = subtitle['text']
-                    failed_block_translations[idx] = subtitle['text']
-                    failed_count += 1
-
-                # Increment failed blocks count
-                failed_blocks_count += 1
-
-                previous_translation_block = ""  # Reset context on failure
-
-                # Save checkpoint for failed block
-                if checkpoint_manager and translation_id:
-                    block_chunk_data = {
-                        'block_translations': failed_block_translations,
-                        'block_indices': block_indices
-                    }
-                    translation_context = {
-                        'previous_translation_block': previous_translation_block
-                    }
-                    checkpoint_manager.save_checkpoint(
-                        translation_id=translation_id,
-                        chunk_index=block_idx,
-                        original_text="",  # No translated text for failed blocks
-                        translated_text=None,  # Mark as failed
-                        chunk_data=block_chunk_data,
-                        translation_context=translation_context,
-                        total_chunks=total_blocks,
-                        completed_chunks=completed_blocks_count,
-                        failed_chunks=failed_blocks_count
-                    )
-            
-            if stats_callback and total_subtitles > 0:
-                stats_callback({
-                    'completed_subtitles': completed_count,
-                    'failed_subtitles': failed_count,
-                    'total_subtitles': total_subtitles,
-                    'completed_blocks': block_idx + 1,
-                    'total_blocks': total_blocks
-                })
-        
         if log_callback:
             log_callback("srt_block_translation_complete",
                         f"Completed block translation: {completed_count} successful, {failed_count} failed")
@@ -619,8 +719,13 @@ async def translate_subtitles_in_blocks(subtitle_blocks: List[List[Dict[str, str
             translations = refined_translations
 
     finally:
+        # Blocks still in flight only remain after an error
+        for task in in_flight:
+            task.cancel()
+
         # Clean up LLM client resources if created
         if llm_client:
+            report_job_metrics(llm_client, log_callback, checkpoint_manager, translation_id)
             await llm_client.close()
 
     return translations
\ No newline at end of file
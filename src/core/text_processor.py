@@ -2,7 +2,7 @@
 Text processing module for chunking and context management
 """
 import re
-from typing import List, Dict, Optional, TYPE_CHECKING
+from typing import List, Dict, Iterator, Optional, TYPE_CHECKING
 
 from src.config import SENTENCE_TERMINATORS
 
@@ -14,6 +14,30 @@ if TYPE_CHECKING:
 # All text chunking now uses token-based approach via split_text_into_chunks()
 
 
+def _create_token_chunker(
+    config: Optional['TranslationConfig'] = None,
+    max_tokens_per_chunk: Optional[int] = None,
+    soft_limit_ratio: Optional[float] = None
+):
+    """Create a TokenChunker from explicit settings, a TranslationConfig or the defaults."""
+    from src.config import MAX_TOKENS_PER_CHUNK, SOFT_LIMIT_RATIO
+
+    # Determine settings from config or defaults
+    if config is not None:
+        _max_tokens = max_tokens_per_chunk if max_tokens_per_chunk is not None else config.max_tokens_per_chunk
+        _soft_limit = soft_limit_ratio if soft_limit_ratio is not None else config.soft_limit_ratio
+    else:
+        _max_tokens = max_tokens_per_chunk if max_tokens_per_chunk is not None else MAX_TOKENS_PER_CHUNK
+        _soft_limit = soft_limit_ratio if soft_limit_ratio is not None else SOFT_LIMIT_RATIO
+
+    # Token-based chunking
+    from src.core.chunking.token_chunker import TokenChunker
+    return TokenChunker(
+        max_tokens=_max_tokens,
+        soft_limit_ratio=_soft_limit
+    )
+
+
 def split_text_into_chunks(
     text: str,
     config: Optional['TranslationConfig'] = None,
@@ -32,20 +56,33 @@ def split_text_into_chunks(
     Returns:
         List of chunk dictionaries with context_before, main_content, context_after
     """
-    from src.config import MAX_TOKENS_PER_CHUNK, SOFT_LIMIT_RATIO
+    chunker = _create_token_chunker(config, max_tokens_per_chunk, soft_limit_ratio)
+    return chunker.chunk_text(text)
 
-    # Determine settings from config or defaults
-    if config is not None:
-        _max_tokens = max_tokens_per_chunk if max_tokens_per_chunk is not None else config.max_tokens_per_chunk
-        _soft_limit = soft_limit_ratio if soft_limit_ratio is not None else config.soft_limit_ratio
-    else:
-        _max_tokens = max_tokens_per_chunk if max_tokens_per_chunk is not None else MAX_TOKENS_PER_CHUNK
-        _soft_limit = soft_limit_ratio if soft_limit_ratio is not None else SOFT_LIMIT_RATIO
 
-    # Token-based chunking
-    from src.core.chunking.token_chunker import TokenChunker
-    chunker = TokenChunker(
-        max_tokens=_max_tokens,
-        soft_limit_ratio=_soft_limit
-    )
-    return chunker.chunk_text(text)
\ No newline at end of file
+def iter_file_chunks(
+    file_path: str,
+    config: Optional['TranslationConfig'] = None,
+    max_tokens_per_chunk: Optional[int] = None,
+    soft_limit_ratio: Optional[float] = None,
+    encoding: str = 'utf-8'
+) -> Iterator[Dict[str, str]]:
+    """
+    Stream the chunks of a text file without loading it into memory.
+
+    Yields the same chunks as split_text_into_chunks(file contents), reading
+    the file through a buffered reader a block at a time.
+
+    Args:
+        file_path: Path to the text file
+        config: TranslationConfig object (optional, for default values)
+        max_tokens_per_chunk: Override for max tokens per chunk
+        soft_limit_ratio: Override for soft limit ratio
+        encoding: File encoding
+
+    Yields:
+        Chunk dictionaries with context_before, main_content, context_after
+    """
+    chunker = _create_token_chunker(config, max_tokens_per_chunk, soft_limit_ratio)
+    with open(file_path, 'r', encoding=encoding) as f:
+        yield from chunker.iter_chunks(chunker.iter_paragraphs(f))
\ No newline at end of file
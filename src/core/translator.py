@@ -13,17 +13,21 @@ from src.config import (
 from prompts.prompts import generate_translation_prompt, generate_subtitle_block_prompt, generate_refinement_prompt
 from prompts.examples import ensure_example_ready, has_example_for_pair, PLACEHOLDER_EXAMPLES
 from .llm_client import default_client, LLMClient, create_llm_client, LLMResponse
+from .llm.utils.prompt_cache import prompt_cache_summary
+from src.utils.metrics import report_job_metrics
+from src.utils.tracing import span
 from .llm import ContextOverflowError, RepetitionLoopError
 from .post_processor import clean_translated_text
 from .context_optimizer import (
     AdaptiveContextManager,
     validate_configuration,
     INITIAL_CONTEXT_SIZE,
-    CONTEXT_STEP
+    CONTEXT_STEP,
+    estimate_request_tokens
 )
 from .progress_tracker import TokenProgressTracker
 from .chunking.token_chunker import TokenChunker
-from typing import List, Dict, Tuple, Optional
+from typing import Iterable, List, Dict, Tuple, Optional
 
 
 # Configuration for context overflow recovery
@@ -31,6 +35,70 @@ MAX_CHUNK_REDUCTION_ATTEMPTS = 3
 CHUNK_REDUCTION_FACTOR = 0.6  # Reduce to 60% of original size each attempt
 MIN_CHUNK_CHARACTERS = 200  # Minimum chunk size to attempt translation
 
+# Upper estimate of the previous-translation context (last 25 words) in a prompt
+PREVIOUS_CONTEXT_TOKENS = 64
+
+
+def plan_job_context(context_manager: AdaptiveContextManager, llm_client: LLMClient,
+                     chunks: Iterable[Dict], source_language: str, target_language: str,
+                     model_name: str, prompt_options: Optional[Dict] = None,
+                     has_placeholders: bool = False, previous_context: bool = True,
+                     content_tokens: Optional[List[int]] = None) -> int:
+    """
+    Size an adaptive context once for the whole job, from its largest request.
+
+    The thinking status comes from the cache or the known model lists:
+    probing would load the model before its size is known.
+
+    Args:
+        context_manager: Adaptive context manager of the job
+        llm_client: LLM client of the job (receives the planned context window
+            and is told the context is final, see LLMClient.start_warm_up)
+        chunks: Chunks still to translate ('main_content', optional
+            'context_before' and 'context_after')
+        source_language: Source language
+        target_language: Target language
+        model_name: LLM model name
+        prompt_options: Prompt customization options of the job
+        has_placeholders: Whether requests include the placeholder instructions
+        previous_context: Whether requests include the previous translation
+        content_tokens: Token counts of the main contents, if already counted
+
+    Returns:
+        The planned context size
+    """
+    token_counter = TokenChunker(max_tokens=800)  # Just for counting, max doesn't matter
+    is_thinking_model = llm_client.get_is_thinking_model()
+    if is_thinking_model is None:
+        is_thinking_model = any(tm in model_name.lower() for tm in THINKING_MODELS)
+
+    prompt_overhead = sum(token_counter.count_tokens(part) for part in generate_translation_prompt(
+        "", "", "", "", source_language, target_language,
+        has_placeholders=has_placeholders, prompt_options=prompt_options
+    ))
+    if previous_context:
+        prompt_overhead += PREVIOUS_CONTEXT_TOKENS
+
+    request_tokens = []
+    for i, chunk in enumerate(chunks):
+        main_content = chunk.get('main_content') or ''
+        if not main_content.strip():
+            continue
+        tokens = content_tokens[i] if content_tokens is not None else token_counter.count_tokens(main_content)
+        request_tokens.append(estimate_request_tokens(
+            prompt_overhead + tokens
+            + token_counter.count_tokens(chunk.get('context_before') or '')
+            + token_counter.count_tokens(chunk.get('context_after') or ''),
+            tokens,
+            is_thinking_model
+        ))
+
+    planned = context_manager.plan(request_tokens)
+    context_manager.apply_to_client(llm_client)
+    # A warm-up waiting for the plan now loads the model at the planned size
+    llm_client.context_planned()
+    return planned
+
 
 def split_chunk_for_retry(main_content: str, target_ratio: float = 0.5) -> Tuple[str, str]:
     """
@@ -177,17 +245,18 @@ async def _make_llm_request_with_adaptive_context(
     while current_content.strip():
         try:
             # Generate prompts
-            prompt_pair = generate_translation_prompt(
-                current_content,
-                context_before,
-                context_after,
-                previous_translation_context,
-                source_language,
-                target_language,
-                has_placeholders=has_placeholders,
-                prompt_options=prompt_options,
-                placeholder_format=placeholder_format
-            )
+            with span("prompt.build"):
+                prompt_pair = generate_translation_prompt(
+                    current_content,
+                    context_before,
+                    context_after,
+                    previous_translation_context,
+                    source_language,
+                    target_language,
+                    has_placeholders=has_placeholders,
+                    prompt_options=prompt_options,
+                    placeholder_format=placeholder_format
+                )
 
             # Log the request
             if log_callback and reduction_attempt == 0:
@@ -203,14 +272,14 @@ async def _make_llm_request_with_adaptive_context(
 
             # Set context from manager if available
             if context_manager and hasattr(client, 'context_window'):
-                new_ctx = context_manager.get_context_size()
-                if client.context_window != new_ctx:
+                old_ctx = context_manager.apply_to_client(client)
+                if old_ctx is not None:
+                    new_ctx = context_manager.get_context_size()
                     if log_callback:
                         log_callback("context_update",
-                            f"📐 Updating context window: {client.context_window} → {new_ctx}")
+                            f"📐 Updating context window: {old_ctx} → {new_ctx}")
                     else:
-                        tqdm.write(f"\n📐 Context: {client.context_window} → {new_ctx}")
-                client.context_window = new_ctx
+                        tqdm.write(f"\n📐 Context: {old_ctx} → {new_ctx}")
 
             llm_response = await client.generate(
                 prompt_pair.user, system_prompt=prompt_pair.system
@@ -220,6 +289,9 @@ async def _make_llm_request_with_adaptive_context(
             if not llm_response:
                 return None, main_content, None
 
+            if context_manager:
+                context_manager.record_load_duration(llm_response.load_duration)
+
             last_response = llm_response
             full_raw_response = llm_response.content
 
@@ -237,12 +309,15 @@ async def _make_llm_request_with_adaptive_context(
                     'type': 'llm_response',
                     'response': full_raw_response,
                     'execution_time': execution_time,
+                    'time_to_first_token': llm_response.time_to_first_token,
+                    'tokens_per_second': llm_response.tokens_per_second,
                     'model': model,
                     'tokens': {
                         'prompt': llm_response.prompt_tokens,
                         'completion': llm_response.completion_tokens,
                         'total': llm_response.context_used,
-                        'limit': llm_response.context_limit
+                        'limit': llm_response.context_limit,
+                        'cached': llm_response.cached_tokens
                     }
                 })
 
@@ -485,6 +560,7 @@ async def translate_chunks(chunks, source_language, target_language, model_name,
     Returns:
         tuple: (list of translated chunks, TokenProgressTracker instance)
     """
+    job_started_at = time.perf_counter()
     total_chunks = len(chunks)
     full_translation_parts = []
     last_successful_llm_context = ""
@@ -496,8 +572,10 @@ async def translate_chunks(chunks, source_language, target_language, model_name,
     token_counter = TokenChunker(max_tokens=800)  # Just for counting, max doesn't matter
 
     # Register all chunks with their token counts
+    chunk_token_counts = []
     for chunk in chunks:
         token_count = token_counter.count_tokens(chunk.get('main_content', ''))
+        chunk_token_counts.append(token_count)
         progress_tracker.register_chunk(token_count)
 
     # Get chunk_size from first chunk (assuming consistent chunking)
@@ -584,9 +662,19 @@ async def translate_chunks(chunks, source_language, target_language, model_name,
                 f"🎯 Adaptive context enabled ({model_type} model): starting at {initial_context} tokens, "
                 f"max={MAX_CONTEXT_SIZE}, step={CONTEXT_STEP}")
 
-    # Detect thinking model status before translation loop
-    if llm_client and llm_provider == "ollama":
-        await llm_client.detect_thinking_model()
+    # Size the context once for the whole job, from the largest remaining request
+    if context_manager:
+        plan_job_context(
+            context_manager, llm_client, chunks[resume_from_index:],
+            source_language, target_language, model_name,
+            prompt_options=prompt_options,
+            content_tokens=chunk_token_counts[resume_from_index:]
+        )
+
+    # Load the model at its final size and probe its thinking behavior in the
+    # background; the first request waits for the probes if still running
+    if llm_client:
+        llm_client.start_warm_up(log_callback, job_started_at=job_started_at)
 
     try:
         iterator = tqdm(chunks, desc=f"Translating {source_language} to {target_language}", unit="seg") if not log_callback else chunks
@@ -621,7 +709,8 @@ async def translate_chunks(chunks, source_language, target_language, model_name,
                     ctx_stats = context_manager.get_stats()
                     log_callback("context_adaptive",
                         f"📊 Context stats: current={ctx_stats['current_context']}, "
-                        f"avg_usage={ctx_stats['avg_usage']:.0f}, max_usage={ctx_stats['max_usage']}")
+                        f"avg_usage={ctx_stats['avg_usage']:.0f}, max_usage={ctx_stats['max_usage']}, "
+                        f"reloads={ctx_stats['reloads']} ({ctx_stats['reload_time']:.1f}s)")
 
             main_content_to_translate = chunk_data["main_content"]
             context_before_text = chunk_data["context_before"]
@@ -734,8 +823,18 @@ async def translate_chunks(chunks, source_language, target_language, model_name,
                 )
     
     finally:
+        if context_manager and log_callback:
+            ctx_stats = context_manager.get_stats()
+            log_callback("context_adaptive",
+                f"📊 Context: final={ctx_stats['current_context']}, "
+                f"model reloads={ctx_stats['reloads']} ({ctx_stats['reload_time']:.1f}s)")
+
         # Clean up LLM client resources if created
         if llm_client:
+            cache_summary = prompt_cache_summary(llm_client.prompt_cache_stats)
+            if cache_summary and log_callback:
+                log_callback("prompt_cache_summary", cache_summary)
+            report_job_metrics(llm_client, log_callback, checkpoint_manager, translation_id)
             await llm_client.close()
 
     return full_translation_parts, progress_tracker
@@ -805,9 +904,7 @@ async def _make_refinement_request(
 
         # Set context from manager if available
         if context_manager and hasattr(client, 'context_window'):
-            new_ctx = context_manager.get_context_size()
-            if client.context_window != new_ctx:
-                client.context_window = new_ctx
+            context_manager.apply_to_client(client)
 
         llm_response = await client.make_request(
             prompt_pair.user, model, system_prompt=prompt_pair.system
@@ -817,6 +914,9 @@ async def _make_refinement_request(
         if not llm_response:
             return None, None
 
+        if context_manager:
+            context_manager.record_load_duration(llm_response.load_duration)
+
         full_raw_response = llm_response.content
 
         # Log the response
@@ -825,6 +925,8 @@ async def _make_refinement_request(
                 'type': 'refinement_response',
                 'response': full_raw_response,
                 'execution_time': execution_time,
+                'time_to_first_token': llm_response.time_to_first_token,
+                'tokens_per_second': llm_response.tokens_per_second,
                 'model': model,
                 'tokens': {
                     'prompt': llm_response.prompt_tokens,
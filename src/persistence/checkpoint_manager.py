@@ -7,6 +7,8 @@ import shutil
 from typing import Optional, Dict, List, Any, Tuple
 from pathlib import Path
 from .database import Database
+from src.utils.tracing import traced
+from .compression import compress_bytes, decompress_bytes, COMPRESSED_FILE_SUFFIX
 
 
 class CheckpointManager:
@@ -33,16 +35,18 @@ class CheckpointManager:
         translation_id: str,
         file_type: str,
         config: Dict[str, Any],
-        input_file_path: Optional[str] = None
+        input_file_path: Optional[str] = None,
+        input_file_paths: Optional[List[str]] = None
     ) -> bool:
         """
         Start tracking a new translation job.
 
         Args:
             translation_id: Unique job identifier
-            file_type: Type of file (txt, srt, epub)
+            file_type: Type of file (txt, srt, epub, batch)
             config: Full translation configuration
             input_file_path: Path to input file (will be preserved if it's a temp file)
+            input_file_paths: Paths of the input files of a batch job (all preserved)
 
         Returns:
             True if started successfully
@@ -50,6 +54,8 @@ class CheckpointManager:
         # Preserve input file first (updates config with preserved_input_path)
         if input_file_path:
             self._preserve_input_file(translation_id, input_file_path, config)
+        if input_file_paths:
+            self._preserve_input_files(translation_id, input_file_paths, config)
 
         # Create job in database with updated config and server session ID
         success = self.db.create_job(
@@ -83,6 +89,47 @@ class CheckpointManager:
         """
         return self.db.update_job_config(translation_id, config)
 
+    def save_job_metrics(self, translation_id: str, metrics: Dict[str, Any]) -> bool:
+        """
+        Write the request metrics of a job into its record.
+
+        Args:
+            translation_id: Job identifier
+            metrics: Serialized MetricsRegistry
+
+        Returns:
+            True if updated successfully
+        """
+        return self.db.update_job_metrics(translation_id, metrics)
+
+    @traced("checkpoint.save_chunk_plan")
+    def save_chunk_plan(self, translation_id: str, kind: str, items: List[Any]) -> bool:
+        """
+        Save the chunk plan of a job so a resume reuses the exact same chunks.
+
+        Args:
+            translation_id: Job identifier
+            kind: Plan type (txt_chunks, srt_blocks)
+            items: List of chunks/blocks computed at job start
+
+        Returns:
+            True if saved successfully
+        """
+        return self.db.save_chunk_plan(translation_id, kind, items)
+
+    def load_chunk_plan(self, translation_id: str, kind: str) -> Optional[List[Any]]:
+        """
+        Load the chunk plan saved for a job.
+
+        Args:
+            translation_id: Job identifier
+            kind: Plan type (txt_chunks, srt_blocks)
+
+        Returns:
+            List of chunks/blocks or None if no plan was saved
+        """
+        return self.db.get_chunk_plan(translation_id, kind)
+
     def _preserve_input_file(
         self,
         translation_id: str,
@@ -121,6 +168,44 @@ class CheckpointManager:
         except Exception as e:
             print(f"Warning: Could not preserve input file: {e}")
 
+    def _preserve_input_files(
+        self,
+        translation_id: str,
+        input_file_paths: List[str],
+        config: Dict[str, Any]
+    ):
+        """
+        Preserve the input files of a batch job for resume capability.
+
+        Args:
+            translation_id: Job identifier
+            input_file_paths: Original input file paths, in batch order
+            config: Translation configuration (updated with preserved_input_paths,
+                only when every file could be preserved)
+        """
+        preserved_paths = []
+        for file_idx, input_file_path in enumerate(input_file_paths):
+            input_path = Path(input_file_path)
+            if not input_path.exists():
+                print(f"Warning: Input file does not exist: {input_file_path}")
+                return
+
+            # One directory per file: files of a batch may share a name
+            file_upload_dir = self.uploads_dir / translation_id / str(file_idx)
+            file_upload_dir.mkdir(parents=True, exist_ok=True)
+            preserved_path = file_upload_dir / input_path.name
+
+            try:
+                shutil.copy2(input_file_path, preserved_path)
+            except Exception as e:
+                print(f"Warning: Could not preserve input file: {e}")
+                return
+            preserved_paths.append(str(preserved_path))
+
+        config['preserved_input_paths'] = preserved_paths
+        print(f"Input files preserved: {self.uploads_dir / translation_id}")
+
+    @traced("checkpoint.save_chunk")
     def save_checkpoint(
         self,
         translation_id: str,
@@ -231,14 +316,23 @@ class CheckpointManager:
             'translation_context': job.get('translation_context')
         }
 
-    def get_resumable_jobs(self) -> List[Dict[str, Any]]:
+    def get_resumable_jobs(
+        self,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[str, str]] = None
+    ) -> List[Dict[str, Any]]:
         """
         Get all jobs that can be resumed.
 
+        Args:
+            limit: Maximum number of jobs to return (None for all)
+            after: Keyset cursor (updated_at, translation_id) of the last job
+                of the previous page
+
         Returns:
             List of job summaries with progress information
         """
-        jobs = self.db.get_resumable_jobs()
+        jobs = self.db.get_resumable_jobs(limit=limit, after=after)
 
         # Enrich with additional info
         for job in jobs:
@@ -251,19 +345,10 @@ class CheckpointManager:
             else:
                 job['progress_percentage'] = 0
 
-            # Get input and output file names from config
-            config = job['config']
-
-            # Extract input filename (use file_path, then preserved_input_path as fallback)
-            input_path = config.get('file_path') or config.get('preserved_input_path', 'unknown')
-            if input_path != 'unknown':
-                job['input_filename'] = Path(input_path).name
-            else:
-                job['input_filename'] = 'unknown'
-
-            # Extract output filename
-            output_filename = config.get('output_filename', 'unknown')
-            job['output_filename'] = output_filename if output_filename != 'unknown' else 'unknown'
+            # Input path is file_path, then preserved_input_path as fallback
+            input_path = job.pop('input_path', None)
+            job['input_filename'] = Path(input_path).name if input_path else 'unknown'
+            job['output_filename'] = job.get('output_filename') or 'unknown'
 
         return jobs
 
@@ -356,17 +441,20 @@ class CheckpointManager:
         # Get all job IDs and preserved file paths from database
         try:
             import sqlite3
-            import json
             conn = sqlite3.connect(self.db.db_path)
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
-            cursor.execute("SELECT translation_id, config FROM translation_jobs")
+            # Only extract the preserved path instead of decoding every config
+            cursor.execute("""
+                SELECT translation_id,
+                       json_extract(config, '$.preserved_input_path') AS preserved_input_path
+                FROM translation_jobs
+            """)
             db_job_ids = set()
             preserved_files = set()  # Full file paths that are referenced
             for row in cursor.fetchall():
                 db_job_ids.add(row['translation_id'])
-                config = json.loads(row['config'])
-                preserved_path = config.get('preserved_input_path', '')
+                preserved_path = row['preserved_input_path']
                 if preserved_path:
                     # Store the filename to check against orphan files
                     preserved_files.add(Path(preserved_path).name)
@@ -710,6 +798,7 @@ class CheckpointManager:
         else:
             return None, f"Unknown file type: {file_type}"
 
+    @traced("checkpoint.save_epub_file")
     def save_epub_file(
         self,
         translation_id: str,
@@ -719,6 +808,8 @@ class CheckpointManager:
         """
         Save a translated XHTML file for EPUB reconstruction.
 
+        The snapshot is stored zlib-compressed (``<href>.zz``).
+
         Args:
             translation_id: Job identifier
             file_href: Relative path within EPUB (e.g., "OEBPS/chapter1.xhtml")
@@ -733,10 +824,14 @@ class CheckpointManager:
         # Preserve directory structure
         file_path = job_dir / file_href
         file_path.parent.mkdir(parents=True, exist_ok=True)
+        compressed_path = file_path.with_name(file_path.name + COMPRESSED_FILE_SUFFIX)
 
         try:
-            with open(file_path, 'wb') as f:
-                f.write(file_content)
+            with open(compressed_path, 'wb') as f:
+                f.write(compress_bytes(file_content))
+            # Drop an uncompressed snapshot left by an older version
+            if file_path.exists():
+                file_path.unlink()
             return True
         except Exception as e:
             print(f"Error saving EPUB file {file_href}: {e}")
@@ -763,8 +858,17 @@ class CheckpointManager:
 
         try:
             for file_path in translated_files_dir.rglob('*'):
-                if file_path.is_file():
-                    rel_path = file_path.relative_to(translated_files_dir)
+                if not file_path.is_file():
+                    continue
+                rel_path = file_path.relative_to(translated_files_dir)
+                if file_path.name.endswith(COMPRESSED_FILE_SUFFIX):
+                    dest_path = work_dir / rel_path.with_name(
+                        rel_path.name[:-len(COMPRESSED_FILE_SUFFIX)]
+                    )
+                    dest_path.parent.mkdir(parents=True, exist_ok=True)
+                    dest_path.write_bytes(decompress_bytes(file_path.read_bytes()))
+                else:
+                    # Uncompressed snapshot from an older version
                     dest_path = work_dir / rel_path
                     dest_path.parent.mkdir(parents=True, exist_ok=True)
                     shutil.copy2(file_path, dest_path)
@@ -773,6 +877,31 @@ class CheckpointManager:
             print(f"Error restoring EPUB files: {e}")
             return False
 
+    def list_epub_files(self, translation_id: str) -> List[str]:
+        """
+        List the EPUB files saved for a job.
+
+        Args:
+            translation_id: Job identifier
+
+        Returns:
+            Relative paths (as passed to save_epub_file) of the saved files
+        """
+        translated_files_dir = self.uploads_dir / translation_id / "translated_files"
+        if not translated_files_dir.exists():
+            return []
+
+        hrefs = []
+        for file_path in translated_files_dir.rglob('*'):
+            if not file_path.is_file():
+                continue
+            href = file_path.relative_to(translated_files_dir).as_posix()
+            if href.endswith(COMPRESSED_FILE_SUFFIX):
+                href = href[:-len(COMPRESSED_FILE_SUFFIX)]
+            hrefs.append(href)
+        return hrefs
+
+    @traced("checkpoint.save_xhtml_state")
     def save_xhtml_partial_state(
         self,
         translation_id: str,
@@ -794,7 +923,7 @@ class CheckpointManager:
             True if saved successfully
         """
         from datetime import datetime
-        import json
+        from src.utils import json_backend
 
         # Create states directory
         states_dir = self.uploads_dir / translation_id / "xhtml_states"
@@ -811,7 +940,7 @@ class CheckpointManager:
         try:
             # Serialize and save
             with open(state_file, 'w', encoding='utf-8') as f:
-                json.dump(state.to_dict(), f, ensure_ascii=False, indent=2)
+                f.write(json_backend.dumps(state.to_dict()))
 
             print(f"Partial state saved: {state_file} (chunk {state.current_chunk_index}/{len(state.chunks)})")
 
@@ -847,7 +976,7 @@ class CheckpointManager:
         Returns:
             XHTMLTranslationState instance or None if not found
         """
-        import json
+        from src.utils import json_backend
         from src.core.epub.xhtml_translation_state import XHTMLTranslationState
 
         states_dir = self.uploads_dir / translation_id / "xhtml_states"
@@ -859,7 +988,7 @@ class CheckpointManager:
 
         try:
             with open(state_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+                data = json_backend.loads(f.read())
 
             state = XHTMLTranslationState.from_dict(data)
 
@@ -0,0 +1,73 @@
+"""
+Transparent compression helpers for checkpoint storage.
+
+Large chunk texts are stored as zlib-compressed BLOBs in the same TEXT
+columns that hold plain strings. SQLite keeps the storage class of each
+value, so readers tell both apart by type and rows written before
+compression was introduced keep working unchanged.
+"""
+
+import zlib
+from typing import Optional, Union
+
+
+# Values shorter than this (in characters) are stored as plain text:
+# zlib headers and the decompression call cost more than they save.
+COMPRESSION_MIN_LENGTH = 256
+
+# zlib level for checkpoint data. Written on every chunk, so favor speed;
+# level 6 is within a few percent of level 9 on prose.
+COMPRESSION_LEVEL = 6
+
+# Suffix of compressed EPUB file snapshots on disk
+COMPRESSED_FILE_SUFFIX = '.zz'
+
+
+def compress_text(value: Optional[str]) -> Optional[Union[str, bytes]]:
+    """
+    Compress a text value for storage if it is large enough to benefit.
+
+    Args:
+        value: Text to store (or None)
+
+    Returns:
+        The original string, or zlib-compressed UTF-8 bytes when smaller
+
+    Example:
+        >>> compress_text("short")
+        'short'
+        >>> isinstance(compress_text("word " * 200), bytes)
+        True
+    """
+    if value is None or len(value) < COMPRESSION_MIN_LENGTH:
+        return value
+
+    raw = value.encode('utf-8')
+    compressed = zlib.compress(raw, COMPRESSION_LEVEL)
+    # Incompressible text (rare) stays plain so it remains readable in SQL
+    return compressed if len(compressed) < len(raw) else value
+
+
+def decompress_text(value: Optional[Union[str, bytes]]) -> Optional[str]:
+    """
+    Read back a value written by compress_text.
+
+    Args:
+        value: Stored value (plain string, compressed bytes or None)
+
+    Returns:
+        The original text
+    """
+    if isinstance(value, bytes):
+        return zlib.decompress(value).decode('utf-8')
+    return value
+
+
+def compress_bytes(data: bytes) -> bytes:
+    """Compress raw file content."""
+    return zlib.compress(data, COMPRESSION_LEVEL)
+
+
+def decompress_bytes(data: bytes) -> bytes:
+    """Decompress file content written by compress_bytes."""
+    return zlib.decompress(data)
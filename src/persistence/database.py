@@ -3,13 +3,42 @@ SQLite database manager for translation job persistence.
 """
 
 import sqlite3
-import json
 import os
 import time
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Tuple
 from datetime import datetime
 import threading
 
+from src.utils import json_backend
+from .compression import compress_bytes, decompress_bytes, compress_text, decompress_text, COMPRESSION_MIN_LENGTH
+
+
+# Config keys that used to hold a serialized chunk plan inside the job config.
+# Kept only so existing databases can be migrated to the chunk_plans table.
+LEGACY_PLAN_CONFIG_KEYS = {
+    'saved_chunks_structure': 'txt_chunks',
+    'saved_subtitle_blocks': 'srt_blocks',
+}
+
+# Bumped when stored data needs a one-time migration (PRAGMA user_version)
+# 1: large checkpoint chunk texts are stored compressed
+SCHEMA_VERSION = 1
+
+# Summary columns for job listings. Progress counters and the few config
+# fields the UI shows are extracted with JSON1 so listings never decode
+# the full config/progress documents.
+JOB_SUMMARY_COLUMNS = """
+    translation_id, status, file_type, created_at, updated_at, paused_at,
+    json_extract(progress, '$.current_chunk_index') AS current_chunk_index,
+    json_extract(progress, '$.total_chunks') AS total_chunks,
+    json_extract(progress, '$.completed_chunks') AS completed_chunks,
+    json_extract(progress, '$.failed_chunks') AS failed_chunks,
+    json_extract(progress, '$.start_time') AS start_time,
+    coalesce(nullif(json_extract(config, '$.file_path'), ''),
+             nullif(json_extract(config, '$.preserved_input_path'), '')) AS input_path,
+    json_extract(config, '$.output_filename') AS output_filename
+"""
+
 
 class Database:
     """
@@ -61,6 +90,7 @@ class Database:
                     progress JSON NOT NULL,
                     translation_context JSON,
                     server_session_id TEXT,
+                    metrics JSON,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     paused_at TIMESTAMP,
@@ -73,6 +103,8 @@ class Database:
             columns = [row[1] for row in cursor.fetchall()]
             if 'server_session_id' not in columns:
                 cursor.execute("ALTER TABLE translation_jobs ADD COLUMN server_session_id TEXT")
+            if 'metrics' not in columns:
+                cursor.execute("ALTER TABLE translation_jobs ADD COLUMN metrics JSON")
 
             # Checkpoint chunks table
             cursor.execute("""
@@ -96,13 +128,120 @@ class Database:
                 ON translation_jobs(status)
             """)
 
+            # Backs job listings: filter on status, keyset-paginate on
+            # (updated_at, translation_id). created_at is included so the page
+            # selection is answered from the index alone.
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_jobs_status_updated
+                ON translation_jobs(status, updated_at, translation_id, created_at)
+            """)
+
             cursor.execute("""
                 CREATE INDEX IF NOT EXISTS idx_chunks_translation
                 ON checkpoint_chunks(translation_id)
             """)
 
+            # Chunk plans table: the chunk/block structure computed at job start,
+            # stored compressed and apart from the job config so that job
+            # listings never have to decode whole books of text.
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS chunk_plans (
+                    translation_id TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    item_count INTEGER NOT NULL,
+                    plan BLOB NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (translation_id, kind),
+                    FOREIGN KEY (translation_id) REFERENCES translation_jobs(translation_id)
+                        ON DELETE CASCADE
+                )
+            """)
+
+            self._migrate_legacy_chunk_plans(cursor)
+
+            cursor.execute("PRAGMA user_version")
+            if cursor.fetchone()[0] < 1:
+                self._compress_legacy_chunks(cursor)
+            cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
             conn.commit()
 
+    def _migrate_legacy_chunk_plans(self, cursor: sqlite3.Cursor):
+        """
+        Move chunk plans stored in the job config into the chunk_plans table.
+
+        Only rows whose config still contains one of the legacy keys are
+        decoded, so this is a no-op on already migrated databases.
+        """
+        conditions = " OR ".join("config LIKE ?" for _ in LEGACY_PLAN_CONFIG_KEYS)
+        cursor.execute(
+            f"SELECT translation_id, config FROM translation_jobs WHERE {conditions}",
+            [f'%"{key}"%' for key in LEGACY_PLAN_CONFIG_KEYS]
+        )
+        for row in cursor.fetchall():
+            try:
+                config = json_backend.loads(row['config'])
+            except (TypeError, ValueError):
+                continue
+
+            for key, kind in LEGACY_PLAN_CONFIG_KEYS.items():
+                serialized = config.pop(key, None)
+                if not serialized:
+                    continue
+                items = json_backend.loads(serialized) if isinstance(serialized, str) else serialized
+                cursor.execute("""
+                    INSERT OR REPLACE INTO chunk_plans
+                    (translation_id, kind, item_count, plan)
+                    VALUES (?, ?, ?, ?)
+                """, (row['translation_id'], kind, len(items), self._encode_plan(items)))
+
+            cursor.execute(
+                "UPDATE translation_jobs SET config = ? WHERE translation_id = ?",
+                (json_backend.dumps(config), row['translation_id'])
+            )
+
+    def _compress_legacy_chunks(self, cursor: sqlite3.Cursor):
+        """
+        Compress checkpoint chunk texts written before compression existed.
+
+        Only plain-text values long enough to be compressed are rewritten.
+        Freed pages are reused by later writes; run VACUUM to shrink the file.
+        """
+        cursor.execute("""
+            SELECT translation_id, chunk_index, original_text, translated_text, chunk_data
+            FROM checkpoint_chunks
+            WHERE (typeof(original_text) = 'text' AND length(original_text) >= ?)
+               OR (typeof(translated_text) = 'text' AND length(translated_text) >= ?)
+               OR (typeof(chunk_data) = 'text' AND length(chunk_data) >= ?)
+        """, (COMPRESSION_MIN_LENGTH,) * 3)
+
+        updates = [
+            (
+                compress_text(decompress_text(row['original_text'])),
+                compress_text(decompress_text(row['translated_text'])),
+                compress_text(decompress_text(row['chunk_data'])),
+                row['translation_id'],
+                row['chunk_index']
+            )
+            for row in cursor.fetchall()
+        ]
+        cursor.executemany("""
+            UPDATE checkpoint_chunks
+            SET original_text = ?, translated_text = ?, chunk_data = ?
+            WHERE translation_id = ? AND chunk_index = ?
+        """, updates)
+
+    @staticmethod
+    def _encode_plan(items: List[Any]) -> bytes:
+        """Serialize and compress a chunk plan for storage."""
+        payload = json_backend.dumps(items)
+        return compress_bytes(payload.encode('utf-8'))
+
+    @staticmethod
+    def _decode_plan(blob: bytes) -> List[Any]:
+        """Decompress and deserialize a stored chunk plan."""
+        return json_backend.loads(decompress_bytes(blob))
+
     def create_job(
         self,
         translation_id: str,
@@ -143,8 +282,8 @@ class Database:
                     translation_id,
                     'running',
                     file_type,
-                    json.dumps(config),
-                    json.dumps(progress),
+                    json_backend.dumps(config),
+                    json_backend.dumps(progress),
                     server_session_id
                 ))
 
@@ -194,7 +333,7 @@ class Database:
                 if not row:
                     return False
 
-                progress = json.loads(row['progress'])
+                progress = json_backend.loads(row['progress'])
 
                 # Update fields
                 if current_chunk_index is not None:
@@ -208,7 +347,7 @@ class Database:
 
                 # Build update query
                 updates = ["progress = ?", "updated_at = CURRENT_TIMESTAMP"]
-                params = [json.dumps(progress)]
+                params = [json_backend.dumps(progress)]
 
                 if status:
                     updates.append("status = ?")
@@ -244,6 +383,8 @@ class Database:
         """
         Save a translated chunk to database.
 
+        Large texts are stored compressed (see persistence.compression).
+
         Args:
             translation_id: Job identifier
             chunk_index: Index of the chunk
@@ -268,9 +409,9 @@ class Database:
                 """, (
                     translation_id,
                     chunk_index,
-                    original_text,
-                    translated_text,
-                    json.dumps(chunk_data) if chunk_data else None,
+                    compress_text(original_text),
+                    compress_text(translated_text),
+                    compress_text(json_backend.dumps(chunk_data)) if chunk_data else None,
                     status
                 ))
 
@@ -308,9 +449,10 @@ class Database:
                     'translation_id': row['translation_id'],
                     'status': row['status'],
                     'file_type': row['file_type'],
-                    'config': json.loads(row['config']),
-                    'progress': json.loads(row['progress']),
-                    'translation_context': json.loads(row['translation_context']) if row['translation_context'] else None,
+                    'config': json_backend.loads(row['config']),
+                    'progress': json_backend.loads(row['progress']),
+                    'translation_context': json_backend.loads(row['translation_context']) if row['translation_context'] else None,
+                    'metrics': json_backend.loads(row['metrics']) if row['metrics'] else None,
                     'created_at': row['created_at'],
                     'updated_at': row['updated_at'],
                     'paused_at': row['paused_at'],
@@ -338,7 +480,7 @@ class Database:
 
                 cursor.execute(
                     "UPDATE translation_jobs SET config = ?, updated_at = CURRENT_TIMESTAMP WHERE translation_id = ?",
-                    (json.dumps(config), translation_id)
+                    (json_backend.dumps(config), translation_id)
                 )
                 conn.commit()
                 return cursor.rowcount > 0
@@ -346,6 +488,65 @@ class Database:
                 print(f"Error updating job config: {e}")
                 return False
 
+    def save_chunk_plan(self, translation_id: str, kind: str, items: List[Any]) -> bool:
+        """
+        Store the chunk plan (chunk or block structure) of a job.
+
+        Args:
+            translation_id: Job identifier
+            kind: Plan type (txt_chunks, srt_blocks)
+            items: JSON-serializable list of chunks/blocks
+
+        Returns:
+            True if saved successfully
+        """
+        with self._lock:
+            try:
+                conn = self._get_connection()
+                cursor = conn.cursor()
+
+                cursor.execute("""
+                    INSERT OR REPLACE INTO chunk_plans
+                    (translation_id, kind, item_count, plan)
+                    VALUES (?, ?, ?, ?)
+                """, (translation_id, kind, len(items), self._encode_plan(items)))
+
+                conn.commit()
+                return True
+            except Exception as e:
+                print(f"Error saving chunk plan: {e}")
+                return False
+
+    def get_chunk_plan(self, translation_id: str, kind: str) -> Optional[List[Any]]:
+        """
+        Retrieve the chunk plan of a job.
+
+        Args:
+            translation_id: Job identifier
+            kind: Plan type (txt_chunks, srt_blocks)
+
+        Returns:
+            List of chunks/blocks or None if no plan was saved
+        """
+        with self._lock:
+            try:
+                conn = self._get_connection()
+                cursor = conn.cursor()
+
+                cursor.execute(
+                    "SELECT plan FROM chunk_plans WHERE translation_id = ? AND kind = ?",
+                    (translation_id, kind)
+                )
+                row = cursor.fetchone()
+
+                if not row:
+                    return None
+
+                return self._decode_plan(row['plan'])
+            except Exception as e:
+                print(f"Error getting chunk plan: {e}")
+                return None
+
     def get_chunks(self, translation_id: str) -> List[Dict[str, Any]]:
         """
         Retrieve all chunks for a job.
@@ -369,11 +570,12 @@ class Database:
 
                 chunks = []
                 for row in cursor.fetchall():
+                    chunk_data = decompress_text(row['chunk_data'])
                     chunks.append({
                         'chunk_index': row['chunk_index'],
-                        'original_text': row['original_text'],
-                        'translated_text': row['translated_text'],
-                        'chunk_data': json.loads(row['chunk_data']) if row['chunk_data'] else None,
+                        'original_text': decompress_text(row['original_text']),
+                        'translated_text': decompress_text(row['translated_text']),
+                        'chunk_data': json_backend.loads(chunk_data) if chunk_data else None,
                         'status': row['status'],
                         'completed_at': row['completed_at']
                     })
@@ -383,28 +585,57 @@ class Database:
                 print(f"Error getting chunks: {e}")
                 return []
 
-    def get_resumable_jobs(self, max_age_days: int = 30) -> List[Dict[str, Any]]:
+    def get_resumable_jobs(
+        self,
+        max_age_days: int = 30,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[str, str]] = None
+    ) -> List[Dict[str, Any]]:
         """
-        Get all jobs that can be resumed (status = paused or interrupted).
+        Get summaries of jobs that can be resumed (status = paused or interrupted).
+
+        Only summary columns are read: progress counters and the input/output
+        file names are extracted in SQL instead of decoding each job's config.
 
         Args:
             max_age_days: Maximum age in days for resumable jobs (default 30)
+            limit: Maximum number of jobs to return (None for all)
+            after: Keyset cursor (updated_at, translation_id) of the last job
+                of the previous page; only older jobs are returned
 
         Returns:
-            List of job dictionaries
+            List of job summary dictionaries, most recently updated first
         """
         with self._lock:
             try:
                 conn = self._get_connection()
                 cursor = conn.cursor()
 
+                # Select the page from the covering index first, then extract
+                # summary columns for those rows only.
                 # Only return jobs created within max_age_days
-                cursor.execute("""
-                    SELECT * FROM translation_jobs
+                page_query = """
+                    SELECT rowid FROM translation_jobs
                     WHERE status IN ('paused', 'interrupted', 'error')
                     AND created_at > datetime('now', ? || ' days')
-                    ORDER BY updated_at DESC
-                """, (f'-{max_age_days}',))
+                """
+                params: List[Any] = [f'-{max_age_days}']
+
+                if after is not None:
+                    page_query += " AND (updated_at, translation_id) < (?, ?)"
+                    params.extend(after)
+
+                page_query += " ORDER BY updated_at DESC, translation_id DESC"
+
+                if limit is not None:
+                    page_query += " LIMIT ?"
+                    params.append(limit)
+
+                cursor.execute(f"""
+                    SELECT {JOB_SUMMARY_COLUMNS} FROM translation_jobs
+                    WHERE rowid IN ({page_query})
+                    ORDER BY updated_at DESC, translation_id DESC
+                """, params)
 
                 jobs = []
                 for row in cursor.fetchall():
@@ -412,8 +643,15 @@ class Database:
                         'translation_id': row['translation_id'],
                         'status': row['status'],
                         'file_type': row['file_type'],
-                        'config': json.loads(row['config']),
-                        'progress': json.loads(row['progress']),
+                        'progress': {
+                            'current_chunk_index': row['current_chunk_index'],
+                            'total_chunks': row['total_chunks'] or 0,
+                            'completed_chunks': row['completed_chunks'] or 0,
+                            'failed_chunks': row['failed_chunks'] or 0,
+                            'start_time': row['start_time']
+                        },
+                        'input_path': row['input_path'],
+                        'output_filename': row['output_filename'],
                         'created_at': row['created_at'],
                         'updated_at': row['updated_at'],
                         'paused_at': row['paused_at']
@@ -462,6 +700,14 @@ class Database:
                 """, (f'-{max_age_days}',))
 
                 deleted_count = cursor.rowcount
+
+                # Foreign keys are not enforced on this connection, so drop
+                # the plans of deleted jobs explicitly
+                cursor.execute("""
+                    DELETE FROM chunk_plans
+                    WHERE translation_id NOT IN (SELECT translation_id FROM translation_jobs)
+                """)
+
                 conn.commit()
                 return deleted_count
             except Exception as e:
@@ -531,7 +777,7 @@ class Database:
                     UPDATE translation_jobs
                     SET translation_context = ?, updated_at = CURRENT_TIMESTAMP
                     WHERE translation_id = ?
-                """, (json.dumps(context), translation_id))
+                """, (json_backend.dumps(context), translation_id))
 
                 conn.commit()
                 return True
@@ -539,9 +785,35 @@ class Database:
                 print(f"Error updating translation context: {e}")
                 return False
 
+    def update_job_metrics(self, translation_id: str, metrics: Dict[str, Any]) -> bool:
+        """
+        Store the request metrics of a job (see src.utils.metrics).
+
+        Args:
+            translation_id: Job identifier
+            metrics: Serialized MetricsRegistry
+
+        Returns:
+            True if updated successfully
+        """
+        with self._lock:
+            try:
+                conn = self._get_connection()
+                cursor = conn.cursor()
+
+                cursor.execute(
+                    "UPDATE translation_jobs SET metrics = ?, updated_at = CURRENT_TIMESTAMP WHERE translation_id = ?",
+                    (json_backend.dumps(metrics), translation_id)
+                )
+                conn.commit()
+                return cursor.rowcount > 0
+            except Exception as e:
+                print(f"Error updating job metrics: {e}")
+                return False
+
     def delete_job(self, translation_id: str) -> bool:
         """
-        Delete a job and all its chunks (CASCADE).
+        Delete a job with all its chunks (CASCADE) and its chunk plans.
 
         Args:
             translation_id: Job identifier
@@ -558,6 +830,10 @@ class Database:
                     "DELETE FROM translation_jobs WHERE translation_id = ?",
                     (translation_id,)
                 )
+                cursor.execute(
+                    "DELETE FROM chunk_plans WHERE translation_id = ?",
+                    (translation_id,)
+                )
 
                 conn.commit()
                 return True
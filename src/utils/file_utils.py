@@ -14,7 +14,7 @@ from src.core.translator import translate_chunks, refine_chunks
 from src.core.subtitle_translator import translate_subtitles, translate_subtitles_in_blocks
 from src.core.epub import translate_epub_file
 from src.core.srt_processor import SRTProcessor
-from src.config import DEFAULT_MODEL, API_ENDPOINT, SRT_LINES_PER_BLOCK, SRT_MAX_CHARS_PER_BLOCK
+from src.config import DEFAULT_MODEL, API_ENDPOINT
 
 
 def get_unique_output_path(output_path):
@@ -128,12 +128,11 @@ async def translate_text_file_with_callbacks(input_filepath, output_filepath,
     is_resume = checkpoint_manager and translation_id and resume_from_index > 0
 
     if is_resume:
-        # Load checkpoint data to get the original chunks structure
-        checkpoint_data = checkpoint_manager.load_checkpoint(translation_id)
-        if checkpoint_data and checkpoint_data['job'].get('config', {}).get('saved_chunks_structure'):
+        # Load the original chunks structure saved at job start
+        saved_chunks = checkpoint_manager.load_chunk_plan(translation_id, 'txt_chunks')
+        if saved_chunks:
             # Use the saved chunks structure from original translation
-            import json
-            structured_chunks = json.loads(checkpoint_data['job']['config']['saved_chunks_structure'])
+            structured_chunks = saved_chunks
             if log_callback:
                 log_callback("txt_resume_chunks", f"✅ Resuming with original chunk structure ({len(structured_chunks)} chunks)")
         else:
@@ -156,12 +155,7 @@ async def translate_text_file_with_callbacks(input_filepath, output_filepath,
     # Save the chunks structure for potential resume (for both new and resumed translations)
     # This ensures the structure is always available for future resumes
     if checkpoint_manager and translation_id and not is_resume:
-        import json
-        job = checkpoint_manager.get_job(translation_id)
-        if job:
-            config = job['config']
-            config['saved_chunks_structure'] = json.dumps(structured_chunks)
-            checkpoint_manager.update_job_config(translation_id, config)
+        if checkpoint_manager.save_chunk_plan(translation_id, 'txt_chunks', structured_chunks):
             if log_callback:
                 log_callback("txt_save_chunks_structure", f"💾 Saved chunk structure for resume capability")
 
@@ -392,12 +386,11 @@ async def translate_srt_file_with_callbacks(input_filepath, output_filepath,
     is_resume = checkpoint_manager and translation_id and resume_from_block_index > 0
 
     if is_resume:
-        # Load checkpoint data to get the original blocks structure
-        checkpoint_data = checkpoint_manager.load_checkpoint(translation_id)
-        if checkpoint_data and checkpoint_data['job'].get('config', {}).get('saved_subtitle_blocks'):
+        # Load the original blocks structure saved at job start
+        saved_blocks = checkpoint_manager.load_chunk_plan(translation_id, 'srt_blocks')
+        if saved_blocks:
             # Use the saved blocks structure from original translation
-            import json
-            subtitle_blocks = json.loads(checkpoint_data['job']['config']['saved_subtitle_blocks'])
+            subtitle_blocks = saved_blocks
             if log_callback:
                 log_callback("srt_resume_blocks", f"✅ Resuming with original block structure ({len(subtitle_blocks)} blocks)")
         else:
@@ -405,31 +398,16 @@ async def translate_srt_file_with_callbacks(input_filepath, output_filepath,
             if log_callback:
                 log_callback("srt_resume_warning", "⚠️ Warning: No saved block structure found, re-grouping (may cause alignment issues)")
                 log_callback("srt_grouping", f"Grouping {len(subtitles)} subtitles into blocks...")
-            lines_per_block = SRT_LINES_PER_BLOCK
-            subtitle_blocks = srt_processor.group_subtitles_for_translation(
-                subtitles,
-                lines_per_block=lines_per_block,
-                max_chars_per_block=SRT_MAX_CHARS_PER_BLOCK
-            )
+            subtitle_blocks = srt_processor.group_subtitles(subtitles)
     else:
         # New translation: group normally
         if log_callback:
             log_callback("srt_grouping", f"Grouping {len(subtitles)} subtitles into blocks...")
-        lines_per_block = SRT_LINES_PER_BLOCK
-        subtitle_blocks = srt_processor.group_subtitles_for_translation(
-            subtitles,
-            lines_per_block=lines_per_block,
-            max_chars_per_block=SRT_MAX_CHARS_PER_BLOCK
-        )
+        subtitle_blocks = srt_processor.group_subtitles(subtitles)
 
     # Save the blocks structure for potential resume (for new translations only)
     if checkpoint_manager and translation_id and not is_resume:
-        import json
-        job = checkpoint_manager.get_job(translation_id)
-        if job:
-            config = job['config']
-            config['saved_subtitle_blocks'] = json.dumps(subtitle_blocks)
-            checkpoint_manager.update_job_config(translation_id, config)
+        if checkpoint_manager.save_chunk_plan(translation_id, 'srt_blocks', subtitle_blocks):
             if log_callback:
                 log_callback("srt_save_blocks_structure", f"💾 Saved block structure for resume capability")
     
@@ -0,0 +1,185 @@
+"""
+Pluggable JSON backend.
+
+JSON is decoded on every streamed line of a response and encoded on every
+checkpoint. msgspec or orjson, when installed, do this several times faster
+than the standard library; the json module is used otherwise. JSON_BACKEND
+forces a backend ('auto', 'orjson', 'msgspec' or 'json').
+
+Whatever the backend:
+- loads() accepts str or bytes and raises json.JSONDecodeError on bad input
+- dumps() returns compact str with non-ASCII characters kept, and falls back
+  to the json module for objects the fast backend can't encode
+- decode_ollama_chunk() decodes a streamed Ollama line into an OllamaChunk
+  holding only the fields the provider reads (msgspec decodes straight into
+  typed structs and skips the rest of the line)
+"""
+
+import json
+from typing import Any, Callable, NamedTuple, Union
+
+from src.config import JSON_BACKEND
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+
+JSONDecodeError = json.JSONDecodeError
+
+
+class OllamaChunk(NamedTuple):
+    """Fields read from one line of an Ollama /api/chat stream"""
+    content: str = ""
+    thinking: str = ""
+    done: bool = False
+    prompt_eval_count: int = 0
+    eval_count: int = 0
+    load_duration: int = 0
+    eval_duration: int = 0
+
+
+class JSONBackend(NamedTuple):
+    """JSON functions of one backend"""
+    name: str
+    loads: Callable[[Union[str, bytes]], Any]
+    dumps: Callable[[Any], str]
+    decode_ollama_chunk: Callable[[Union[str, bytes]], OllamaChunk]
+
+
+def _std_dumps(obj: Any) -> str:
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+
+
+def _chunk_from_dict(data: Any) -> OllamaChunk:
+    if not isinstance(data, dict):
+        raise JSONDecodeError("Expected a JSON object", str(data), 0)
+    message = data.get("message") or {}
+    return OllamaChunk(
+        content=message.get("content") or "",
+        thinking=message.get("thinking") or "",
+        done=bool(data.get("done")),
+        prompt_eval_count=data.get("prompt_eval_count") or 0,
+        eval_count=data.get("eval_count") or 0,
+        load_duration=data.get("load_duration") or 0,
+        eval_duration=data.get("eval_duration") or 0
+    )
+
+
+def _std_backend() -> JSONBackend:
+    return JSONBackend("json", json.loads, _std_dumps, lambda line: _chunk_from_dict(json.loads(line)))
+
+
+def _orjson_backend() -> JSONBackend:
+    # orjson.JSONDecodeError is a json.JSONDecodeError
+    options = orjson.OPT_NON_STR_KEYS
+
+    def dumps(obj: Any) -> str:
+        try:
+            return orjson.dumps(obj, option=options).decode("utf-8")
+        except TypeError:
+            return _std_dumps(obj)
+
+    return JSONBackend("orjson", orjson.loads, dumps, lambda line: _chunk_from_dict(orjson.loads(line)))
+
+
+def _msgspec_backend() -> JSONBackend:
+    class Message(msgspec.Struct):
+        content: str = ""
+        thinking: str = ""
+
+    class Chunk(msgspec.Struct):
+        message: Message = msgspec.field(default_factory=Message)
+        done: bool = False
+        prompt_eval_count: int = 0
+        eval_count: int = 0
+        load_duration: int = 0
+        eval_duration: int = 0
+
+    encoder = msgspec.json.Encoder()
+    decoder = msgspec.json.Decoder()
+    chunk_decoder = msgspec.json.Decoder(Chunk)
+
+    def loads(data: Union[str, bytes]) -> Any:
+        try:
+            return decoder.decode(data)
+        except msgspec.DecodeError as e:
+            raise JSONDecodeError(str(e), str(data), 0) from e
+
+    def dumps(obj: Any) -> str:
+        try:
+            return encoder.encode(obj).decode("utf-8")
+        except TypeError:
+            return _std_dumps(obj)
+
+    def decode_ollama_chunk(line: Union[str, bytes]) -> OllamaChunk:
+        try:
+            chunk = chunk_decoder.decode(line)
+        except msgspec.ValidationError:
+            # Unexpected field types (e.g. null): read the line loosely
+            return _chunk_from_dict(loads(line))
+        except msgspec.DecodeError as e:
+            raise JSONDecodeError(str(e), str(line), 0) from e
+        return OllamaChunk(chunk.message.content, chunk.message.thinking, chunk.done,
+                           chunk.prompt_eval_count, chunk.eval_count,
+                           chunk.load_duration, chunk.eval_duration)
+
+    return JSONBackend("msgspec", loads, dumps, decode_ollama_chunk)
+
+
+_BACKENDS = {
+    "msgspec": (MSGSPEC_AVAILABLE, _msgspec_backend),
+    "orjson": (ORJSON_AVAILABLE, _orjson_backend),
+    "json": (True, _std_backend),
+}
+
+
+def available_backends() -> list:
+    """Names of the installed backends, fastest first"""
+    return [name for name, (available, _) in _BACKENDS.items() if available]
+
+
+def get_backend(name: str = "auto") -> JSONBackend:
+    """
+    Get a JSON backend.
+
+    Args:
+        name: 'orjson', 'msgspec', 'json', or 'auto' for the fastest installed one;
+            an unknown or missing backend falls back to 'auto'
+
+    Returns:
+        JSONBackend
+    """
+    available, factory = _BACKENDS.get(name, (False, None))
+    if not available:
+        factory = _BACKENDS[available_backends()[0]][1]
+    return factory()
+
+
+backend = get_backend(JSON_BACKEND)
+loads = backend.loads
+dumps = backend.dumps
+decode_ollama_chunk = backend.decode_ollama_chunk
+
+
+class StdlibCompatible:
+    """
+    Stand-in for the json module, for libraries that accept one
+    (python-socketio packets). Formatting arguments are ignored: the
+    output is always compact.
+    """
+
+    @staticmethod
+    def dumps(obj: Any, **kwargs) -> str:
+        return dumps(obj)
+
+    @staticmethod
+    def loads(data: Union[str, bytes], **kwargs) -> Any:
+        return loads(data)
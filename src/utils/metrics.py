@@ -0,0 +1,363 @@
+"""
+Per-request LLM metrics.
+
+Each LLM client records, for every request, the time spent waiting for a
+concurrency slot, the time to first token, the generation time, prompt and
+completion tokens, the generation speed and the retries, plus the context
+size changes and translation fallback phases of its job. Observations are
+labelled with provider, model and endpoint and go into two registries:
+
+- the job's own (LLMClient.metrics), summarized at the end of the job and
+  written into its record in the jobs database
+- the process-wide one (REGISTRY), served in Prometheus text format on
+  /metrics for capacity planning across jobs
+
+Histograms keep log-spaced buckets, as HDR histograms do: percentiles are
+exact to HISTOGRAM_PRECISION whatever the range of values, and memory only
+grows with the number of distinct orders of magnitude seen.
+"""
+
+import math
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+# Relative error of histogram percentiles
+HISTOGRAM_PRECISION = 0.01
+_LOG_BASE = math.log1p(2 * HISTOGRAM_PRECISION)
+
+# Prometheus bucket bounds of each kind of histogram
+SECONDS_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+TOKEN_BUCKETS = (64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384, 32768, 65536)
+RATE_BUCKETS = (1, 2, 5, 10, 20, 35, 50, 75, 100, 150, 250, 500)
+
+# name -> (type, help, bucket bounds)
+METRICS: Dict[str, Tuple[str, str, Tuple[float, ...]]] = {
+    "llm_queue_wait_seconds": ("histogram", "Time requests waited for a concurrency slot", SECONDS_BUCKETS),
+    "llm_time_to_first_token_seconds": ("histogram", "Time from request to first streamed token", SECONDS_BUCKETS),
+    "llm_generation_seconds": ("histogram", "Duration of LLM requests, retries included", SECONDS_BUCKETS),
+    "llm_prompt_tokens": ("histogram", "Prompt tokens per request", TOKEN_BUCKETS),
+    "llm_completion_tokens": ("histogram", "Completion tokens per request", TOKEN_BUCKETS),
+    "llm_tokens_per_second": ("histogram", "Generation speed after the first token", RATE_BUCKETS),
+    "llm_requests_total": ("counter", "LLM requests answered", ()),
+    "llm_request_failures_total": ("counter", "LLM requests that failed after all retries", ()),
+    "llm_retries_total": ("counter", "Retried attempts of LLM requests", ()),
+    "llm_context_size_changes_total": ("counter", "Context window changes (model reloads on Ollama)", ()),
+    "translation_fallbacks_total": ("counter", "Chunk retries and fallback phases (token alignment, left untranslated)", ()),
+}
+
+METRIC_PREFIX = "tbl_"
+_INF_LABEL = 'le="+Inf"'
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Histogram with log-spaced buckets (bounded relative error)"""
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.zero_count = 0  # Observations <= 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    @staticmethod
+    def _index(value: float) -> int:
+        return math.floor(math.log(value) / _LOG_BASE)
+
+    @staticmethod
+    def _value(index: int) -> float:
+        """Representative (geometric middle) of a bucket"""
+        return math.exp((index + 0.5) * _LOG_BASE)
+
+    def record(self, value: float, count: int = 1) -> None:
+        if value > 0:
+            index = self._index(value)
+            self.counts[index] = self.counts.get(index, 0) + count
+        else:
+            self.zero_count += count
+        self.count += count
+        self.sum += value * count
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: "Histogram") -> None:
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def percentile(self, percent: float) -> float:
+        """
+        Value below which percent% of the observations fall.
+
+        Args:
+            percent: 0 to 100
+
+        Returns:
+            Value, within HISTOGRAM_PRECISION (0.0 if nothing was recorded)
+        """
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * percent / 100))
+        if rank >= self.count:
+            return self.max
+        seen = self.zero_count
+        if seen >= rank:
+            return min(self.min, 0.0)
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(max(self._value(index), self.min), self.max)
+        return self.max
+
+    def cumulative(self, bounds: Tuple[float, ...]) -> List[int]:
+        """Observations <= each bound (Prometheus 'le' buckets)"""
+        result = []
+        for bound in bounds:
+            total = self.zero_count
+            if bound > 0:
+                limit = self._index(bound)
+                total += sum(count for index, count in self.counts.items() if index <= limit)
+            result.append(total)
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "counts": {str(index): count for index, count in self.counts.items()},
+            "zero_count": self.zero_count, "count": self.count, "sum": self.sum,
+            "min": self.min if self.count else None, "max": self.max if self.count else None
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Histogram":
+        histogram = cls()
+        histogram.counts = {int(index): count for index, count in data.get("counts", {}).items()}
+        histogram.zero_count = data.get("zero_count", 0)
+        histogram.count = data.get("count", 0)
+        histogram.sum = data.get("sum", 0.0)
+        if histogram.count:
+            histogram.min = data["min"]
+            histogram.max = data["max"]
+        return histogram
+
+
+def _label_key(labels: Optional[Dict[str, Any]]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in (labels or {}).items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(key: LabelKey, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in key]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class MetricsRegistry:
+    """Labelled histograms and counters (thread-safe: jobs run in worker threads)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self.counters: Dict[str, Dict[LabelKey, float]] = {}
+
+    def observe(self, name: str, value: float, labels: Optional[Dict[str, Any]] = None) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self.histograms.setdefault(name, {})
+            if key not in series:
+                series[key] = Histogram()
+            series[key].record(value)
+
+    def increment(self, name: str, labels: Optional[Dict[str, Any]] = None, amount: float = 1) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self.counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def histogram(self, name: str) -> Histogram:
+        """All series of a histogram merged together"""
+        merged = Histogram()
+        with self._lock:
+            for histogram in self.histograms.get(name, {}).values():
+                merged.merge(histogram)
+        return merged
+
+    def counter(self, name: str, **labels) -> float:
+        """Sum of the series of a counter matching the given labels"""
+        wanted = set(_label_key(labels))
+        with self._lock:
+            return sum(value for key, value in self.counters.get(name, {}).items() if wanted <= set(key))
+
+    def merge(self, other: "MetricsRegistry") -> None:
+        with other._lock:
+            histograms = {name: dict(series) for name, series in other.histograms.items()}
+            counters = {name: dict(series) for name, series in other.counters.items()}
+        with self._lock:
+            for name, series in histograms.items():
+                mine = self.histograms.setdefault(name, {})
+                for key, histogram in series.items():
+                    mine.setdefault(key, Histogram()).merge(histogram)
+            for name, series in counters.items():
+                mine = self.counters.setdefault(name, {})
+                for key, value in series.items():
+                    mine[key] = mine.get(key, 0) + value
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable state (see from_dict)"""
+        with self._lock:
+            return {
+                "histograms": {name: [{"labels": dict(key), **histogram.to_dict()}
+                                      for key, histogram in series.items()]
+                               for name, series in self.histograms.items()},
+                "counters": {name: [{"labels": dict(key), "value": value} for key, value in series.items()]
+                             for name, series in self.counters.items()}
+            }
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "MetricsRegistry":
+        registry = cls()
+        for name, series in (data or {}).get("histograms", {}).items():
+            registry.histograms[name] = {_label_key(entry.get("labels")): Histogram.from_dict(entry)
+                                         for entry in series}
+        for name, series in (data or {}).get("counters", {}).items():
+            registry.counters[name] = {_label_key(entry.get("labels")): entry.get("value", 0)
+                                       for entry in series}
+        return registry
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+        with self._lock:
+            for name, (kind, help_text, bounds) in METRICS.items():
+                full_name = METRIC_PREFIX + name
+                series = self.histograms.get(name) if kind == "histogram" else self.counters.get(name)
+                if not series:
+                    continue
+                lines.append(f"# HELP {full_name} {help_text}")
+                lines.append(f"# TYPE {full_name} {kind}")
+                for key in sorted(series):
+                    if kind == "counter":
+                        lines.append(f"{full_name}{_format_labels(key)} {_format_number(series[key])}")
+                        continue
+                    histogram = series[key]
+                    for bound, count in zip(bounds, histogram.cumulative(bounds)):
+                        le = f'le="{_format_number(bound)}"'
+                        lines.append(f"{full_name}_bucket{_format_labels(key, le)} {count}")
+                    lines.append(f"{full_name}_bucket{_format_labels(key, _INF_LABEL)} {histogram.count}")
+                    lines.append(f"{full_name}_sum{_format_labels(key)} {_format_number(histogram.sum)}")
+                    lines.append(f"{full_name}_count{_format_labels(key)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> Dict[str, Any]:
+        """Readable summary: percentiles of each histogram and counter totals"""
+        result: Dict[str, Any] = {}
+        for name, (kind, _, _) in METRICS.items():
+            if kind == "histogram":
+                histogram = self.histogram(name)
+                if histogram.count:
+                    result[name] = {
+                        "count": histogram.count, "mean": round(histogram.mean, 3),
+                        "p50": round(histogram.percentile(50), 3), "p90": round(histogram.percentile(90), 3),
+                        "p99": round(histogram.percentile(99), 3), "max": round(histogram.max, 3)
+                    }
+            else:
+                total = self.counter(name)
+                if total:
+                    result[name] = total
+        return result
+
+    def summary_line(self) -> Optional[str]:
+        """
+        One-line summary of the requests.
+
+        Returns:
+            Summary message, or None if no request was recorded
+        """
+        requests = self.counter("llm_requests_total")
+        if not requests:
+            return None
+        generation = self.histogram("llm_generation_seconds")
+        parts = [f"{int(requests)} requests",
+                 f"generation p50 {generation.percentile(50):.1f}s / p90 {generation.percentile(90):.1f}s"]
+        ttft = self.histogram("llm_time_to_first_token_seconds")
+        if ttft.count:
+            parts.append(f"first token p50 {ttft.percentile(50):.2f}s / p90 {ttft.percentile(90):.2f}s")
+        speed = self.histogram("llm_tokens_per_second")
+        if speed.count:
+            parts.append(f"{speed.percentile(50):.1f} tok/s median")
+        queue_wait = self.histogram("llm_queue_wait_seconds")
+        if queue_wait.count and queue_wait.max > 0:
+            parts.append(f"queue wait p90 {queue_wait.percentile(90):.1f}s")
+        for name, label in (("llm_retries_total", "retries"),
+                            ("llm_request_failures_total", "failures"),
+                            ("llm_context_size_changes_total", "context changes"),
+                            ("translation_fallbacks_total", "fallbacks")):
+            total = self.counter(name)
+            if total:
+                parts.append(f"{int(total)} {label}")
+        return "📈 LLM metrics: " + ", ".join(parts)
+
+
+# Process-wide registry, served on /metrics
+REGISTRY = MetricsRegistry()
+
+
+class JobMetrics(MetricsRegistry):
+    """Metrics of one job, also recorded into the process-wide registry"""
+
+    def __init__(self, parent: Optional[MetricsRegistry] = None):
+        super().__init__()
+        self.parent = REGISTRY if parent is None else parent
+
+    def observe(self, name: str, value: float, labels: Optional[Dict[str, Any]] = None) -> None:
+        super().observe(name, value, labels)
+        self.parent.observe(name, value, labels)
+
+    def increment(self, name: str, labels: Optional[Dict[str, Any]] = None, amount: float = 1) -> None:
+        super().increment(name, labels, amount)
+        self.parent.increment(name, labels, amount)
+
+
+def report_job_metrics(llm_client: Any, log_callback=None, checkpoint_manager=None,
+                       translation_id: Optional[str] = None) -> None:
+    """
+    Log the metrics summary of a job and write its metrics into the job record.
+
+    A resumed job adds its metrics to those of its earlier runs.
+
+    Args:
+        llm_client: LLM client of the job
+        log_callback: Optional logging callback
+        checkpoint_manager: Optional CheckpointManager holding the job record
+        translation_id: Job identifier
+    """
+    metrics = getattr(llm_client, "metrics", None)
+    if not isinstance(metrics, MetricsRegistry):
+        return
+
+    if checkpoint_manager and translation_id:
+        job = checkpoint_manager.get_job(translation_id) or {}
+        total = MetricsRegistry.from_dict(job.get("metrics"))
+        total.merge(metrics)
+        checkpoint_manager.save_job_metrics(translation_id, total.to_dict())
+
+    summary = metrics.summary_line()
+    if summary and log_callback:
+        log_callback("llm_metrics_summary", summary)
@@ -0,0 +1,320 @@
+"""
+On-demand profiling of a running translation job.
+
+A ProfileSession samples the stack of one thread (the job's worker thread)
+from a background thread, using sys._current_frames(), so it can be started
+on a job that is already running without restarting it or attaching a
+debugger:
+
+    session = ProfileSession(worker_thread_id, profile_output_base(output_path), memory=True)
+    files = session.run(60)
+
+CPU samples are written as a speedscope file (open it in
+https://www.speedscope.app) or as collapsed stacks (flamegraph.pl,
+speedscope, inferno...). With memory=True, tracemalloc snapshots taken at
+the start and end of the window are compared to show where memory grew;
+the final snapshot is also dumped for tracemalloc.Snapshot.load().
+
+Sampling costs one stack walk per interval on the sampler thread; the
+profiled thread itself isn't instrumented. tracemalloc slows allocations
+down noticeably while it runs, so memory snapshots are opt-in.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from src.config import PROFILE_SAMPLE_INTERVAL_MS
+
+PROFILE_FORMATS = ("speedscope", "collapsed")
+# Frames kept per allocation traceback while tracemalloc runs
+TRACEMALLOC_FRAMES = 10
+# Allocation sites listed in the memory report
+MEMORY_REPORT_LIMIT = 30
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+Frame = Tuple[str, str, int]  # (function, file, first line)
+
+# tracemalloc is process-wide: overlapping memory profiles (of two jobs)
+# share it, and the last one to stop turns it off if the first turned it on
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+_tracing_started_here = False
+
+
+def _acquire_tracing() -> None:
+    global _tracing_users, _tracing_started_here
+    with _tracing_lock:
+        # Allocations made before tracing started are invisible; the
+        # comparison only needs what grows during the window
+        if _tracing_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            _tracing_started_here = True
+        _tracing_users += 1
+
+
+def _release_tracing() -> None:
+    global _tracing_users, _tracing_started_here
+    with _tracing_lock:
+        _tracing_users -= 1
+        if _tracing_users == 0 and _tracing_started_here:
+            tracemalloc.stop()
+            _tracing_started_here = False
+
+
+def _short_path(filename: str) -> str:
+    """Project files relative to the project root, others (stdlib, site-packages) by file name"""
+    if filename.startswith(_PROJECT_ROOT + os.sep):
+        return os.path.relpath(filename, _PROJECT_ROOT)
+    return os.path.basename(filename)
+
+
+class SamplingProfiler:
+    """Samples the call stack of one thread at a fixed interval"""
+
+    def __init__(self, thread_id: int, interval: Optional[float] = None):
+        """
+        Args:
+            thread_id: threading.get_ident() of the thread to profile
+            interval: Seconds between two samples (default: PROFILE_SAMPLE_INTERVAL_MS)
+        """
+        self.thread_id = thread_id
+        self.interval = interval if interval is not None else PROFILE_SAMPLE_INTERVAL_MS / 1000
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.started_at: Optional[float] = None
+        self.duration = 0.0
+        self.thread_exited = threading.Event()
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self.started_at = time.perf_counter()
+        self._sampler = threading.Thread(target=self._run, name="profiler-sampler", daemon=True)
+        self._sampler.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._sampler is not None and self._sampler is not threading.current_thread():
+            self._sampler.join()
+        if self.started_at is not None:
+            self.duration = time.perf_counter() - self.started_at
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            if not self.sample():
+                self.thread_exited.set()
+                return
+
+    def sample(self) -> bool:
+        """
+        Record the current stack of the profiled thread.
+
+        Returns:
+            False once the thread has exited
+        """
+        frame = sys._current_frames().get(self.thread_id)
+        if frame is None:
+            return False
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+            frame = frame.f_back
+        stack.reverse()
+        self.stacks[tuple(stack)] += 1
+        self.samples += 1
+        return True
+
+    @staticmethod
+    def frame_name(frame: Frame) -> str:
+        function, filename, line = frame
+        return f"{function} ({_short_path(filename)}:{line})"
+
+    def to_collapsed(self) -> str:
+        """Collapsed stacks, one 'root;...;leaf count' line per distinct stack"""
+        lines = []
+        for stack, count in self.stacks.most_common():
+            names = (self.frame_name(frame).replace(";", ":") for frame in stack)
+            lines.append(f"{';'.join(names)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def to_speedscope(self, name: str) -> Dict:
+        """Samples as a speedscope 'sampled' profile, weighted in seconds"""
+        frame_index: Dict[Frame, int] = {}
+        frames: List[Dict] = []
+        samples, weights = [], []
+        for stack, count in self.stacks.most_common():
+            indexes = []
+            for frame in stack:
+                if frame not in frame_index:
+                    frame_index[frame] = len(frames)
+                    frames.append({"name": frame[0], "file": _short_path(frame[1]), "line": frame[2]})
+                indexes.append(frame_index[frame])
+            samples.append(indexes)
+            weights.append(count * self.interval)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "TranslateBooksWithLLMs",
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": name,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights
+            }]
+        }
+
+
+class MemorySnapshots:
+    """tracemalloc snapshots at the start and end of a profiling window"""
+
+    def __init__(self):
+        self.first: Optional[tracemalloc.Snapshot] = None
+        self.last: Optional[tracemalloc.Snapshot] = None
+        self._tracing = False
+
+    def start(self) -> None:
+        _acquire_tracing()
+        self._tracing = True
+        self.first = tracemalloc.take_snapshot()
+
+    def stop(self) -> None:
+        self.last = tracemalloc.take_snapshot()
+        if self._tracing:
+            self._tracing = False
+            _release_tracing()
+
+    def report(self, limit: int = MEMORY_REPORT_LIMIT) -> str:
+        """Allocation sites that grew the most during the window, then the largest ones"""
+        lines = ["Memory growth during the profiling window (by allocation site):"]
+        growth = [stat for stat in self.last.compare_to(self.first, "lineno") if stat.size_diff > 0]
+        lines.extend(f"  {stat}" for stat in growth[:limit])
+        if not growth:
+            lines.append("  (none)")
+        current = self.last.statistics("lineno")
+        total = sum(stat.size for stat in current)
+        lines.append("")
+        lines.append(f"Largest allocation sites at the end of the window ({total / 1024 / 1024:.1f} MiB traced):")
+        lines.extend(f"  {stat}" for stat in current[:limit])
+        return "\n".join(lines) + "\n"
+
+
+def profile_output_base(output_path: str) -> str:
+    """
+    Path prefix for the profile files of a job, next to its output.
+
+    Args:
+        output_path: Output file of the job (or output directory of a batch)
+
+    Returns:
+        '<output without extension>.profile-<timestamp>' (inside the directory for a batch)
+    """
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    if os.path.isdir(output_path):
+        return os.path.join(output_path, f"profile-{stamp}")
+    return f"{os.path.splitext(output_path)[0]}.profile-{stamp}"
+
+
+class ProfileSession:
+    """CPU sampling, and optionally memory snapshots, of one thread for a time window"""
+
+    def __init__(self, thread_id: int, output_base: str, fmt: str = "speedscope",
+                 memory: bool = False, interval: Optional[float] = None):
+        """
+        Args:
+            thread_id: threading.get_ident() of the thread to profile
+            output_base: Path prefix of the files written (see profile_output_base)
+            fmt: CPU profile format, 'speedscope' or 'collapsed'
+            memory: Also compare tracemalloc snapshots over the window
+            interval: Seconds between two stack samples
+        """
+        if fmt not in PROFILE_FORMATS:
+            raise ValueError(f"Unknown profile format '{fmt}' (expected one of {', '.join(PROFILE_FORMATS)})")
+        self.output_base = output_base
+        self.fmt = fmt
+        self.cpu = SamplingProfiler(thread_id, interval)
+        self.memory = MemorySnapshots() if memory else None
+        self.files: List[str] = []
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._started = False
+
+    @property
+    def planned_files(self) -> List[str]:
+        """Files the session writes once stopped"""
+        extension = ".speedscope.json" if self.fmt == "speedscope" else ".collapsed.txt"
+        files = [self.output_base + extension]
+        if self.memory is not None:
+            files += [self.output_base + ".memory.txt", self.output_base + ".tracemalloc"]
+        return files
+
+    def start(self) -> None:
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+            if self.memory is not None:
+                self.memory.start()
+            self.cpu.start()
+
+    def stop(self) -> List[str]:
+        """
+        Stop profiling and write the files (only the first call does).
+
+        Returns:
+            Paths of the files written
+        """
+        with self._lock:
+            if self._stopped.is_set() or not self._started:
+                return self.files
+            self._stopped.set()
+            self.cpu.stop()
+            if self.memory is not None:
+                self.memory.stop()
+            self._write()
+        return self.files
+
+    def run(self, seconds: float) -> List[str]:
+        """
+        Profile for a number of seconds, or until the thread exits or stop() is called.
+
+        Returns:
+            Paths of the files written
+        """
+        self.start()
+        deadline = time.monotonic() + seconds
+        while not self._stopped.is_set() and not self.cpu.thread_exited.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            self._stopped.wait(min(remaining, 0.1))
+        return self.stop()
+
+    def _write(self) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(self.output_base)), exist_ok=True)
+        cpu_path, *memory_paths = self.planned_files
+        name = os.path.basename(self.output_base)
+        with open(cpu_path, "w", encoding="utf-8") as f:
+            if self.fmt == "speedscope":
+                json.dump(self.cpu.to_speedscope(name), f)
+            else:
+                f.write(self.cpu.to_collapsed())
+        self.files = [cpu_path]
+        if self.memory is not None:
+            report_path, snapshot_path = memory_paths
+            with open(report_path, "w", encoding="utf-8") as f:
+                f.write(self.memory.report())
+            self.memory.last.dump(snapshot_path)
+            self.files += memory_paths
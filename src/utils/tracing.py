@@ -0,0 +1,205 @@
+"""
+Lightweight tracing spans across the translation pipeline.
+
+    with span("epub.repackage", files=len(files)):
+        ...
+
+    @traced("checkpoint.save")
+    def save_checkpoint(...):
+        ...
+
+Tracing is off by default: span() then returns a shared no-op context
+manager and traced functions call straight through, so instrumented code
+pays one global lookup per span. start_tracing() installs a Tracer that
+records every span as a Chrome trace "complete" event, and stop_tracing()
+writes them to a JSON file that chrome://tracing and Perfetto
+(ui.perfetto.dev) open (translate.py --trace out.json).
+
+Spans of concurrent asyncio tasks go on separate tracks, so overlapping
+requests nest correctly in the viewer.
+"""
+
+import asyncio
+import functools
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class _NoopSpan:
+    """Span used while tracing is off"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **attributes) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class _Span:
+    """Span being recorded"""
+    __slots__ = ("tracer", "name", "attributes", "start", "track")
+
+    def __init__(self, tracer: "Tracer", name: str, attributes: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.attributes = attributes
+
+    def __enter__(self):
+        self.track = self.tracer.current_track()
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        if exc_type is not None:
+            self.attributes["error"] = exc_type.__name__
+        self.tracer.record(self.name, self.start, end, self.track, self.attributes)
+        return False
+
+    def set(self, **attributes) -> None:
+        """Add attributes known only once the work is done (token counts, sizes...)"""
+        self.attributes.update(attributes)
+
+
+class Tracer:
+    """Collects finished spans as Chrome trace events"""
+
+    def __init__(self):
+        self._origin = time.perf_counter_ns()
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._events: List[Dict[str, Any]] = []
+        self._tracks: Dict[Tuple[int, int], int] = {}
+        self._track_names: Dict[int, str] = {}
+
+    def current_track(self) -> int:
+        """Track of the calling thread, or of the calling asyncio task"""
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        thread_id = threading.get_ident()
+        key = (thread_id, id(task) if task is not None else 0)
+        with self._lock:
+            track = self._tracks.get(key)
+            if track is None:
+                track = len(self._tracks) + 1
+                self._tracks[key] = track
+                thread_name = threading.current_thread().name
+                self._track_names[track] = f"{thread_name} / {task.get_name()}" if task is not None else thread_name
+        return track
+
+    def record(self, name: str, start_ns: int, end_ns: int, track: int, attributes: Dict[str, Any]) -> None:
+        event = {
+            "name": name,
+            "cat": name.split(".", 1)[0],
+            "ph": "X",
+            "ts": (start_ns - self._origin) / 1000,
+            "dur": (end_ns - start_ns) / 1000,
+            "pid": self._pid,
+            "tid": track,
+            "args": attributes
+        }
+        with self._lock:
+            self._events.append(event)
+
+    def events(self) -> List[Dict[str, Any]]:
+        """Recorded spans, preceded by the track name metadata events"""
+        with self._lock:
+            metadata = [{"name": "thread_name", "ph": "M", "pid": self._pid, "tid": track, "args": {"name": name}}
+                        for track, name in self._track_names.items()]
+            return metadata + sorted(self._events, key=lambda event: event["ts"])
+
+
+def export_chrome_trace(tracer: Tracer, path: str) -> None:
+    """
+    Write the spans of a tracer in Chrome trace event format.
+
+    Args:
+        tracer: Tracer to export
+        path: Output JSON file
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": tracer.events(), "displayTimeUnit": "ms"}, f, default=str)
+
+
+_tracer: Optional[Tracer] = None
+
+
+def span(name: str, **attributes):
+    """
+    Context manager timing a step of the pipeline.
+
+    Args:
+        name: Span name, 'category.step' (e.g. 'llm.request')
+        **attributes: Values shown with the span in the viewer
+
+    Returns:
+        Span context manager (a no-op one while tracing is off)
+    """
+    tracer = _tracer
+    if tracer is None:
+        return _NOOP_SPAN
+    return _Span(tracer, name, attributes)
+
+
+def traced(name: str) -> Callable:
+    """Decorator wrapping every call of a function (sync or async) in a span"""
+    def decorator(func: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if _tracer is None:
+                    return await func(*args, **kwargs)
+                with _Span(_tracer, name, {}):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _tracer is None:
+                return func(*args, **kwargs)
+            with _Span(_tracer, name, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def start_tracing() -> Tracer:
+    """Start recording spans (replaces any tracer already running)"""
+    global _tracer
+    _tracer = Tracer()
+    return _tracer
+
+
+def stop_tracing(path: Optional[str] = None) -> Optional[Tracer]:
+    """
+    Stop recording spans.
+
+    Args:
+        path: Optional file to write the trace to (Chrome trace JSON)
+
+    Returns:
+        The tracer that was running, or None
+    """
+    global _tracer
+    tracer, _tracer = _tracer, None
+    if tracer is not None and path:
+        export_chrome_trace(tracer, path)
+    return tracer
+
+
+def is_tracing() -> bool:
+    return _tracer is not None
@@ -0,0 +1,137 @@
+"""
+Benchmark for DocxHtmlConverter on a large generated DOCX report.
+
+Times to_html (mammoth) and from_html, and compares the direct-XML
+reconstruction with the previous python-docx object API implementation,
+checking both write the same word/document.xml.
+
+Usage:
+    python tests/standalone/bench_docx_conversion.py [pages]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from docx import Document
+
+from src.core.docx.converter import DocxHtmlConverter
+
+
+class LegacyDocxHtmlConverter(DocxHtmlConverter):
+    """Reference implementation: one python-docx API call per paragraph/run/cell."""
+
+    def _convert_paragraph(self, doc, element, metadata):
+        p = doc.add_paragraph()
+        self._add_runs_from_element(p, element, metadata)
+
+    def _convert_heading(self, doc, element, tag, metadata):
+        doc.add_heading(self._get_text_content(element), level=int(tag[1]))
+
+    def _convert_list(self, doc, element, metadata):
+        style = 'List Number' if element.tag == 'ol' else 'List Bullet'
+        for li in element.findall('.//li'):
+            doc.add_paragraph(self._get_text_content(li), style=style)
+
+    def _convert_table(self, doc, element, metadata):
+        rows = element.findall('.//tr')
+        if not rows:
+            return
+        cols = len(rows[0].findall('.//td')) + len(rows[0].findall('.//th'))
+        if cols == 0:
+            return
+        table = doc.add_table(rows=len(rows), cols=cols)
+        table.style = 'Table Grid'
+        for row_idx, tr in enumerate(rows):
+            cells = tr.findall('.//td') + tr.findall('.//th')
+            for col_idx, cell in enumerate(cells[:cols]):
+                table.rows[row_idx].cells[col_idx].text = self._get_text_content(cell)
+
+    def _add_runs_from_element(self, paragraph, element, metadata):
+        if element.text:
+            paragraph.add_run(element.text)
+        for child in element:
+            run = paragraph.add_run(self._get_text_content(child))
+            if child.tag in ('strong', 'b'):
+                run.bold = True
+            elif child.tag in ('em', 'i'):
+                run.italic = True
+            elif child.tag == 'u':
+                run.underline = True
+            if child.tail:
+                paragraph.add_run(child.tail)
+
+
+def generate_report(path, pages, seed=42):
+    """Generate a report-like DOCX of roughly `pages` pages."""
+    rng = random.Random(seed)
+    words = ("the quick brown fox jumps over lazy dog report quarter revenue growth "
+             "market analysis forecast region product customer").split()
+
+    def sentence(low, high):
+        return ' '.join(rng.choice(words) for _ in range(rng.randint(low, high))).capitalize() + '.'
+
+    doc = Document()
+    for page in range(pages):
+        if page % 5 == 0:
+            doc.add_heading(f"Section {page // 5 + 1}: {sentence(2, 5)}", level=1 + (page // 5) % 2)
+        for _ in range(6):
+            p = doc.add_paragraph(sentence(10, 30) + ' ')
+            p.add_run(sentence(2, 4)).bold = True
+            p.add_run(' ' + sentence(5, 15) + ' ')
+            p.add_run(sentence(1, 3)).italic = True
+            p.add_run(' ' + sentence(3, 10))
+        if page % 3 == 0:
+            for _ in range(3):
+                doc.add_paragraph(sentence(4, 10), style='List Bullet')
+        if page % 10 == 0:
+            table = doc.add_table(rows=40, cols=5)
+            for row in table.rows:
+                for cell in row.cells:
+                    cell.text = sentence(1, 3)
+    doc.save(path)
+
+
+def document_xml(path):
+    with zipfile.ZipFile(path) as docx_zip:
+        return docx_zip.read('word/document.xml')
+
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "report.docx")
+        generate_report(source, pages)
+        print(f"Pages:          {pages} ({os.path.getsize(source) / 1024:.0f} KB)")
+
+        start = time.perf_counter()
+        html, metadata = DocxHtmlConverter().to_html(source)
+        to_html_time = time.perf_counter() - start
+
+        legacy_path = os.path.join(tmp, "legacy.docx")
+        start = time.perf_counter()
+        LegacyDocxHtmlConverter().from_html(html, metadata, legacy_path)
+        legacy_time = time.perf_counter() - start
+
+        output_path = os.path.join(tmp, "output.docx")
+        start = time.perf_counter()
+        DocxHtmlConverter().from_html(html, metadata, output_path)
+        from_html_time = time.perf_counter() - start
+
+        identical = document_xml(legacy_path) == document_xml(output_path)
+
+    print(f"HTML size:      {len(html) / 1024 / 1024:.2f} MB")
+    print(f"to_html:        {to_html_time:.3f}s")
+    print(f"from_html:      {legacy_time:.3f}s legacy, "
+          f"{from_html_time:.3f}s direct XML ({legacy_time / from_html_time:.2f}x)")
+    print(f"Identical:      {identical}")
+    return 0 if identical else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
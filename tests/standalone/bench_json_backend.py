@@ -0,0 +1,91 @@
+"""
+Benchmark for decoding a streamed Ollama response with each JSON backend.
+
+Builds an NDJSON stream shaped like a recorded /api/chat response (one line
+per token, then a final line with the counters) and times
+decode_ollama_chunk of every installed backend against plain json.loads,
+checking they all read the same text and token counts.
+
+Usage:
+    python tests/standalone/bench_json_backend.py [lines]
+"""
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.utils.json_backend import available_backends, get_backend
+
+
+def generate_stream(lines, seed=42):
+    """Generate an Ollama stream of the given number of lines."""
+    rng = random.Random(seed)
+    words = ("le renard brun rapide saute par-dessus chien paresseux rivière nuit "
+             "lumière voix maison longue route silence fenêtre matin").split()
+    stream = []
+    for i in range(lines - 1):
+        token = rng.choice(words) + (" " if rng.random() < 0.8 else ". ")
+        stream.append(json.dumps({
+            "model": "qwen3:14b",
+            "created_at": f"2025-06-01T12:00:{i % 60:02d}.{i:06d}Z",
+            "message": {"role": "assistant", "content": token},
+            "done": False
+        }, ensure_ascii=False))
+    stream.append(json.dumps({
+        "model": "qwen3:14b", "created_at": "2025-06-01T12:01:00.000000Z",
+        "message": {"role": "assistant", "content": ""}, "done": True, "done_reason": "stop",
+        "total_duration": 9_812_345_678, "load_duration": 25_123_456, "prompt_eval_count": 1843,
+        "prompt_eval_duration": 412_345_678, "eval_count": lines - 1, "eval_duration": 9_301_234_567
+    }))
+    return [line.encode("utf-8") for line in stream]
+
+
+def read_with_json(stream):
+    """Reference: what the provider did before, one json.loads per line."""
+    parts, eval_count = [], 0
+    for line in stream:
+        data = json.loads(line)
+        parts.append(data.get("message", {}).get("content", ""))
+        if data.get("done"):
+            eval_count = data.get("eval_count", 0)
+    return "".join(parts), eval_count
+
+
+def read_with_backend(stream, backend):
+    parts, eval_count = [], 0
+    for line in stream:
+        chunk = backend.decode_ollama_chunk(line)
+        parts.append(chunk.content)
+        if chunk.done:
+            eval_count = chunk.eval_count
+    return "".join(parts), eval_count
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    stream = generate_stream(lines)
+    print(f"Stream: {lines} lines, {sum(map(len, stream)) / 1024:.0f} KB")
+
+    start = time.perf_counter()
+    expected = read_with_json(stream)
+    baseline = time.perf_counter() - start
+    print(f"json.loads:         {baseline * 1000:.1f} ms")
+
+    identical = True
+    for name in available_backends():
+        backend = get_backend(name)
+        start = time.perf_counter()
+        result = read_with_backend(stream, backend)
+        elapsed = time.perf_counter() - start
+        identical = identical and result == expected
+        print(f"{name + ':':<20}{elapsed * 1000:.1f} ms ({baseline / elapsed:.2f}x)")
+
+    print(f"Identical:          {identical}")
+    return 0 if identical else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
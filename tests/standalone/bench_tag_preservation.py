@@ -0,0 +1,100 @@
+"""
+Benchmark for TagPreserver.preserve_tags on a large synthetic XHTML body.
+
+Compares the fused single-pass tokenizer with the previous
+split-then-classify implementation and checks both produce the same
+processed text and tag map.
+
+Usage:
+    python tests/standalone/bench_tag_preservation.py [size_mb]
+"""
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.core.epub.tag_preservation import TagPreserver, is_non_translatable
+from src.common.placeholder_format import PlaceholderFormat
+
+
+def legacy_preserve_tags(text):
+    """Reference implementation: re.split on tags, then classify each segment."""
+    fmt = PlaceholderFormat.from_config()
+    tag_map = {}
+    counter = 0
+    merged_segments = []
+    current_group = []
+
+    for segment in re.split(r'(<[^>]+>)', text):
+        if not segment:
+            continue
+        is_tag = segment.startswith('<') and segment.endswith('>')
+        if is_tag or is_non_translatable(segment):
+            current_group.append(segment)
+        else:
+            if current_group:
+                placeholder = fmt.create(counter)
+                tag_map[placeholder] = ''.join(current_group)
+                merged_segments.append(placeholder)
+                counter += 1
+                current_group = []
+            merged_segments.append(segment)
+
+    if current_group:
+        placeholder = fmt.create(counter)
+        tag_map[placeholder] = ''.join(current_group)
+        merged_segments.append(placeholder)
+
+    return ''.join(merged_segments), tag_map
+
+
+def generate_body(size_bytes, seed=42):
+    """Generate a book-like XHTML body of roughly size_bytes characters."""
+    rng = random.Random(seed)
+    words = ("the quick brown fox jumps over lazy dog chapter river night "
+             "light voice house long road silence window morning").split()
+    parts = []
+    total = 0
+    chapter = 1
+    while total < size_bytes:
+        if rng.random() < 0.02:
+            block = f'<h2 class="chapter">{chapter}.</h2><p> </p><p> </p>'
+            chapter += 1
+        else:
+            sentence = ' '.join(rng.choice(words) for _ in range(rng.randint(8, 40)))
+            if rng.random() < 0.3:
+                sentence = sentence.replace(' fox ', ' <em>fox</em> ', 1)
+            if rng.random() < 0.1:
+                sentence += ' <a href="#n1" id="r1"><sup>12</sup></a>'
+            block = f'<p class="body">{sentence.capitalize()}.</p>\n'
+        parts.append(block)
+        total += len(block)
+    return ''.join(parts)
+
+
+def main():
+    size_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    body = generate_body(int(size_mb * 1024 * 1024))
+    print(f"Body size: {len(body) / 1024 / 1024:.2f} MB")
+
+    start = time.perf_counter()
+    legacy_text, legacy_map = legacy_preserve_tags(body)
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    text, tag_map = TagPreserver().preserve_tags(body)
+    fused_time = time.perf_counter() - start
+
+    identical = text == legacy_text and tag_map == legacy_map
+    print(f"Placeholders:   {len(tag_map)}")
+    print(f"Legacy:         {legacy_time:.3f}s")
+    print(f"Fused:          {fused_time:.3f}s ({legacy_time / fused_time:.2f}x)")
+    print(f"Identical:      {identical}")
+    return 0 if identical else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
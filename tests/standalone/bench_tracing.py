@@ -0,0 +1,75 @@
+"""
+Benchmark for the cost of tracing spans, disabled and enabled.
+
+Times a loop of span() and @traced calls around a trivial body with tracing
+off and on, against the same loop without instrumentation, and prints the
+overhead per span.
+
+Usage:
+    python tests/standalone/bench_tracing.py [iterations]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.utils.tracing import span, start_tracing, stop_tracing, traced
+
+
+def work(x):
+    return x + 1
+
+
+@traced("bench.work")
+def traced_work(x):
+    return x + 1
+
+
+def run_plain(iterations):
+    total = 0
+    for i in range(iterations):
+        total = work(total)
+    return total
+
+
+def run_span(iterations):
+    total = 0
+    for i in range(iterations):
+        with span("bench.work", index=i):
+            total = work(total)
+    return total
+
+
+def run_traced(iterations):
+    total = 0
+    for i in range(iterations):
+        total = traced_work(total)
+    return total
+
+
+def timed(func, iterations):
+    start = time.perf_counter()
+    func(iterations)
+    return time.perf_counter() - start
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    baseline = timed(run_plain, iterations)
+    print(f"No instrumentation:  {baseline * 1000:.1f} ms")
+
+    for label in ("disabled", "enabled"):
+        if label == "enabled":
+            start_tracing()
+        for name, func in (("span()", run_span), ("@traced", run_traced)):
+            elapsed = timed(func, iterations)
+            overhead = (elapsed - baseline) / iterations * 1e9
+            print(f"{name + ' ' + label + ':':<21}{elapsed * 1000:.1f} ms ({overhead:.0f} ns/span)")
+    tracer = stop_tracing()
+    print(f"Spans recorded:      {sum(1 for event in tracer.events() if event['ph'] == 'X')}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
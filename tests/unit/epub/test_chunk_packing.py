@@ -0,0 +1,154 @@
+"""
+Unit tests for packing small EPUB chunks into shared requests.
+"""
+import asyncio
+
+from src.common.placeholder_format import PlaceholderFormat
+from src.core.epub import chunk_packing, xhtml_translator
+from src.core.epub.chunk_packing import shift_placeholders, translate_small_chunks
+from src.core.epub.translation_metrics import TranslationMetrics
+
+
+FMT = PlaceholderFormat.from_config()
+
+
+def count_words(text):
+    return len(FMT.remove_all(text).split())
+
+
+def _chunk(text, tag_count, first_global=0):
+    return {
+        'text': text,
+        'local_tag_map': {FMT.create(i): f"<t{i}>" for i in range(tag_count)},
+        'global_indices': list(range(first_global, first_global + tag_count)),
+    }
+
+
+CHUNKS = [
+    _chunk("[id0]Title page[id1]", 2),
+    _chunk("[id0]Copyright notice[id1]", 2),
+    _chunk("[id0]For my [id1]family[id2][id3]", 4),
+    _chunk("[id0]" + "long chapter text " * 100 + "[id1]", 2),
+    _chunk("[id0]The end[id1]", 2),
+]
+
+
+class FakeTranslator:
+    """Stands in for generate_translation_request and records the requests."""
+
+    def __init__(self, transform=lambda text: text):
+        self.transform = transform
+        self.requests = []
+
+    async def __call__(self, main_content, *args, **kwargs):
+        self.requests.append((main_content, kwargs))
+        return self.transform(main_content)
+
+
+def _reword(text):
+    """Change some words but keep markers and placeholders as they are."""
+    return text.replace("Title", "TITLE").replace("end", "END")
+
+
+def _run(monkeypatch, translator, chunks=CHUNKS, max_tokens=400):
+    monkeypatch.setattr(chunk_packing, "generate_translation_request", translator)
+    return asyncio.run(translate_small_chunks(
+        chunks, max_tokens, count_words, "English", "French", "model", llm_client=None
+    ))
+
+
+class TestPlaceholderShift:
+    """Test moving a chunk's local placeholders into its pack range."""
+
+    def test_round_trip(self):
+        text = "[id0]For my [id1]family[id2][id3]"
+
+        shifted = shift_placeholders(text, 4, 6, FMT)
+
+        assert shifted == "[id6]For my [id7]family[id8][id9]"
+        assert shift_placeholders(shifted, 4, -6, FMT) == text
+
+    def test_foreign_indices_are_not_shifted_back(self):
+        # [id2] belongs to another segment of the pack
+        assert shift_placeholders("[id6]Un[id2]", 2, -6, FMT) == "[id0]Un[id2]"
+
+
+class TestPackedTranslation:
+    """Test the pre-pass that translates small chunks together."""
+
+    def test_small_chunks_share_one_request(self, monkeypatch):
+        translator = FakeTranslator(_reword)
+
+        translations = _run(monkeypatch, translator)
+
+        assert len(translator.requests) == 1
+        packed, kwargs = translator.requests[0]
+        assert kwargs["prompt_options"] == {'segmented_input': True}
+        assert "long chapter" not in packed
+        # Placeholders are unique across the pack
+        assert "[id4]For my [id5]family[id6][id7]" in packed
+        assert translations == {
+            "[id0]Title page[id1]": "[id0]TITLE page[id1]",
+            "[id0]Copyright notice[id1]": "[id0]Copyright notice[id1]",
+            "[id0]For my [id1]family[id2][id3]": "[id0]For my [id1]family[id2][id3]",
+            "[id0]The end[id1]": "[id0]The END[id1]",
+        }
+
+    def test_mismatched_markers_record_nothing(self, monkeypatch):
+        translator = FakeTranslator(lambda text: "Tout en un seul bloc")
+
+        assert _run(monkeypatch, translator) == {}
+
+    def test_segment_with_lost_placeholder_is_dropped(self, monkeypatch):
+        translator = FakeTranslator(lambda text: text.replace("[id5]family", "family"))
+
+        translations = _run(monkeypatch, translator)
+
+        assert "[id0]For my [id1]family[id2][id3]" not in translations
+        assert len(translations) == 3
+
+    def test_segment_cap_and_duplicates(self, monkeypatch):
+        chunks = [_chunk(f"[id0]Note {i}[id1]", 2) for i in range(6)] + [_chunk("[id0]Note 0[id1]", 2)]
+        translator = FakeTranslator(lambda text: text)
+        monkeypatch.setattr(chunk_packing, "generate_translation_request", translator)
+
+        translations = asyncio.run(translate_small_chunks(
+            chunks, 400, count_words, "English", "French", "model", llm_client=None, max_segments=3
+        ))
+
+        assert len(translator.requests) == 2
+        assert len(translations) == 6
+
+
+class TestChunkFallback:
+    """Test how translate_chunk_with_fallback uses the packed translations."""
+
+    def test_packed_chunk_needs_no_request(self, monkeypatch):
+        translator = FakeTranslator()
+        monkeypatch.setattr(xhtml_translator, "generate_translation_request", translator)
+        stats = TranslationMetrics()
+        chunk = _chunk("[id0]The end[id1]", 2, first_global=40)
+
+        result = asyncio.run(xhtml_translator.translate_chunk_with_fallback(
+            chunk['text'], chunk['local_tag_map'], chunk['global_indices'],
+            "English", "French", "model", None, stats,
+            packed_translations={"[id0]The end[id1]": "[id0]La fin[id1]"}
+        ))
+
+        assert result == "[id40]La fin[id41]"
+        assert translator.requests == []
+        assert stats.successful_first_try == 1
+
+    def test_unpacked_chunk_is_translated_alone(self, monkeypatch):
+        translator = FakeTranslator(lambda text: text.replace("Title page", "Page de titre"))
+        monkeypatch.setattr(xhtml_translator, "generate_translation_request", translator)
+        chunk = _chunk("[id0]Title page[id1]", 2, first_global=3)
+
+        result = asyncio.run(xhtml_translator.translate_chunk_with_fallback(
+            chunk['text'], chunk['local_tag_map'], chunk['global_indices'],
+            "English", "French", "model", None, TranslationMetrics(),
+            packed_translations={}
+        ))
+
+        assert result == "[id3]Page de titre[id4]"
+        assert len(translator.requests) == 1
@@ -172,3 +172,46 @@ class TestTagPreserver:
         assert "</p>" in restored
         assert "<a" in restored
         assert "</a>" in restored
+
+
+class TestTagPreserverGrouping:
+    """Test grouping of tags with non-translatable runs by the fused tokenizer."""
+
+    def test_numbers_between_tags_grouped(self):
+        """Chapter numbers and blank paragraphs merge into one placeholder."""
+        preserver = TagPreserver()
+        text, tag_map = preserver.preserve_tags("<p> </p><p>1.</p><p>Hello</p>")
+
+        assert text == "[id0]Hello[id1]"
+        assert tag_map == {"[id0]": "<p> </p><p>1.</p><p>", "[id1]": "</p>"}
+
+    def test_leading_and_trailing_runs_grouped(self):
+        """Non-translatable runs at the text edges join the adjacent tags."""
+        preserver = TagPreserver()
+        text, tag_map = preserver.preserve_tags("  IV. <h1>Title</h1>\n ")
+
+        assert text == "[id0]Title[id1]"
+        assert tag_map == {"[id0]": "  IV. <h1>", "[id1]": "</h1>\n "}
+
+    def test_text_ending_in_number_not_grouped(self):
+        """A run is only grouped when it is non-translatable as a whole."""
+        preserver = TagPreserver()
+        text, tag_map = preserver.preserve_tags("<p>Page 12</p>")
+
+        assert text == "[id0]Page 12[id1]"
+
+    def test_stray_angle_brackets_kept_as_text(self):
+        """A lone "<" that does not start a tag stays in the text."""
+        preserver = TagPreserver()
+        text, tag_map = preserver.preserve_tags("<p>a <> b</p>")
+
+        assert text == "[id0]a <> b[id1]"
+        assert tag_map == {"[id0]": "<p>", "[id1]": "</p>"}
+
+    def test_only_non_translatable_content(self):
+        """Text without translatable content becomes a single placeholder."""
+        preserver = TagPreserver()
+        text, tag_map = preserver.preserve_tags("<p>42</p>")
+
+        assert text == "[id0]"
+        assert tag_map == {"[id0]": "<p>42</p>"}
@@ -0,0 +1,143 @@
+"""Unit tests for TechnicalContentDetector."""
+
+import asyncio
+
+import pytest
+from src.core.epub.technical_content_detector import (
+    TechnicalContentDetector,
+    TechnicalPattern,
+    clear_detection_cache,
+    get_default_detector,
+    job_detector,
+)
+
+
+def _span(start, end, priority, name="p"):
+    return TechnicalPattern(start=start, end=end, content="", pattern_name=name, priority=priority)
+
+
+@pytest.fixture
+def detector():
+    clear_detection_cache()
+    return TechnicalContentDetector()
+
+
+class TestTechnicalContentDetection:
+    """Test pattern detection and overlap resolution."""
+
+    def test_detects_mixed_content(self, detector):
+        text = "The $V_{cm}$ voltage is 10 Mbps using `MAX1482` chip."
+        patterns = detector.find_all_technical_content(text)
+
+        assert [p.pattern_name for p in patterns] == ['latex_inline', 'measurement', 'inline_code']
+
+    def test_code_block_wins_over_inline_content(self, detector):
+        text = "See ```code with $x_1$ and 5V``` here"
+        patterns = detector.find_all_technical_content(text)
+
+        assert len(patterns) == 1
+        assert patterns[0].pattern_name == 'code_block'
+
+    def test_currency_not_latex(self, detector):
+        assert detector.find_all_technical_content("It costs $5 and $10.") == []
+
+    def test_technical_identifiers(self, detector):
+        patterns = detector.find_all_technical_content("Uses the RS-485 bus and a DS1487.")
+
+        assert [p.content for p in patterns] == ['RS-485', 'DS1487']
+
+
+class TestResolveOverlaps:
+    """Test priority-ordered overlap resolution."""
+
+    def test_higher_priority_wins(self, detector):
+        result = detector._resolve_overlaps([_span(0, 10, 3), _span(5, 8, 10)])
+
+        assert [(p.start, p.end) for p in result] == [(5, 8)]
+
+    def test_equal_priority_keeps_longer(self, detector):
+        result = detector._resolve_overlaps([_span(0, 4, 5, "a"), _span(2, 12, 5, "b")])
+
+        assert [p.pattern_name for p in result] == ["b"]
+
+    def test_low_priority_span_not_lost_in_chain(self, detector):
+        """A span only overlapping a discarded one is kept."""
+        result = detector._resolve_overlaps([
+            _span(0, 10, 2, "a"),    # only overlaps b
+            _span(5, 15, 3, "b"),    # overlaps c (higher) -> dropped
+            _span(12, 30, 10, "c"),
+        ])
+
+        assert [p.pattern_name for p in result] == ["a", "c"]
+
+    def test_result_sorted_and_disjoint(self, detector):
+        spans = [_span(i, i + 3, (2, 3, 5, 9, 10)[i % 5]) for i in range(0, 300, 2)]
+        result = detector._resolve_overlaps(spans)
+
+        assert all(a.end <= b.start for a, b in zip(result, result[1:]))
+
+
+class TestDetectionMemoization:
+    """Test pre-filter, content-hash cache and usage statistics."""
+
+    def test_prose_skipped_by_prefilter(self, detector):
+        assert detector.find_all_technical_content("Once upon a time, there was a Fox.") == []
+
+        usage = detector.get_usage_statistics()
+        assert usage['calls'] == 1
+        assert usage['prefilter_skips'] == 1
+        assert usage['detections'] == 0
+
+    def test_repeated_text_served_from_cache(self, detector):
+        text = "Set the line to 12V with `gpio.set()`."
+        first = detector.find_all_technical_content(text)
+        second = detector.find_all_technical_content(text)
+
+        assert first == second
+        usage = detector.get_usage_statistics()
+        assert usage['detections'] == 1
+        assert usage['cache_hits'] == 1
+        assert usage['patterns'] == {'measurement': 2, 'inline_code': 2}
+
+    def test_cache_shared_between_detectors(self, detector):
+        text = "Bandwidth is 100 Mbps."
+        detector.find_all_technical_content(text)
+
+        other = TechnicalContentDetector()
+        assert other.find_all_technical_content(text)[0].content == "100 Mbps"
+        assert other.get_usage_statistics()['cache_hits'] == 1
+
+    def test_results_are_independent_lists(self, detector):
+        text = "Use `ls` here."
+        detector.find_all_technical_content(text).clear()
+
+        assert len(detector.find_all_technical_content(text)) == 1
+
+    def test_cache_disabled(self):
+        detector = TechnicalContentDetector(use_cache=False)
+        detector.find_all_technical_content("Use `ls` here.")
+        detector.find_all_technical_content("Use `ls` here.")
+
+        assert detector.get_usage_statistics()['detections'] == 2
+
+    def test_format_usage_summary(self, detector):
+        detector.find_all_technical_content("Use `ls` here.")
+
+        assert "inline_code=1" in detector.format_usage_summary()
+
+    def test_jobs_count_separately(self, detector):
+        job_detectors = []
+
+        async def job(text, repeats):
+            with job_detector() as own:
+                job_detectors.append(own)
+                for _ in range(repeats):
+                    await asyncio.sleep(0)
+                    get_default_detector().find_all_technical_content(text)
+                return own.get_usage_statistics()['calls']
+
+        async def server():
+            return await asyncio.gather(job("Use `ls` here.", 3), job("Bandwidth is 100 Mbps.", 5))
+
+        assert asyncio.run(server()) == [3, 5]
+        assert get_default_detector() not in job_detectors
@@ -0,0 +1,277 @@
+"""
+Unit tests for batch translation of many small files.
+"""
+import asyncio
+import os
+import re
+from types import SimpleNamespace
+
+import pytest
+
+from src.core.adapters import batch_translator
+from src.core.segment_packing import pack_segments, unpack_segments, plan_packs, SEGMENT_MARKER_TOKENS
+
+
+def count_words(text):
+    return len(text.split())
+
+
+class TestSegmentPacking:
+    """Test packing texts into one request and splitting the response."""
+
+    def test_round_trip(self):
+        texts = ["First text.", "Second\nwith two lines.", "[0]Subtitle\n[1]Another"]
+
+        assert unpack_segments(pack_segments(texts), 3) == texts
+
+    def test_marker_spacing_is_tolerated(self):
+        response = "<<<SEGMENT 0>>>  \nUn\n\n  <<<SEGMENT 1>>>\nDeux\n"
+
+        assert unpack_segments(response, 2) == ["Un", "Deux"]
+
+    @pytest.mark.parametrize("response", [
+        "<<<SEGMENT 0>>>\nUn\nDeux",                        # merged
+        "<<<SEGMENT 1>>>\nDeux\n<<<SEGMENT 0>>>\nUn",       # reordered
+        "<<<SEGMENT 0>>>\nUn\n<<<SEGMENT 1>>>\n",           # empty segment
+        "Un\nDeux",                                         # markers dropped
+    ])
+    def test_mismatched_markers_are_rejected(self, response):
+        assert unpack_segments(response, 2) is None
+
+    def test_packs_respect_budget_and_segment_cap(self):
+        per_item = 10 + SEGMENT_MARKER_TOKENS
+
+        assert plan_packs([10] * 7, max_tokens=per_item * 3, max_segments=10) == [[0, 1, 2], [3, 4, 5], [6]]
+        assert plan_packs([10] * 5, max_tokens=10_000, max_segments=2) == [[0, 1], [2, 3], [4]]
+
+    def test_unpackable_items_stay_alone(self):
+        packs = plan_packs([5] * 5, max_tokens=10_000, max_segments=10, packable=lambda i: i != 2)
+
+        assert packs == [[0, 1], [2], [3, 4]]
+
+
+class FakeClient:
+    """Uppercases the source text; can drop the segment markers."""
+
+    def __init__(self, keep_markers=True):
+        self.keep_markers = keep_markers
+        self.requests = []
+        self.context_size_queries = 0
+        self.prompt_cache_stats = {"requests": 0, "prompt_tokens": 0, "cached_tokens": 0}
+        self.closed = False
+        self.warm_up_started = False
+
+    def start_warm_up(self, log_callback=None, job_started_at=None):
+        self.warm_up_started = True
+
+    async def get_model_context_size(self):
+        self.context_size_queries += 1
+        return 8192
+
+    def record_queue_wait(self, seconds):
+        pass
+
+    async def generate(self, prompt, system_prompt=None):
+        source = re.search(r'<SOURCE_TEXT>\n(.*?)\n</SOURCE_TEXT>', prompt, re.DOTALL).group(1)
+        self.requests.append((source, system_prompt))
+        await asyncio.sleep(0)
+        translated = source.upper()
+        if not self.keep_markers:
+            translated = re.sub(r'<<<SEGMENT \d+>>>\n', '', translated)
+        return SimpleNamespace(content=translated, was_truncated=False)
+
+    def extract_translation(self, response):
+        return response
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeCheckpointManager:
+    def __init__(self, checkpoint=None):
+        self.checkpoint = checkpoint
+        self.jobs = []
+        self.saved = {}
+        self.completed = False
+
+    def load_checkpoint(self, translation_id):
+        return self.checkpoint
+
+    def start_job(self, translation_id, file_type, config, input_file_path=None, input_file_paths=None):
+        self.jobs.append((translation_id, file_type))
+        self.config = config
+        self.input_file_paths = input_file_paths
+
+    def save_checkpoint(self, translation_id, chunk_index, original_text, translated_text, **kwargs):
+        self.saved[chunk_index] = translated_text
+
+    def mark_completed(self, translation_id):
+        self.completed = True
+
+    def mark_paused(self, translation_id):
+        pass
+
+
+class WordEncoding:
+    def encode(self, text):
+        return text.split()
+
+
+@pytest.fixture
+def folder(tmp_path, monkeypatch):
+    """Three short text files and two short subtitle files."""
+    monkeypatch.setattr("src.core.chunking.token_chunker.tiktoken.get_encoding", lambda name: WordEncoding())
+
+    inputs = []
+    for number in range(3):
+        path = tmp_path / f"note_{number}.txt"
+        path.write_text(f"Short note number {number}.\n\nSecond paragraph.", encoding='utf-8')
+        inputs.append(path)
+    for number in range(2):
+        path = tmp_path / f"clip_{number}.srt"
+        path.write_text(
+            f"1\n00:00:01,000 --> 00:00:02,000\nHello from clip {number}\n\n"
+            f"2\n00:00:03,000 --> 00:00:04,000\nGoodbye\n",
+            encoding='utf-8'
+        )
+        inputs.append(path)
+    outputs = [tmp_path / f"out_{path.name}" for path in inputs]
+    return [str(p) for p in inputs], [str(p) for p in outputs]
+
+
+def _run(folder, client, monkeypatch, checkpoint_manager=None, **kwargs):
+    monkeypatch.setattr(batch_translator, "create_llm_client", lambda *args, **kw: client)
+    inputs, outputs = folder
+    checkpoint_manager = checkpoint_manager or FakeCheckpointManager()
+    results = asyncio.run(batch_translator.translate_batch(
+        inputs, outputs, "English", "French", "model", "ollama",
+        checkpoint_manager=checkpoint_manager, translation_id="batch_1",
+        count_tokens=count_words, max_tokens_per_request=400, max_concurrent_requests=3,
+        **kwargs
+    ))
+    return results, checkpoint_manager
+
+
+class TestTranslateBatch:
+    """Test the batch job end to end with a fake client."""
+
+    def test_small_files_share_one_request(self, folder, monkeypatch):
+        client = FakeClient()
+
+        results, checkpoint_manager = _run(folder, client, monkeypatch)
+
+        inputs, outputs = folder
+        assert all(results[path] for path in inputs)
+        assert len(client.requests) == 1
+        assert "SEGMENTED INPUT" in client.requests[0][1]
+        assert checkpoint_manager.jobs == [("batch_1", "batch")]
+        assert checkpoint_manager.completed
+        assert client.warm_up_started and client.closed
+
+        with open(outputs[0], encoding='utf-8') as f:
+            assert f.read() == "SHORT NOTE NUMBER 0.\n\nSECOND PARAGRAPH."
+        with open(outputs[4], encoding='utf-8') as f:
+            srt = f.read()
+        assert "HELLO FROM CLIP 1" in srt and "GOODBYE" in srt
+        assert "00:00:03,000 --> 00:00:04,000" in srt
+
+    def test_budget_splits_packs_across_requests(self, folder, monkeypatch):
+        client = FakeClient()
+
+        results, _ = _run(folder, client, monkeypatch, max_segments_per_request=2)
+
+        assert all(results.values())
+        assert len(client.requests) == 3
+
+    def test_unsplittable_pack_falls_back_to_single_requests(self, folder, monkeypatch):
+        client = FakeClient(keep_markers=False)
+
+        results, checkpoint_manager = _run(folder, client, monkeypatch)
+
+        assert all(results.values())
+        assert len(client.requests) == 1 + 5
+        assert all("SEGMENTED INPUT" not in system for _, system in client.requests[1:])
+        assert sorted(checkpoint_manager.saved) == list(range(5))
+
+    def test_resume_skips_translated_units(self, folder, monkeypatch):
+        client = FakeClient()
+        checkpoint = {'chunks': [
+            {'chunk_index': 0, 'status': 'completed', 'translated_text': "DÉJÀ TRADUIT"},
+        ]}
+
+        results, checkpoint_manager = _run(folder, client, monkeypatch,
+                                           checkpoint_manager=FakeCheckpointManager(checkpoint))
+
+        inputs, outputs = folder
+        assert all(results.values())
+        assert checkpoint_manager.jobs == []
+        assert "Short note number 0" not in client.requests[0][0]
+        with open(outputs[0], encoding='utf-8') as f:
+            assert f.read() == "DÉJÀ TRADUIT"
+
+    def test_unsupported_format_is_rejected(self, tmp_path, monkeypatch):
+        from src.core.adapters import UnsupportedFormatError
+
+        with pytest.raises(UnsupportedFormatError):
+            _run(([str(tmp_path / "book.epub")], [str(tmp_path / "out.epub")]), FakeClient(), monkeypatch)
+
+
+class TestBatchResume:
+    """Test resuming a batch job from the web interface."""
+
+    @pytest.fixture
+    def app(self, tmp_path, monkeypatch):
+        from flask import Flask
+        from src.api.blueprints.translation_routes import create_translation_blueprint
+        from src.persistence.checkpoint_manager import CheckpointManager
+
+        monkeypatch.chdir(tmp_path)
+        # Imported here: the module creates its default state manager (and data/) in the cwd
+        from src.api.translation_state import TranslationStateManager
+        state_manager = TranslationStateManager(CheckpointManager(str(tmp_path / "jobs.db")))
+        started = []
+        app = Flask(__name__)
+        app.register_blueprint(create_translation_blueprint(
+            state_manager, lambda translation_id, config: started.append(config), str(tmp_path)))
+        return app.test_client(), state_manager.checkpoint_manager, started
+
+    def test_batch_inputs_are_preserved(self, folder, monkeypatch):
+        checkpoint_manager = FakeCheckpointManager()
+
+        _run(folder, FakeClient(), monkeypatch, checkpoint_manager=checkpoint_manager,
+             llm_api_endpoint="http://localhost:11434/api/chat", job_config={'output_filename': "5 files"})
+
+        inputs, outputs = folder
+        assert checkpoint_manager.input_file_paths == inputs
+        assert checkpoint_manager.config['output_filename'] == "5 files"
+        assert checkpoint_manager.config['input_files'] == inputs
+        assert checkpoint_manager.config['llm_api_endpoint'] == "http://localhost:11434/api/chat"
+
+    def test_resume_rebuilds_the_handler_config(self, app, folder):
+        client, checkpoint_manager, started = app
+        inputs, outputs = folder
+        checkpoint_manager.start_job("batch_1", "batch", {
+            'input_files': inputs, 'output_files': outputs,
+            'source_language': "English", 'target_language': "French",
+            'model_name': "model", 'llm_provider': "ollama",
+            'llm_api_endpoint': "http://localhost:11434/api/chat"
+        }, input_file_paths=inputs)
+
+        response = client.post("/api/resume/batch_1")
+
+        assert response.status_code == 200
+        config, = started
+        assert config['file_type'] == 'batch' and config['model'] == "model"
+        assert [os.path.basename(path) for path in config['file_paths']] == [os.path.basename(path) for path in inputs]
+        assert all(path not in inputs and os.path.exists(path) for path in config['file_paths'])
+        assert config['output_filenames'] == [os.path.basename(path) for path in outputs]
+
+    def test_batch_without_preserved_inputs_is_rejected(self, app, folder):
+        client, checkpoint_manager, started = app
+        inputs, outputs = folder
+        checkpoint_manager.start_job("batch_1", "batch", {
+            'input_files': inputs, 'output_files': outputs, 'model_name': "model"
+        })
+
+        assert client.post("/api/resume/batch_1").status_code == 404
+        assert started == []
@@ -0,0 +1,124 @@
+"""
+Unit tests for compressed checkpoint storage.
+
+Large chunk texts are stored as compressed BLOBs and EPUB file snapshots
+as .zz files; both read back transparently, including data written
+before compression was introduced.
+"""
+import sqlite3
+
+import pytest
+
+from src.persistence.checkpoint_manager import CheckpointManager
+from src.persistence.compression import compress_text, decompress_text, COMPRESSION_MIN_LENGTH
+from src.persistence.database import Database
+
+
+LONG_TEXT = "Il était une fois une traduction assez longue. " * 40
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = Database(str(tmp_path / "jobs.db"))
+    yield database
+    database.close()
+
+
+class TestCompressText:
+    """Test the compression helpers."""
+
+    def test_short_text_stays_plain(self):
+        assert compress_text("Bonjour") == "Bonjour"
+        assert compress_text(None) is None
+
+    def test_long_text_round_trip(self):
+        stored = compress_text(LONG_TEXT)
+
+        assert isinstance(stored, bytes)
+        assert len(stored) < len(LONG_TEXT)
+        assert decompress_text(stored) == LONG_TEXT
+
+
+class TestCompressedChunks:
+    """Test that checkpoint chunks are compressed transparently."""
+
+    def test_save_and_get_chunks(self, db):
+        db.create_job("trans_1", "txt", {})
+        db.save_chunk("trans_1", 0, LONG_TEXT, LONG_TEXT.upper(), {"context_before": LONG_TEXT})
+        db.save_chunk("trans_1", 1, "court", None, None, status="failed")
+
+        chunks = db.get_chunks("trans_1")
+
+        assert chunks[0]["original_text"] == LONG_TEXT
+        assert chunks[0]["translated_text"] == LONG_TEXT.upper()
+        assert chunks[0]["chunk_data"] == {"context_before": LONG_TEXT}
+        assert chunks[1]["original_text"] == "court"
+        assert chunks[1]["translated_text"] is None
+
+        row = db._get_connection().execute(
+            "SELECT typeof(original_text), typeof(translated_text) FROM checkpoint_chunks WHERE chunk_index = 0"
+        ).fetchone()
+        assert tuple(row) == ("blob", "blob")
+
+    def test_legacy_plain_rows_are_compressed_on_open(self, tmp_path):
+        db_path = str(tmp_path / "jobs.db")
+        Database(db_path).close()
+
+        # Simulate a database written before compression existed
+        conn = sqlite3.connect(db_path)
+        conn.execute("INSERT INTO translation_jobs (translation_id, status, file_type, config, progress) "
+                     "VALUES ('trans_1', 'paused', 'txt', '{}', '{}')")
+        conn.execute("INSERT INTO checkpoint_chunks (translation_id, chunk_index, original_text, translated_text, status) "
+                     "VALUES ('trans_1', 0, ?, 'court', 'completed')", (LONG_TEXT,))
+        conn.execute("PRAGMA user_version = 0")
+        conn.commit()
+        conn.close()
+
+        migrated = Database(db_path)
+        try:
+            row = migrated._get_connection().execute(
+                "SELECT typeof(original_text), typeof(translated_text) FROM checkpoint_chunks"
+            ).fetchone()
+            assert tuple(row) == ("blob", "text")
+            assert migrated.get_chunks("trans_1")[0]["original_text"] == LONG_TEXT
+        finally:
+            migrated.close()
+
+    def test_threshold(self):
+        assert isinstance(compress_text("a" * COMPRESSION_MIN_LENGTH), bytes)
+        assert isinstance(compress_text("a" * (COMPRESSION_MIN_LENGTH - 1)), str)
+
+
+class TestCompressedEpubSnapshots:
+    """Test EPUB file snapshots stored compressed on disk."""
+
+    @pytest.fixture
+    def manager(self, tmp_path, monkeypatch):
+        # CheckpointManager creates data/uploads relative to the working directory
+        monkeypatch.chdir(tmp_path)
+        manager = CheckpointManager(str(tmp_path / "jobs.db"))
+        yield manager
+        manager.close()
+
+    def test_save_list_and_restore(self, manager, tmp_path):
+        content = ("<html><body>" + "<p>Bonjour le monde</p>" * 100 + "</body></html>").encode("utf-8")
+        assert manager.save_epub_file("trans_1", "OEBPS/ch1.xhtml", content)
+
+        saved = tmp_path / "data" / "uploads" / "trans_1" / "translated_files" / "OEBPS" / "ch1.xhtml.zz"
+        assert saved.exists()
+        assert saved.stat().st_size < len(content)
+        assert manager.list_epub_files("trans_1") == ["OEBPS/ch1.xhtml"]
+
+        work_dir = tmp_path / "work"
+        assert manager.restore_epub_files("trans_1", work_dir)
+        assert (work_dir / "OEBPS" / "ch1.xhtml").read_bytes() == content
+
+    def test_restore_legacy_uncompressed_snapshot(self, manager, tmp_path):
+        legacy = tmp_path / "data" / "uploads" / "trans_1" / "translated_files" / "ch2.xhtml"
+        legacy.parent.mkdir(parents=True)
+        legacy.write_bytes(b"<html/>")
+
+        work_dir = tmp_path / "work"
+        assert manager.list_epub_files("trans_1") == ["ch2.xhtml"]
+        assert manager.restore_epub_files("trans_1", work_dir)
+        assert (work_dir / "ch2.xhtml").read_bytes() == b"<html/>"
@@ -0,0 +1,69 @@
+"""
+Unit tests for chunk plan storage in the jobs database.
+
+Chunk plans live in their own compressed table instead of the job config,
+so job lookups and listings don't decode whole books of text.
+"""
+import json
+
+import pytest
+
+from src.persistence.database import Database
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = Database(str(tmp_path / "jobs.db"))
+    yield database
+    database.close()
+
+
+PLAN = [
+    {"context_before": "", "main_content": "Première phrase.", "context_after": "Suite."},
+    {"context_before": "Première phrase.", "main_content": "Suite.", "context_after": ""},
+]
+
+
+class TestChunkPlans:
+    """Test saving, loading and cleaning up chunk plans."""
+
+    def test_round_trip(self, db):
+        db.create_job("trans_1", "txt", {"output_filename": "out.txt"})
+
+        assert db.save_chunk_plan("trans_1", "txt_chunks", PLAN)
+        assert db.get_chunk_plan("trans_1", "txt_chunks") == PLAN
+        assert db.get_chunk_plan("trans_1", "srt_blocks") is None
+
+    def test_plan_not_stored_in_config(self, db):
+        db.create_job("trans_1", "txt", {"output_filename": "out.txt"})
+        db.save_chunk_plan("trans_1", "txt_chunks", PLAN)
+
+        assert db.get_job("trans_1")["config"] == {"output_filename": "out.txt"}
+
+    def test_delete_job_removes_plan(self, db):
+        db.create_job("trans_1", "txt", {})
+        db.save_chunk_plan("trans_1", "txt_chunks", PLAN)
+
+        db.delete_job("trans_1")
+
+        assert db.get_chunk_plan("trans_1", "txt_chunks") is None
+
+    def test_legacy_config_plans_are_migrated(self, tmp_path):
+        db_path = str(tmp_path / "jobs.db")
+        legacy = Database(db_path)
+        legacy.create_job("trans_1", "txt", {
+            "output_filename": "out.txt",
+            "saved_chunks_structure": json.dumps(PLAN),
+        })
+        legacy.create_job("trans_2", "srt", {
+            "saved_subtitle_blocks": json.dumps([[{"index": "1", "text": "Hi"}]]),
+        })
+        legacy.close()
+
+        migrated = Database(db_path)
+        try:
+            assert migrated.get_job("trans_1")["config"] == {"output_filename": "out.txt"}
+            assert migrated.get_chunk_plan("trans_1", "txt_chunks") == PLAN
+            assert migrated.get_chunk_plan("trans_2", "srt_blocks") == [[{"index": "1", "text": "Hi"}]]
+        finally:
+            migrated.close()
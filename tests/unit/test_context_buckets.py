@@ -0,0 +1,184 @@
+"""
+Unit tests for bucketed context sizing in AdaptiveContextManager.
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from src.core.context_optimizer import AdaptiveContextManager, estimate_request_tokens
+
+
+BUCKETS = [2048, 4096, 8192, 16384, 32768]
+
+
+def _manager(**kwargs):
+    kwargs.setdefault("initial_context", 2048)
+    kwargs.setdefault("stability_window", 3)
+    kwargs.setdefault("max_context", 32768)
+    return AdaptiveContextManager(buckets=BUCKETS, **kwargs)
+
+
+class TestPlanning:
+    """Test the one-off sizing from pre-computed request sizes."""
+
+    def test_plan_picks_bucket_for_largest_request(self):
+        manager = _manager()
+
+        planned = manager.plan([1200, 3000, 5000, 900])
+
+        assert planned == 8192
+        assert manager.get_context_size() == 8192
+
+    def test_plan_keeps_headroom_below_near_limit(self):
+        # 4000 tokens would be at 97.7% of 4096
+        assert _manager().plan([4000]) == 8192
+
+    def test_plan_never_goes_below_initial_context(self):
+        assert _manager(initial_context=6144).plan([500]) == 8192
+
+    def test_estimate_includes_output_and_thinking(self):
+        assert estimate_request_tokens(1000, 400) == 1000 + 850
+        assert estimate_request_tokens(1000, 400, is_thinking_model=True) == 1000 + 850 + 2000
+
+
+class TestHysteresis:
+    """Test that the size only moves between buckets, and only when it must."""
+
+    def test_growth_jumps_to_next_bucket(self):
+        manager = _manager()
+        manager.plan([3000])
+
+        assert manager.increase_context() == 8192
+
+    def test_no_shrink_below_plan(self):
+        manager = _manager()
+        manager.plan([3000])
+
+        for _ in range(5):
+            manager.record_success(200, 100, 4096)
+
+        assert manager.get_context_size() == 4096
+
+    def test_shrink_needs_usage_well_below_smaller_bucket(self):
+        manager = _manager()
+        manager.increase_context()
+        manager.increase_context()  # 8192 after two overflows
+
+        for _ in range(3):
+            manager.record_success(1800, 400, 8192)  # 2200 > 4096 * 0.5
+        assert manager.get_context_size() == 8192
+
+        for _ in range(3):
+            manager.record_success(1200, 400, 8192)  # 1600 <= 2048
+        assert manager.get_context_size() == 4096
+
+    def test_step_mode_without_buckets(self):
+        manager = AdaptiveContextManager(initial_context=2048, context_step=2048, buckets=[])
+
+        assert manager.increase_context() == 4096
+        assert manager.increase_context() == 6144
+
+
+class TestReloadTracking:
+    """Test that context changes pushed to the client count as reloads."""
+
+    def test_reloads_and_reload_time(self):
+        manager = _manager()
+        client = SimpleNamespace(context_window=2048)
+
+        assert manager.apply_to_client(client) is None
+        manager.record_load_duration(3.0)  # initial load, not a reload
+
+        manager.increase_context()
+        assert manager.apply_to_client(client) == 2048
+        assert client.context_window == 4096
+        manager.record_load_duration(2.5)
+
+        manager.apply_to_client(client)
+        manager.record_load_duration(0.0)
+
+        stats = manager.get_stats()
+        assert stats["reloads"] == 1
+        assert stats["reload_time"] == 2.5
+
+    def test_planned_size_applied_before_first_request_is_not_a_reload(self):
+        manager = _manager()
+        client = SimpleNamespace(context_window=2048)
+        manager.plan([5000])
+
+        assert manager.apply_to_client(client) == 2048
+        assert manager.get_stats()["reloads"] == 0
+
+    def test_first_application_counts_against_the_loaded_size(self):
+        manager = _manager()
+        # The warm-up already loaded the model at the initial size
+        client = SimpleNamespace(context_window=2048, loaded_context=2048)
+        manager.plan([5000])
+
+        assert manager.apply_to_client(client) == 2048
+        manager.record_load_duration(1.5)
+
+        assert manager.get_stats()["reloads"] == 1
+        assert manager.get_stats()["reload_time"] == 1.5
+
+
+class WordEncoding:
+    def encode(self, text):
+        return text.split()
+
+
+class TestJobPlanning:
+    """Test that jobs plan their context from the requests they will send."""
+
+    @pytest.fixture(autouse=True)
+    def word_tokens(self, monkeypatch):
+        monkeypatch.setattr("src.core.chunking.token_chunker.tiktoken.get_encoding", lambda name: WordEncoding())
+
+    def test_plan_job_context_applies_largest_request(self):
+        from src.core.translator import plan_job_context
+
+        manager = _manager()
+        client = SimpleNamespace(context_window=2048, get_is_thinking_model=lambda: False,
+                                 context_planned=lambda: None)
+        chunks = [{'main_content': "word " * 200}, {'main_content': "   "}, {'main_content': "word " * 1500}]
+
+        planned = plan_job_context(manager, client, chunks, "English", "French", "model",
+                                   content_tokens=[200, 0, 1500])
+
+        assert planned == 8192
+        assert client.context_window == 8192
+
+    def test_adapter_path_plans_and_passes_the_manager(self, tmp_path, monkeypatch):
+        import asyncio
+        from src.core import translator as core_translator
+        from src.core.adapters import GenericTranslator, TxtAdapter
+        from src.core.llm_client import LLMClient
+
+        input_path = tmp_path / "book.txt"
+        input_path.write_text("\n\n".join(f"Paragraph {n} of the book." for n in range(20)), encoding="utf-8")
+        planned = []
+        managers = []
+
+        def plan(self, request_tokens):
+            planned.append(list(request_tokens))
+            return self.current_context
+
+        async def translate(main_content, *args, context_manager=None, **kwargs):
+            managers.append(context_manager)
+            return main_content.upper()
+
+        monkeypatch.setattr(AdaptiveContextManager, "plan", plan)
+        monkeypatch.setattr(LLMClient, "get_is_thinking_model", lambda self: False)
+        monkeypatch.setattr(core_translator, "generate_translation_request", translate)
+        checkpoint_manager = SimpleNamespace(
+            load_checkpoint=lambda translation_id: None, start_job=lambda **kwargs: True,
+            save_checkpoint=lambda **kwargs: True, mark_completed=lambda translation_id: None,
+            get_job=lambda translation_id: None, save_job_metrics=lambda *args: None
+        )
+        adapter = TxtAdapter(str(input_path), str(tmp_path / "out.txt"), {"auto_adjust_context": True})
+
+        assert asyncio.run(GenericTranslator(adapter, checkpoint_manager, "txt_job").translate(
+            "English", "French", "model", "ollama", api_endpoint="http://localhost:1/api/generate"))
+
+        assert len(planned) == 1 and len(planned[0]) == len(managers)
+        assert all(isinstance(manager, AdaptiveContextManager) for manager in managers)
@@ -0,0 +1,59 @@
+"""
+Unit tests for DOCX reconstruction from translated HTML.
+"""
+from docx import Document
+
+from src.core.docx.converter import DocxHtmlConverter
+
+
+HTML = (
+    "<html><body>"
+    "<h2>Résumé</h2>"
+    "<p>Le <strong>rapport</strong> du <em>trimestre</em> <u>final</u> </p>"
+    "<ul><li>Un</li><li>Deux</li></ul>"
+    "<table><tr><th>A</th><th>B</th></tr><tr><td>1</td><td>2</td></tr></table>"
+    "<p>Après le tableau</p>"
+    "</body></html>"
+)
+
+
+def _reconstruct(tmp_path, html=HTML):
+    output_path = tmp_path / "out.docx"
+    DocxHtmlConverter().from_html(html, {}, str(output_path))
+    return Document(str(output_path))
+
+
+class TestFromHtml:
+    """Test the direct-XML reconstruction."""
+
+    def test_paragraphs_and_runs(self, tmp_path):
+        doc = _reconstruct(tmp_path)
+        paragraphs = doc.paragraphs
+
+        assert paragraphs[0].text == "Résumé"
+        assert paragraphs[0].style.name == "Heading 2"
+
+        runs = paragraphs[1].runs
+        assert [run.text for run in runs] == ["Le ", "rapport", " du ", "trimestre", " ", "final", " "]
+        assert runs[1].bold and runs[3].italic and runs[5].underline
+        assert not runs[0].bold
+
+        assert [p.style.name for p in paragraphs[2:4]] == ["List Bullet", "List Bullet"]
+        assert paragraphs[-1].text == "Après le tableau"
+
+    def test_table_cells(self, tmp_path):
+        doc = _reconstruct(tmp_path)
+        table = doc.tables[0]
+
+        assert table.style.name == "Table Grid"
+        assert [[cell.text for cell in row.cells] for row in table.rows] == [["A", "B"], ["1", "2"]]
+
+    def test_body_ends_with_section_properties(self, tmp_path):
+        doc = _reconstruct(tmp_path)
+
+        assert doc.element.body[-1].tag.endswith("}sectPr")
+
+    def test_tabs_and_line_breaks(self, tmp_path):
+        doc = _reconstruct(tmp_path, "<html><body><p>a\tb\nc</p></body></html>")
+
+        assert doc.paragraphs[0].text == "a\tb\nc"
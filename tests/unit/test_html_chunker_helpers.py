@@ -429,3 +429,39 @@ class TestChunkSizeLimitations:
         if chunks:
             token_count = chunker._count_segment_tokens(chunks[0]['text'])
             assert token_count <= 100
+
+
+class TestOffsetBasedSegments:
+    """Test offset-based segmentation and chunk materialization."""
+
+    def test_segment_spans_skip_whitespace(self):
+        """Spans cover the text between split points, whitespace-only ones dropped."""
+        chunker = HtmlChunker(max_tokens=100)
+        text = "[id0]A[id1][id2]B[id3]  "
+
+        spans = chunker._segment_spans(text, [(11, 1), (22, 1)])
+
+        assert spans == [(0, 11), (11, 22)]
+        assert chunker._split_at_points(text, [(11, 1), (22, 1)]) == ["[id0]A[id1]", "[id2]B[id3]"]
+
+    def test_materialize_joins_adjacent_spans(self):
+        """Adjacent spans are sliced once; split strings are inserted as-is."""
+        text = "abcdefgh"
+
+        assert HtmlChunker._materialize(text, [(0, 2), (2, 5)]) == "abcde"
+        assert HtmlChunker._materialize(text, [(0, 2), "XY", (5, 8)]) == "abXYfgh"
+        assert HtmlChunker._materialize(text, [(0, 1), (3, 4)]) == "ad"
+
+    def test_chunks_match_segment_merging(self):
+        """Chunking the whole text equals merging its segments as strings."""
+        chunker = HtmlChunker(max_tokens=30)
+        paragraphs = [f"[id{2 * i}]Paragraph number {i} has a few words.[id{2 * i + 1}]" for i in range(10)]
+        tag_map = {}
+        for i in range(10):
+            tag_map[f"[id{2 * i}]"] = "<p>"
+            tag_map[f"[id{2 * i + 1}]"] = "</p>"
+
+        chunks = chunker.chunk_html_with_placeholders("".join(paragraphs), tag_map)
+
+        assert chunks == chunker._merge_segments_into_chunks(paragraphs, tag_map)
+        assert sum(len(c['global_indices']) for c in chunks) == 20
@@ -0,0 +1,79 @@
+"""
+Unit tests for the lightweight resumable job listing.
+
+Listings read summary columns only (JSON1 extraction) and support keyset
+pagination on (updated_at, translation_id).
+"""
+import pytest
+
+from src.persistence.database import Database
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = Database(str(tmp_path / "jobs.db"))
+    yield database
+    database.close()
+
+
+def _create_paused_job(db, translation_id, updated_at, config=None):
+    db.create_job(translation_id, "txt", config or {})
+    db.update_job_progress(translation_id, total_chunks=4, completed_chunks=1, status="paused")
+    conn = db._get_connection()
+    conn.execute(
+        "UPDATE translation_jobs SET updated_at = ? WHERE translation_id = ?",
+        (updated_at, translation_id)
+    )
+    conn.commit()
+
+
+class TestResumableJobListing:
+    """Test projection and pagination of resumable jobs."""
+
+    def test_summary_fields(self, db):
+        _create_paused_job(db, "trans_1", "2026-01-01 10:00:00", {
+            "preserved_input_path": "data/uploads/trans_1/book.txt",
+            "output_filename": "book_fr.txt",
+            "file_path": "",
+        })
+
+        [job] = db.get_resumable_jobs()
+
+        assert job["translation_id"] == "trans_1"
+        assert job["status"] == "paused"
+        assert job["progress"]["total_chunks"] == 4
+        assert job["progress"]["completed_chunks"] == 1
+        assert job["input_path"] == "data/uploads/trans_1/book.txt"
+        assert job["output_filename"] == "book_fr.txt"
+        assert "config" not in job
+
+    def test_excludes_running_and_completed(self, db):
+        _create_paused_job(db, "trans_1", "2026-01-01 10:00:00")
+        db.create_job("trans_2", "txt", {})
+        db.create_job("trans_3", "txt", {})
+        db.update_job_progress("trans_3", status="completed")
+
+        assert [job["translation_id"] for job in db.get_resumable_jobs()] == ["trans_1"]
+
+    def test_keyset_pagination(self, db):
+        for i in range(5):
+            _create_paused_job(db, f"trans_{i}", f"2026-01-0{i + 1} 10:00:00")
+        # Same timestamp as trans_4: the translation_id breaks the tie
+        _create_paused_job(db, "trans_9", "2026-01-05 10:00:00")
+
+        seen = []
+        after = None
+        while True:
+            page = db.get_resumable_jobs(limit=2, after=after)
+            if not page:
+                break
+            seen.extend(job["translation_id"] for job in page)
+            after = (page[-1]["updated_at"], page[-1]["translation_id"])
+
+        assert seen == ["trans_9", "trans_4", "trans_3", "trans_2", "trans_1", "trans_0"]
+
+    def test_status_updated_index_exists(self, db):
+        conn = db._get_connection()
+        indexes = {row[1] for row in conn.execute("PRAGMA index_list(translation_jobs)")}
+
+        assert "idx_jobs_status_updated" in indexes
@@ -0,0 +1,78 @@
+"""
+Unit tests for the pluggable JSON backend.
+"""
+import json
+
+import pytest
+
+from src.utils import json_backend
+from src.utils.json_backend import OllamaChunk, StdlibCompatible, available_backends, get_backend
+
+BACKENDS = available_backends()
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request):
+    return get_backend(request.param)
+
+
+class TestBackends:
+    """Test that every installed backend behaves like the json module."""
+
+    def test_json_is_always_available(self):
+        assert BACKENDS[-1] == "json"
+        assert get_backend("no-such-backend").name == BACKENDS[0]
+
+    def test_round_trip(self, backend):
+        data = {"text": "Élan — 日本語", "n": [1, 2.5, None, True], "nested": {"a": {}}}
+
+        encoded = backend.dumps(data)
+
+        assert isinstance(encoded, str)
+        assert "日本語" in encoded and " " not in encoded.replace("Élan — 日本語", "")
+        assert backend.loads(encoded) == data
+        assert backend.loads(encoded.encode("utf-8")) == data
+
+    def test_unsupported_objects_fall_back_to_json(self, backend):
+        assert json.loads(backend.dumps({1: "one"})) == {"1": "one"}
+
+    def test_malformed_input_raises_json_decode_error(self, backend):
+        with pytest.raises(json.JSONDecodeError):
+            backend.loads('{"message": ')
+        with pytest.raises(json_backend.JSONDecodeError):
+            backend.decode_ollama_chunk("data: [DONE]")
+
+
+class TestOllamaChunk:
+    """Test decoding streamed Ollama lines."""
+
+    def test_content_chunk(self, backend):
+        line = ('{"model":"qwen3","created_at":"2025-01-01T00:00:00Z",'
+                '"message":{"role":"assistant","content":"Bon","thinking":""},"done":false}')
+
+        assert backend.decode_ollama_chunk(line) == OllamaChunk(content="Bon")
+
+    def test_final_chunk(self, backend):
+        line = ('{"model":"qwen3","message":{"role":"assistant","content":""},"done":true,'
+                '"done_reason":"stop","total_duration":5,"load_duration":2500,'
+                '"prompt_eval_count":120,"eval_count":42,"eval_duration":900}')
+
+        chunk = backend.decode_ollama_chunk(line.encode("utf-8"))
+
+        assert chunk == OllamaChunk(done=True, prompt_eval_count=120, eval_count=42,
+                                    load_duration=2500, eval_duration=900)
+
+    def test_missing_and_null_fields(self, backend):
+        assert backend.decode_ollama_chunk('{"done":false}') == OllamaChunk()
+        assert backend.decode_ollama_chunk(
+            '{"message":{"content":null,"thinking":"hmm"},"done":false,"eval_count":null}'
+        ) == OllamaChunk(thinking="hmm")
+
+
+class TestStdlibCompatible:
+    """Test the json module stand-in handed to python-socketio."""
+
+    def test_accepts_json_module_arguments(self):
+        encoded = StdlibCompatible.dumps({"event": "progress", "value": 0.5}, separators=(",", ":"))
+
+        assert StdlibCompatible.loads(encoded, object_hook=None) == {"event": "progress", "value": 0.5}
@@ -0,0 +1,307 @@
+"""
+Unit tests for background model warm-up and thinking-behavior probing.
+"""
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from src.core import llm_client as llm_client_module
+from src.core.llm.providers import ollama
+from src.core.llm.thinking.behavior import ThinkingBehavior
+from src.core.llm.thinking.cache import ThinkingCache
+from src.core.llm_client import LLMClient
+
+ENDPOINT = "http://localhost:11434/api/chat"
+
+
+class FakeResponse:
+    def __init__(self, body, status_code=200):
+        self.body = body
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            request = httpx.Request("POST", ENDPOINT)
+            raise httpx.HTTPStatusError("error", request=request,
+                                        response=httpx.Response(self.status_code, request=request))
+
+    def json(self):
+        return self.body
+
+
+class FakeOllama:
+    """Answers probes and preloads, tracking how many requests overlap."""
+
+    def __init__(self, thinks_when=(None, True), reject_think_param=False, delay=0.05):
+        self.thinks_when = thinks_when
+        self.reject_think_param = reject_think_param
+        self.delay = delay
+        self.payloads = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def post(self, url, json=None, timeout=None):
+        self.payloads.append(json)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+
+        if not json["messages"]:
+            return FakeResponse({"done_reason": "load", "load_duration": 2_500_000_000})
+        think = json.get("think")
+        if think is not None and self.reject_think_param:
+            return FakeResponse({}, status_code=400)
+        thinking = "Let me think." if think in self.thinks_when else ""
+        return FakeResponse({"message": {"content": "4", "thinking": thinking}})
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = ThinkingCache(tmp_path / "thinking_cache.json")
+    monkeypatch.setattr(ollama, "get_thinking_cache", lambda: cache)
+    return cache
+
+
+def _provider(monkeypatch, server, model="custom-model:7b", context_window=8192):
+    provider = ollama.OllamaProvider(ENDPOINT, model, context_window=context_window)
+
+    async def get_client():
+        return server
+    monkeypatch.setattr(provider, "_get_client", get_client)
+    return provider
+
+
+class TestThinkingProbes:
+    """Test the concurrent probes and the persistent cache."""
+
+    def test_probes_run_concurrently_and_are_cached(self, monkeypatch, cache):
+        server = FakeOllama(thinks_when=(None, True))
+        provider = _provider(monkeypatch, server)
+
+        behavior = asyncio.run(provider._detect_thinking_behavior())
+
+        assert behavior == ThinkingBehavior.CONTROLLABLE
+        assert server.max_in_flight == 3
+        assert all(payload["options"]["num_ctx"] == 8192 for payload in server.payloads)
+        assert cache.get("custom-model:7b", ENDPOINT) == ThinkingBehavior.CONTROLLABLE
+
+    def test_rejected_think_param_is_cached(self, monkeypatch, cache):
+        server = FakeOllama(thinks_when=(), reject_think_param=True)
+        provider = _provider(monkeypatch, server)
+
+        assert asyncio.run(provider._detect_thinking_behavior()) == ThinkingBehavior.STANDARD
+        assert cache.supports_think_param("custom-model:7b", ENDPOINT) is False
+
+        # A later job skips the probes and doesn't send the parameter either
+        fresh = _provider(monkeypatch, FakeOllama())
+        assert asyncio.run(fresh._detect_thinking_behavior()) == ThinkingBehavior.STANDARD
+        assert fresh._supports_think_param is False
+
+    def test_warm_up_and_first_request_share_one_detection(self, monkeypatch, cache):
+        server = FakeOllama(thinks_when=())
+        provider = _provider(monkeypatch, server)
+
+        async def run():
+            return await asyncio.gather(provider.warm_up(), provider._ensure_thinking_behavior())
+
+        load_duration, behavior = asyncio.run(run())
+
+        assert behavior == ThinkingBehavior.STANDARD
+        assert load_duration == 2.5
+        assert len(server.payloads) == 4  # 3 probes + 1 preload
+
+
+class TestPreload:
+    """Test the explicit preload request."""
+
+    def test_preload_payload(self, monkeypatch):
+        server = FakeOllama()
+        provider = _provider(monkeypatch, server, context_window=16384)
+        provider.keep_alive = ollama._keep_alive_value("-1")
+
+        assert asyncio.run(provider.preload()) == 2.5
+        assert provider.loaded_context == 16384
+        assert server.payloads == [
+            {"model": "custom-model:7b", "messages": [], "options": {"num_ctx": 16384}, "keep_alive": -1}
+        ]
+
+    def test_keep_alive_values(self):
+        assert ollama._keep_alive_value("30m") == "30m"
+        assert ollama._keep_alive_value("3600") == 3600
+
+
+class FakeProvider:
+    """Provider whose warm-up takes a while."""
+
+    context_window = 4096
+
+    def __init__(self):
+        self.warmed_up = False
+
+    async def warm_up(self):
+        await asyncio.sleep(0.05)
+        self.warmed_up = True
+        return 1.5
+
+    async def generate(self, prompt, system_prompt=None):
+        return llm_client_module.LLMResponse(content="Bonjour", prompt_tokens=10)
+
+    async def close(self):
+        pass
+
+
+class TestClientWarmUp:
+    """Test the background warm-up started at job start."""
+
+    def _client(self):
+        client = LLMClient(provider_type="ollama", api_endpoint=ENDPOINT, model="m")
+        client._provider = FakeProvider()
+        return client
+
+    def test_warm_up_runs_while_the_job_prepares(self):
+        client = self._client()
+        events = []
+
+        async def job():
+            client.start_warm_up(lambda event, message: events.append(event))
+            await asyncio.sleep(0)
+            assert not client._provider.warmed_up  # job goes on meanwhile
+            await client.wait_for_warm_up()
+            await client.close()
+
+        asyncio.run(job())
+
+        assert events == ["model_warm_up"]
+
+    def test_time_to_first_chunk_is_reported_once(self):
+        client = self._client()
+        messages = []
+
+        async def job():
+            client.start_warm_up(lambda event, message: messages.append((event, message)),
+                                 job_started_at=time.perf_counter() - 2.0)
+            await client.generate("Hello")
+            await client.generate("World")
+            await client.close()
+
+        asyncio.run(job())
+
+        first_chunk = [message for event, message in messages if event == "time_to_first_chunk"]
+        assert len(first_chunk) == 1
+        assert client.time_to_first_chunk >= 2.0
+
+    def test_disabled_warm_up_still_times_the_job(self, monkeypatch):
+        monkeypatch.setattr(llm_client_module, "MODEL_WARM_UP", False)
+        client = self._client()
+        provider = client._provider
+
+        async def job():
+            client.start_warm_up()
+            await client.generate("Hello")
+            await client.close()
+
+        asyncio.run(job())
+
+        assert not provider.warmed_up
+        assert client.time_to_first_chunk is not None
+
+
+class WordEncoding:
+    def encode(self, text):
+        return text.split()
+
+
+class JobServer(FakeOllama):
+    """Ollama server of a whole job: also answers /api/show and records the event order."""
+
+    def __init__(self, events):
+        super().__init__(thinks_when=(), delay=0)
+        self.events = events
+        self.preloaded = threading.Event()
+
+    async def post(self, url, json=None, timeout=None):
+        if url.endswith("/api/show"):
+            return FakeResponse({"parameters": "", "model_info": {"llama.context_length": 32768}})
+        if not json["messages"]:
+            self.events.append("preload")
+            self.preloaded.set()
+        return await super().post(url, json=json, timeout=timeout)
+
+
+class TestGenericTranslatorWarmUp:
+    """Test the warm-up of adapter-path (TXT/SRT) jobs."""
+
+    @pytest.fixture
+    def txt_job(self, tmp_path, monkeypatch, cache):
+        from src.core import translator as core_translator
+        from src.core.adapters import GenericTranslator, TxtAdapter
+
+        monkeypatch.setattr("src.core.chunking.token_chunker.tiktoken.get_encoding", lambda name: WordEncoding())
+        input_path = tmp_path / "book.txt"
+        input_path.write_text("\n\n".join("word " * 100 for _ in range(20)), encoding="utf-8")
+        events = []
+        server = JobServer(events)
+
+        async def get_client(provider):
+            return server
+        monkeypatch.setattr(ollama.OllamaProvider, "_get_client", get_client)
+
+        async def translate(main_content, llm_client=None, **kwargs):
+            await llm_client.wait_for_warm_up()
+            events.append("request")
+            return main_content.upper()
+        monkeypatch.setattr(core_translator, "generate_translation_request", translate)
+
+        checkpoint_manager = SimpleNamespace(
+            load_checkpoint=lambda translation_id: None, start_job=lambda **kwargs: True,
+            save_checkpoint=lambda **kwargs: True, mark_completed=lambda translation_id: None,
+            get_job=lambda translation_id: None, save_job_metrics=lambda *args: None
+        )
+
+        def run(auto_adjust_context):
+            adapter = TxtAdapter(str(input_path), str(tmp_path / "out.txt"),
+                                 {"auto_adjust_context": auto_adjust_context, "max_tokens_per_chunk": 1500})
+            return asyncio.run(GenericTranslator(adapter, checkpoint_manager, "txt_job").translate(
+                "English", "French", "model", "ollama", api_endpoint=ENDPOINT))
+
+        return run, server, events
+
+    def test_model_is_loaded_at_the_planned_context(self, txt_job, monkeypatch):
+        from src.core.context_optimizer import AdaptiveContextManager
+        run, server, _ = txt_job
+        planned = []
+        plan = AdaptiveContextManager.plan
+
+        def recording_plan(manager, request_tokens):
+            planned.append(plan(manager, request_tokens))
+            return planned[-1]
+        monkeypatch.setattr(AdaptiveContextManager, "plan", recording_plan)
+
+        assert run(auto_adjust_context=True)
+
+        assert planned[0] > 2048  # the initial context
+        loads = [payload for payload in server.payloads if "options" in payload]
+        assert len(loads) == 4  # 3 probes + 1 preload
+        assert all(payload["options"]["num_ctx"] == planned[0] for payload in loads)
+
+    def test_preload_overlaps_preparation(self, txt_job, monkeypatch):
+        from src.core import text_processor
+        run, server, events = txt_job
+        iter_file_chunks = text_processor.iter_file_chunks
+
+        def slow_chunks(*args, **kwargs):
+            yield from iter_file_chunks(*args, **kwargs)
+            server.preloaded.wait(5)
+            events.append("prepare_done")
+        monkeypatch.setattr(text_processor, "iter_file_chunks", slow_chunks)
+
+        assert run(auto_adjust_context=False)
+
+        assert events.index("preload") < events.index("prepare_done") < events.index("request")
@@ -0,0 +1,264 @@
+"""
+Unit tests for offline translation through a Batch API.
+
+The batch server is a local stand-in speaking the OpenAI Batch API over
+httpx, so the jobs run end to end without network access.
+"""
+import asyncio
+import email
+import itertools
+import json
+import re
+
+import httpx
+import pytest
+
+from src.config import TRANSLATE_TAG_IN, TRANSLATE_TAG_OUT
+from src.core import translator as core_translator
+from src.core.adapters import translate_file
+from src.core.epub import translator as epub_translator
+from src.core.llm import BatchAPIClient, BatchAPIError
+from src.core.llm import batch_api as batch_api_module
+from src.core.llm.batch_api import parse_result_line
+from src.core.llm.providers import openai
+from src.core.llm_client import LLMClient
+from src.core.offline_batch import translate_offline
+from src.persistence.checkpoint_manager import CheckpointManager
+
+ENDPOINT = "http://localhost:8000/v1/chat/completions"
+
+
+def _source(body):
+    prompt = body["messages"][-1]["content"]
+    return re.search(r'<SOURCE_TEXT>\n(.*?)\n</SOURCE_TEXT>', prompt, re.DOTALL).group(1)
+
+
+def uppercase(body):
+    """Default answer: the source text in upper case, between the translation tags."""
+    return f"{TRANSLATE_TAG_IN}\n{_source(body).upper()}\n{TRANSLATE_TAG_OUT}"
+
+
+class LocalBatchServer:
+    """In-process stand-in for an OpenAI-style Batch API."""
+
+    def __init__(self, answer=uppercase, fail_when=lambda body: False, final_status="completed", polls=2):
+        self.answer = answer
+        self.fail_when = fail_when
+        self.final_status = final_status
+        self.polls = polls
+        self.files = {}
+        self.batches = {}
+        self.calls = []
+        self._ids = itertools.count(1)
+
+    def client(self):
+        return httpx.AsyncClient(transport=httpx.MockTransport(self.handle))
+
+    def handle(self, request):
+        path = request.url.path
+        self.calls.append((request.method, path))
+        if request.method == "POST" and path == "/v1/files":
+            return self._upload(request)
+        if request.method == "POST" and path == "/v1/batches":
+            return self._create(json.loads(request.content))
+        match = re.fullmatch(r"/v1/batches/([^/]+)(/cancel)?", path)
+        if match:
+            batch = self.batches[match.group(1)]
+            if match.group(2):
+                batch["status"] = "cancelled"
+            else:
+                self._advance(batch)
+            return httpx.Response(200, json=batch)
+        match = re.fullmatch(r"/v1/files/([^/]+)/content", path)
+        if match:
+            return httpx.Response(200, text=self.files[match.group(1)])
+        return httpx.Response(404, json={"error": {"message": f"no route {path}"}})
+
+    def _upload(self, request):
+        message = email.message_from_bytes(
+            f"Content-Type: {request.headers['content-type']}\r\n\r\n".encode() + request.read()
+        )
+        parts = {part.get_param("name", header="content-disposition"): part.get_payload(decode=True)
+                 for part in message.get_payload()}
+        assert parts["purpose"] == b"batch"
+        file_id = f"file-{next(self._ids)}"
+        self.files[file_id] = parts["file"].decode("utf-8")
+        return httpx.Response(200, json={"id": file_id, "purpose": "batch"})
+
+    def _create(self, payload):
+        assert payload["endpoint"] == "/v1/chat/completions"
+        batch_id = f"batch-{next(self._ids)}"
+        self.batches[batch_id] = {"id": batch_id, "status": "validating", "polls": 0, **payload}
+        return httpx.Response(200, json=self.batches[batch_id])
+
+    def _advance(self, batch):
+        if batch["status"] in ("completed", "failed", "expired", "cancelled"):
+            return
+        batch["polls"] += 1
+        if batch["polls"] < self.polls:
+            batch["status"] = "in_progress"
+            return
+        batch["status"] = self.final_status
+        if self.final_status == "failed":
+            batch["errors"] = {"data": [{"message": "invalid input file"}]}
+            return
+
+        output, errors = [], []
+        for line in self.files[batch["input_file_id"]].splitlines():
+            request = json.loads(line)
+            assert request["url"] == "/v1/chat/completions"
+            if self.fail_when(request["body"]):
+                errors.append({"custom_id": request["custom_id"],
+                               "response": {"status_code": 500, "body": {"error": {"message": "server error"}}}})
+                continue
+            output.append({"custom_id": request["custom_id"], "response": {"status_code": 200, "body": {
+                "choices": [{"message": {"role": "assistant", "content": self.answer(request["body"])}}]
+            }}})
+        for key, records in (("output_file_id", output), ("error_file_id", errors)):
+            if records:
+                file_id = f"file-{next(self._ids)}"
+                self.files[file_id] = "".join(json.dumps(record) + "\n" for record in reversed(records))
+                batch[key] = file_id
+        batch["request_counts"] = {"total": len(output) + len(errors), "completed": len(output),
+                                   "failed": len(errors)}
+
+
+@pytest.fixture
+def serve(monkeypatch):
+    """Route Batch API clients to a local server, without waiting between polls."""
+    def serve(server):
+        async def get_client(self):
+            if self._client is None:
+                self._client = server.client()
+            return self._client
+        monkeypatch.setattr(BatchAPIClient, "_get_client", get_client)
+        monkeypatch.setattr(batch_api_module, "BATCH_API_POLL_INTERVAL", 0)
+        return server
+    return serve
+
+
+def _client():
+    return LLMClient(provider_type="openai", api_endpoint=ENDPOINT, model="model", api_key="key")
+
+
+class TestBatchAPIClient:
+    """Test the submit / poll / download cycle."""
+
+    def test_run_collects_answers_and_errors(self, serve):
+        server = serve(LocalBatchServer(fail_when=lambda body: "two" in _source(body)))
+        batch_api = openai.OpenAICompatibleProvider(ENDPOINT, "model", api_key="key").batch_api()
+        lines = [batch_api.request_line(f"request-{i}", f"<SOURCE_TEXT>\n{text}\n</SOURCE_TEXT>", "Rules")
+                 for i, text in enumerate(["one", "two", "three"])]
+        events = []
+
+        results = asyncio.run(batch_api.run(lines, lambda event, message: events.append(event)))
+
+        assert results["request-0"].content == f"{TRANSLATE_TAG_IN}\nONE\n{TRANSLATE_TAG_OUT}"
+        assert results["request-1"].content is None and "500" in results["request-1"].error
+        assert lines[0]["body"]["messages"][0] == {"role": "system", "content": "Rules"}
+        assert "stream" not in lines[0]["body"]
+        assert events[0] == "batch_api_submitted" and "batch_api_status" in events
+
+    def test_failed_batch_raises(self, serve):
+        serve(LocalBatchServer(final_status="failed"))
+        batch_api = openai.OpenAICompatibleProvider(ENDPOINT, "model").batch_api()
+
+        with pytest.raises(BatchAPIError, match="invalid input file"):
+            asyncio.run(batch_api.run([batch_api.request_line("request-0", "Hi")]))
+
+    def test_interruption_cancels_the_batch(self, serve):
+        server = serve(LocalBatchServer(polls=10))
+        batch_api = openai.OpenAICompatibleProvider(ENDPOINT, "model").batch_api()
+
+        with pytest.raises(BatchAPIError, match="interrupted"):
+            asyncio.run(batch_api.run([batch_api.request_line("request-0", "Hi")],
+                                      check_interruption_callback=lambda: True))
+        assert server.calls[-1] == ("POST", "/v1/batches/batch-2/cancel")
+
+    @pytest.mark.parametrize("line, content, error", [
+        ('{"custom_id": "a", "response": {"status_code": 200, "body": '
+         '{"choices": [{"message": {"content": "Bonjour"}}]}}}', "Bonjour", None),
+        ('{"custom_id": "a", "error": {"message": "expired"}}', None, "expired"),
+        ('{"custom_id": "a", "response": {"status_code": 429, "body": {"error": {"message": "slow down"}}}}',
+         None, "HTTP 429: slow down"),
+    ])
+    def test_result_lines(self, line, content, error):
+        result = parse_result_line(line)
+
+        assert (result.content, result.error) == (content, error)
+        assert parse_result_line("not json") is None
+
+
+class TestTranslateOffline:
+    """Test rendering prompts up front and reading the answers back."""
+
+    def test_invalid_answers_are_left_for_online(self, serve):
+        serve(LocalBatchServer(answer=lambda body: uppercase(body) if "keep" in _source(body) else "no tags"))
+        requests = [{'main_content': text} for text in ["keep this", "x", "lose this", "keep that"]]
+
+        translations = asyncio.run(translate_offline(
+            requests, "English", "French", _client(),
+            validate=lambda i, translated: i != 3
+        ))
+
+        assert translations == {0: "KEEP THIS"}
+
+    def test_epub_chunks_are_validated_and_sent_once(self, serve):
+        server = serve(LocalBatchServer(answer=lambda body: uppercase(body).replace("[ID1]", "")))
+        tags = {"[id0]": "<p>", "[id1]": "</p>"}
+        chunks = [{'text': "[id0]Title[id1]", 'local_tag_map': tags},
+                  {'text': "[id0]Title[id1]", 'local_tag_map': tags},
+                  {'text': "Plain words", 'local_tag_map': {}}]
+
+        translations = asyncio.run(epub_translator._translate_chunks_offline(
+            chunks, "English", "French", _client()
+        ))
+
+        # The tagged chunk lost a placeholder: left to the online path
+        assert translations == {"Plain words": "PLAIN WORDS"}
+        assert len(server.files["file-1"].splitlines()) == 2
+
+    def test_unsupported_provider_translates_nothing(self):
+        client = LLMClient(provider_type="ollama", api_endpoint="http://localhost:11434/api/chat", model="m")
+        events = []
+
+        translations = asyncio.run(translate_offline(
+            [{'main_content': "Hello"}], "English", "French", client,
+            log_callback=lambda event, message: events.append(event)
+        ))
+
+        assert translations == {} and events == ["batch_api_unsupported"]
+
+
+class TestBatchJob:
+    """Run a TXT job end to end against the local batch server."""
+
+    def test_failed_chunks_go_through_the_online_path(self, serve, monkeypatch, tmp_path):
+        serve(LocalBatchServer(fail_when=lambda body: "Second" in _source(body)))
+        online = []
+
+        async def translate_online(main_content, *args, **kwargs):
+            online.append(main_content)
+            return "ONLINE"
+        monkeypatch.setattr(core_translator, "generate_translation_request", translate_online)
+        monkeypatch.chdir(tmp_path)  # the checkpoint manager keeps a copy of the input in data/
+
+        paragraphs = [f"{name} paragraph of the story, long enough to fill a chunk on its own."
+                      for name in ("First", "Second", "Third")]
+        input_path = tmp_path / "story.txt"
+        input_path.write_text("\n\n".join(paragraphs), encoding="utf-8")
+        output_path = tmp_path / "story (French).txt"
+
+        success = asyncio.run(translate_file(
+            input_filepath=str(input_path), output_filepath=str(output_path),
+            source_language="English", target_language="French", model_name="model",
+            llm_provider="openai", checkpoint_manager=CheckpointManager(str(tmp_path / "jobs.db")),
+            translation_id="batch_job", llm_api_endpoint=ENDPOINT, openai_api_key="key",
+            max_tokens_per_chunk=20, batch_mode=True
+        ))
+
+        output = output_path.read_text(encoding="utf-8")
+        assert success
+        assert online and all("Second" in text for text in online)
+        assert paragraphs[0].upper() in output and paragraphs[2].upper() in output
+        assert "ONLINE" in output
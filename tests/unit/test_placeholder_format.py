@@ -0,0 +1,95 @@
+"""
+Unit tests for PlaceholderFormat.scan() and PlaceholderScan.
+
+The scan is the single pass shared by placeholder validation and
+local/global renumbering.
+"""
+import pytest
+
+from src.common.placeholder_format import PlaceholderFormat
+from src.core.epub.placeholder_validator import PlaceholderValidator
+
+
+@pytest.fixture
+def fmt():
+    return PlaceholderFormat.from_config()
+
+
+class TestPlaceholderScan:
+    """Test the positions/index arrays produced by a scan."""
+
+    def test_scan_positions_and_indices(self, fmt):
+        scan = fmt.scan("[id0]Hello[id1] world[id12]")
+
+        assert list(scan.starts) == [0, 10, 21]
+        assert list(scan.ends) == [5, 15, 27]
+        assert list(scan.indices) == [0, 1, 12]
+        assert len(scan) == 3
+
+    def test_scan_empty_text(self, fmt):
+        scan = fmt.scan("")
+
+        assert len(scan) == 0
+        assert scan.is_sequential(0)
+        assert scan.remap_indices([3]) == ""
+
+    def test_validation_helpers(self, fmt):
+        scan = fmt.scan("[id2]a[id0]b[id0]c[id7]")
+
+        assert not scan.is_ordered()
+        assert not scan.is_sequential(3)
+        assert scan.missing(3) == [1]
+        assert scan.extra(3) == [7]
+        assert scan.duplicates() == {0: 2}
+
+    def test_remap_indices_keeps_out_of_range(self, fmt):
+        scan = fmt.scan("[id0]Bonjour[id1]monde[id9]")
+
+        assert scan.remap_indices([5, 6]) == "[id5]Bonjour[id6]monde[id9]"
+
+    def test_remap_does_not_cascade(self, fmt):
+        """Swapping indices must not re-replace already rewritten placeholders."""
+        scan = fmt.scan("[id0]a[id1]")
+
+        assert scan.remap({0: 1, 1: 0}) == "[id1]a[id0]"
+
+    def test_renumber_occurrences_gives_duplicates_distinct_indices(self, fmt):
+        scan = fmt.scan("[id5]x[id5]y[id9]")
+
+        assert scan.renumber_occurrences() == "[id0]x[id1]y[id2]"
+        assert scan.renumber_occurrences(offset=3) == "[id3]x[id4]y[id5]"
+
+    def test_renumber_uses_scan(self, fmt):
+        text, mapping = fmt.renumber("[id10]Hello[id1]world[id10]")
+
+        assert text == "[id0]Hello[id1]world[id0]"
+        assert mapping == {"[id10]": "[id0]", "[id1]": "[id1]"}
+
+    def test_from_placeholder_custom_format(self):
+        custom = PlaceholderFormat.from_placeholder("[[0]]")
+
+        assert custom.prefix == "[["
+        assert custom.suffix == "]]"
+        assert list(custom.scan("[[0]]a[[3]]").indices) == [0, 3]
+        assert PlaceholderFormat.from_placeholder("[[0]]") is custom
+
+    def test_from_placeholder_invalid(self):
+        assert PlaceholderFormat.from_placeholder("no digits") is None
+
+
+class TestValidateScan:
+    """Test validation on a precomputed scan."""
+
+    def test_validate_scan_matches_validate_strict(self, fmt):
+        tag_map = {"[id0]": "<p>", "[id1]": "</p>"}
+        for text in ["[id0]Hi[id1]", "[id1]Hi[id0]", "[id0]Hi", "[id0][id0]", "[id0]a[id2]"]:
+            assert (PlaceholderValidator.validate_scan(fmt.scan(text), tag_map)
+                    == PlaceholderValidator.validate_strict(text, tag_map))
+
+    def test_scan_for_uses_tag_map_format(self):
+        scan = PlaceholderValidator.scan_for("[[0]]a[id1]", {"[[0]]": "<p>"})
+
+        assert list(scan.indices) == [0]
+
+    def test_scan_for_empty_map(self):
+        assert PlaceholderValidator.scan_for("[id0]", {}) is None
@@ -0,0 +1,161 @@
+"""
+Unit tests for on-demand profiling of running jobs.
+"""
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+import pytest
+from flask import Flask
+
+from src.api.blueprints import translation_routes
+from src.api.blueprints.translation_routes import create_translation_blueprint
+from src.persistence.checkpoint_manager import CheckpointManager
+from src.utils.profiler import MemorySnapshots, ProfileSession, SamplingProfiler, profile_output_base
+
+
+def busy_worker(stop, allocations):
+    while not stop.is_set():
+        allocations.append("x" * 1000)
+        sum(range(1000))
+
+
+@pytest.fixture
+def worker():
+    stop, allocations = threading.Event(), []
+    thread = threading.Thread(target=busy_worker, args=(stop, allocations), daemon=True)
+    thread.start()
+    yield thread
+    stop.set()
+    thread.join()
+
+
+class TestSampling:
+    """Test the stack sampler and its output formats."""
+
+    def test_collapsed_stacks(self, worker, tmp_path):
+        session = ProfileSession(worker.ident, str(tmp_path / "book.profile"), fmt="collapsed", interval=0.002)
+
+        files = session.run(0.3)
+
+        assert files == [str(tmp_path / "book.profile.collapsed.txt")]
+        lines = (tmp_path / "book.profile.collapsed.txt").read_text(encoding="utf-8").splitlines()
+        stack, count = lines[0].rsplit(" ", 1)
+        assert int(count) > 0
+        assert f"busy_worker ({os.path.join('tests', 'unit', 'test_profiler.py')}:" in stack
+
+    def test_speedscope_profile(self, worker, tmp_path):
+        profiler = SamplingProfiler(worker.ident, interval=0.002)
+        profiler.start()
+        time.sleep(0.2)
+        profiler.stop()
+
+        profile = json.loads(json.dumps(profiler.to_speedscope("book")))
+
+        sampled, = profile["profiles"]
+        assert sampled["type"] == "sampled" and sampled["unit"] == "seconds"
+        assert len(sampled["samples"]) == len(sampled["weights"]) == len(profiler.stacks)
+        assert sum(sampled["weights"]) == pytest.approx(profiler.samples * 0.002)
+        frames = profile["shared"]["frames"]
+        assert any(frame["name"] == "busy_worker" for frame in frames)
+        assert all(0 <= index < len(frames) for stack in sampled["samples"] for index in stack)
+
+    def test_stops_when_the_thread_exits(self, tmp_path):
+        thread = threading.Thread(target=time.sleep, args=(0.1,))
+        thread.start()
+        session = ProfileSession(thread.ident, str(tmp_path / "short"), interval=0.002)
+
+        start = time.monotonic()
+        files = session.run(30)
+
+        assert time.monotonic() - start < 5
+        assert session.cpu.thread_exited.is_set()
+        assert os.path.exists(files[0]) and session.stop() == files
+
+    def test_memory_snapshots(self, worker, tmp_path):
+        session = ProfileSession(worker.ident, str(tmp_path / "book.profile"), memory=True, interval=0.005)
+
+        files = session.run(0.3)
+
+        assert [os.path.basename(path) for path in files] == [
+            "book.profile.speedscope.json", "book.profile.memory.txt", "book.profile.tracemalloc"
+        ]
+        report = (tmp_path / "book.profile.memory.txt").read_text(encoding="utf-8")
+        growth = report.split("\n\n")[0]
+        assert "test_profiler.py" in growth
+        assert tracemalloc.Snapshot.load(files[2]).statistics("lineno")
+        assert not tracemalloc.is_tracing()
+
+    def test_overlapping_memory_snapshots_share_tracing(self):
+        first, second = MemorySnapshots(), MemorySnapshots()
+
+        first.start()
+        second.start()
+        first.stop()
+        assert tracemalloc.is_tracing()
+        second.stop()
+
+        assert first.report() and second.report()
+        assert not tracemalloc.is_tracing()
+
+    def test_unknown_format(self):
+        with pytest.raises(ValueError):
+            ProfileSession(threading.get_ident(), "out", fmt="pstats")
+
+
+def test_profile_output_base(tmp_path):
+    assert profile_output_base(str(tmp_path / "book (fr).epub")).startswith(str(tmp_path / "book (fr).profile-"))
+    assert profile_output_base(str(tmp_path)).startswith(os.path.join(str(tmp_path), "profile-"))
+
+
+class TestProfileEndpoint:
+    """Test POST /api/translation/<id>/profile."""
+
+    @pytest.fixture
+    def app(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(translation_routes, "PROFILING_ENABLED", True)
+        # Imported here: the module creates its default state manager (and data/) in the cwd
+        from src.api.translation_state import TranslationStateManager
+        state_manager = TranslationStateManager(CheckpointManager(str(tmp_path / "jobs.db")))
+        app = Flask(__name__)
+        app.register_blueprint(create_translation_blueprint(state_manager, lambda *args: None, str(tmp_path)))
+        return app.test_client(), state_manager
+
+    def _start_job(self, state_manager, thread):
+        state_manager.create_translation("trans_1", {"output_filename": "book (fr).epub"})
+        state_manager.update_translation("trans_1", {"status": "running", "worker_thread_id": thread.ident})
+
+    def test_profiles_a_running_job(self, app, worker, tmp_path):
+        client, state_manager = app
+        self._start_job(state_manager, worker)
+
+        response = client.post("/api/translation/trans_1/profile", json={"seconds": 0.2, "format": "collapsed"})
+
+        assert response.status_code == 202
+        file_name, = response.get_json()["files"]
+        assert file_name.startswith("book (fr).profile-") and file_name.endswith(".collapsed.txt")
+        assert client.post("/api/translation/trans_1/profile").status_code == 409
+        deadline = time.monotonic() + 5
+        while state_manager.get_translation_field("trans_1", "profile")["status"] == "running":
+            assert time.monotonic() < deadline
+            time.sleep(0.05)
+        assert client.get("/api/translation/trans_1").get_json()["profile"] == {
+            "status": "completed", "files": [file_name]
+        }
+        assert "busy_worker" in (tmp_path / file_name).read_text(encoding="utf-8")
+
+    def test_rejected_requests(self, app, worker, monkeypatch):
+        client, state_manager = app
+
+        assert client.post("/api/translation/unknown/profile").status_code == 404
+        state_manager.create_translation("trans_1", {"output_filename": "book.txt"})
+        assert client.post("/api/translation/trans_1/profile").status_code == 400
+        state_manager.update_translation("trans_1", {"status": "running", "worker_thread_id": worker.ident})
+        assert client.post("/api/translation/trans_1/profile", json={"seconds": 100000}).status_code == 400
+        assert client.post("/api/translation/trans_1/profile", json={"format": "pstats"}).status_code == 400
+
+        monkeypatch.setattr(translation_routes, "PROFILING_ENABLED", False)
+        assert client.post("/api/translation/trans_1/profile").status_code == 403
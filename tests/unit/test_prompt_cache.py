@@ -0,0 +1,225 @@
+"""
+Unit tests for the cache-friendly prompt layout and prefix-cache hints.
+"""
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from prompts.prompts import generate_translation_prompt
+from src.core.llm.providers import gemini, openai, openrouter
+from src.core.llm.utils.prompt_cache import (
+    openai_cached_tokens, cache_control_system_message, supports_cache_control, prompt_cache_summary
+)
+
+
+def _prompt(text, previous="", layout="cache"):
+    return generate_translation_prompt(
+        text, "", "", previous, "English", "French", has_placeholders=False, layout=layout
+    )
+
+
+class TestCacheLayout:
+    """Test that the variable parts of the prompt come last."""
+
+    def test_system_prompt_is_shared_by_every_chunk(self):
+        first = _prompt("First chunk.")
+        second = _prompt("Second chunk.", previous="Premier morceau.")
+
+        assert first.system == second.system
+        assert "First chunk." not in first.system
+
+    def test_source_text_ends_the_user_prompt(self):
+        user = _prompt("Hello there.", previous="Bonjour.").user
+
+        assert user.index("Bonjour.") < user.index("Hello there.")
+        assert user.rstrip().endswith("Provide your translation now:")
+
+    def test_standard_layout_is_unchanged(self):
+        assert _prompt("Hello.", layout="standard") == _prompt("Hello.", layout=None)
+
+
+class TestCachedTokenParsing:
+    """Test reading cached-token counts from responses."""
+
+    @pytest.mark.parametrize("response, expected", [
+        ({"usage": {"prompt_tokens": 900, "prompt_tokens_details": {"cached_tokens": 768}}}, 768),
+        ({"usage": {"prompt_tokens": 900}, "timings": {"cache_n": 512}}, 512),
+        ({"usage": {"prompt_tokens": 900, "prompt_tokens_details": None}}, 0),
+        ({}, 0),
+    ])
+    def test_openai_cached_tokens(self, response, expected):
+        assert openai_cached_tokens(response) == expected
+
+    def test_summary_only_when_cache_was_hit(self):
+        assert prompt_cache_summary({'requests': 3, 'prompt_tokens': 900, 'cached_tokens': 0}) is None
+        assert "600 of 900" in prompt_cache_summary({'requests': 3, 'prompt_tokens': 900, 'cached_tokens': 600})
+
+    def test_cache_control_message(self):
+        message = cache_control_system_message("Rules")
+
+        assert message["content"][0]["cache_control"] == {"type": "ephemeral"}
+        assert supports_cache_control("anthropic/claude-sonnet-4")
+        assert not supports_cache_control("openai/gpt-4o")
+
+
+class FakeResponse:
+    def __init__(self, body):
+        self.body = body
+        self.is_error = False
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.body
+
+    async def aiter_lines(self):
+        for event in self.body:
+            yield f"data: {json.dumps(event)}"
+        yield "data: [DONE]"
+
+
+class FakeStream:
+    def __init__(self, response):
+        self.response = response
+
+    async def __aenter__(self):
+        return self.response
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+class FakeHttpClient:
+    """Records posted payloads and answers from a list of bodies (event lists when streamed)."""
+
+    def __init__(self, *bodies):
+        self.bodies = list(bodies)
+        self.posts = []
+
+    async def post(self, url, json=None, headers=None, timeout=None):
+        self.posts.append((url, json))
+        return FakeResponse(self.bodies.pop(0))
+
+    def stream(self, method, url, json=None, headers=None, timeout=None):
+        self.posts.append((url, dict(json)))
+        body = self.bodies.pop(0)
+        return FakeStream(body if isinstance(body, httpx.Response) else FakeResponse(body))
+
+
+CHAT_EVENTS = [
+    {"choices": [{"delta": {"content": "Bon"}}]},
+    {"choices": [{"delta": {"content": "jour"}, "finish_reason": "stop"}]},
+    {"choices": [], "usage": {"prompt_tokens": 100, "completion_tokens": 5,
+                              "prompt_tokens_details": {"cached_tokens": 80}}},
+]
+
+
+def _use_client(monkeypatch, provider, client):
+    async def get_client():
+        return client
+    monkeypatch.setattr(provider, "_get_client", get_client)
+
+
+class TestProviderHints:
+    """Test the hints each provider adds when PROMPT_CACHE_HINTS is on."""
+
+    def test_openai_compatible_local_server(self, monkeypatch):
+        monkeypatch.setattr(openai, "PROMPT_CACHE_HINTS", True)
+        provider = openai.OpenAICompatibleProvider("http://localhost:8080/v1/chat/completions", "model")
+        client = FakeHttpClient(CHAT_EVENTS)
+        _use_client(monkeypatch, provider, client)
+
+        response = asyncio.run(provider.generate("Hello", system_prompt="Rules"))
+
+        assert client.posts[0][1]["cache_prompt"] is True
+        assert response.cached_tokens == 80
+
+    def test_openai_api_gets_no_unknown_fields(self, monkeypatch):
+        monkeypatch.setattr(openai, "PROMPT_CACHE_HINTS", True)
+        provider = openai.OpenAICompatibleProvider("https://api.openai.com/v1/chat/completions", "gpt-4o")
+        client = FakeHttpClient(CHAT_EVENTS)
+        _use_client(monkeypatch, provider, client)
+
+        asyncio.run(provider.generate("Hello", system_prompt="Rules"))
+
+        assert "cache_prompt" not in client.posts[0][1]
+
+    def test_openrouter_cache_breakpoint(self, monkeypatch):
+        monkeypatch.setattr(openrouter, "PROMPT_CACHE_HINTS", True)
+        provider = openrouter.OpenRouterProvider("key", model="anthropic/claude-sonnet-4")
+        client = FakeHttpClient(CHAT_EVENTS)
+        _use_client(monkeypatch, provider, client)
+
+        response = asyncio.run(provider.generate("Hello", system_prompt="Rules"))
+
+        system = client.posts[0][1]["messages"][0]
+        assert system["content"][0]["cache_control"] == {"type": "ephemeral"}
+        assert response.cached_tokens == 80
+
+    def test_gemini_context_cache_is_created_once(self, monkeypatch):
+        monkeypatch.setattr(gemini, "PROMPT_CACHE_HINTS", True)
+        provider = gemini.GeminiProvider("key", model="gemini-2.0-flash")
+        generate_events = [
+            {"candidates": [{"content": {"parts": [{"text": "Bonjour"}]}, "finishReason": "STOP"}],
+             "usageMetadata": {"promptTokenCount": 100, "candidatesTokenCount": 5,
+                               "cachedContentTokenCount": 90}},
+        ]
+        client = FakeHttpClient({"name": "cachedContents/abc"}, generate_events, generate_events)
+        _use_client(monkeypatch, provider, client)
+
+        first = asyncio.run(provider.generate("Hello", system_prompt="Rules"))
+        asyncio.run(provider.generate("World", system_prompt="Rules"))
+
+        assert [url.rsplit("/", 1)[-1] for url, _ in client.posts] == [
+            "cachedContents", "gemini-2.0-flash:streamGenerateContent?alt=sse",
+            "gemini-2.0-flash:streamGenerateContent?alt=sse"
+        ]
+        assert client.posts[1][1]["cachedContent"] == "cachedContents/abc"
+        assert "systemInstruction" not in client.posts[1][1]
+        assert first.cached_tokens == 90
+
+    def test_gemini_context_cache_is_recreated_before_expiry(self, monkeypatch):
+        monkeypatch.setattr(gemini, "PROMPT_CACHE_HINTS", True)
+        monkeypatch.setattr(gemini, "GEMINI_CACHE_TTL_SECONDS", 600)
+        now = [1000.0]
+        monkeypatch.setattr(gemini.time, "monotonic", lambda: now[0])
+        provider = gemini.GeminiProvider("key", model="gemini-2.0-flash")
+        events = [{"candidates": [{"content": {"parts": [{"text": "Bonjour"}]}, "finishReason": "STOP"}]}]
+        client = FakeHttpClient({"name": "cachedContents/abc"}, events, events,
+                                {"name": "cachedContents/def"}, events)
+        _use_client(monkeypatch, provider, client)
+
+        asyncio.run(provider.generate("Hello", system_prompt="Rules"))
+        now[0] += 500
+        asyncio.run(provider.generate("World", system_prompt="Rules"))
+        now[0] += 60
+        asyncio.run(provider.generate("Again", system_prompt="Rules"))
+
+        assert [url.rsplit("/", 1)[-1] for url, _ in client.posts].count("cachedContents") == 2
+        assert [payload.get("cachedContent") for _, payload in client.posts if "contents" in payload] == [
+            "cachedContents/abc", "cachedContents/abc", "cachedContents/def"
+        ]
+
+    def test_gemini_rejected_cache_falls_back_to_system_instruction(self, monkeypatch):
+        monkeypatch.setattr(gemini, "PROMPT_CACHE_HINTS", True)
+        provider = gemini.GeminiProvider("key", model="gemini-2.0-flash")
+        events = [{"candidates": [{"content": {"parts": [{"text": "Bonjour"}]}, "finishReason": "STOP"}]}]
+        rejection = httpx.Response(
+            403, text='{"error": {"message": "CachedContent not found (or permission denied)"}}',
+            request=httpx.Request("POST", provider.stream_endpoint)
+        )
+        client = FakeHttpClient({"name": "cachedContents/abc"}, rejection, events,
+                                {"name": "cachedContents/def"}, events)
+        _use_client(monkeypatch, provider, client)
+
+        response = asyncio.run(provider.generate("Hello", system_prompt="Rules"))
+        asyncio.run(provider.generate("World", system_prompt="Rules"))
+
+        assert response.content == "Bonjour" and response.attempts == 1
+        fallback = client.posts[2][1]
+        assert "cachedContent" not in fallback
+        assert fallback["systemInstruction"] == {"parts": [{"text": "Rules"}]}
+        assert client.posts[4][1]["cachedContent"] == "cachedContents/def"
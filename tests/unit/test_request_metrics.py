@@ -0,0 +1,207 @@
+"""
+Unit tests for per-request LLM metrics: histograms, the Prometheus
+exposition, recording in LLMClient and the per-job summary.
+"""
+import asyncio
+import random
+
+import pytest
+from flask import Flask
+
+from src.api.blueprints.config_routes import create_config_blueprint
+from src.core.llm_client import LLMClient, LLMResponse
+from src.persistence.checkpoint_manager import CheckpointManager
+from src.utils import metrics as metrics_module
+from src.utils.metrics import (HISTOGRAM_PRECISION, Histogram, JobMetrics, MetricsRegistry,
+                               report_job_metrics)
+
+ENDPOINT = "http://gpu-1:11434/api/chat"
+
+
+class TestHistogram:
+    """Test the log-bucketed histogram."""
+
+    def test_percentiles_within_precision(self):
+        rng = random.Random(7)
+        values = sorted(rng.lognormvariate(0, 1.5) for _ in range(10_000))
+        histogram = Histogram()
+        for value in values:
+            histogram.record(value)
+
+        for percent in (50, 90, 99):
+            exact = values[int(len(values) * percent / 100) - 1]
+            assert histogram.percentile(percent) == pytest.approx(exact, rel=2 * HISTOGRAM_PRECISION)
+        assert histogram.percentile(100) == values[-1]
+        assert histogram.count == len(values) and histogram.sum == pytest.approx(sum(values))
+
+    def test_zero_and_merge(self):
+        first, second = Histogram(), Histogram()
+        first.record(0.0)
+        second.record(5.0, count=3)
+
+        first.merge(second)
+
+        assert (first.count, first.min, first.max) == (4, 0.0, 5.0)
+        assert first.percentile(25) == 0.0
+        assert first.cumulative((1, 10)) == [1, 4]
+
+    def test_serialization_round_trip(self):
+        histogram = Histogram()
+        for value in (0.2, 1.5, 1.5, 40):
+            histogram.record(value)
+
+        restored = Histogram.from_dict(histogram.to_dict())
+
+        assert restored.to_dict() == histogram.to_dict()
+        assert restored.percentile(50) == histogram.percentile(50)
+
+
+class TestRegistry:
+    """Test labelled series and the Prometheus text format."""
+
+    def test_prometheus_exposition(self):
+        registry = MetricsRegistry()
+        labels = {"provider": "ollama", "model": "qwen3:14b", "endpoint": ENDPOINT}
+        for seconds in (0.3, 4.0, 45.0):
+            registry.observe("llm_generation_seconds", seconds, labels)
+        registry.increment("llm_requests_total", labels, 3)
+        registry.increment("translation_fallbacks_total", {**labels, "phase": 'quoted "x"'})
+
+        text = registry.render_prometheus()
+
+        assert "# TYPE tbl_llm_generation_seconds histogram" in text
+        assert ('tbl_llm_generation_seconds_bucket{endpoint="http://gpu-1:11434/api/chat",'
+                'model="qwen3:14b",provider="ollama",le="5"} 2') in text
+        assert 'le="+Inf"} 3' in text
+        assert 'tbl_llm_generation_seconds_sum{' in text and '} 49.3' in text
+        assert 'tbl_llm_requests_total{endpoint="http://gpu-1:11434/api/chat",model="qwen3:14b",provider="ollama"} 3' in text
+        assert 'phase="quoted \\"x\\""' in text
+        assert "tbl_llm_time_to_first_token_seconds" not in text
+
+    def test_job_metrics_feed_the_parent(self):
+        parent = MetricsRegistry()
+        first, second = JobMetrics(parent), JobMetrics(parent)
+
+        first.increment("llm_requests_total", {"model": "a"})
+        second.increment("llm_requests_total", {"model": "b"}, 2)
+
+        assert first.counter("llm_requests_total") == 1
+        assert parent.counter("llm_requests_total") == 3
+        assert parent.counter("llm_requests_total", model="b") == 2
+
+
+class FakeProvider:
+    """Provider answering from a script of responses (None = failure, exception = raised)."""
+
+    api_endpoint = ENDPOINT
+    model = "qwen3:14b"
+    context_window = 4096
+
+    def __init__(self, script):
+        self.script = list(script)
+
+    async def generate(self, prompt, timeout=None, system_prompt=None):
+        await asyncio.sleep(0)
+        result = self.script.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    async def close(self):
+        pass
+
+
+def _client(script):
+    client = LLMClient(provider_type="ollama", api_endpoint=ENDPOINT, model="qwen3:14b")
+    client._provider = FakeProvider(script)
+    client.metrics = JobMetrics(MetricsRegistry())
+    return client
+
+
+class TestClientRecording:
+    """Test what LLMClient records for each request."""
+
+    def test_request_metrics(self):
+        client = _client([
+            LLMResponse(content="a", prompt_tokens=900, completion_tokens=300,
+                        time_to_first_token=0.4, tokens_per_second=42.0),
+            LLMResponse(content="b", prompt_tokens=1100, completion_tokens=350, attempts=3),
+            None,
+            RuntimeError("connection reset"),
+        ])
+
+        async def job():
+            await client.generate("one")
+            await client.make_request("two")
+            await client.generate("three")
+            with pytest.raises(RuntimeError):
+                await client.generate("four")
+
+        asyncio.run(job())
+
+        metrics = client.metrics
+        assert metrics.counter("llm_requests_total", provider="ollama", endpoint=ENDPOINT) == 2
+        assert metrics.counter("llm_request_failures_total") == 2
+        assert metrics.counter("llm_retries_total") == 2
+        assert metrics.histogram("llm_generation_seconds").count == 2
+        assert metrics.histogram("llm_time_to_first_token_seconds").count == 1
+        assert metrics.histogram("llm_prompt_tokens").sum == 2000
+        assert metrics.histogram("llm_tokens_per_second").max == 42.0
+        assert metrics.parent.counter("llm_requests_total", model="qwen3:14b") == 2
+
+    def test_context_changes_after_the_first_request(self):
+        client = _client([LLMResponse(content="a")])
+
+        client.context_window = 8192  # initial sizing
+        asyncio.run(client.generate("one"))
+        client.context_window = 8192
+        client.context_window = 16384
+        client.record_fallback("token_alignment")
+        client.record_queue_wait(1.5)
+
+        assert client.metrics.counter("llm_context_size_changes_total") == 1
+        assert client.metrics.counter("translation_fallbacks_total", phase="token_alignment") == 1
+        assert client.metrics.histogram("llm_queue_wait_seconds").max == 1.5
+
+
+class TestJobReport:
+    """Test the per-job summary and the job record."""
+
+    def test_summary_is_logged_and_accumulated_over_resumes(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        checkpoint_manager = CheckpointManager(str(tmp_path / "jobs.db"))
+        checkpoint_manager.start_job("job_1", "txt", {"model": "qwen3:14b"})
+        logs = []
+
+        for run in range(2):
+            client = _client([LLMResponse(content="a", completion_tokens=100, tokens_per_second=25.0,
+                                          attempts=2)])
+            asyncio.run(client.generate("one"))
+            report_job_metrics(client, lambda event, message: logs.append((event, message)),
+                               checkpoint_manager, "job_1")
+
+        stored = MetricsRegistry.from_dict(checkpoint_manager.get_job("job_1")["metrics"])
+        assert stored.counter("llm_requests_total") == 2
+        assert stored.summary()["llm_retries_total"] == 2
+        event, message = logs[-1]
+        assert event == "llm_metrics_summary"
+        assert "1 requests" in message and "25.0 tok/s median" in message and "1 retries" in message
+
+    def test_clients_without_metrics_are_ignored(self):
+        logs = []
+        report_job_metrics(object(), lambda event, message: logs.append(event))
+        assert logs == []
+
+
+def test_metrics_endpoint(monkeypatch):
+    registry = MetricsRegistry()
+    registry.increment("llm_requests_total", {"provider": "openai"}, 4)
+    monkeypatch.setattr(metrics_module, "REGISTRY", registry)
+    app = Flask(__name__)
+    app.register_blueprint(create_config_blueprint(server_session_id="1"))
+
+    response = app.test_client().get("/metrics")
+
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    assert 'tbl_llm_requests_total{provider="openai"} 4' in response.get_data(as_text=True)
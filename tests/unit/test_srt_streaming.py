@@ -0,0 +1,121 @@
+"""
+Unit tests for the streaming SRT parser and writer.
+"""
+import asyncio
+import io
+
+from src.core.adapters.srt_adapter import SrtAdapter
+from src.core.srt_processor import SRTProcessor, SRTStreamWriter
+
+
+SRT_CONTENT = (
+    "1\r\n00:00:01,000 --> 00:00:02,000\r\nHello\r\n\r\n"
+    "2\n00:00:03,000 --> 00:00:04,000\nHow are you?\nFine.\n\n\n"
+    "oops\n00:00:05,000 --> 00:00:06,000\nskipped\n\n"
+    "3\n00:00:07,000 --> 00:00:08,000\nBye"
+)
+
+
+class TestStreamingParser:
+    """Test iter_srt / iter_srt_file against parse_srt."""
+
+    def test_iter_srt_matches_parse_srt(self):
+        processor = SRTProcessor()
+        subtitles = processor.parse_srt(SRT_CONTENT)
+
+        assert [s['number'] for s in subtitles] == ['1', '2', '3']
+        assert subtitles[1]['text'] == "How are you?\nFine."
+        assert list(processor.iter_srt(io.StringIO(SRT_CONTENT, newline=None))) == subtitles
+
+    def test_iter_srt_file(self, tmp_path):
+        path = tmp_path / "movie.srt"
+        path.write_bytes(SRT_CONTENT.encode('utf-8'))
+        processor = SRTProcessor()
+
+        assert list(processor.iter_srt_file(str(path))) == processor.parse_srt(SRT_CONTENT)
+
+
+class TestStreamWriter:
+    """Test incremental, ordered writing."""
+
+    def test_write_matches_reconstruct_srt(self):
+        processor = SRTProcessor()
+        subtitles = processor.parse_srt(SRT_CONTENT)
+        output = io.StringIO()
+
+        writer = SRTStreamWriter(output, signature="\n# sig\n")
+        for subtitle in subtitles:
+            writer.write(subtitle)
+        writer.close()
+
+        expected = '\n'.join(
+            f"{s['number']}\n{s['start_time']} --> {s['end_time']}\n{s['text']}\n" for s in subtitles
+        ) + "\n\n# sig\n"
+        assert output.getvalue() == expected
+
+    def test_out_of_order_blocks_are_held_back(self):
+        subtitles = SRTProcessor().parse_srt(SRT_CONTENT)
+        output = io.StringIO()
+        writer = SRTStreamWriter(output)
+
+        writer.add_block(1, subtitles[1:])
+        assert output.getvalue() == ""
+        assert writer.pending_blocks == 1
+
+        writer.add_block(0, subtitles[:1])
+        assert writer.pending_blocks == 0
+        assert writer.written == 3
+        assert output.getvalue().startswith("1\n00:00:01,000")
+
+
+class TestSrtAdapterStreaming:
+    """Test that streamed adapter output matches the in-memory reconstruction."""
+
+    def test_write_output_matches_reconstruct_output(self, tmp_path):
+        input_path = tmp_path / "movie.srt"
+        input_path.write_bytes(SRT_CONTENT.encode('utf-8'))
+
+        for bilingual in (False, True):
+            adapter = SrtAdapter(str(input_path), str(tmp_path / "out.srt"), {})
+            assert asyncio.run(adapter.prepare_for_translation())
+            units = adapter.get_translation_units()
+            assert units[0].metadata['local_to_global'] == {0: 0, 1: 1, 2: 2}
+            assert asyncio.run(adapter.save_unit_translation("block_0", "[0]Bonjour\n[1]Ça va ?"))
+
+            asyncio.run(adapter.write_output(bilingual=bilingual))
+            expected = asyncio.run(adapter.reconstruct_output(bilingual=bilingual))
+
+            assert (tmp_path / "out.srt").read_bytes() == expected
+
+
+class TestSrtJobStreaming:
+    """Test that a job writes finished blocks while later ones are translated."""
+
+    def test_blocks_are_written_as_they_finish(self, tmp_path, monkeypatch):
+        from src.core import translator as core_translator
+        from src.core.adapters.generic_translator import GenericTranslator
+        from src.persistence.checkpoint_manager import CheckpointManager
+
+        cues = [f"{n}\n00:00:{n:02d},000 --> 00:00:{n:02d},500\nLine {n}\n" for n in range(1, 13)]
+        input_path = tmp_path / "movie.srt"
+        input_path.write_text("\n".join(cues), encoding="utf-8")
+        output_path = tmp_path / "movie (fr).srt"
+        written_before = []
+
+        async def translate(main_content, *args, **kwargs):
+            written_before.append(output_path.read_text(encoding="utf-8"))
+            return main_content.upper()
+
+        monkeypatch.setattr(core_translator, "generate_translation_request", translate)
+        monkeypatch.chdir(tmp_path)
+        adapter = SrtAdapter(str(input_path), str(output_path), {"lines_per_block": 5})
+        translator = GenericTranslator(adapter, CheckpointManager(str(tmp_path / "jobs.db")), "srt_job")
+
+        assert asyncio.run(translator.translate("English", "French", "model", "openai",
+                                                api_endpoint="http://localhost:1/v1/chat/completions"))
+
+        assert written_before[0] == ""
+        assert "LINE 10" in written_before[2] and "Line 11" not in written_before[2]
+        output = output_path.read_text(encoding="utf-8")
+        assert output.startswith("1\n00:00:01,000 --> 00:00:01,500\nLINE 1\n\n2\n")
+        assert all(f"LINE {n}\n" in output for n in range(1, 13))
@@ -0,0 +1,141 @@
+"""
+Unit tests for token-aware SRT block grouping.
+"""
+import asyncio
+
+from src.core.adapters.srt_adapter import SrtAdapter
+from src.core.srt_processor import (
+    SRTProcessor, block_token_budget, timecode_to_seconds,
+    SRT_MIN_BLOCK_TOKENS, SRT_CUE_TAG_TOKENS
+)
+
+
+def _subtitle(number, start, end, text):
+    return {'number': str(number), 'start_time': start, 'end_time': end, 'text': text}
+
+
+def _sequence(count, text="word " * 5, gap_after=None, gap=10):
+    """Consecutive one-second cues; a long silence follows cue gap_after."""
+    subtitles = []
+    second = 0
+    for number in range(1, count + 1):
+        start = f"00:{second // 60:02d}:{second % 60:02d},000"
+        end = f"00:{(second + 1) // 60:02d}:{(second + 1) % 60:02d},000"
+        subtitles.append(_subtitle(number, start, end, text.strip()))
+        second += 1 + (gap if number == gap_after else 0)
+    return subtitles
+
+
+def count_words(text):
+    return len(text.split())
+
+
+class TestTokenBudget:
+    """Test the context-derived block budget."""
+
+    def test_budget_grows_with_context(self):
+        assert block_token_budget(8192) > block_token_budget(4096)
+
+    def test_budget_has_a_floor(self):
+        assert block_token_budget(512) == SRT_MIN_BLOCK_TOKENS
+
+    def test_timecode_to_seconds(self):
+        assert timecode_to_seconds("01:02:03,500") == 3723.5
+
+
+class TestGroupByTokens:
+    """Test group_subtitles_by_tokens."""
+
+    def test_blocks_respect_token_budget(self):
+        subtitles = _sequence(20)
+        per_cue = 5 + SRT_CUE_TAG_TOKENS
+
+        blocks = SRTProcessor().group_subtitles_by_tokens(
+            subtitles, max_tokens_per_block=per_cue * 4, scene_gap_seconds=0,
+            count_tokens=count_words
+        )
+
+        assert [len(block) for block in blocks] == [4] * 5
+        assert [s for block in blocks for s in block] == subtitles
+
+    def test_cue_cap_is_a_quality_floor(self):
+        blocks = SRTProcessor().group_subtitles_by_tokens(
+            _sequence(10), max_tokens_per_block=10_000, max_cues_per_block=3,
+            scene_gap_seconds=0, count_tokens=count_words
+        )
+
+        assert [len(block) for block in blocks] == [3, 3, 3, 1]
+
+    def test_scene_break_closes_block(self):
+        subtitles = _sequence(10, gap_after=6)
+        processor = SRTProcessor()
+
+        blocks = processor.group_subtitles_by_tokens(
+            subtitles, max_tokens_per_block=10_000, scene_gap_seconds=5,
+            count_tokens=count_words
+        )
+        assert [len(block) for block in blocks] == [6, 4]
+
+        # Too small a block to be closed by the scene break
+        blocks = processor.group_subtitles_by_tokens(
+            subtitles, max_tokens_per_block=10_000, scene_gap_seconds=5,
+            min_cues_before_scene_break=7, count_tokens=count_words
+        )
+        assert [len(block) for block in blocks] == [10]
+
+    def test_empty_cues_are_kept(self):
+        subtitles = _sequence(4)
+        subtitles[0]['text'] = ""
+        subtitles[2]['text'] = ""
+
+        blocks = SRTProcessor().group_subtitles_by_tokens(
+            subtitles, max_tokens_per_block=1, count_tokens=count_words
+        )
+
+        assert [s for block in blocks for s in block] == subtitles
+        assert all(any(s['text'] for s in block) for block in blocks)
+
+    def test_oversized_cue_gets_its_own_block(self):
+        subtitles = _sequence(3)
+        subtitles[1]['text'] = "word " * 100
+
+        blocks = SRTProcessor().group_subtitles_by_tokens(
+            subtitles, max_tokens_per_block=20, scene_gap_seconds=0,
+            count_tokens=count_words
+        )
+
+        assert [len(block) for block in blocks] == [1, 1, 1]
+
+
+class FakeClient:
+    def __init__(self, context_size):
+        self.context_size = context_size
+
+    async def get_model_context_size(self):
+        return self.context_size
+
+
+class TestSrtAdapterTokenGrouping:
+    """Test that the adapter sizes blocks from the detected context."""
+
+    def test_larger_context_gives_fewer_blocks(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("src.core.adapters.srt_adapter.SRT_BLOCK_GROUPING", "tokens")
+        monkeypatch.setattr("src.config.SRT_MAX_CUES_PER_BLOCK", 1000)
+        monkeypatch.setattr("src.config.SRT_SCENE_GAP_SECONDS", 0.0)
+        monkeypatch.setattr("src.core.chunking.token_chunker.default_token_counter", lambda: count_words)
+
+        input_path = tmp_path / "movie.srt"
+        input_path.write_text('\n'.join(
+            f"{s['number']}\n{s['start_time']} --> {s['end_time']}\n{s['text']}\n"
+            for s in _sequence(200, text="This is a fairly ordinary subtitle line " * 2)
+        ), encoding='utf-8')
+
+        block_counts = []
+        for context_size in (2048, 16384):
+            adapter = SrtAdapter(str(input_path), str(tmp_path / "out.srt"), {})
+            asyncio.run(adapter.configure_for_model(FakeClient(context_size)))
+            assert asyncio.run(adapter.prepare_for_translation())
+            assert sum(len(block) for block in adapter.blocks) == 200
+            block_counts.append(len(adapter.blocks))
+
+        assert block_counts[1] < block_counts[0]
@@ -0,0 +1,215 @@
+"""
+Unit tests for streamed responses from the API providers.
+"""
+import asyncio
+import json
+
+import pytest
+
+from src.core.llm import RepetitionLoopError
+from src.core.llm.providers import gemini, openai, openrouter
+from src.core.llm.utils import streaming
+from src.core.llm.utils.streaming import StreamMonitor, is_reasoning_model, iter_sse_events, output_token_ceiling
+
+
+def sse(*events):
+    return [f"data: {json.dumps(event)}" for event in events] + ["data: [DONE]"]
+
+
+class FakeStreamResponse:
+    def __init__(self, lines):
+        self.lines = lines
+        self.is_error = False
+
+    def raise_for_status(self):
+        pass
+
+    async def aiter_lines(self):
+        for line in self.lines:
+            await asyncio.sleep(0)
+            yield line
+
+
+class FakeStream:
+    def __init__(self, response):
+        self.response = response
+
+    async def __aenter__(self):
+        return self.response
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+class FakeHttpClient:
+    """Streams the given SSE lines and records the request."""
+
+    def __init__(self, lines):
+        self.lines = lines
+        self.requests = []
+
+    def stream(self, method, url, json=None, headers=None, timeout=None):
+        self.requests.append((url, json))
+        return FakeStream(FakeStreamResponse(self.lines))
+
+
+def _generate(monkeypatch, provider, lines):
+    client = FakeHttpClient(lines)
+
+    async def get_client():
+        return client
+    monkeypatch.setattr(provider, "_get_client", get_client)
+    return asyncio.run(provider.generate("Hello", system_prompt="Rules")), client
+
+
+def _chat_delta(text, finish_reason=None):
+    return {"choices": [{"delta": {"content": text}, "finish_reason": finish_reason}]}
+
+
+LOOP_TEXT = "the same words again and " * 200
+
+
+class TestSseParsing:
+    """Test the SSE reader and the stream monitor."""
+
+    def test_comments_and_bad_payloads_are_skipped(self):
+        lines = [": OPENROUTER PROCESSING", "", "data: {\"a\": 1}", "data: {broken", "data: [DONE]", "data: {\"b\": 2}"]
+
+        async def collect():
+            return [event async for event in iter_sse_events(FakeStreamResponse(lines))]
+
+        assert asyncio.run(collect()) == [{"a": 1}]
+
+    def test_monitor_stops_a_repetition_loop(self):
+        monitor = StreamMonitor(max_output_tokens=100_000)
+
+        reasons = [monitor.feed(word + " ") for word in LOOP_TEXT.split()]
+
+        assert any(reasons)
+        assert "Repetition" in next(r for r in reasons if r)
+
+    def test_monitor_stops_an_overrun(self):
+        monitor = StreamMonitor(max_output_tokens=10)
+
+        assert monitor.feed("x" * 30) is None
+        assert "exceeded" in monitor.feed("x" * 30)
+
+    def test_ceiling_has_a_floor(self):
+        assert output_token_ceiling() >= 2048
+
+    def test_reasoning_models_are_not_capped(self, monkeypatch):
+        for model in ("o3-mini", "gpt-5", "openai/o4-mini", "deepseek/deepseek-r1", "qwen3:thinking"):
+            assert is_reasoning_model(model), model
+            assert output_token_ceiling(model) is None
+        for model in ("gpt-4o", "gpt-4o-mini", "mistral-small", "llama3.1:8b"):
+            assert not is_reasoning_model(model), model
+
+        monkeypatch.setattr(streaming, "REASONING_MAX_OUTPUT_TOKENS", 32000)
+        assert output_token_ceiling("o3-mini") == 32000
+
+    def test_monitor_without_ceiling_has_no_overrun_guard(self):
+        monitor = StreamMonitor(max_output_tokens=None)
+
+        assert monitor.feed("x" * 30) is None
+        assert monitor.feed("x" * 30) is None
+
+
+class TestOpenAICompatibleStreaming:
+    """Test streaming through the OpenAI-compatible provider."""
+
+    def test_deltas_usage_and_timing(self, monkeypatch):
+        provider = openai.OpenAICompatibleProvider("http://localhost:8080/v1/chat/completions", "model")
+        lines = sse(_chat_delta("Bon"), _chat_delta("jour", "stop"),
+                    {"choices": [], "usage": {"prompt_tokens": 12, "completion_tokens": 2}})
+
+        response, client = _generate(monkeypatch, provider, lines)
+
+        payload = client.requests[0][1]
+        assert payload["stream"] is True and payload["max_tokens"] == output_token_ceiling()
+        assert response.content == "Bonjour"
+        assert (response.prompt_tokens, response.completion_tokens) == (12, 2)
+        assert not response.was_truncated
+        assert response.time_to_first_token > 0 and response.tokens_per_second > 0
+
+    def test_length_finish_marks_truncation(self, monkeypatch):
+        provider = openai.OpenAICompatibleProvider("http://localhost:8080/v1/chat/completions", "model")
+
+        response, _ = _generate(monkeypatch, provider, sse(_chat_delta("Bon", "length")))
+
+        assert response.was_truncated
+        assert response.completion_tokens == 1  # estimated when usage isn't reported
+
+    def test_openai_api_uses_max_completion_tokens(self, monkeypatch):
+        provider = openai.OpenAICompatibleProvider("https://api.openai.com/v1/chat/completions", "gpt-4o")
+
+        _, client = _generate(monkeypatch, provider, sse(_chat_delta("Bonjour", "stop")))
+
+        payload = client.requests[0][1]
+        assert "max_tokens" not in payload and payload["max_completion_tokens"] == output_token_ceiling()
+
+    def test_reasoning_model_gets_no_ceiling(self, monkeypatch):
+        provider = openai.OpenAICompatibleProvider("https://api.openai.com/v1/chat/completions", "o3-mini")
+
+        _, client = _generate(monkeypatch, provider, sse(_chat_delta("Bonjour", "stop")))
+
+        payload = client.requests[0][1]
+        assert "max_tokens" not in payload and "max_completion_tokens" not in payload
+
+    def test_runaway_stream_is_aborted(self, monkeypatch):
+        provider = openai.OpenAICompatibleProvider("http://localhost:8080/v1/chat/completions", "model")
+        lines = sse(*[_chat_delta(word + " ") for word in LOOP_TEXT.split()])
+
+        with pytest.raises(RepetitionLoopError):
+            _generate(monkeypatch, provider, lines)
+
+
+class TestOpenRouterStreaming:
+    """Test streaming through the OpenRouter provider."""
+
+    def test_cost_from_final_usage(self, monkeypatch):
+        provider = openrouter.OpenRouterProvider("key", model="openai/gpt-4o")
+        costs = []
+        monkeypatch.setattr(openrouter.OpenRouterProvider, "_cost_callback", staticmethod(costs.append))
+        lines = [": OPENROUTER PROCESSING"] + sse(
+            _chat_delta("Bonjour", "stop"),
+            {"choices": [], "usage": {"prompt_tokens": 10, "completion_tokens": 3, "cost": 0.002}},
+        )
+
+        response, _ = _generate(monkeypatch, provider, lines)
+
+        assert response.content == "Bonjour"
+        assert costs[-1]["request_cost"] == 0.002
+
+    def test_reasoning_model_gets_no_ceiling(self, monkeypatch):
+        provider = openrouter.OpenRouterProvider("key", model="openai/gpt-5")
+
+        _, client = _generate(monkeypatch, provider, sse(_chat_delta("Bonjour", "stop")))
+
+        assert "max_tokens" not in client.requests[0][1]
+
+    def test_error_event_fails_the_request(self, monkeypatch):
+        provider = openrouter.OpenRouterProvider("key", model="openai/gpt-4o")
+
+        response, _ = _generate(monkeypatch, provider, sse({"error": {"message": "upstream failed"}}))
+
+        assert response is None
+
+
+class TestGeminiStreaming:
+    """Test streaming through the Gemini provider."""
+
+    def test_parts_are_joined_and_thoughts_skipped(self, monkeypatch):
+        provider = gemini.GeminiProvider("key", model="gemini-2.5-flash")
+        lines = sse(
+            {"candidates": [{"content": {"parts": [{"text": "thinking...", "thought": True}]}}]},
+            {"candidates": [{"content": {"parts": [{"text": "Bon"}]}}]},
+            {"candidates": [{"content": {"parts": [{"text": "jour"}]}, "finishReason": "MAX_TOKENS"}],
+             "usageMetadata": {"promptTokenCount": 20, "candidatesTokenCount": 2}},
+        )
+
+        response, client = _generate(monkeypatch, provider, lines)
+
+        assert client.requests[0][0].endswith(":streamGenerateContent?alt=sse")
+        assert response.content == "Bonjour"
+        assert response.prompt_tokens == 20
+        assert response.was_truncated
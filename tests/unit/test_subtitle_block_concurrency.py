@@ -0,0 +1,214 @@
+"""
+Unit tests for concurrent SRT block translation.
+
+Blocks may finish out of order; translations, checkpoints and stats must
+still be applied in block order.
+"""
+import asyncio
+import random
+import re
+from types import SimpleNamespace
+
+import pytest
+
+from src.core import subtitle_translator
+
+
+def _make_blocks(block_count, block_size=3):
+    blocks = []
+    number = 1
+    for _ in range(block_count):
+        block = []
+        for _ in range(block_size):
+            block.append({'number': str(number), 'start_time': '00:00:00,000',
+                          'end_time': '00:00:01,000', 'text': f"line {number}"})
+            number += 1
+        blocks.append(block)
+    return blocks
+
+
+class FakeClient:
+    """Uppercases [N]-tagged lines after a random delay."""
+
+    def __init__(self, seed=0):
+        self.random = random.Random(seed)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def make_request(self, prompt, model, system_prompt=None):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.random.random() / 100)
+        self.in_flight -= 1
+        source = re.search(r'<SOURCE_TEXT>\n(.*?)\n</SOURCE_TEXT>', prompt, re.DOTALL).group(1)
+        lines = source.split('\n')
+        return SimpleNamespace(content='\n'.join(line.upper() for line in lines))
+
+    def extract_translation(self, response):
+        return response
+
+    async def close(self):
+        pass
+
+
+class FakeCheckpointManager:
+    def __init__(self):
+        self.saved_indices = []
+
+    def save_checkpoint(self, translation_id, chunk_index, **kwargs):
+        self.saved_indices.append(chunk_index)
+
+    def mark_paused(self, translation_id):
+        pass
+
+
+@pytest.fixture
+def fake_client(monkeypatch):
+    client = FakeClient()
+    monkeypatch.setattr(subtitle_translator, "create_llm_client", lambda *args, **kwargs: client)
+    return client
+
+
+def _translate(blocks, concurrency, **kwargs):
+    return asyncio.run(subtitle_translator.translate_subtitles_in_blocks(
+        blocks, "English", "French", "model", "http://localhost",
+        log_callback=lambda *args, **kw: None,
+        max_concurrent_blocks=concurrency,
+        **kwargs
+    ))
+
+
+class TestConcurrentBlockTranslation:
+    """Test ordered reassembly of concurrently translated blocks."""
+
+    def test_same_translations_as_sequential(self, fake_client):
+        blocks = _make_blocks(12)
+
+        sequential = _translate(blocks, 1)
+        concurrent = _translate(blocks, 4)
+
+        assert concurrent == sequential
+        assert concurrent[0] == "LINE 1"
+        assert concurrent[35] == "LINE 36"
+        assert fake_client.max_in_flight == 4
+
+    def test_checkpoints_cover_contiguous_prefix(self, fake_client):
+        blocks = _make_blocks(10)
+        checkpoint_manager = FakeCheckpointManager()
+        stats = []
+
+        _translate(blocks, 5, checkpoint_manager=checkpoint_manager, translation_id="trans_1",
+                   stats_callback=stats.append)
+
+        assert checkpoint_manager.saved_indices == list(range(10))
+        assert [s['completed_blocks'] for s in stats] == list(range(1, 11))
+
+    def test_interruption_finishes_in_flight_blocks(self, fake_client):
+        blocks = _make_blocks(10)
+        checkpoint_manager = FakeCheckpointManager()
+        checks = iter([False] * 3 + [True] * 100)
+
+        translations = _translate(blocks, 3, checkpoint_manager=checkpoint_manager,
+                                  translation_id="trans_1",
+                                  check_interruption_callback=lambda: next(checks))
+
+        assert checkpoint_manager.saved_indices == [0, 1, 2]
+        assert len(translations) == 9
+
+
+class FakeJobCheckpointManager(FakeCheckpointManager):
+    """Checkpoint manager of a new GenericTranslator job."""
+
+    def __init__(self):
+        super().__init__()
+        self.completed_chunks = []
+        self.paused = False
+        self.job_metrics = None
+
+    def load_checkpoint(self, translation_id):
+        return None
+
+    def start_job(self, **kwargs):
+        pass
+
+    def save_checkpoint(self, translation_id, chunk_index, **kwargs):
+        super().save_checkpoint(translation_id, chunk_index)
+        self.completed_chunks.append(kwargs.get('completed_chunks'))
+
+    def mark_paused(self, translation_id):
+        self.paused = True
+
+    def mark_completed(self, translation_id):
+        pass
+
+    def get_job(self, translation_id):
+        return None
+
+    def save_job_metrics(self, translation_id, metrics):
+        self.job_metrics = metrics
+
+
+class TestGenericTranslatorWindow:
+    """Test the in-flight window of SRT jobs run through GenericTranslator."""
+
+    @pytest.fixture
+    def srt_job(self, tmp_path, monkeypatch):
+        from src.core import translator as core_translator
+        from src.core.adapters import srt_adapter
+        from src.core.adapters.generic_translator import GenericTranslator
+
+        cues = [f"{n}\n00:00:{n:02d},000 --> 00:00:{n:02d},500\nLine {n}\n" for n in range(1, 31)]
+        input_path = tmp_path / "movie.srt"
+        input_path.write_text("\n".join(cues), encoding="utf-8")
+        output_path = tmp_path / "movie (fr).srt"
+        delays = random.Random(0)
+        requests = SimpleNamespace(in_flight=0, max_in_flight=0, contexts=[])
+
+        async def translate(main_content, previous_translation_context="", **kwargs):
+            requests.in_flight += 1
+            requests.max_in_flight = max(requests.max_in_flight, requests.in_flight)
+            requests.contexts.append((main_content, previous_translation_context))
+            await asyncio.sleep(delays.random() / 100)
+            requests.in_flight -= 1
+            return main_content.upper()
+
+        monkeypatch.setattr(core_translator, "generate_translation_request", translate)
+        monkeypatch.setattr(srt_adapter, "SRT_BLOCK_CONCURRENCY", 4)
+
+        def run(**kwargs):
+            checkpoint_manager = FakeJobCheckpointManager()
+            adapter = srt_adapter.SrtAdapter(str(input_path), str(output_path), {"lines_per_block": 3})
+            translator = GenericTranslator(adapter, checkpoint_manager, "srt_job")
+            result = asyncio.run(translator.translate(
+                "English", "French", "model", "openai",
+                api_endpoint="http://localhost:1/v1/chat/completions", **kwargs))
+            return result, checkpoint_manager, output_path.read_text(encoding="utf-8")
+
+        return run, requests
+
+    def test_blocks_are_recorded_in_order(self, srt_job):
+        run, requests = srt_job
+        stats = []
+
+        result, checkpoint_manager, output = run(stats_callback=stats.append)
+
+        assert result
+        assert requests.max_in_flight == 4
+        assert checkpoint_manager.saved_indices == list(range(10))
+        assert checkpoint_manager.completed_chunks == list(range(1, 11))
+        assert [s['completed_chunks'] for s in stats] == list(range(11))
+        assert all(f"LINE {n}\n" in output for n in range(1, 31))
+        assert output.index("LINE 9\n") < output.index("LINE 10\n")
+        # The first blocks are sent before any block is translated
+        assert [context for _, context in requests.contexts[:4]] == [""] * 4
+
+    def test_interruption_records_in_flight_blocks(self, srt_job):
+        run, requests = srt_job
+        checks = iter([False] * 3 + [True] * 100)
+
+        result, checkpoint_manager, output = run(check_interruption_callback=lambda: next(checks))
+
+        assert not result and checkpoint_manager.paused
+        assert checkpoint_manager.saved_indices == [0, 1, 2]
+        assert checkpoint_manager.job_metrics is not None
+        assert "LINE 9\n" in output and "Line 10\n" in output
@@ -3,6 +3,8 @@ Unit tests for the TokenChunker class.
 
 Tests token-based text chunking with natural boundary preservation.
 """
+import io
+
 import pytest
 import sys
 from pathlib import Path
@@ -267,5 +269,95 @@ class TestTokenChunkerIntegration:
         assert len(chunks) >= 1
 
 
+class TestStreamingChunker:
+    """Tests for streaming paragraphs and chunks."""
+
+    TEXT = (
+        "First paragraph.\nStill first.\n\n"
+        "Second paragraph. " * 10 + "\n \n\t\n"
+        "  Third paragraph keeps its indent.\n\n\n\n"
+        "Fourth. " * 30 + "\n\n"
+    )
+
+    @pytest.mark.parametrize("block_size", [1, 2, 5, 64, 1 << 20])
+    def test_iter_paragraphs_matches_split(self, block_size):
+        """Streaming split gives the same paragraphs for any block size."""
+        chunker = TokenChunker()
+        paragraphs = list(chunker.iter_paragraphs(io.StringIO(self.TEXT), block_size=block_size))
+        assert paragraphs == chunker.split_into_paragraphs(self.TEXT)
+
+    def test_iter_chunks_matches_chunk_text(self):
+        """Lazily built chunks carry the same neighbour context."""
+        chunker = TokenChunker(max_tokens=40)
+        chunks = list(chunker.iter_chunks(chunker.iter_paragraphs(io.StringIO(self.TEXT), block_size=7)))
+
+        assert len(chunks) > 2
+        assert chunks == chunker.chunk_text(self.TEXT)
+        assert chunks[0]["context_before"] == ""
+        assert chunks[-1]["context_after"] == ""
+
+    def test_iter_chunks_empty(self):
+        """No paragraphs, no chunks."""
+        chunker = TokenChunker()
+        assert list(chunker.iter_chunks(chunker.iter_paragraphs(io.StringIO(" \n\n ")))) == []
+
+
+class TestParagraphBoundaries:
+    """Tests for boundary paragraphs carried from the first split."""
+
+    def test_text_is_split_into_paragraphs_once(self, monkeypatch):
+        """Context assembly reuses the first split instead of re-splitting chunks."""
+        chunker = TokenChunker(max_tokens=30)
+        calls = []
+        original_split = chunker.split_into_paragraphs
+
+        def counting_split(text):
+            calls.append(text)
+            return original_split(text)
+
+        monkeypatch.setattr(chunker, "split_into_paragraphs", counting_split)
+        text = "\n\n".join(f"Paragraph {i} has a few words in it." for i in range(20))
+        chunks = chunker.chunk_text(text)
+
+        assert len(chunks) > 2
+        assert calls == [text]
+        assert chunks[1]["context_before"] == original_split(chunks[0]["main_content"])[-1]
+        assert chunks[1]["context_after"] == original_split(chunks[2]["main_content"])[0]
+
+    def test_sentence_chunks_keep_neighbour_context(self):
+        """A long paragraph split into sentences keeps exact neighbour context."""
+        chunker = TokenChunker(max_tokens=20)
+        long_paragraph = " ".join(f"Sentence number {i} is here." for i in range(12))
+        text = f"Short intro.\n\n{long_paragraph}\n\nClosing words."
+
+        chunks = chunker.chunk_text(text)
+
+        assert len(chunks) > 3
+        for previous, chunk in zip(chunks, chunks[1:]):
+            assert chunk["context_before"] == chunker.split_into_paragraphs(previous["main_content"])[-1]
+            assert previous["context_after"] == chunker.split_into_paragraphs(chunk["main_content"])[0]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
+
+
+class TestDefaultTokenCounter:
+    """Tests for the counter shared by batch packing and SRT grouping."""
+
+    def test_counts_like_the_chunker(self, monkeypatch):
+        from types import SimpleNamespace
+        from src.core.chunking.token_chunker import default_token_counter
+        monkeypatch.setattr("src.core.chunking.token_chunker.tiktoken.get_encoding",
+                            lambda name: SimpleNamespace(encode=str.split))
+
+        assert default_token_counter()("one two three") == 3
+
+    def test_falls_back_to_the_estimate(self, monkeypatch):
+        from src.core.chunking.token_chunker import default_token_counter
+
+        def unavailable(name):
+            raise OSError("encoding not available offline")
+        monkeypatch.setattr("src.core.chunking.token_chunker.tiktoken.get_encoding", unavailable)
+
+        assert default_token_counter()("one two three") > 0
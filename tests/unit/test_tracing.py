@@ -0,0 +1,130 @@
+"""
+Unit tests for tracing spans and the Chrome trace export.
+"""
+import asyncio
+import json
+
+import pytest
+
+from src.core.llm_client import LLMClient, LLMResponse
+from src.persistence.checkpoint_manager import CheckpointManager
+from src.utils import tracing
+from src.utils.tracing import span, start_tracing, stop_tracing, traced
+
+
+@pytest.fixture
+def tracer():
+    tracer = start_tracing()
+    yield tracer
+    stop_tracing()
+
+
+def _spans(tracer, name=None):
+    return [event for event in tracer.events() if event["ph"] == "X" and name in (None, event["name"])]
+
+
+class TestDisabled:
+    """Test that instrumented code runs unchanged while tracing is off."""
+
+    def test_span_is_a_shared_noop(self):
+        assert not tracing.is_tracing()
+        with span("step", size=1) as current:
+            current.set(tokens=2)
+        assert span("other") is current
+
+    def test_traced_functions_call_through(self):
+        @traced("sync")
+        def double(x):
+            return 2 * x
+
+        @traced("async")
+        async def triple(x):
+            return 3 * x
+
+        assert double(2) == 4
+        assert asyncio.run(triple(2)) == 6
+        assert double.__name__ == "double"
+
+
+class TestRecording:
+    """Test the spans recorded while tracing is on."""
+
+    def test_nested_spans(self, tracer):
+        @traced("outer.function")
+        def outer():
+            with span("inner.step", size=3) as current:
+                current.set(tokens=7)
+
+        outer()
+        with pytest.raises(ValueError):
+            with span("failing.step"):
+                raise ValueError("boom")
+
+        inner, = _spans(tracer, "inner.step")
+        outer_span, = _spans(tracer, "outer.function")
+        assert inner["args"] == {"size": 3, "tokens": 7}
+        assert inner["cat"] == "inner" and inner["tid"] == outer_span["tid"]
+        assert outer_span["ts"] <= inner["ts"]
+        assert inner["ts"] + inner["dur"] <= outer_span["ts"] + outer_span["dur"]
+        assert _spans(tracer, "failing.step")[0]["args"] == {"error": "ValueError"}
+
+    def test_concurrent_tasks_get_their_own_tracks(self, tracer):
+        async def request(i):
+            with span("task.request", index=i):
+                await asyncio.sleep(0.01)
+
+        async def job():
+            await asyncio.gather(*(request(i) for i in range(3)))
+
+        asyncio.run(job())
+
+        requests = _spans(tracer, "task.request")
+        assert len({event["tid"] for event in requests}) == 3
+        names = {event["tid"]: event["args"]["name"] for event in tracer.events() if event["ph"] == "M"}
+        assert all(event["tid"] in names for event in requests)
+
+    def test_export_writes_a_chrome_trace(self, tracer, tmp_path):
+        with span("epub.repackage", files=12):
+            pass
+        path = tmp_path / "traces" / "out.json"
+
+        assert stop_tracing(str(path)) is tracer
+        assert not tracing.is_tracing()
+
+        trace = json.loads(path.read_text(encoding="utf-8"))
+        events = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+        assert [event["name"] for event in events] == ["epub.repackage"]
+        assert events[0]["dur"] >= 0 and events[0]["args"] == {"files": 12}
+
+
+class FakeProvider:
+    model = "qwen3:14b"
+
+    async def generate(self, prompt, timeout=None, system_prompt=None):
+        return LLMResponse(content="Bonjour", prompt_tokens=120, completion_tokens=30, attempts=2)
+
+    async def close(self):
+        pass
+
+
+class TestPipelineSpans:
+    """Test the spans of instrumented pipeline steps."""
+
+    def test_llm_request_span(self, tracer):
+        client = LLMClient(provider_type="ollama", api_endpoint="http://localhost:11434/api/chat", model="m")
+        client._provider = FakeProvider()
+
+        asyncio.run(client.generate("Hello"))
+
+        request, = _spans(tracer, "llm.request")
+        assert request["args"]["provider"] == "ollama"
+        assert request["args"]["completion_tokens"] == 30 and request["args"]["attempts"] == 2
+
+    def test_checkpoint_spans(self, tracer, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        checkpoint_manager = CheckpointManager(str(tmp_path / "jobs.db"))
+        checkpoint_manager.start_job("job_1", "txt", {})
+
+        checkpoint_manager.save_checkpoint("job_1", 0, "Hello", "Bonjour", total_chunks=1, completed_chunks=1)
+
+        assert len(_spans(tracer, "checkpoint.save_chunk")) == 1
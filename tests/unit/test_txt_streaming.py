@@ -0,0 +1,71 @@
+"""
+Unit tests for streaming TXT ingestion and incremental output.
+"""
+import asyncio
+
+from src.core.adapters.spool import SpooledRecords
+from src.core.adapters.txt_adapter import TxtAdapter
+from src.core.text_processor import iter_file_chunks, split_text_into_chunks
+
+
+TEXT = "".join(f"Paragraph {i}. " + "Some words here. " * (i % 7 + 1) + "\n\n" for i in range(60))
+
+
+class TestSpooledRecords:
+    """Test the temporary-file record store."""
+
+    def test_append_set_and_read_back(self):
+        records = SpooledRecords(2)
+        records.append({"main_content": "été"})
+        records[0] = "first"
+
+        assert len(records) == 3
+        assert list(records) == ["first", None, {"main_content": "été"}]
+
+        records[0] = "replaced"
+        assert records[0] == "replaced"
+        records.close()
+
+
+class TestStreamingTxtAdapter:
+    """Test that the streamed adapter matches in-memory chunking and output."""
+
+    def _prepare(self, tmp_path):
+        input_path = tmp_path / "book.txt"
+        input_path.write_text(TEXT, encoding="utf-8")
+        adapter = TxtAdapter(str(input_path), str(tmp_path / "out.txt"), {"max_tokens_per_chunk": 60})
+        assert asyncio.run(adapter.prepare_for_translation())
+        return adapter
+
+    def test_iter_file_chunks_matches_split(self, tmp_path):
+        input_path = tmp_path / "book.txt"
+        input_path.write_text(TEXT, encoding="utf-8")
+
+        assert list(iter_file_chunks(str(input_path), max_tokens_per_chunk=60)) == \
+            split_text_into_chunks(TEXT, max_tokens_per_chunk=60)
+
+    def test_units_are_built_from_spooled_chunks(self, tmp_path):
+        adapter = self._prepare(tmp_path)
+        chunks = split_text_into_chunks(TEXT, max_tokens_per_chunk=60)
+        units = adapter.get_translation_units()
+
+        assert len(units) == len(chunks) > 2
+        assert [unit.content for unit in units] == [chunk["main_content"] for chunk in chunks]
+        assert units[1].context_before == chunks[1]["context_before"]
+        assert units[-1].metadata == {"chunk_index": len(chunks) - 1, "total_chunks": len(chunks)}
+
+    def test_write_output_matches_reconstruct_output(self, tmp_path):
+        adapter = self._prepare(tmp_path)
+        for unit in adapter.get_translation_units()[::2]:
+            assert asyncio.run(adapter.save_unit_translation(unit.unit_id, unit.content.upper()))
+
+        outputs = {}
+        for bilingual in (False, True):
+            asyncio.run(adapter.write_output(bilingual=bilingual))
+            outputs[bilingual] = (tmp_path / "out.txt").read_bytes()
+            assert outputs[bilingual] == asyncio.run(adapter.reconstruct_output(bilingual=bilingual))
+
+        assert outputs[False].startswith(b"PARAGRAPH 0.")
+        assert outputs[True].startswith(b"Paragraph 0.")
+        assert not outputs[True].decode("utf-8").endswith("\u2500")
+        asyncio.run(adapter.cleanup())
@@ -5,6 +5,7 @@ import os
 import argparse
 import asyncio
 import logging
+import threading
 
 # Reduce verbosity of httpx (avoid showing 400 errors during model detection)
 logging.getLogger('httpx').setLevel(logging.WARNING)
@@ -12,16 +13,21 @@ logging.getLogger('httpx').setLevel(logging.WARNING)
 from src.config import DEFAULT_MODEL, API_ENDPOINT, LLM_PROVIDER, GEMINI_API_KEY, OPENAI_API_KEY, OPENROUTER_API_KEY, DEFAULT_SOURCE_LANGUAGE, DEFAULT_TARGET_LANGUAGE
 from src.utils.file_utils import get_unique_output_path, generate_tts_for_translation
 from src.utils.unified_logger import setup_cli_logger, LogType
+from src.utils.tracing import start_tracing, stop_tracing
+from src.utils.profiler import PROFILE_FORMATS, ProfileSession, profile_output_base
 from src.tts.tts_config import TTSConfig, TTS_ENABLED, TTS_VOICE, TTS_RATE, TTS_BITRATE, TTS_OUTPUT_FORMAT
 from src.persistence.checkpoint_manager import CheckpointManager
-from src.core.adapters import translate_file
+from src.core.adapters import translate_file, translate_batch, is_batch_supported
 import uuid
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Translate a text, EPUB or SRT file using an LLM.")
-    parser.add_argument("-i", "--input", required=True, help="Path to the input file (text, EPUB, or SRT).")
+    input_group = parser.add_mutually_exclusive_group(required=True)
+    input_group.add_argument("-i", "--input", help="Path to the input file (text, EPUB, or SRT).")
+    input_group.add_argument("--input-dir", help="Translate all TXT and SRT files of a directory as a single batch job.")
     parser.add_argument("-o", "--output", default=None, help="Path to the output file. If not specified, uses input filename with suffix.")
+    parser.add_argument("--output-dir", default=None, help="Output directory for --input-dir (default: the input directory).")
     parser.add_argument("-sl", "--source_lang", default=DEFAULT_SOURCE_LANGUAGE, help=f"Source language (default: {DEFAULT_SOURCE_LANGUAGE}).")
     parser.add_argument("-tl", "--target_lang", default=DEFAULT_TARGET_LANGUAGE, help=f"Target language (default: {DEFAULT_TARGET_LANGUAGE}).")
     parser.add_argument("-m", "--model", default=DEFAULT_MODEL, help=f"LLM model (default: {DEFAULT_MODEL}).")
@@ -30,7 +36,12 @@ if __name__ == "__main__":
     parser.add_argument("--gemini_api_key", default=GEMINI_API_KEY, help="Google Gemini API key (required if using gemini provider).")
     parser.add_argument("--openai_api_key", default=OPENAI_API_KEY, help="OpenAI API key (required for OpenAI cloud, not needed for local servers).")
     parser.add_argument("--openrouter_api_key", default=OPENROUTER_API_KEY, help="OpenRouter API key (required if using openrouter provider).")
+    parser.add_argument("--batch", action="store_true", help="Submit the whole job to the provider's Batch API (OpenAI-compatible providers): cheaper and not rate limited, but answered within hours. Chunks that fail are then translated online.")
     parser.add_argument("--no-color", action="store_true", help="Disable colored output.")
+    parser.add_argument("--trace", metavar="OUT.json", default=None, help="Record where the time goes (parsing, chunking, LLM requests, checkpoints...) and write it as a Chrome trace, to open in chrome://tracing or ui.perfetto.dev.")
+    parser.add_argument("--profile", metavar="SECONDS", type=float, default=None, help="Sample the CPU for the first SECONDS of the job and save the profile next to the output.")
+    parser.add_argument("--profile-format", default="speedscope", choices=PROFILE_FORMATS, help="Profile file format: speedscope (open in speedscope.app) or collapsed stacks for flame graphs (default: %(default)s).")
+    parser.add_argument("--profile-memory", action="store_true", help="With --profile, also compare tracemalloc snapshots taken at the start and end of the window.")
 
     # Prompt options (optional system prompt instructions)
     prompt_group = parser.add_argument_group('Prompt Options', 'Optional instructions to include in the translation prompt')
@@ -47,7 +58,27 @@ if __name__ == "__main__":
 
     args = parser.parse_args()
 
-    if args.output is None:
+    if args.input_dir:
+        if not os.path.isdir(args.input_dir):
+            parser.error(f"--input-dir is not a directory: {args.input_dir}")
+        input_files = sorted(
+            os.path.join(args.input_dir, name) for name in os.listdir(args.input_dir)
+            if is_batch_supported(name) and os.path.isfile(os.path.join(args.input_dir, name))
+        )
+        if not input_files:
+            parser.error(f"No TXT or SRT files found in {args.input_dir}")
+        output_dir = args.output_dir or args.input_dir
+        os.makedirs(output_dir, exist_ok=True)
+        output_files = []
+        for input_file in input_files:
+            base, ext = os.path.splitext(os.path.basename(input_file))
+            output_files.append(get_unique_output_path(
+                os.path.join(output_dir, f"{base} ({args.target_lang}){ext}")
+            ))
+        # Used below for logging and TTS
+        args.input = args.input_dir
+        args.output = output_dir
+    elif args.output is None:
         base, ext = os.path.splitext(args.input)
         output_ext = ext
         if args.input.lower().endswith('.epub'):
@@ -57,11 +88,14 @@ if __name__ == "__main__":
         # Use parentheses format: {originalName} ({target_lang}).{ext}
         args.output = f"{base} ({args.target_lang}){output_ext}"
 
-    # Ensure output path is unique (add number suffix if file exists)
-    args.output = get_unique_output_path(args.output)
+    if not args.input_dir:
+        # Ensure output path is unique (add number suffix if file exists)
+        args.output = get_unique_output_path(args.output)
 
     # Determine file type
-    if args.input.lower().endswith('.epub'):
+    if args.input_dir:
+        file_type = f"BATCH ({len(input_files)} files)"
+    elif args.input.lower().endswith('.epub'):
         file_type = "EPUB"
     elif args.input.lower().endswith('.srt'):
         file_type = "SRT"
@@ -78,6 +112,10 @@ if __name__ == "__main__":
     # Only required for OpenAI cloud API
     if args.provider == "openrouter" and not args.openrouter_api_key:
         parser.error("--openrouter_api_key is required when using openrouter provider")
+    if args.batch and args.provider != "openai":
+        parser.error("--batch requires the openai provider (OpenAI or a compatible server with a Batch API)")
+    if args.batch and args.input_dir:
+        parser.error("--batch can't be combined with --input-dir")
 
     # Log translation start
     logger.info("Translation Started", LogType.TRANSLATION_START, {
@@ -109,6 +147,16 @@ if __name__ == "__main__":
         'refine': args.refine
     }
 
+    if args.trace:
+        start_tracing()
+
+    profile_session = None
+    if args.profile:
+        profile_session = ProfileSession(threading.get_ident(), profile_output_base(args.output),
+                                         fmt=args.profile_format, memory=args.profile_memory)
+        profile_session.start()
+        threading.Thread(target=profile_session.run, args=(args.profile,), daemon=True).start()
+
     try:
         # Create checkpoint manager for resume capability
         checkpoint_manager = CheckpointManager()
@@ -116,26 +164,55 @@ if __name__ == "__main__":
         # Generate unique translation ID
         translation_id = f"cli_{uuid.uuid4().hex[:8]}"
 
-        # Call the new adapter-based translate_file
-        asyncio.run(translate_file(
-            input_filepath=args.input,
-            output_filepath=args.output,
-            source_language=args.source_lang,
-            target_language=args.target_lang,
-            model_name=args.model,
-            llm_provider=args.provider,
-            checkpoint_manager=checkpoint_manager,
-            translation_id=translation_id,
-            progress_callback=None,
-            log_callback=log_callback,
-            stats_callback=stats_callback,
-            check_interruption_callback=None,
-            llm_api_endpoint=args.api_endpoint,
-            gemini_api_key=args.gemini_api_key,
-            openai_api_key=args.openai_api_key,
-            openrouter_api_key=args.openrouter_api_key,
-            prompt_options=prompt_options
-        ))
+        if args.input_dir:
+            # One job for the whole directory: shared client, packed requests
+            results = asyncio.run(translate_batch(
+                input_filepaths=input_files,
+                output_filepaths=output_files,
+                source_language=args.source_lang,
+                target_language=args.target_lang,
+                model_name=args.model,
+                llm_provider=args.provider,
+                checkpoint_manager=checkpoint_manager,
+                translation_id=translation_id,
+                log_callback=log_callback,
+                stats_callback=stats_callback,
+                llm_api_endpoint=args.api_endpoint,
+                gemini_api_key=args.gemini_api_key,
+                openai_api_key=args.openai_api_key,
+                openrouter_api_key=args.openrouter_api_key,
+                prompt_options=prompt_options
+            ))
+            for input_file, success in results.items():
+                if not success:
+                    logger.warning(f"Not fully translated: {input_file}")
+            translated_files = [
+                output_file for input_file, output_file in zip(input_files, output_files)
+                if results[input_file]
+            ]
+        else:
+            # Call the new adapter-based translate_file
+            asyncio.run(translate_file(
+                input_filepath=args.input,
+                output_filepath=args.output,
+                source_language=args.source_lang,
+                target_language=args.target_lang,
+                model_name=args.model,
+                llm_provider=args.provider,
+                checkpoint_manager=checkpoint_manager,
+                translation_id=translation_id,
+                progress_callback=None,
+                log_callback=log_callback,
+                stats_callback=stats_callback,
+                check_interruption_callback=None,
+                llm_api_endpoint=args.api_endpoint,
+                gemini_api_key=args.gemini_api_key,
+                openai_api_key=args.openai_api_key,
+                openrouter_api_key=args.openrouter_api_key,
+                prompt_options=prompt_options,
+                batch_mode=args.batch
+            ))
+            translated_files = [args.output]
 
         # Log successful completion
         logger.info("Translation Completed Successfully", LogType.TRANSLATION_END, {
@@ -153,25 +230,33 @@ if __name__ == "__main__":
             # Create TTS config from CLI arguments
             tts_config = TTSConfig.from_cli_args(args)
 
-            # Generate audio from translated file
-            success, message, audio_path = asyncio.run(generate_tts_for_translation(
-                translated_filepath=args.output,
-                target_language=args.target_lang,
-                tts_config=tts_config,
-                log_callback=log_callback
-            ))
+            for translated_filepath in translated_files:
+                # Generate audio from translated file
+                success, message, audio_path = asyncio.run(generate_tts_for_translation(
+                    translated_filepath=translated_filepath,
+                    target_language=args.target_lang,
+                    tts_config=tts_config,
+                    log_callback=log_callback
+                ))
 
-            if success:
-                logger.info("TTS Generation Completed", LogType.INFO, {
-                    'audio_file': audio_path
-                })
-            else:
-                logger.error(f"TTS generation failed: {message}", LogType.ERROR_DETAIL, {
-                    'details': message
-                })
+                if success:
+                    logger.info("TTS Generation Completed", LogType.INFO, {
+                        'audio_file': audio_path
+                    })
+                else:
+                    logger.error(f"TTS generation failed: {message}", LogType.ERROR_DETAIL, {
+                        'details': message
+                    })
 
     except Exception as e:
         logger.error(f"Translation failed: {str(e)}", LogType.ERROR_DETAIL, {
             'details': str(e),
             'input_file': args.input
-        })
\ No newline at end of file
+        })
+    finally:
+        if args.trace:
+            stop_tracing(args.trace)
+            logger.info(f"Trace written to {args.trace}", LogType.INFO)
+        if profile_session:
+            profile_files = profile_session.stop()
+            logger.info(f"Profile written to {', '.join(profile_files)}", LogType.INFO)
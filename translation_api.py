@@ -41,6 +41,7 @@ from src.api.routes import configure_routes
 from src.api.websocket import configure_websocket_handlers
 from src.api.handlers import start_translation_job
 from src.api.translation_state import get_state_manager
+from src.utils import json_backend
 
 
 # Initialize Flask app with static folder configuration
@@ -74,7 +75,8 @@ app = Flask(__name__,
             template_folder=template_folder_path,
             static_url_path='/static')
 CORS(app)
-socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading')
+socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading',
+                    json=json_backend.StdlibCompatible)
 
 # Thread-safe state manager (generates unique session ID for this server instance)
 state_manager = get_state_manager()